@@ -14,6 +14,7 @@
 """Concurrency utilities for use with Python `async`."""
 
 import asyncio
+import concurrent.futures
 import contextlib
 import sys
 import threading
@@ -217,9 +218,13 @@ class AsyncThreadRunner():
   def __del__(self):
     self._finalizer(self._event_loop, self._thread)
 
+  def submit_coro(self, coro) -> concurrent.futures.Future:
+    """Schedules coroutine in the managed event loop without waiting on it."""
+    return asyncio.run_coroutine_threadsafe(coro, self._event_loop)
+
   def run_coro_and_return_result(self, coro):
     """Runs coroutine in the managed event loop, returning the result."""
-    future = asyncio.run_coroutine_threadsafe(coro, self._event_loop)
+    future = self.submit_coro(coro)
     return future.result()
 
   async def await_coro_and_return_result(self, coro):
@@ -18,6 +18,7 @@ import typing
 from typing import Any, Callable, Dict, Optional, OrderedDict, Iterable, Iterator, List, Tuple, Union
 
 import attr
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -82,31 +83,72 @@ class Struct(object):
     py_typecheck.check_type(elements, collections.abc.Iterable)
     values = []
     names = []
-    name_to_index = {}
-    reserved_names = frozenset(('_asdict',) + Struct.__slots__)
-    for idx, e in enumerate(elements):
-      if not py_typecheck.is_name_value_pair(e, name_required=False):
+    for e in elements:
+      # Fast path for the most common element specification, a 2-tuple.
+      if type(e) is tuple and len(e) == 2:  # pylint: disable=unidiomatic-typecheck
+        name, value = e
+        if name is not None and not isinstance(name, str):
+          raise TypeError(
+              'Expected every item on the list to be a pair in which the first '
+              'element is a string, found {!r}.'.format(e))
+      elif py_typecheck.is_name_value_pair(e, name_required=False):
+        name, value = e
+      else:
         raise TypeError(
             'Expected every item on the list to be a pair in which the first '
             'element is a string, found {!r}.'.format(e))
-      name, value = e
-      if name in reserved_names:
+      names.append(name)
+      values.append(value)
+    named = [name for name in names if name is not None]
+    if named:
+      unique_names = frozenset(named)
+      reserved_names = unique_names.intersection(_RESERVED_NAMES)
+      if reserved_names:
         raise ValueError(
             'The names in {} are reserved. You passed the name {}.'.format(
-                reserved_names, name))
-      elif name in name_to_index:
+                _RESERVED_NAMES, next(iter(reserved_names))))
+      elif len(unique_names) != len(named):
         raise ValueError('`Struct` does not support duplicated names, '
-                         'found {}.'.format([e[0] for e in elements]))
-      names.append(name)
-      values.append(value)
-      if name is not None:
-        name_to_index[name] = idx
+                         'found {}.'.format(names))
     self._element_array = tuple(values)
-    self._name_to_index = name_to_index
-    self._name_array = names
+    self._name_array = tuple(names)
+    # Built on the first lookup by name, see `_name_index`.
+    self._name_to_index = None
     self._hash = None
     self._elements_cache = None
 
+  @classmethod
+  def _from_validated(cls, name_array: Tuple[Optional[str], ...],
+                      element_array: Tuple[Any, ...],
+                      name_to_index: Optional[Dict[str, int]]) -> 'Struct':
+    """Constructs a new `Struct` skipping the validation of the names.
+
+    Args:
+      name_array: The names of an existing `Struct`.
+      element_array: The elements of the new `Struct`, as many as names.
+      name_to_index: The `_name_to_index` of the existing `Struct`, which can
+        be shared since it is never mutated, or `None`.
+
+    Returns:
+      A new `Struct`.
+    """
+    struct = object.__new__(cls)
+    struct._element_array = element_array
+    struct._name_array = name_array
+    struct._name_to_index = name_to_index
+    struct._hash = None
+    struct._elements_cache = None
+    return struct
+
+  def _name_index(self) -> Dict[str, int]:
+    if self._name_to_index is None:
+      self._name_to_index = {
+          name: index
+          for index, name in enumerate(self._name_array)
+          if name is not None
+      }
+    return self._name_to_index
+
   def _elements(self):
     if self._elements_cache is None:
       self._elements_cache = list(zip(self._name_array, self._element_array))
@@ -130,7 +172,7 @@ class Struct(object):
     Returns:
       A `list` of `str`.
     """
-    return list(self._name_to_index.keys())
+    return list(self._name_index().keys())
 
   def __getitem__(self, key: Union[int, str, slice]):
     py_typecheck.check_type(key, (int, str, slice))
@@ -144,13 +186,16 @@ class Struct(object):
     return self._element_array[key]
 
   def __getattr__(self, name):
-    if name not in self._name_to_index:
+    name_to_index = self._name_to_index
+    if name_to_index is None:
+      name_to_index = self._name_index()
+    if name not in name_to_index:
       raise AttributeError(
           'The `Struct` of length {:d} does not have named field "{!s}". '
           'Fields (up to first 10): {!s}'.format(
               len(self._element_array), name,
-              list(self._name_to_index.keys())[:10]))
-    return self._element_array[self._name_to_index[name]]
+              list(name_to_index.keys())[:10]))
+    return self._element_array[name_to_index[name]]
 
   def __eq__(self, other):
     if self is other:
@@ -183,7 +228,7 @@ class Struct(object):
       self._hash = hash((
           'Struct',  # salting to avoid type mismatch.
           self._element_array,
-          tuple(self._name_array)))
+          self._name_array))
     return self._hash
 
   def _asdict(self, recursive=False):
@@ -195,6 +240,9 @@ class Struct(object):
     return to_odict(self, recursive=recursive)
 
 
+_RESERVED_NAMES = frozenset(('_asdict',) + Struct.__slots__)
+
+
 def name_list(struct: Struct) -> List[str]:
   """Returns a `list` of the names of the named fields in `struct`.
 
@@ -211,8 +259,8 @@ def name_list(struct: Struct) -> List[str]:
 
 
 def name_list_with_nones(struct: Struct) -> List[Optional[str]]:
-  """Returns an iterator over the names of all fields in `struct`."""
-  return struct._name_array  # pylint: disable=protected-access
+  """Returns a `list` of the names of all fields in `struct`."""
+  return list(struct._name_array)  # pylint: disable=protected-access
 
 
 def to_elements(struct: Struct) -> List[Tuple[Optional[str], Any]]:
@@ -347,11 +395,27 @@ def flatten(struct):
   """
   if not isinstance(struct, Struct):
     return tf.nest.flatten(struct)
-  else:
-    result = []
-    for _, v in iter_elements(struct):
-      result.extend(flatten(v))
-    return result
+  result = []
+  _flatten_into(struct, result)
+  return result
+
+
+# The most common types of the leaves of `Struct`s, which are never flattened
+# further by `tf.nest.flatten`.
+_LEAF_TYPES = (np.ndarray, np.generic, tf.Tensor, int, float, str, bytes,
+               type(None))
+
+
+def _flatten_into(struct: Struct, result: List[Any]):
+  """Appends the leaf values of the `Struct` `struct` to `result`."""
+  for value in struct._element_array:  # pylint: disable=protected-access
+    if isinstance(value, _LEAF_TYPES):
+      # Equivalent to, but much faster than, `tf.nest.flatten` on a leaf.
+      result.append(value)
+    elif isinstance(value, Struct):
+      _flatten_into(value, result)
+    else:
+      result.extend(tf.nest.flatten(value))
 
 
 def pack_sequence_as(structure, flat_sequence: List[Any]):
@@ -383,10 +447,15 @@ def pack_sequence_as(structure, flat_sequence: List[Any]):
       return flat_sequence[position], position + 1
     else:
       elements = []
-      for k, v in iter_elements(structure):
+      for v in structure._element_array:  # pylint: disable=protected-access
         packed_v, position = _pack(v, flat_sequence, position)
-        elements.append((k, packed_v))
-      return Struct(elements), position
+        elements.append(packed_v)
+      # The names of `structure` were already validated, and its name index
+      # can be shared with the packed `Struct`.
+      # pylint: disable=protected-access
+      return Struct._from_validated(structure._name_array, tuple(elements),
+                                    structure._name_to_index), position
+      # pylint: enable=protected-access
 
   result, _ = _pack(structure, flat_sequence, 0)
   # Note: trailing elements are currently ignored.
@@ -508,7 +577,13 @@ def from_container(value: Any, recursive=False) -> Struct:
       TypeError: If `value` is not a container and `must_be_container` has
         been set to `True`.
     """
-    if isinstance(value, Struct):
+    if isinstance(value, _LEAF_TYPES):
+      if must_be_container:
+        raise TypeError('Unable to convert a Python object of type {} into '
+                        'an `Struct`. Object: {}'.format(
+                            py_typecheck.type_string(type(value)), value))
+      return value
+    elif isinstance(value, Struct):
       if recursive:
         return Struct((k, _convert(v, True)) for k, v in iter_elements(value))
       else:
@@ -606,8 +681,7 @@ def has_field(structure: Struct, field: str) -> bool:
     field: A string, the field to test for.
   """
   py_typecheck.check_type(structure, Struct)
-  names = structure._name_array  # pylint: disable=protected-access
-  return field in names
+  return field in structure._name_index()  # pylint: disable=protected-access
 
 
 def name_to_index_map(structure: Struct) -> Dict[str, int]:
@@ -620,7 +694,7 @@ def name_to_index_map(structure: Struct) -> Dict[str, int]:
     Mapping from names in `structure` to their indices.
   """
   py_typecheck.check_type(structure, Struct)
-  return structure._name_to_index  # pylint: disable=protected-access
+  return structure._name_index()  # pylint: disable=protected-access
 
 
 def update_struct(structure, **kwargs):
@@ -0,0 +1,98 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the `Struct` utilities of `structure`.
+
+Times the round trip of the weights of a model with many variables through
+`structure.from_container`, `structure.flatten`, `structure.pack_sequence_as`
+and `structure.map_structure`, as the executors do with the values of each
+round. The model weights are an `OrderedDict` of `trainable` and
+`non_trainable` lists of an `OrderedDict` of variables for each layer, and
+the leaves are NumPy arrays.
+
+To run the benchmarks:
+
+  bazel run //tensorflow_federated/python/common_libs:structure_benchmark -- --benchmark_filter=.
+"""
+
+import collections
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import structure
+
+# The number of layers of the benchmarked models, each with four variables.
+_NUM_LAYERS = (10, 100, 1_000)
+
+# The approximate number of variables processed by each benchmark, which bounds
+# the number of iterations for large models.
+_VARIABLES_PER_BENCHMARK = 1_000_000
+_MAX_ITERS = 1_000
+
+
+def _create_model_weights(num_layers: int):
+  leaf = np.zeros([2], np.float32)
+  trainable = []
+  non_trainable = []
+  for _ in range(num_layers):
+    trainable.append(collections.OrderedDict(kernel=leaf, bias=leaf))
+    non_trainable.append(
+        collections.OrderedDict(moving_mean=leaf, moving_variance=leaf))
+  return collections.OrderedDict(
+      trainable=trainable, non_trainable=non_trainable)
+
+
+class StructureBenchmark(tf.test.Benchmark):
+
+  def _run_benchmark(self, name: str, fn, num_iters: int, num_variables: int):
+    fn()  # Warm up.
+    start_time = time.perf_counter()
+    for _ in range(num_iters):
+      fn()
+    wall_time = (time.perf_counter() - start_time) / num_iters
+    self.report_benchmark(
+        name=name,
+        iters=num_iters,
+        wall_time=wall_time,
+        extras={'variables_per_second': num_variables / wall_time})
+
+  def _benchmark_model(self, num_layers: int):
+    weights = _create_model_weights(num_layers)
+    struct = structure.from_container(weights, recursive=True)
+    flat_weights = structure.flatten(struct)
+    num_variables = len(flat_weights)
+    num_iters = min(_MAX_ITERS, max(1,
+                                    _VARIABLES_PER_BENCHMARK // num_variables))
+
+    benchmarks = [
+        ('from_container',
+         lambda: structure.from_container(weights, recursive=True)),
+        ('flatten', lambda: structure.flatten(struct)),
+        ('pack_sequence_as',
+         lambda: structure.pack_sequence_as(struct, flat_weights)),
+        ('map_structure', lambda: structure.map_structure(lambda x: x, struct)),
+        ('getattr', lambda: [s.kernel for s in struct.trainable]),
+    ]
+    for name, fn in benchmarks:
+      self._run_benchmark(f'{name}_{num_variables}', fn, num_iters,
+                          num_variables)
+
+  def benchmark_model_weights(self):
+    for num_layers in _NUM_LAYERS:
+      self._benchmark_model(num_layers)
+
+
+if __name__ == '__main__':
+  tf.test.main()
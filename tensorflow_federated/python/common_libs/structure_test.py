@@ -319,6 +319,32 @@ class StructTest(tf.test.TestCase, parameterized.TestCase):
     z = structure.pack_sequence_as(x, y)
     self.assertEqual(str(z), '<a=10,b=<x=<p=40>,y=30,z=<q=50,r=60>>,c=20>')
 
+  def test_flatten_leaves_with_nested_python_containers(self):
+    x = structure.Struct([
+        ('a', [1, (2, 3)]),
+        (None, collections.OrderedDict(c=4, b=5)),
+        ('d', tf.constant([6, 7])),
+        ('e', None),
+    ])
+    y = structure.flatten(x)
+    self.assertEqual(y[:5], [1, 2, 3, 5, 4])
+    self.assertAllEqual(y[5], [6, 7])
+    self.assertIsNone(y[6])
+
+  def test_pack_sequence_as_preserves_names(self):
+    x = structure.Struct([('a', 10), (None, structure.Struct.named(b=20))])
+    y = structure.pack_sequence_as(x, [30, 40])
+    self.assertEqual(
+        y, structure.Struct([('a', 30), (None, structure.Struct.named(b=40))]))
+    self.assertEqual(y.a, 30)
+    self.assertEqual(y[1].b, 40)
+    self.assertEqual(structure.name_list_with_nones(y), ['a', None])
+    self.assertEqual(
+        hash(y),
+        hash(
+            structure.Struct([('a', 30),
+                              (None, structure.Struct.named(b=40))])))
+
   def test_is_same_structure_check_types(self):
     self.assertTrue(
         structure.is_same_structure(
@@ -503,6 +529,12 @@ class StructTest(tf.test.TestCase, parameterized.TestCase):
     expected_name_to_index_map = {'b': 0, 'a': 1}
     self.assertEqual(name_to_index_dict, expected_name_to_index_map)
 
+  def test_name_list_with_nones_returns_copy(self):
+    x = structure.Struct([(None, 10), ('a', 20)])
+    names = structure.name_list_with_nones(x)
+    names.append('b')
+    self.assertEqual(structure.name_list_with_nones(x), [None, 'a'])
+
   def test_update_struct(self):
     with self.subTest('fully_named'):
       state = structure.Struct.named(a=1, b=2, c=3)
@@ -23,13 +23,20 @@ various boundaries, namely between asyncio and regular python code:
   * EventLoops should use the Task factory provided by
     propagate_trace_context_task_factory by calling
     `set_task_factory(propagate_trace_context_task_factory)`.
+
+The cost of tracing is controlled by the global tracing level, set with
+`set_tracing_level`: tracing can be turned off entirely, in which case traced
+functions are called directly, or only a sample of the root spans (e.g. of the
+rounds run by an execution context) can be traced, with all their nested spans.
 """
 
 import abc
 import asyncio
 import contextlib
+import enum
 import functools
 import inspect
+import itertools
 import random
 import sys
 import threading
@@ -162,6 +169,94 @@ class LoggingTracingProvider(TracingProvider):
 _global_tracing_providers = [LoggingTracingProvider()]
 
 
+class TracingLevel(enum.Enum):
+  """The level of tracing of the spans.
+
+  Attributes:
+    OFF: No span is traced. The traced functions are called directly, without
+      calling the `TracingProvider`s.
+    SAMPLED: One in every `sampling_interval` root spans is traced, along with
+      all the spans nested in it. The spans nested in the other root spans are
+      not traced either, at the cost of a lookup of the current trace context.
+    FULL: All the spans are traced.
+  """
+  OFF = 'off'
+  SAMPLED = 'sampled'
+  FULL = 'full'
+
+
+_tracing_level = TracingLevel.FULL
+_sampling_interval = 1
+_root_span_counter = itertools.count()
+# Derived from the tracing level and the tracing providers, and checked by the
+# traced functions before anything else, as looking up the members of an
+# `enum.Enum` is comparatively slow.
+_tracing_enabled = True
+_sampling_enabled = False
+
+
+def _update_tracing_enabled():
+  global _tracing_enabled, _sampling_enabled
+  _tracing_enabled = (
+      _tracing_level is not TracingLevel.OFF and
+      bool(_global_tracing_providers))
+  _sampling_enabled = _tracing_level is TracingLevel.SAMPLED
+
+
+def set_tracing_level(level: TracingLevel, sampling_interval: int = 1):
+  """Sets the global level of tracing.
+
+  A root span is a span started outside of any other traced span, e.g. the span
+  of each invocation of a computation by an execution context, or of a call
+  received by an executor service.
+
+  Args:
+    level: A `TracingLevel`.
+    sampling_interval: The number of root spans for each root span traced, when
+      `level` is `TracingLevel.SAMPLED`. For example, `10` traces the first root
+      span, and then one in every ten.
+
+  Raises:
+    ValueError: If `sampling_interval` is not a positive integer.
+  """
+  py_typecheck.check_type(level, TracingLevel)
+  py_typecheck.check_type(sampling_interval, int)
+  if sampling_interval < 1:
+    raise ValueError('Expected `sampling_interval` to be a positive integer, '
+                     f'found {sampling_interval}.')
+  global _tracing_level, _sampling_interval, _root_span_counter
+  _tracing_level = level
+  _sampling_interval = sampling_interval
+  _root_span_counter = itertools.count()
+  _update_tracing_enabled()
+
+
+def get_tracing_level() -> Tuple[TracingLevel, int]:
+  """Returns the global `TracingLevel` and sampling interval."""
+  return _tracing_level, _sampling_interval
+
+
+def _sample_span() -> Optional[bool]:
+  """Returns whether to trace a new span, given the global tracing level.
+
+  Returns:
+    `True` if the span is traced. `False` if the span is an unsampled root span,
+    whose nested spans must not be traced either. `None` if the span is not
+    traced, and the trace context does not need to change.
+  """
+  if not _tracing_enabled:
+    return None
+  if not _sampling_enabled:
+    return True
+  span_yields = _current_span_yields()
+  if span_yields is _UNSAMPLED_SPAN_YIELDS:
+    return None
+  if isinstance(span_yields, _OpenSpanYields):
+    return True
+  # Note: `next` on an `itertools.count` is atomic.
+  return next(_root_span_counter) % _sampling_interval == 0
+
+
 def trace(fn=None, **trace_kwargs):
   """Delegates to the current global `TracingProvider`.
 
@@ -189,6 +284,14 @@ def trace(fn=None, **trace_kwargs):
 
     @functools.wraps(fn)
     async def async_trace(*fn_args, **fn_kwargs):
+      if not _tracing_enabled:
+        return await fn(*fn_args, **fn_kwargs)
+      sampled = _sample_span()
+      if sampled is None:
+        return await fn(*fn_args, **fn_kwargs)
+      elif not sampled:
+        with _with_span_yields(_UNSAMPLED_SPAN_YIELDS):
+          return await fn(*fn_args, **fn_kwargs)
       # Produce the span generator
       span_gen = _span_generator(
           scope, sub_scope, trace_kwargs, fn_args=fn_args, fn_kwargs=fn_kwargs)
@@ -220,6 +323,14 @@ def trace(fn=None, **trace_kwargs):
 
     @functools.wraps(fn)
     def sync_trace(*fn_args, **fn_kwargs):
+      if not _tracing_enabled:
+        return fn(*fn_args, **fn_kwargs)
+      sampled = _sample_span()
+      if sampled is None:
+        return fn(*fn_args, **fn_kwargs)
+      elif not sampled:
+        with _with_span_yields(_UNSAMPLED_SPAN_YIELDS):
+          return fn(*fn_args, **fn_kwargs)
       span_gen = _span_generator(
           scope, sub_scope, trace_kwargs, fn_args=fn_args, fn_kwargs=fn_kwargs)
       next(span_gen)
@@ -265,6 +376,14 @@ def trace(fn=None, **trace_kwargs):
 SpanYields = List[Any]
 
 
+class _OpenSpanYields(list):
+  """The span yields of a traced span, whose nested spans are not root spans."""
+
+
+# The span yields of an unsampled root span, and of the spans nested in it.
+_UNSAMPLED_SPAN_YIELDS: SpanYields = _OpenSpanYields()
+
+
 class ThreadLocalSpanYields(threading.local):
   """The span set for the current thread.
 
@@ -288,11 +407,11 @@ _non_async_span_yields = ThreadLocalSpanYields()
 def _current_task() -> Optional[asyncio.Task]:
   """Get the current running task, or `None` if no task is running."""
   # Note: `current_task` returns `None` if there is no current task, but it
-  # throws if no currently running async loop.
-  try:
-    return asyncio.current_task()
-  except RuntimeError:
+  # throws if no currently running async loop, which is much slower to handle
+  # than checking for a running loop first.
+  if asyncio._get_running_loop() is None:  # pylint: disable=protected-access
     return None
+  return asyncio.current_task()
 
 
 def _current_span_yields() -> SpanYields:
@@ -304,6 +423,8 @@ def _current_span_yields() -> SpanYields:
     spans = _non_async_span_yields.get()
   else:
     spans = getattr(task, 'trace_span_yields', None)
+  if spans is _UNSAMPLED_SPAN_YIELDS:
+    return spans
   if spans is None:
     spans = [None for _ in range(len(_global_tracing_providers))]
   assert len(_global_tracing_providers) == len(spans)
@@ -326,13 +447,23 @@ def _with_span_yields(span_yields: Optional[SpanYields]):
   """Context manager which sets and unsets the current parent span list."""
   old_span_yields = _current_span_yields()
   _set_span_yields(span_yields)
-  yield None
-  _set_span_yields(old_span_yields)
+  try:
+    yield None
+  finally:
+    _set_span_yields(old_span_yields)
 
 
 @contextlib.contextmanager
 def span(scope, sub_scope, **trace_opts):
   """Creates a `ContextManager` that wraps the code in question with a span."""
+  sampled = _sample_span()
+  if sampled is None:
+    yield
+    return
+  elif not sampled:
+    with _with_span_yields(_UNSAMPLED_SPAN_YIELDS):
+      yield
+    return
   span_gen = _span_generator(scope, sub_scope, trace_opts)
   next(span_gen)
   yield
@@ -353,7 +484,7 @@ def _span_generator(scope,
   nonce = random.randrange(1000000000)
   # Call `span` on all the global `TraceProvider`s and run it up until `yield`.
   span_generators = []
-  new_span_yields: SpanYields = []
+  new_span_yields: SpanYields = _OpenSpanYields()
   for tp, parent_span_yield in zip(_global_tracing_providers,
                                    _current_span_yields()):
     new_span_gen = tp.span(scope, sub_scope, nonce, parent_span_yield, fn_args,
@@ -379,9 +510,26 @@ def propagate_trace_context_task_factory(loop, coro):
   child_task = asyncio.tasks.Task(coro, loop=loop)
   trace_span_yields = _current_span_yields()
   setattr(child_task, 'trace_span_yields', trace_span_yields)
+  setattr(child_task, 'trace_scheduled_time', time.perf_counter())
   return child_task
 
 
+def current_task_scheduled_time() -> Optional[float]:
+  """Returns the time at which the current `asyncio.Task` was scheduled.
+
+  The time is given by `time.perf_counter()`, and is only known for tasks
+  created by `propagate_trace_context_task_factory`.
+
+  Returns:
+    A float, or `None` if there is no current task or if the time at which it
+    was scheduled is unknown.
+  """
+  task = _current_task()
+  if task is None:
+    return None
+  return getattr(task, 'trace_scheduled_time', None)
+
+
 def wrap_coroutine_in_current_trace_context(coro):
   """Wraps the coroutine in the currently active span."""
   trace_span_yields = _current_span_yields()
@@ -415,6 +563,7 @@ def add_tracing_provider(tracing_provider: TracingProvider):
   """Add to the global list of tracing providers."""
   py_typecheck.check_type(tracing_provider, TracingProvider)
   _global_tracing_providers.append(tracing_provider)
+  _update_tracing_enabled()
 
 
 def set_tracing_providers(tracing_providers: List[TracingProvider]):
@@ -424,6 +573,7 @@ def set_tracing_providers(tracing_providers: List[TracingProvider]):
     py_typecheck.check_type(tp, TracingProvider)
   global _global_tracing_providers
   _global_tracing_providers = tracing_providers
+  _update_tracing_enabled()
 
 
 def _func_to_class_and_method(fn) -> Tuple[str, str]:
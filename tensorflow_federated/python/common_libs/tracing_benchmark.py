@@ -0,0 +1,121 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the per-call overhead of `tracing.trace`.
+
+Compares calling a trivial function and coroutine function directly with
+calling them through `tracing.trace`, for each `tracing.TracingLevel`. The calls
+are nested in a root span, as the calls of the executors are nested in the span
+of the round invoked by the execution context; with `TracingLevel.SAMPLED`, the
+root span is not sampled. The reported `overhead_ns` is the time added to each
+call by the decorator.
+
+To run the benchmarks:
+
+  bazel run //tensorflow_federated/python/common_libs:tracing_benchmark -- --benchmark_filter=.
+"""
+
+import asyncio
+import time
+
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import tracing
+
+_NUM_ITERS = 100_000
+
+
+class _NoOpTracingProvider(tracing.TracingProvider):
+
+  def span(self, scope, sub_scope, nonce, parent_span_yield, fn_args, fn_kwargs,
+           trace_opts):
+    del scope, sub_scope, nonce, parent_span_yield, fn_args, fn_kwargs
+    del trace_opts
+    yield None
+
+
+def _fn(x):
+  return x
+
+
+async def _async_fn(x):
+  return x
+
+
+_traced_fn = tracing.trace(_fn)
+_traced_async_fn = tracing.trace(_async_fn)
+
+
+def _time_sync_calls(fn) -> float:
+  with tracing.span('Benchmark', 'root'):
+    start_time = time.perf_counter()
+    for i in range(_NUM_ITERS):
+      fn(i)
+    return (time.perf_counter() - start_time) / _NUM_ITERS
+
+
+def _time_async_calls(fn) -> float:
+
+  async def _calls():
+    with tracing.span('Benchmark', 'root'):
+      start_time = time.perf_counter()
+      for i in range(_NUM_ITERS):
+        await fn(i)
+      return (time.perf_counter() - start_time) / _NUM_ITERS
+
+  return asyncio.run(_calls())
+
+
+class TracingBenchmark(tf.test.Benchmark):
+
+  def _benchmark_levels(self, name, time_calls, fn, traced_fn):
+    tracing_providers = tracing._global_tracing_providers  # pylint: disable=protected-access
+    tracing_level = tracing.get_tracing_level()
+    tracing.set_tracing_providers([_NoOpTracingProvider()])
+    try:
+      time_calls(fn)  # Warm up.
+      baseline_wall_time = time_calls(fn)
+      self.report_benchmark(
+          name=f'{name}_undecorated',
+          iters=_NUM_ITERS,
+          wall_time=baseline_wall_time)
+      levels = [
+          ('off', tracing.TracingLevel.OFF, 1),
+          ('sampled_out', tracing.TracingLevel.SAMPLED, 2),
+          ('full', tracing.TracingLevel.FULL, 1),
+      ]
+      for level_name, level, sampling_interval in levels:
+        # With an interval of 2, the warm up consumes the sampled root span,
+        # and the root span of the timed calls is not sampled.
+        tracing.set_tracing_level(level, sampling_interval)
+        time_calls(traced_fn)
+        wall_time = time_calls(traced_fn)
+        self.report_benchmark(
+            name=f'{name}_traced_{level_name}',
+            iters=_NUM_ITERS,
+            wall_time=wall_time,
+            extras={'overhead_ns': (wall_time - baseline_wall_time) * 1e9})
+    finally:
+      tracing.set_tracing_providers(tracing_providers)
+      tracing.set_tracing_level(*tracing_level)
+
+  def benchmark_sync_calls(self):
+    self._benchmark_levels('sync', _time_sync_calls, _fn, _traced_fn)
+
+  def benchmark_async_calls(self):
+    self._benchmark_levels('async', _time_async_calls, _async_fn,
+                           _traced_async_fn)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -318,6 +318,98 @@ class TracingProviderInterfaceTest(absltest.TestCase):
     self.assertEqual(mock.scopes, ['outer', '<locals>', 'inner'])
     self.assertEqual(mock.sub_scopes, ['', 'middle', ''])
 
+  def test_current_task_scheduled_time(self):
+    loop = asyncio.new_event_loop()
+    loop.set_task_factory(tracing.propagate_trace_context_task_factory)
+
+    async def get_scheduled_time():
+      return tracing.current_task_scheduled_time()
+
+    before = time.perf_counter()
+    scheduled_time = loop.run_until_complete(get_scheduled_time())
+    loop.close()
+
+    self.assertIsNotNone(scheduled_time)
+    self.assertBetween(scheduled_time, before, time.perf_counter())
+
+  def test_current_task_scheduled_time_unknown(self):
+
+    async def get_scheduled_time():
+      return tracing.current_task_scheduled_time()
+
+    self.assertIsNone(tracing.current_task_scheduled_time())
+    self.assertIsNone(asyncio.run(get_scheduled_time()))
+
+
+class TracingLevelTest(absltest.TestCase):
+
+  def tearDown(self):
+    tracing.set_tracing_level(tracing.TracingLevel.FULL)
+    super().tearDown()
+
+  def test_off_does_not_trace(self):
+    mock = set_mock_trace()
+    tracing.set_tracing_level(tracing.TracingLevel.OFF)
+
+    @tracing.trace
+    def sync_fn():
+      return 1
+
+    @tracing.trace
+    async def async_fn():
+      return 2
+
+    with tracing.span('outer', ''):
+      self.assertEqual(sync_fn(), 1)
+      self.assertEqual(asyncio.run(async_fn()), 2)
+
+    self.assertEmpty(mock.scopes)
+
+  def test_sampled_traces_one_in_n_root_spans_with_nested_spans(self):
+    mock = set_mock_trace()
+    tracing.set_tracing_level(tracing.TracingLevel.SAMPLED, sampling_interval=3)
+
+    @tracing.trace
+    async def middle():
+      with tracing.span('inner', ''):
+        pass
+
+    for i in range(6):
+      with tracing.span('outer', str(i)):
+        asyncio.run(tracing.wrap_coroutine_in_current_trace_context(middle()))
+
+    self.assertEqual(mock.scopes, ['outer', '<locals>', 'inner'] * 2)
+    self.assertEqual(mock.sub_scopes, ['0', 'middle', '', '3', 'middle', ''])
+    self.assertEqual(mock.parent_span_yields, [None, 0, 1] * 2)
+
+  def test_sampled_restores_trace_context_on_error(self):
+    mock = set_mock_trace()
+    tracing.set_tracing_level(tracing.TracingLevel.SAMPLED, sampling_interval=2)
+
+    @tracing.trace
+    def fail():
+      raise ValueError()
+
+    with tracing.span('sampled', ''):
+      pass
+    with self.assertRaises(ValueError):
+      fail()
+    with tracing.span('sampled', ''):
+      pass
+
+    self.assertEqual(mock.scopes, ['sampled', 'sampled'])
+
+  def test_get_tracing_level(self):
+    tracing.set_tracing_level(
+        tracing.TracingLevel.SAMPLED, sampling_interval=10)
+    self.assertEqual(tracing.get_tracing_level(),
+                     (tracing.TracingLevel.SAMPLED, 10))
+
+  def test_raises_on_invalid_sampling_interval(self):
+    with self.assertRaises(ValueError):
+      tracing.set_tracing_level(
+          tracing.TracingLevel.SAMPLED, sampling_interval=0)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -26,6 +26,7 @@ from typing import Callable, Dict, Optional, Tuple
 
 import tensorflow as tf
 
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.backends.mapreduce import compiler
@@ -38,10 +39,13 @@ from tensorflow_federated.python.core.impl.compiler import tree_analysis
 from tensorflow_federated.python.core.impl.compiler import tree_transformations
 from tensorflow_federated.python.core.impl.computation import computation_base
 from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.federated_context import federated_computation
 from tensorflow_federated.python.core.impl.federated_context import intrinsics
 from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
+from tensorflow_federated.python.core.impl.types import type_serialization
 
 _GRAPPLER_DEFAULT_CONFIG = tf.compat.v1.ConfigProto()
 _AGGRESSIVE = _GRAPPLER_DEFAULT_CONFIG.graph_options.rewrite_options.AGGRESSIVE
@@ -54,6 +58,13 @@ _GRAPPLER_DEFAULT_CONFIG.graph_options.rewrite_options.function_optimization = _
 BuildingBlockFn = Callable[[building_blocks.ComputationBuildingBlock],
                            building_blocks.ComputationBuildingBlock]
 
+# The computations of a `MapReduceForm`, in the order of its constructor's
+# arguments.
+_MAP_REDUCE_FORM_COMPUTATIONS = ('prepare', 'work', 'zero', 'accumulate',
+                                 'merge', 'report', 'secure_sum_bitwidth',
+                                 'secure_sum_max_input',
+                                 'secure_modular_sum_modulus', 'update')
+
 
 def get_computation_for_broadcast_form(
     bf: forms.BroadcastForm) -> computation_base.Computation:
@@ -905,11 +916,52 @@ def get_broadcast_form_for_computation(
       client_data_label=client_data_label)
 
 
+def serialize_map_reduce_form(mrf: forms.MapReduceForm) -> bytes:
+  """Serializes a `tff.backends.mapreduce.MapReduceForm`.
+
+  The computations of `mrf` are stored as the named elements of a struct
+  `pb.Computation` whose type is the type signature of `mrf`. Like other
+  serialized types, this type does not retain Python containers.
+
+  Args:
+    mrf: An instance of `tff.backends.mapreduce.MapReduceForm`.
+
+  Returns:
+    The serialized `mrf`, which can be deserialized with
+    `deserialize_map_reduce_form`.
+  """
+  py_typecheck.check_type(mrf, forms.MapReduceForm)
+  elements = [
+      pb.Struct.Element(
+          name=name,
+          value=computation_impl.ConcreteComputation.get_proto(
+              getattr(mrf, name))) for name in _MAP_REDUCE_FORM_COMPUTATIONS
+  ]
+  proto = pb.Computation(
+      type=type_serialization.serialize_type(mrf.type_signature),
+      struct=pb.Struct(element=elements))
+  return proto.SerializeToString()
+
+
+def deserialize_map_reduce_form(data: bytes) -> forms.MapReduceForm:
+  """Deserializes the output of `serialize_map_reduce_form`."""
+  proto = pb.Computation.FromString(data)
+  comps = {
+      element.name: computation_impl.ConcreteComputation(
+          element.value, context_stack_impl.context_stack)
+      for element in proto.struct.element
+  }
+  return forms.MapReduceForm(
+      type_serialization.deserialize_type(proto.type),
+      *[comps[name] for name in _MAP_REDUCE_FORM_COMPUTATIONS])
+
+
 def get_map_reduce_form_for_computation(
     comp: computation_base.Computation,
     grappler_config: tf.compat.v1.ConfigProto = _GRAPPLER_DEFAULT_CONFIG,
     *,
     tff_internal_preprocessing: Optional[BuildingBlockFn] = None,
+    compilation_cache: Optional[compilation_cache_lib.CompilationCache] = None,
 ) -> forms.MapReduceForm:
   """Constructs `tff.backends.mapreduce.MapReduceForm` for a computation.
 
@@ -928,6 +980,10 @@ def get_map_reduce_form_for_computation(
       bypassed.
     tff_internal_preprocessing: An optional function to transform the AST of the
       iterative process.
+    compilation_cache: An optional `compilation_cache.CompilationCache` in which
+      to persist the resulting `tff.backends.mapreduce.MapReduceForm`, and from
+      which to load it if `comp` was already compiled with the same
+      `grappler_config`. Not used if `tff_internal_preprocessing` is given.
 
   Returns:
     An instance of `tff.backends.mapreduce.MapReduceForm` equivalent to the
@@ -938,11 +994,30 @@ def get_map_reduce_form_for_computation(
     compiler.MapReduceFormCompilationError: If the compilation process fails.
   """
   py_typecheck.check_type(comp, computation_base.Computation)
-  comp_bb = check_computation_compatible_with_map_reduce_form(
-      comp, tff_internal_preprocessing=tff_internal_preprocessing)
   py_typecheck.check_type(grappler_config, tf.compat.v1.ConfigProto)
   grappler_config = _merge_grappler_config_with_default(grappler_config)
 
+  cache_key = None
+  # The preprocessing function can not be fingerprinted, so computations
+  # compiled with one are not cached.
+  if compilation_cache is not None and tff_internal_preprocessing is None:
+    py_typecheck.check_type(compilation_cache,
+                            compilation_cache_lib.CompilationCache)
+    options = grappler_config.SerializeToString(deterministic=True).hex()
+    cache_key = compilation_cache.fingerprint(
+        comp, f'mapreduce.get_map_reduce_form_for_computation:{options}')
+  if cache_key is not None:
+    mrf = compilation_cache.get(cache_key, deserialize_map_reduce_form)
+    if mrf is not None:
+      # Serialized types do not carry Python containers, so use the type of
+      # `comp` to return the same form as compiling it.
+      return forms.MapReduceForm(
+          comp.type_signature,
+          *[getattr(mrf, name) for name in _MAP_REDUCE_FORM_COMPUTATIONS])
+
+  comp_bb = check_computation_compatible_with_map_reduce_form(
+      comp, tff_internal_preprocessing=tff_internal_preprocessing)
+
   comp_bb, _ = tree_transformations.uniquify_reference_names(comp_bb)
   before_broadcast, after_broadcast = _split_ast_on_broadcast(comp_bb)
   before_aggregate, after_aggregate = _split_ast_on_aggregate(after_broadcast)
@@ -966,4 +1041,7 @@ def get_map_reduce_form_for_computation(
   comps = (
       computation_impl.ConcreteComputation.from_building_block(bb)
       for bb in blocks)
-  return forms.MapReduceForm(comp.type_signature, *comps)
+  mrf = forms.MapReduceForm(comp.type_signature, *comps)
+  if cache_key is not None:
+    compilation_cache.put(cache_key, mrf, serialize_map_reduce_form)
+  return mrf
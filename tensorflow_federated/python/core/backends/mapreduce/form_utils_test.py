@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import collections
+from unittest import mock
 
 from absl.testing import parameterized
 import numpy as np
@@ -26,6 +27,7 @@ from tensorflow_federated.python.core.impl.compiler import building_blocks
 from tensorflow_federated.python.core.impl.compiler import transformation_utils
 from tensorflow_federated.python.core.impl.compiler import tree_analysis
 from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache
 from tensorflow_federated.python.core.impl.federated_context import federated_computation
 from tensorflow_federated.python.core.impl.federated_context import intrinsics
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
@@ -720,6 +722,61 @@ class GetMapReduceFormTest(MapReduceFormTestCase, parameterized.TestCase):
 
     self.assertIsInstance(mrf, forms.MapReduceForm)
 
+  def test_serialize_map_reduce_form_round_trip(self):
+    mrf = mapreduce_test_utils.get_temperature_sensor_example().mrf
+
+    new_mrf = form_utils.deserialize_map_reduce_form(
+        form_utils.serialize_map_reduce_form(mrf))
+
+    self.assertIsInstance(new_mrf, forms.MapReduceForm)
+    type_test_utils.assert_types_equivalent(new_mrf.type_signature,
+                                            mrf.type_signature)
+    for name in ('prepare', 'work', 'zero', 'accumulate', 'merge', 'report',
+                 'secure_sum_bitwidth', 'secure_sum_max_input',
+                 'secure_modular_sum_modulus', 'update'):
+      self.assertEqual(
+          computation_impl.ConcreteComputation.get_proto(getattr(new_mrf,
+                                                                 name)),
+          computation_impl.ConcreteComputation.get_proto(getattr(mrf, name)))
+
+  def test_returns_map_reduce_form_from_compilation_cache(self):
+    ip = get_iterative_process_for_sum_example()
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+    mrf = form_utils.get_map_reduce_form_for_computation(
+        ip.next, compilation_cache=cache)
+
+    with mock.patch.object(
+        form_utils,
+        'check_computation_compatible_with_map_reduce_form',
+        wraps=form_utils.check_computation_compatible_with_map_reduce_form
+    ) as mock_check:
+      cached_mrf = form_utils.get_map_reduce_form_for_computation(
+          ip.next, compilation_cache=cache)
+      mock_check.assert_not_called()
+
+    self.assertIsInstance(cached_mrf, forms.MapReduceForm)
+    self.assertEqual(cached_mrf.type_signature, mrf.type_signature)
+    self.assertEqual(
+        computation_impl.ConcreteComputation.get_proto(cached_mrf.work),
+        computation_impl.ConcreteComputation.get_proto(mrf.work))
+
+  def test_compilation_cache_is_keyed_on_grappler_config(self):
+    ip = get_iterative_process_for_sum_example()
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+    form_utils.get_map_reduce_form_for_computation(
+        ip.next, compilation_cache=cache)
+    grappler_config = tf.compat.v1.ConfigProto()
+    grappler_config.graph_options.rewrite_options.disable_meta_optimizer = True
+
+    with mock.patch.object(
+        form_utils,
+        'check_computation_compatible_with_map_reduce_form',
+        wraps=form_utils.check_computation_compatible_with_map_reduce_form
+    ) as mock_check:
+      form_utils.get_map_reduce_form_for_computation(
+          ip.next, grappler_config, compilation_cache=cache)
+      mock_check.assert_called_once()
+
   def get_map_reduce_form_for_client_to_server_fn(
       self, client_to_server_fn) -> forms.MapReduceForm:
     """Produces a `MapReduceForm` for the provided `client_to_server_fn`.
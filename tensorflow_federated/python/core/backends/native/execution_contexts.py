@@ -30,6 +30,7 @@ from tensorflow_federated.python.core.backends.native import mergeable_comp_comp
 from tensorflow_federated.python.core.impl.context_stack import context_base
 from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.impl.execution_contexts import async_execution_context
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.execution_contexts import mergeable_comp_execution_context
 from tensorflow_federated.python.core.impl.execution_contexts import sync_execution_context
 from tensorflow_federated.python.core.impl.executor_stacks import python_executor_stacks
@@ -40,27 +41,43 @@ from tensorflow_federated.python.core.impl.types import placements
 _LOCALHOST_SERVER_WAIT_TIME_SEC = 1.
 
 
-def _make_basic_python_execution_context(*, executor_fn, compiler_fn,
-                                         asynchronous):
+def _make_basic_python_execution_context(*,
+                                         executor_fn,
+                                         compiler_fn,
+                                         asynchronous,
+                                         compilation_cache=None,
+                                         compilation_options=''):
   """Wires executor function and compiler into sync or async context."""
 
   if not asynchronous:
     context = sync_execution_context.ExecutionContext(
-        executor_fn=executor_fn, compiler_fn=compiler_fn)
+        executor_fn=executor_fn,
+        compiler_fn=compiler_fn,
+        compilation_cache=compilation_cache,
+        compilation_options=compilation_options)
   else:
     context = async_execution_context.AsyncExecutionContext(
-        executor_fn=executor_fn, compiler_fn=compiler_fn)
+        executor_fn=executor_fn,
+        compiler_fn=compiler_fn,
+        compilation_cache=compilation_cache,
+        compilation_options=compilation_options)
 
   return context
 
 
+def _native_compilation_options(transform_math_to_tf: bool) -> str:
+  return ('native.transform_to_native_form:'
+          f'transform_math_to_tf={transform_math_to_tf}')
+
+
 def create_local_python_execution_context(
     default_num_clients: int = 0,
     max_fanout: int = 100,
     clients_per_thread: int = 1,
     server_tf_device=None,
     client_tf_devices=tuple(),
-    reference_resolving_clients=False
+    reference_resolving_clients=False,
+    compilation_cache: Optional[compilation_cache_lib.CompilationCache] = None
 ) -> sync_execution_context.ExecutionContext:
   """Creates an execution context that executes computations locally."""
   factory = python_executor_stacks.local_executor_factory(
@@ -77,15 +94,22 @@ def create_local_python_execution_context(
     return native_form
 
   return _make_basic_python_execution_context(
-      executor_fn=factory, compiler_fn=_compiler, asynchronous=False)
+      executor_fn=factory,
+      compiler_fn=_compiler,
+      asynchronous=False,
+      compilation_cache=compilation_cache,
+      compilation_options=_native_compilation_options(
+          transform_math_to_tf=not reference_resolving_clients))
 
 
-def set_local_python_execution_context(default_num_clients: int = 0,
-                                       max_fanout: int = 100,
-                                       clients_per_thread: int = 1,
-                                       server_tf_device=None,
-                                       client_tf_devices=tuple(),
-                                       reference_resolving_clients=False):
+def set_local_python_execution_context(
+    default_num_clients: int = 0,
+    max_fanout: int = 100,
+    clients_per_thread: int = 1,
+    server_tf_device=None,
+    client_tf_devices=tuple(),
+    reference_resolving_clients=False,
+    compilation_cache: Optional[compilation_cache_lib.CompilationCache] = None):
   """Sets an execution context that executes computations locally."""
   context = create_local_python_execution_context(
       default_num_clients=default_num_clients,
@@ -94,6 +118,7 @@ def set_local_python_execution_context(default_num_clients: int = 0,
       server_tf_device=server_tf_device,
       client_tf_devices=client_tf_devices,
       reference_resolving_clients=reference_resolving_clients,
+      compilation_cache=compilation_cache,
   )
   context_stack_impl.context_stack.set_default_context(context)
 
@@ -104,7 +129,8 @@ def create_local_async_python_execution_context(
     clients_per_thread: int = 1,
     server_tf_device=None,
     client_tf_devices=tuple(),
-    reference_resolving_clients: bool = False
+    reference_resolving_clients: bool = False,
+    compilation_cache: Optional[compilation_cache_lib.CompilationCache] = None
 ) -> async_execution_context.AsyncExecutionContext:
   """Creates a context that executes computations locally as coro functions."""
   factory = python_executor_stacks.local_executor_factory(
@@ -121,7 +147,12 @@ def create_local_async_python_execution_context(
     return native_form
 
   return _make_basic_python_execution_context(
-      executor_fn=factory, compiler_fn=_compiler, asynchronous=True)
+      executor_fn=factory,
+      compiler_fn=_compiler,
+      asynchronous=True,
+      compilation_cache=compilation_cache,
+      compilation_options=_native_compilation_options(
+          transform_math_to_tf=not reference_resolving_clients))
 
 
 def set_local_async_python_execution_context(
@@ -130,7 +161,8 @@ def set_local_async_python_execution_context(
     clients_per_thread: int = 1,
     server_tf_device=None,
     client_tf_devices=tuple(),
-    reference_resolving_clients: bool = False):
+    reference_resolving_clients: bool = False,
+    compilation_cache: Optional[compilation_cache_lib.CompilationCache] = None):
   """Sets a context that executes computations locally as coro functions."""
   context = create_local_async_python_execution_context(
       default_num_clients=default_num_clients,
@@ -138,7 +170,8 @@ def set_local_async_python_execution_context(
       clients_per_thread=clients_per_thread,
       server_tf_device=server_tf_device,
       client_tf_devices=client_tf_devices,
-      reference_resolving_clients=reference_resolving_clients)
+      reference_resolving_clients=reference_resolving_clients,
+      compilation_cache=compilation_cache)
   context_stack_impl.context_stack.set_default_context(context)
 
 
@@ -14,6 +14,7 @@
 
 import asyncio
 import collections
+import os
 import subprocess
 import sys
 import threading
@@ -26,6 +27,7 @@ import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.python.core.backends.native import execution_contexts
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache
 from tensorflow_federated.python.core.impl.executors import remote_executor_grpc_stub
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
 from tensorflow_federated.python.tensorflow_libs import tensorflow_test_utils
@@ -177,6 +179,46 @@ class AsyncLocalExecutionContextTest(absltest.TestCase):
     self.assertEqual(result, [1, 2])
 
 
+class CompilationCacheTest(absltest.TestCase):
+
+  def test_reuses_compiled_computations_across_contexts(self):
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    directory = self.create_tempdir().full_path
+    cache = compilation_cache.CompilationCache(directory)
+    execution_contexts.set_local_python_execution_context(
+        compilation_cache=cache)
+    self.assertEqual(add_one(1), 2)
+    self.assertLen(os.listdir(directory), 1)
+
+    execution_contexts.set_local_python_execution_context(
+        compilation_cache=cache)
+    with mock.patch.object(
+        execution_contexts.compiler,
+        'transform_to_native_form',
+        side_effect=AssertionError('Unexpected compilation.')):
+      self.assertEqual(add_one(2), 3)
+
+  def test_does_not_share_entries_between_compiler_options(self):
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    directory = self.create_tempdir().full_path
+    cache = compilation_cache.CompilationCache(directory)
+    for reference_resolving_clients in (True, False):
+      execution_contexts.set_local_python_execution_context(
+          reference_resolving_clients=reference_resolving_clients,
+          compilation_cache=cache)
+      self.assertEqual(add_one(1), 2)
+
+    self.assertLen(os.listdir(directory), 2)
+
+
 class LocalhostServerCPPExecutionContextTest(absltest.TestCase):
 
   def setUp(self):
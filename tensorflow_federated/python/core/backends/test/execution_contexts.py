@@ -13,14 +13,19 @@
 # limitations under the License.
 """Execution contexts for the test backend."""
 
+from typing import Optional
+
 from tensorflow_federated.python.core.backends.test import compiler
 from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.execution_contexts import sync_execution_context
 from tensorflow_federated.python.core.impl.executor_stacks import python_executor_stacks
 
 
-def create_test_python_execution_context(default_num_clients=0,
-                                         clients_per_thread=1):
+def create_test_python_execution_context(
+    default_num_clients=0,
+    clients_per_thread=1,
+    compilation_cache: Optional[compilation_cache_lib.CompilationCache] = None):
   """Creates an execution context that executes computations locally."""
   factory = python_executor_stacks.local_executor_factory(
       default_num_clients=default_num_clients,
@@ -28,13 +33,18 @@ def create_test_python_execution_context(default_num_clients=0,
 
   return sync_execution_context.ExecutionContext(
       executor_fn=factory,
-      compiler_fn=compiler.replace_secure_intrinsics_with_bodies)
+      compiler_fn=compiler.replace_secure_intrinsics_with_bodies,
+      compilation_cache=compilation_cache,
+      compilation_options='test.replace_secure_intrinsics_with_bodies')
 
 
-def set_test_python_execution_context(default_num_clients=0,
-                                      clients_per_thread=1):
+def set_test_python_execution_context(
+    default_num_clients=0,
+    clients_per_thread=1,
+    compilation_cache: Optional[compilation_cache_lib.CompilationCache] = None):
   """Sets an execution context that executes computations locally."""
   context = create_test_python_execution_context(
       default_num_clients=default_num_clients,
-      clients_per_thread=clients_per_thread)
+      clients_per_thread=clients_per_thread,
+      compilation_cache=compilation_cache)
   context_stack_impl.context_stack.set_default_context(context)
@@ -424,6 +424,41 @@ def create_indexing_operator(
   return _tensorflow_comp(tensorflow, type_signature)
 
 
+def create_row_update_operator(
+    operand_type: computation_types.TensorType) -> ComputationProtoAndType:
+  """Returns a tensorflow computation replacing rows of a tensor.
+
+  The returned computation has the type signature
+  `(<T, int32[?], R> -> T)`, where `T` is `operand_type` and `R` is the type of
+  a stack of rows of `T`, that is `T` with its first dimension unknown. The
+  computation returns the operand with the rows at the given indices replaced by
+  the given rows.
+
+  Args:
+    operand_type: A `computation_types.TensorType` of rank at least 1.
+
+  Raises:
+    TypeError: If `operand_type` is not a tensor type of rank at least 1.
+  """
+  py_typecheck.check_type(operand_type, computation_types.TensorType)
+  if operand_type.shape.rank is None or operand_type.shape.rank < 1:
+    raise TypeError(
+        f'Expected a tensor type of rank at least 1, found {operand_type}.')
+  indices_type = computation_types.TensorType(tf.int32, [None])
+  rows_type = computation_types.TensorType(operand_type.dtype,
+                                           [None] + operand_type.shape[1:])
+  parameter_type = computation_types.StructType([(None, operand_type),
+                                                 (None, indices_type),
+                                                 (None, rows_type)])
+
+  def update_rows(arg):
+    operand, indices, rows = arg
+    return tf.tensor_scatter_nd_update(operand, tf.expand_dims(indices, 1),
+                                       rows)
+
+  return create_computation_for_py_fn(update_rows, parameter_type)
+
+
 def create_empty_tuple() -> ComputationProtoAndType:
   """Returns a tensorflow computation returning an empty tuple.
 
@@ -509,6 +544,173 @@ def create_replicate_input(type_signature: computation_types.Type,
   return _tensorflow_comp(new_tf_pb, fn_type)
 
 
+def create_vectorized_computation(computation: pb.Computation,
+                                  count: int) -> ComputationProtoAndType:
+  """Returns a tensorflow computation invoking `computation` on `count` inputs.
+
+  The returned computation has the type signature
+  `(<T, T, T, ...> -> <U, U, U, ...>)`, where `(T -> U)` is the type signature
+  of `computation` and the length of the parameter and result is `count`. The
+  elements of the `count` inputs are stacked, `computation` is invoked once on
+  the stacked inputs with `tf.vectorized_map`, and the stacked results are
+  split back into `count` results.
+
+  Args:
+    computation: A `pb.Computation` with the `computation` one of equal to
+      `tensorflow`, whose parameter contains only tensors with fully defined
+      shapes and whose result contains only tensors.
+    count: An integer, the number of inputs.
+
+  Raises:
+    TypeError: If `computation` is not a TensorFlow computation, if its type
+      signature violates the constraints above, if it must be initialized, or
+      if `count` is not an integer.
+    ValueError: If `count` is less than 1.
+  """
+  py_typecheck.check_type(computation, pb.Computation)
+  py_typecheck.check_type(count, int)
+  if count < 1:
+    raise ValueError(f'Expected `count` to be positive, found {count}.')
+  if computation.WhichOneof('computation') != 'tensorflow':
+    raise TypeError('Expected a TensorFlow computation, found {}.'.format(
+        computation.WhichOneof('computation')))
+  if computation.tensorflow.initialize_op:
+    raise TypeError('Cannot vectorize a computation which must be initialized.')
+  type_signature = type_serialization.deserialize_type(computation.type)
+  parameter_type = type_signature.parameter
+  result_type = type_signature.result
+  if (parameter_type is None or
+      not type_analysis.is_generic_op_compatible_type(parameter_type) or
+      type_analysis.contains(
+          parameter_type,
+          lambda t: t.is_tensor() and not t.shape.is_fully_defined())):
+    raise TypeError(
+        'Expected a parameter of only tensors with fully defined shapes, found '
+        '{}.'.format(parameter_type))
+  if not type_analysis.is_generic_op_compatible_type(result_type):
+    raise TypeError(
+        'Expected a result of only tensors, found {}.'.format(result_type))
+
+  vectorized_parameter_type = computation_types.StructType([
+      (None, parameter_type) for _ in range(count)
+  ])
+  with tf.Graph().as_default() as graph:
+    session_token_tensor = tf.compat.v1.placeholder(
+        tf.string, shape=(), name='session_token_tensor')
+    parameter_value, parameter_binding = tensorflow_utils.stamp_parameter_in_graph(
+        'x', vectorized_parameter_type, graph)
+    stacked_parameter_parts = [
+        tf.stack(parts) for parts in zip(*[
+            structure.flatten(element)
+            for _, element in structure.iter_elements(parameter_value)
+        ])
+    ]
+
+    def _call_computation(parameter_parts):
+      _, result = tensorflow_utils.deserialize_and_call_tf_computation(
+          computation,
+          structure.pack_sequence_as(parameter_type, list(parameter_parts)),
+          tf.compat.v1.get_default_graph(), '', session_token_tensor)
+      return structure.flatten(result)
+
+    stacked_result_parts = tf.vectorized_map(_call_computation,
+                                             stacked_parameter_parts)
+    results = []
+    for i in range(count):
+      result_parts = [part[i] for part in stacked_result_parts]
+      results.append((None, structure.pack_sequence_as(result_type,
+                                                       result_parts)))
+    result = structure.Struct(results)
+    vectorized_result_type, result_binding = tensorflow_utils.capture_result_from_graph(
+        result, graph)
+
+  fn_type = computation_types.FunctionType(vectorized_parameter_type,
+                                           vectorized_result_type)
+  tensorflow = pb.TensorFlow(
+      graph_def=serialization_utils.pack_graph_def(graph.as_graph_def()),
+      parameter=parameter_binding,
+      result=result_binding,
+      session_token_tensor_name=session_token_tensor.name)
+  return _tensorflow_comp(tensorflow, fn_type)
+
+
+def create_batched_select_computation(
+    select_fn: pb.Computation) -> ComputationProtoAndType:
+  """Returns a tensorflow computation invoking `select_fn` on a batch of keys.
+
+  The returned computation has the type signature `(<S, int32[?]> -> R')`, where
+  `(<S, int32> -> R)` is the type signature of `select_fn`, and `R'` is `R` with
+  an unknown leading dimension added to each of its tensors. `select_fn` is
+  invoked once on each of the keys with `tf.vectorized_map`, and its results for
+  all the keys are returned stacked, in the order of the keys.
+
+  Args:
+    select_fn: A `pb.Computation` with the `computation` one of equal to
+      `tensorflow`, whose parameter is a pair of a value containing only tensors
+      and of a scalar `int32` key, and whose result contains only tensors with
+      fully defined shapes.
+
+  Raises:
+    TypeError: If `select_fn` is not a TensorFlow computation, if its type
+      signature violates the constraints above, or if it must be initialized.
+  """
+  py_typecheck.check_type(select_fn, pb.Computation)
+  if select_fn.WhichOneof('computation') != 'tensorflow':
+    raise TypeError('Expected a TensorFlow computation, found {}.'.format(
+        select_fn.WhichOneof('computation')))
+  if select_fn.tensorflow.initialize_op:
+    raise TypeError('Cannot batch a computation which must be initialized.')
+  type_signature = type_serialization.deserialize_type(select_fn.type)
+  parameter_type = type_signature.parameter
+  result_type = type_signature.result
+  if (parameter_type is None or not parameter_type.is_struct() or
+      len(parameter_type) != 2 or
+      not type_analysis.is_generic_op_compatible_type(parameter_type[0]) or
+      not computation_types.TensorType(tf.int32).is_assignable_from(
+          parameter_type[1])):
+    raise TypeError(
+        'Expected a parameter of a value of only tensors and an `int32` key, '
+        'found {}.'.format(parameter_type))
+  if (not type_analysis.is_generic_op_compatible_type(result_type) or
+      type_analysis.contains(
+          result_type,
+          lambda t: t.is_tensor() and not t.shape.is_fully_defined())):
+    raise TypeError(
+        'Expected a result of only tensors with fully defined shapes, found '
+        '{}.'.format(result_type))
+
+  batched_parameter_type = computation_types.StructType([
+      (None, parameter_type[0]),
+      (None, computation_types.TensorType(tf.int32, [None])),
+  ])
+  with tf.Graph().as_default() as graph:
+    session_token_tensor = tf.compat.v1.placeholder(
+        tf.string, shape=(), name='session_token_tensor')
+    parameter_value, parameter_binding = tensorflow_utils.stamp_parameter_in_graph(
+        'x', batched_parameter_type, graph)
+    value, keys = parameter_value
+
+    def _call_select_fn(key):
+      _, result = tensorflow_utils.deserialize_and_call_tf_computation(
+          select_fn, structure.Struct([(None, value), (None, key)]),
+          tf.compat.v1.get_default_graph(), '', session_token_tensor)
+      return structure.flatten(result)
+
+    stacked_result_parts = tf.vectorized_map(_call_select_fn, keys)
+    result = structure.pack_sequence_as(result_type, stacked_result_parts)
+    batched_result_type, result_binding = tensorflow_utils.capture_result_from_graph(
+        result, graph)
+
+  fn_type = computation_types.FunctionType(batched_parameter_type,
+                                           batched_result_type)
+  tensorflow = pb.TensorFlow(
+      graph_def=serialization_utils.pack_graph_def(graph.as_graph_def()),
+      parameter=parameter_binding,
+      result=result_binding,
+      session_token_tensor_name=session_token_tensor.name)
+  return _tensorflow_comp(tensorflow, fn_type)
+
+
 def create_computation_for_py_fn(
     fn: types.FunctionType, parameter_type: Optional[computation_types.Type]
 ) -> ComputationProtoAndType:
@@ -355,6 +355,37 @@ class CreateBinaryOperatorWithUpcastTest(parameterized.TestCase):
           type_signature, operator)
 
 
+class CreateRowUpdateOperatorTest(parameterized.TestCase, tf.test.TestCase):
+
+  def test_returns_computation_updating_rows(self):
+    operand_type = _TensorType(tf.float32, [4, 2])
+
+    proto, type_signature = tensorflow_computation_factory.create_row_update_operator(
+        operand_type)
+
+    self.assertIsInstance(proto, pb.Computation)
+    self.assertEqual(
+        str(type_signature),
+        '(<float32[4,2],int32[?],float32[?,2]> -> float32[4,2])')
+    arg = structure.Struct([
+        (None, np.zeros([4, 2], np.float32)),
+        (None, np.array([3, 1], np.int32)),
+        (None, np.array([[1.0, 2.0], [3.0, 4.0]], np.float32)),
+    ])
+    actual_result = tensorflow_computation_test_utils.run_tensorflow(
+        proto, arg)
+    self.assertAllEqual(actual_result,
+                        [[0.0, 0.0], [3.0, 4.0], [0.0, 0.0], [1.0, 2.0]])
+
+  @parameterized.named_parameters(
+      ('scalar', _TensorType(tf.int32)),
+      ('unknown_rank', _TensorType(tf.int32, None)),
+  )
+  def test_raises_type_error(self, operand_type):
+    with self.assertRaises(TypeError):
+      tensorflow_computation_factory.create_row_update_operator(operand_type)
+
+
 class CreateEmptyTupleTest(tf.test.TestCase):
 
   def test_returns_computation(self):
@@ -445,6 +476,119 @@ class CreateReplicateInputTest(parameterized.TestCase):
           type_signature, count)
 
 
+class CreateVectorizedComputationTest(parameterized.TestCase, tf.test.TestCase):
+
+  def test_returns_computation_with_tensor_type(self):
+    computation, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        lambda x: x * 2, _TensorType(tf.int32, [2]))
+
+    proto, _ = tensorflow_computation_factory.create_vectorized_computation(
+        computation, 3)
+
+    self.assertIsInstance(proto, pb.Computation)
+    actual_type = type_serialization.deserialize_type(proto.type)
+    expected_type = computation_types.FunctionType(
+        [_TensorType(tf.int32, [2])] * 3, [_TensorType(tf.int32, [2])] * 3)
+    expected_type.check_assignable_from(actual_type)
+    arg = structure.Struct([(None, np.array([i, i + 1], np.int32))
+                            for i in range(3)])
+    actual_result = tensorflow_computation_test_utils.run_tensorflow(
+        proto, arg)
+    self.assertLen(actual_result, 3)
+    for i in range(3):
+      self.assertAllEqual(actual_result[i], [2 * i, 2 * i + 2])
+
+  def test_returns_computation_with_struct_type(self):
+    parameter_type = computation_types.StructType([
+        ('a', _TensorType(tf.float32, [2])),
+        ('b', _TensorType(tf.float32)),
+    ])
+    computation, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        lambda x: structure.Struct([('sum', tf.reduce_sum(x.a) + x.b)]),
+        parameter_type)
+
+    proto, _ = tensorflow_computation_factory.create_vectorized_computation(
+        computation, 2)
+
+    arg = structure.Struct([
+        (None, structure.Struct([('a', np.array([1.0, 2.0], np.float32)),
+                                 ('b', np.float32(i))])) for i in range(2)
+    ])
+    actual_result = tensorflow_computation_test_utils.run_tensorflow(
+        proto, arg)
+    self.assertEqual(actual_result[0].sum, 3.0)
+    self.assertEqual(actual_result[1].sum, 4.0)
+
+  @parameterized.named_parameters(
+      ('undefined_shape', _TensorType(tf.int32, [None])),
+      ('sequence', computation_types.SequenceType(tf.int32)),
+  )
+  def test_raises_type_error_with_parameter_type(self, parameter_type):
+    computation, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        lambda x: tf.constant(1), parameter_type)
+
+    with self.assertRaises(TypeError):
+      tensorflow_computation_factory.create_vectorized_computation(
+          computation, 2)
+
+  def test_raises_value_error_with_non_positive_count(self):
+    computation, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        lambda x: x, _TensorType(tf.int32))
+
+    with self.assertRaises(ValueError):
+      tensorflow_computation_factory.create_vectorized_computation(
+          computation, 0)
+
+
+class CreateBatchedSelectComputationTest(parameterized.TestCase,
+                                         tf.test.TestCase):
+
+  def test_returns_computation_with_tensor_result(self):
+    select_fn, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        lambda x: tf.gather(x[0], x[1]),
+        _StructType([_TensorType(tf.float32, [4, 2]), tf.int32]))
+
+    proto, type_signature = tensorflow_computation_factory.create_batched_select_computation(
+        select_fn)
+
+    self.assertIsInstance(proto, pb.Computation)
+    self.assertEqual(
+        str(type_signature), '(<float32[4,2],int32[?]> -> float32[?,2])')
+    value = np.arange(8, dtype=np.float32).reshape([4, 2])
+    arg = structure.Struct([(None, value), (None, np.array([3, 0, 3],
+                                                           np.int32))])
+    actual_result = tensorflow_computation_test_utils.run_tensorflow(
+        proto, arg)
+    self.assertAllEqual(actual_result, [value[3], value[0], value[3]])
+
+  def test_returns_computation_with_struct_result(self):
+    select_fn, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        lambda x: collections.OrderedDict(value=x[0], key=x[1]),
+        _StructType([tf.string, tf.int32]))
+
+    proto, _ = tensorflow_computation_factory.create_batched_select_computation(
+        select_fn)
+
+    arg = structure.Struct([(None, 'abc'), (None, np.array([1, 2], np.int32))])
+    actual_result = tensorflow_computation_test_utils.run_tensorflow(
+        proto, arg)
+    self.assertAllEqual(actual_result.value, [b'abc', b'abc'])
+    self.assertAllEqual(actual_result.key, [1, 2])
+
+  @parameterized.named_parameters(
+      ('float_key', _StructType([tf.int32, tf.float32]), lambda x: x[0]),
+      ('undefined_result_shape', _StructType([tf.int32, tf.int32]),
+       lambda x: tf.range(x[1])),
+  )
+  def test_raises_type_error(self, parameter_type, fn):
+    select_fn, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        fn, parameter_type)
+
+    with self.assertRaises(TypeError):
+      tensorflow_computation_factory.create_batched_select_computation(
+          select_fn)
+
+
 class CreateComputationForPyFnTest(parameterized.TestCase):
 
   # pyformat: disable
@@ -32,6 +32,7 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.computation import computation_base
 from tensorflow_federated.python.core.impl.context_stack import context_base
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.execution_contexts import compiler_pipeline
 from tensorflow_federated.python.core.impl.executors import cardinalities_utils
 from tensorflow_federated.python.core.impl.executors import executor_base
@@ -162,7 +163,10 @@ class AsyncExecutionContext(context_base.Context):
                                      Any]] = None,
       *,
       cardinality_inference_fn: cardinalities_utils
-      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities):
+      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities,
+      compilation_cache: Optional[
+          compilation_cache_lib.CompilationCache] = None,
+      compilation_options: str = ''):
     """Initializes an execution context.
 
     Args:
@@ -172,13 +176,20 @@ class AsyncExecutionContext(context_base.Context):
         cardinalities from arguments (and their associated types). The value
         returned by this function will be passed to the `create_executor` method
         of `executor_fn` to construct a `tff.framework.Executor` instance.
+      compilation_cache: An optional `compilation_cache.CompilationCache` in
+        which to persist the computations compiled by `compiler_fn`.
+      compilation_options: A string identifying `compiler_fn` and its options
+        in the keys of `compilation_cache`.
     """
     super().__init__()
     py_typecheck.check_type(executor_fn, executor_factory.ExecutorFactory)
     self._executor_factory = executor_fn
     if compiler_fn is not None:
       py_typecheck.check_callable(compiler_fn)
-      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(compiler_fn)
+      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(
+          compiler_fn,
+          compilation_cache=compilation_cache,
+          compilation_options=compilation_options)
     else:
       self._compiler_pipeline = None
     py_typecheck.check_callable(cardinality_inference_fn)
@@ -208,11 +219,13 @@ class AsyncExecutionContext(context_base.Context):
     # container types, so we must remember them here so that they can be
     # restored in the output.
     result_type = comp.type_signature.result
-    if self._compiler_pipeline is not None:
-      with tracing.span('ExecutionContext', 'Compile', span=True):
-        comp = self._compiler_pipeline.compile(comp)
 
+    # The compilation is nested in the span of the invocation, so that each
+    # invocation is a single root span, e.g. when sampling the traced rounds.
     with tracing.span('ExecutionContext', 'Invoke', span=True):
+      if self._compiler_pipeline is not None:
+        with tracing.span('ExecutionContext', 'Compile', span=True):
+          comp = self._compiler_pipeline.compile(comp)
 
       if arg is not None:
         cardinalities = self._cardinality_inference_fn(
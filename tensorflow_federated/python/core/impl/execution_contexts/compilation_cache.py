@@ -0,0 +1,216 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A persistent on-disk cache of compiled computations."""
+
+import hashlib
+import os
+import tempfile
+from typing import Any, Callable, Optional
+
+from absl import logging
+import tensorflow as tf
+
+from tensorflow_federated import version
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
+from tensorflow_federated.python.core.impl.types import type_serialization
+
+# The version of the format of the cache keys and entries. This must be
+# incremented whenever the compilers change the artifacts they produce for the
+# same computation, to invalidate the entries written by older versions.
+COMPILATION_CACHE_VERSION = 1
+
+_ENTRY_SUFFIX = '.bin'
+_DEFAULT_MAX_SIZE_BYTES = 1 << 30
+
+
+def serialize_computation(
+    computation: computation_impl.ConcreteComputation) -> bytes:
+  """Serializes a compiled `computation_impl.ConcreteComputation`."""
+  py_typecheck.check_type(computation, computation_impl.ConcreteComputation)
+  return computation_impl.ConcreteComputation.get_proto(
+      computation).SerializeToString()
+
+
+def deserialize_computation(
+    data: bytes) -> computation_impl.ConcreteComputation:
+  """Deserializes the output of `serialize_computation`."""
+  return computation_impl.ConcreteComputation(
+      pb.Computation.FromString(data), context_stack_impl.context_stack)
+
+
+class CompilationCache(object):
+  """A persistent cache of compiled computations, stored in a directory.
+
+  Entries are keyed on a fingerprint of the serialized `pb.Computation` being
+  compiled, its type signature, a string describing the compiler and its
+  options, the TensorFlow and TensorFlow Federated versions and
+  `COMPILATION_CACHE_VERSION`, so the cache can be shared by different
+  compilers, and by different processes or successive runs of the same program.
+  The compiled artifacts are stored with a serialization function given to
+  `put`, and must be read with the matching deserialization function given to
+  `get`; by default, these handle `computation_impl.ConcreteComputation`s.
+
+  Each entry is stored in its own file, which is written to a temporary file
+  and renamed, so concurrent readers never observe a partially written entry.
+  When the total size of the entries exceeds `max_size_bytes`, the least
+  recently used entries are deleted.
+  """
+
+  def __init__(self,
+               directory: str,
+               *,
+               max_size_bytes: int = _DEFAULT_MAX_SIZE_BYTES):
+    """Creates a `CompilationCache`.
+
+    Args:
+      directory: The path of the directory in which to store the entries. The
+        directory is created if it does not exist.
+      max_size_bytes: The maximum total size of the entries, in bytes.
+
+    Raises:
+      ValueError: If `max_size_bytes` is not positive.
+    """
+    py_typecheck.check_type(directory, str)
+    py_typecheck.check_type(max_size_bytes, int)
+    if max_size_bytes <= 0:
+      raise ValueError('Expected `max_size_bytes` to be positive, found '
+                       f'{max_size_bytes}.')
+    os.makedirs(directory, exist_ok=True)
+    self._directory = directory
+    self._max_size_bytes = max_size_bytes
+
+  @property
+  def directory(self) -> str:
+    return self._directory
+
+  def fingerprint(self,
+                  computation: computation_base.Computation,
+                  options: str = '') -> Optional[str]:
+    """Returns the key of `computation` compiled with `options`.
+
+    Args:
+      computation: The computation to compile.
+      options: A string identifying the compiler and the options it is invoked
+        with. Computations compiled by compilers which produce different
+        artifacts must use different `options`.
+
+    Returns:
+      A string key, or `None` if `computation` is not backed by a
+      `pb.Computation`, in which case it can not be cached.
+    """
+    if not isinstance(computation, computation_impl.ConcreteComputation):
+      return None
+    py_typecheck.check_type(options, str)
+    proto = computation_impl.ConcreteComputation.get_proto(computation)
+    type_proto = type_serialization.serialize_type(computation.type_signature)
+    fingerprint = hashlib.sha256()
+    for part in (str(COMPILATION_CACHE_VERSION).encode(),
+                 tf.__version__.encode(), version.__version__.encode(),
+                 options.encode(),
+                 type_proto.SerializeToString(deterministic=True),
+                 proto.SerializeToString(deterministic=True)):
+      fingerprint.update(hashlib.sha256(part).digest())
+    return fingerprint.hexdigest()
+
+  def _entry_path(self, key: str) -> str:
+    return os.path.join(self._directory, key + _ENTRY_SUFFIX)
+
+  def get(
+      self,
+      key: str,
+      deserialize_fn: Callable[[bytes], Any] = deserialize_computation
+  ) -> Optional[Any]:
+    """Returns the artifact stored at `key`, or `None` if there is none.
+
+    Args:
+      key: A key returned by `fingerprint`.
+      deserialize_fn: A function deserializing the bytes of the stored artifact.
+
+    Returns:
+      The artifact, or `None` if there is no entry for `key`, or if the entry
+      can not be deserialized, in which case it is removed.
+    """
+    path = self._entry_path(key)
+    try:
+      with open(path, 'rb') as f:
+        data = f.read()
+      # Mark the entry as recently used.
+      os.utime(path)
+    except FileNotFoundError:
+      return None
+    try:
+      return deserialize_fn(data)
+    except Exception as e:  # pylint: disable=broad-except
+      logging.warning('Removing unreadable compilation cache entry %s: %s',
+                      path, e)
+      self._remove(path)
+      return None
+
+  def put(self,
+          key: str,
+          artifact: Any,
+          serialize_fn: Callable[[Any], bytes] = serialize_computation):
+    """Stores `artifact` at `key`, evicting old entries if needed.
+
+    Args:
+      key: A key returned by `fingerprint`.
+      artifact: The compiled artifact to store.
+      serialize_fn: A function serializing `artifact` to bytes.
+    """
+    data = serialize_fn(artifact)
+    if len(data) > self._max_size_bytes:
+      logging.info(
+          'Not caching a compiled computation of %d bytes, larger than the '
+          'maximum size of the compilation cache.', len(data))
+      return
+    fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+      os.replace(tmp_path, self._entry_path(key))
+    except BaseException:
+      self._remove(tmp_path)
+      raise
+    self._evict()
+
+  def _remove(self, path: str):
+    try:
+      os.remove(path)
+    except FileNotFoundError:
+      pass
+
+  def _evict(self):
+    """Deletes the least recently used entries exceeding the maximum size."""
+    entries = []
+    total_size = 0
+    with os.scandir(self._directory) as it:
+      for entry in it:
+        if not entry.name.endswith(_ENTRY_SUFFIX):
+          continue
+        try:
+          stat = entry.stat()
+        except FileNotFoundError:
+          continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_size += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+      if total_size <= self._max_size_bytes:
+        break
+      self._remove(path)
+      total_size -= size
@@ -0,0 +1,142 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import mock
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated import version
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache
+from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
+
+
+def _create_computation(value):
+
+  @tensorflow_computation.tf_computation(tf.int32)
+  def add(x):
+    return x + value
+
+  return add
+
+
+def _entries(directory):
+  return sorted(n for n in os.listdir(directory) if n.endswith('.bin'))
+
+
+class CompilationCacheTest(absltest.TestCase):
+
+  def test_fingerprint_is_deterministic(self):
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+
+    self.assertEqual(
+        cache.fingerprint(_create_computation(1)),
+        cache.fingerprint(_create_computation(1)))
+
+  def test_fingerprint_differs_with_computation(self):
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+
+    self.assertNotEqual(
+        cache.fingerprint(_create_computation(1)),
+        cache.fingerprint(_create_computation(2)))
+
+  def test_fingerprint_differs_with_options(self):
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+    comp = _create_computation(1)
+
+    self.assertNotEqual(
+        cache.fingerprint(comp, 'a'), cache.fingerprint(comp, 'b'))
+
+  def test_fingerprint_differs_with_tff_version(self):
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+    comp = _create_computation(1)
+
+    with mock.patch.object(version, '__version__', '1.0.0'):
+      fingerprint = cache.fingerprint(comp)
+    with mock.patch.object(version, '__version__', '2.0.0'):
+      other_fingerprint = cache.fingerprint(comp)
+
+    self.assertNotEqual(fingerprint, other_fingerprint)
+
+  def test_fingerprint_returns_none_with_python_function(self):
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+
+    self.assertIsNone(cache.fingerprint(lambda x: x))
+
+  def test_get_returns_none_with_missing_entry(self):
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+
+    self.assertIsNone(cache.get(cache.fingerprint(_create_computation(1))))
+
+  def test_get_returns_stored_computation(self):
+    directory = self.create_tempdir().full_path
+    comp = _create_computation(1)
+    key = compilation_cache.CompilationCache(directory).fingerprint(comp)
+    compilation_cache.CompilationCache(directory).put(key, comp)
+
+    result = compilation_cache.CompilationCache(directory).get(key)
+
+    self.assertIsInstance(result, computation_impl.ConcreteComputation)
+    self.assertEqual(
+        computation_impl.ConcreteComputation.get_proto(result),
+        computation_impl.ConcreteComputation.get_proto(comp))
+
+  def test_get_with_custom_serialization(self):
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+
+    cache.put('key', 'value', serialize_fn=str.encode)
+
+    self.assertEqual(cache.get('key', deserialize_fn=bytes.decode), 'value')
+
+  def test_get_removes_unreadable_entry(self):
+    directory = self.create_tempdir().full_path
+    cache = compilation_cache.CompilationCache(directory)
+    cache.put('key', b'not a computation', serialize_fn=lambda x: x)
+
+    self.assertIsNone(cache.get('key'))
+    self.assertEmpty(_entries(directory))
+
+  def test_put_evicts_least_recently_used_entries(self):
+    directory = self.create_tempdir().full_path
+    cache = compilation_cache.CompilationCache(directory, max_size_bytes=25)
+    identity = lambda x: x
+    cache.put('a', b'a' * 10, serialize_fn=identity)
+    cache.put('b', b'b' * 10, serialize_fn=identity)
+    # Make `a` the least recently used entry, then use it.
+    os.utime(os.path.join(directory, 'a.bin'), (0, 0))
+    os.utime(os.path.join(directory, 'b.bin'), (1, 1))
+    cache.get('a', deserialize_fn=identity)
+
+    cache.put('c', b'c' * 10, serialize_fn=identity)
+
+    self.assertEqual(_entries(directory), ['a.bin', 'c.bin'])
+
+  def test_put_does_not_store_entry_larger_than_max_size(self):
+    directory = self.create_tempdir().full_path
+    cache = compilation_cache.CompilationCache(directory, max_size_bytes=5)
+
+    cache.put('a', b'a' * 10, serialize_fn=lambda x: x)
+
+    self.assertEmpty(os.listdir(directory))
+
+  def test_raises_value_error_with_non_positive_max_size(self):
+    with self.assertRaises(ValueError):
+      compilation_cache.CompilationCache(
+          self.create_tempdir().full_path, max_size_bytes=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
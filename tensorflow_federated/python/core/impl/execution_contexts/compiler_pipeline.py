@@ -20,10 +20,11 @@
 
 import functools
 
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 
 
 class CompilerPipeline(object):
@@ -40,16 +41,50 @@ class CompilerPipeline(object):
   backend takes the form of an instance of `tff.framework.Context`, which would
   be initialized with a `CompilerPipeline` whose `compilation_fn` accepts
   `tff.Computations` and returns MapReduceForms.
+
+  The artifacts are cached in memory for the lifetime of the pipeline. If a
+  `compilation_cache` is given, they are also cached on disk, so they are
+  reused by other processes and across restarts.
   """
 
-  def __init__(self, compilation_fn: Callable[[computation_base.Computation],
-                                              Any]):
+  def __init__(self,
+               compilation_fn: Callable[[computation_base.Computation], Any],
+               *,
+               compilation_cache: Optional[
+                   compilation_cache_lib.CompilationCache] = None,
+               compilation_options: str = ''):
+    """Creates a `CompilerPipeline`.
+
+    Args:
+      compilation_fn: A function compiling a `computation_base.Computation`.
+      compilation_cache: An optional `compilation_cache.CompilationCache` in
+        which to persist the compiled artifacts.
+      compilation_options: A string identifying `compilation_fn` and its
+        options in the keys of `compilation_cache`. Pipelines sharing a cache
+        must use different options if they compile to different artifacts.
+    """
     py_typecheck.check_callable(compilation_fn)
+    if compilation_cache is not None:
+      py_typecheck.check_type(compilation_cache,
+                              compilation_cache_lib.CompilationCache)
+    py_typecheck.check_type(compilation_options, str)
     self._compilation_fn = compilation_fn
+    self._compilation_cache = compilation_cache
+    self._compilation_options = compilation_options
 
   @functools.lru_cache()
   def compile(self, computation_to_compile: computation_base.Computation):
     """Generates executable for `computation_to_compile`."""
     py_typecheck.check_type(computation_to_compile,
                             computation_base.Computation)
-    return self._compilation_fn(computation_to_compile)
+    if self._compilation_cache is None:
+      return self._compilation_fn(computation_to_compile)
+    key = self._compilation_cache.fingerprint(computation_to_compile,
+                                              self._compilation_options)
+    if key is None:
+      return self._compilation_fn(computation_to_compile)
+    compiled = self._compilation_cache.get(key)
+    if compiled is None:
+      compiled = self._compilation_fn(computation_to_compile)
+      self._compilation_cache.put(key, compiled)
+    return compiled
@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest import mock
+
 from absl.testing import absltest
+import tensorflow as tf
 
 from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache
 from tensorflow_federated.python.core.impl.execution_contexts import compiler_pipeline
+from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
 
 
 class CompilerPipelineTest(absltest.TestCase):
@@ -42,6 +48,45 @@ class CompilerPipelineTest(absltest.TestCase):
 
     # TODO(b/113123410): Expand the test with more structural invariants.
 
+  def test_compile_loads_computation_from_compilation_cache(self):
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+    compilation_fn = mock.Mock(side_effect=lambda x: x)
+    compiler_pipeline.CompilerPipeline(
+        compilation_fn, compilation_cache=cache).compile(add_one)
+    compilation_fn.assert_called_once()
+    compilation_fn.reset_mock()
+
+    compiled = compiler_pipeline.CompilerPipeline(
+        compilation_fn, compilation_cache=cache).compile(add_one)
+
+    compilation_fn.assert_not_called()
+    self.assertEqual(
+        computation_impl.ConcreteComputation.get_proto(compiled),
+        computation_impl.ConcreteComputation.get_proto(add_one))
+
+  def test_compile_with_different_options_does_not_share_cache_entries(self):
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    cache = compilation_cache.CompilationCache(self.create_tempdir().full_path)
+    compilation_fn = mock.Mock(side_effect=lambda x: x)
+    compiler_pipeline.CompilerPipeline(
+        compilation_fn, compilation_cache=cache,
+        compilation_options='a').compile(add_one)
+
+    compiler_pipeline.CompilerPipeline(
+        compilation_fn, compilation_cache=cache,
+        compilation_options='b').compile(add_one)
+
+    self.assertEqual(compilation_fn.call_count, 2)
+
 
 if __name__ == '__main__':
   absltest.main()
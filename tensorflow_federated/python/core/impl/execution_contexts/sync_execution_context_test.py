@@ -21,10 +21,12 @@ import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.impl.execution_contexts import sync_execution_context
 from tensorflow_federated.python.core.impl.executor_stacks import python_executor_stacks
 from tensorflow_federated.python.core.impl.executors import executors_errors
+from tensorflow_federated.python.core.impl.executors import profiling_tracing_provider
 from tensorflow_federated.python.core.impl.federated_context import federated_computation
 from tensorflow_federated.python.core.impl.federated_context import intrinsics
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
@@ -233,5 +235,48 @@ class ExecutionContextIntegrationTest(parameterized.TestCase):
       self.assertEqual(one, 1)
 
 
+class ExecutionContextTracingTest(absltest.TestCase):
+
+  def tearDown(self):
+    tracing.set_tracing_level(tracing.TracingLevel.FULL)
+    tracing.set_tracing_providers([tracing.LoggingTracingProvider()])
+    super().tearDown()
+
+  def test_sampled_tracing_traces_every_other_invocation_in_full(self):
+    profiler = profiling_tracing_provider.ProfilingTracingProvider(
+        scopes=['ExecutionContext', 'FederatedResolvingStrategy'])
+    tracing.set_tracing_providers([profiler])
+    tracing.set_tracing_level(tracing.TracingLevel.SAMPLED, sampling_interval=2)
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    @federated_computation.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def comp(x):
+      return intrinsics.federated_sum(intrinsics.federated_map(add_one, x))
+
+    factory = python_executor_stacks.local_executor_factory()
+    context = sync_execution_context.ExecutionContext(
+        factory, compiler_fn=lambda comp: comp)
+    with context_stack_impl.context_stack.install(context):
+      for _ in range(6):
+        self.assertEqual(comp([1, 2]), 5)
+
+    self.assertEqual(profiler.num_rounds, 3)
+    for round_index in range(3):
+      names = [(s.scope, s.sub_scope)
+               for s in profiler.spans
+               if s.round_index == round_index]
+      self.assertEqual(names.count(('ExecutionContext', 'Invoke')), 1)
+      self.assertEqual(names.count(('ExecutionContext', 'Compile')), 1)
+      self.assertIn(('FederatedResolvingStrategy', 'compute_federated_map'),
+                    names)
+      self.assertIn(('FederatedResolvingStrategy', 'compute_federated_sum'),
+                    names)
+    self.assertTrue(all(s.round_index is not None for s in profiler.spans))
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -19,6 +19,7 @@
 """A collection of constructors for basic types of executor stacks."""
 
 from concurrent import futures
+import functools
 import math
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 import warnings
@@ -39,6 +40,7 @@ from tensorflow_federated.python.core.impl.executors import executors_errors
 from tensorflow_federated.python.core.impl.executors import federated_composing_strategy
 from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
 from tensorflow_federated.python.core.impl.executors import federating_executor
+from tensorflow_federated.python.core.impl.executors import process_pool_executor
 from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
 from tensorflow_federated.python.core.impl.executors import remote_executor
 from tensorflow_federated.python.core.impl.executors import remote_executor_grpc_stub
@@ -46,6 +48,7 @@ from tensorflow_federated.python.core.impl.executors import remote_executor_stub
 from tensorflow_federated.python.core.impl.executors import sequence_executor
 from tensorflow_federated.python.core.impl.executors import sizing_executor
 from tensorflow_federated.python.core.impl.executors import thread_delegating_executor
+from tensorflow_federated.python.core.impl.executors import value_compression
 from tensorflow_federated.python.core.impl.types import placements
 
 # Place a limit on the maximum size of the executor caches managed by the
@@ -272,12 +275,29 @@ def _wrap_executor_in_threading_stack(ex: executor_base.Executor,
   return threaded_ex
 
 
+def _create_worker_executor(*,
+                            device: Optional[tf.config.LogicalDevice] = None,
+                            leaf_executor_fn,
+                            support_sequence_ops: bool,
+                            can_resolve_references: bool):
+  """Constructs a client executor in a worker process of a `ProcessPool`."""
+  return _wrap_executor_in_threading_stack(
+      leaf_executor_fn(device=device),
+      support_sequence_ops=support_sequence_ops,
+      can_resolve_references=can_resolve_references)
+
+
 class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
   """ExecutorFactory to construct executors which cannot understand placement.
 
   This factory constructs executors which represent "local execution": work
   that happens at the clients, at the server, or without placements. As such,
   this executor manages the placement of work on local executors.
+
+  If `num_client_processes` is positive, the client executors are hosted in a
+  `process_pool_executor.ProcessPool` of that many worker processes, which is
+  shared by all the executors constructed by this factory. In that case,
+  `leaf_executor_fn` must be picklable.
   """
 
   def __init__(self,
@@ -286,13 +306,25 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
                can_resolve_references: bool = True,
                server_device: Optional[tf.config.LogicalDevice] = None,
                client_devices: Optional[Sequence[tf.config.LogicalDevice]] = (),
-               leaf_executor_fn=eager_tf_executor.EagerTFExecutor):
+               leaf_executor_fn=eager_tf_executor.EagerTFExecutor,
+               num_client_processes: int = 0):
     self._support_sequence_ops = support_sequence_ops
     self._can_resolve_references = can_resolve_references
     self._server_device = server_device
     self._client_devices = client_devices
     self._client_device_index = 0
     self._leaf_executor_fn = leaf_executor_fn
+    py_typecheck.check_type(num_client_processes, int)
+    if num_client_processes > 0:
+      self._client_process_pool = process_pool_executor.ProcessPool(
+          num_client_processes,
+          functools.partial(
+              _create_worker_executor,
+              leaf_executor_fn=leaf_executor_fn,
+              support_sequence_ops=support_sequence_ops,
+              can_resolve_references=can_resolve_references))
+    else:
+      self._client_process_pool = None
 
   def _get_next_client_device(self) -> Optional[tf.config.LogicalDevice]:
     if not self._client_devices:
@@ -314,6 +346,8 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
           'arguments. Received cardinalities: {}.'.format(cardinalities))
     if placement == placements.CLIENTS:
       device = self._get_next_client_device()
+      if self._client_process_pool is not None:
+        return self._client_process_pool.create_executor(device=device)
     elif placement == placements.SERVER:
       device = self._server_device
     else:
@@ -356,6 +390,12 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
     * An optional instance of `LocalComputationFactory` to use to construct
       local computations used as parameters in certain federated operators
       (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow factory.
+    * An optional integer `reduction_arity`, passed to the federated strategy
+      to aggregate client values in a tree of that arity.
+    * A boolean `vectorize_client_map`, passed to the federated strategy to map
+      the values of the clients sharing an executor with a single call.
+    * A boolean `delta_broadcast`, passed to the federated strategy to
+      broadcast values to the clients as deltas to the last broadcast values.
 
   """
 
@@ -369,7 +409,10 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
                .LocalComputationFactory = tensorflow_computation_factory
                .TensorFlowComputationFactory(),
                federated_strategy_factory=federated_resolving_strategy
-               .FederatedResolvingStrategy.factory):
+               .FederatedResolvingStrategy.factory,
+               reduction_arity: Optional[int] = None,
+               vectorize_client_map: bool = False,
+               delta_broadcast: bool = False):
     py_typecheck.check_type(clients_per_thread, int)
     py_typecheck.check_type(unplaced_ex_factory, UnplacedExecutorFactory)
     py_typecheck.check_type(
@@ -388,6 +431,9 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
       self._sizing_executors = None
     self._federated_strategy_factory = federated_strategy_factory
     self._local_computation_factory = local_computation_factory
+    self._reduction_arity = reduction_arity
+    self._vectorize_client_map = vectorize_client_map
+    self._delta_broadcast = delta_broadcast
 
   @property
   def sizing_executors(self) -> List[sizing_executor.SizingExecutor]:
@@ -422,6 +468,13 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
       ]
       self._sizing_executors.extend(client_stacks)
 
+    strategy_kwargs = {}
+    if self._reduction_arity is not None:
+      strategy_kwargs['reduction_arity'] = self._reduction_arity
+    if self._vectorize_client_map:
+      strategy_kwargs['vectorize_client_map'] = True
+    if self._delta_broadcast:
+      strategy_kwargs['delta_broadcast'] = True
     federating_strategy_factory = self._federated_strategy_factory(
         {
             placements.CLIENTS: [
@@ -432,7 +485,8 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
                 self._unplaced_executor_factory.create_executor(
                     placement=placements.SERVER),
         },
-        local_computation_factory=self._local_computation_factory)
+        local_computation_factory=self._local_computation_factory,
+        **strategy_kwargs)
     unplaced_executor = self._unplaced_executor_factory.create_executor()
     executor = federating_executor.FederatingExecutor(
         federating_strategy_factory, unplaced_executor)
@@ -509,13 +563,15 @@ class ComposingExecutorFactory(executor_factory.ExecutorFactory):
                                        Sequence[executor_base.Executor]],
                local_computation_factory: local_computation_factory_base
                .LocalComputationFactory = tensorflow_computation_factory
-               .TensorFlowComputationFactory()):
+               .TensorFlowComputationFactory(),
+               reduction_arity: Optional[int] = None):
     if max_fanout < 2:
       raise ValueError('Max fanout must be greater than 1.')
     self._flat_stack_fn = flat_stack_fn
     self._max_fanout = max_fanout
     self._unplaced_ex_factory = unplaced_ex_factory
     self._local_computation_factory = local_computation_factory
+    self._reduction_arity = reduction_arity
 
   def create_executor(
       self, cardinalities: executor_factory.CardinalitiesType
@@ -549,7 +605,8 @@ class ComposingExecutorFactory(executor_factory.ExecutorFactory):
     composing_strategy_factory = federated_composing_strategy.FederatedComposingStrategy.factory(
         server_executor,
         target_executors,
-        local_computation_factory=self._local_computation_factory)
+        local_computation_factory=self._local_computation_factory,
+        reduction_arity=self._reduction_arity)
     unplaced_executor = self._unplaced_ex_factory.create_executor()
     composing_executor = federating_executor.FederatingExecutor(
         composing_strategy_factory, unplaced_executor)
@@ -619,6 +676,10 @@ def local_executor_factory(
     leaf_executor_fn=eager_tf_executor.EagerTFExecutor,
     local_computation_factory=tensorflow_computation_factory
     .TensorFlowComputationFactory(),
+    reduction_arity: Optional[int] = None,
+    vectorize_client_map: bool = False,
+    num_client_processes: int = 0,
+    delta_broadcast: bool = False,
 ) -> executor_factory.ExecutorFactory:
   """Constructs an executor factory to execute computations locally.
 
@@ -654,13 +715,39 @@ def local_executor_factory(
       to construct local computations used as parameters in certain federated
       operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
       computation factory that generates TensorFlow code.
+    reduction_arity: An optional integer greater than 1. If given,
+      `tff.federated_aggregate` and `tff.federated_sum` merge client values in a
+      tree of this arity, with the merges at each level running concurrently,
+      rather than folding them into the result one at a time at the server.
+    vectorize_client_map: Boolean indicating whether `tff.federated_map` should
+      stack the values of the clients sharing a thread, and map them with a
+      single vectorized call of the TensorFlow computation, rather than with
+      one call for each client. This only has an effect if `clients_per_thread`
+      is greater than 1, and can reduce the per-call overhead of lightweight
+      client work.
+    num_client_processes: Integer number of worker processes in which to run
+      the client executors. If 0, the default, the client executors run in
+      threads of this process. Otherwise, the client executors are spread over
+      a pool of this many worker processes, so that client work does not
+      contend for the global interpreter lock. Tensor values move between the
+      processes in shared memory, and the worker processes are reused by all
+      the executors constructed by the returned factory. `leaf_executor_fn`
+      must then be picklable.
+    delta_broadcast: Boolean indicating whether values broadcast to the clients
+      should be sent as deltas. If `True`, the last broadcast value of each
+      type is kept resident in the client executors, and only the tensors, or
+      rows of tensors, which changed since are sent to them. This can reduce
+      the cost of broadcasting large models of which a round only updates a
+      small part, such as embeddings.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
     executor construction logic specified above.
 
   Raises:
-    ValueError: If the number of clients is specified and not one or larger.
+    ValueError: If the number of clients is specified and not one or larger,
+      if `reduction_arity` is less than 2, or if `num_client_processes` is
+      negative.
   """
   if server_tf_device is not None:
     py_typecheck.check_type(server_tf_device, tf.config.LogicalDevice)
@@ -669,25 +756,39 @@ def local_executor_factory(
   py_typecheck.check_type(clients_per_thread, int)
   if max_fanout < 2:
     raise ValueError('Max fanout must be greater than 1.')
+  if reduction_arity is not None:
+    py_typecheck.check_type(reduction_arity, int)
+    if reduction_arity < 2:
+      raise ValueError('Reduction arity must be greater than 1.')
+  py_typecheck.check_type(vectorize_client_map, bool)
+  py_typecheck.check_type(num_client_processes, int)
+  py_typecheck.check_type(delta_broadcast, bool)
+  if num_client_processes < 0:
+    raise ValueError('Number of client processes must be nonnegative.')
   unplaced_ex_factory = UnplacedExecutorFactory(
       support_sequence_ops=support_sequence_ops,
       can_resolve_references=reference_resolving_clients,
       server_device=server_tf_device,
       client_devices=client_tf_devices,
-      leaf_executor_fn=leaf_executor_fn)
+      leaf_executor_fn=leaf_executor_fn,
+      num_client_processes=num_client_processes)
   federating_executor_factory = FederatingExecutorFactory(
       clients_per_thread=clients_per_thread,
       unplaced_ex_factory=unplaced_ex_factory,
       default_num_clients=default_num_clients,
       use_sizing=False,
-      local_computation_factory=local_computation_factory)
+      local_computation_factory=local_computation_factory,
+      reduction_arity=reduction_arity,
+      vectorize_client_map=vectorize_client_map,
+      delta_broadcast=delta_broadcast)
   flat_stack_fn = create_minimal_length_flat_stack_fn(
       max_fanout, federating_executor_factory)
   full_stack_factory = ComposingExecutorFactory(
       max_fanout=max_fanout,
       unplaced_ex_factory=unplaced_ex_factory,
       flat_stack_fn=flat_stack_fn,
-      local_computation_factory=local_computation_factory)
+      local_computation_factory=local_computation_factory,
+      reduction_arity=reduction_arity)
 
   def _factory_fn(cardinalities):
     if cardinalities.get(placements.CLIENTS, 0) < max_fanout:
@@ -906,8 +1007,15 @@ class _CardinalitiesOrReadyListChanged():
     return cardinalities_changed or ready_list_changed
 
 
-def _configure_remote_workers(default_num_clients, stubs, thread_pool_executor,
-                              dispose_batch_size):
+def _configure_remote_workers(default_num_clients,
+                              stubs,
+                              thread_pool_executor,
+                              dispose_batch_size,
+                              batch_operations=False,
+                              stream_chunk_size_bytes=None,
+                              value_cache_min_size_bytes=None,
+                              compression=None,
+                              float_transport_dtype=None):
   """"Configures `default_num_clients` across `remote_executors`."""
   available_stubs = [stub for stub in stubs if stub.is_ready]
   logging.info('%s TFF workers available out of a total of %s.',
@@ -922,8 +1030,15 @@ def _configure_remote_workers(default_num_clients, stubs, thread_pool_executor,
     default_num_clients_to_host = remaining_clients // remaining_stubs
     remaining_clients -= default_num_clients_to_host
     if default_num_clients_to_host > 0:
-      ex = remote_executor.RemoteExecutor(stub, thread_pool_executor,
-                                          dispose_batch_size)
+      ex = remote_executor.RemoteExecutor(
+          stub,
+          thread_pool_executor,
+          dispose_batch_size,
+          batch_operations,
+          stream_chunk_size_bytes,
+          value_cache_min_size_bytes=value_cache_min_size_bytes,
+          compression=compression,
+          float_transport_dtype=float_transport_dtype)
       ex.set_cardinalities({placements.CLIENTS: default_num_clients_to_host})
       live_workers.append(ex)
   return [
@@ -938,6 +1053,11 @@ def remote_executor_factory(
     dispose_batch_size: int = 20,
     max_fanout: int = 100,
     default_num_clients: int = 0,
+    batch_operations: bool = False,
+    stream_chunk_size_bytes: Optional[int] = None,
+    value_cache_min_size_bytes: Optional[int] = None,
+    compression: Optional[str] = None,
+    float_transport_dtype: Optional[tf.dtypes.DType] = None,
 ) -> executor_factory.ExecutorFactory:
   """Create an executor backed by remote workers.
 
@@ -961,6 +1081,32 @@ def remote_executor_factory(
       client-placed values. However, when this inference isn't possible (such as
       in the case of a no-argument or non-federated computation) this default
       will be used instead.
+    batch_operations: Whether to batch the operations sent to each remote
+      worker into a single `ExecutePlan` request per computed value, rather than
+      sending one request per operation. Falls back to one request per
+      operation for workers which do not support `ExecutePlan`.
+    stream_chunk_size_bytes: Optional maximum number of bytes of value content
+      in each message sent to or received from a remote worker. If specified,
+      values are transferred as streams of chunks, so that their size is not
+      limited by the maximum size of a gRPC message. Falls back to one message
+      per value for workers which do not support streaming.
+    value_cache_min_size_bytes: Optional minimum serialized size of the values
+      which remote workers cache by their content. If specified, a value which
+      a worker already holds (such as a computation or server state sent in
+      every round) is not uploaded to it again. Falls back to uploading every
+      value to workers which do not support caching values.
+    compression: Optional name of a lossless compression (`'zlib'`, `'zstd'`
+      or `'lz4'`) of the values sent to and received from remote workers. The
+      `'zstd'` and `'lz4'` compressions require the `zstandard` and `lz4`
+      packages. Falls back to uncompressed values for workers which do not
+      support the compression.
+    float_transport_dtype: Optional `tf.float16` or `tf.bfloat16` to negotiate
+      with remote workers. The `tf.float32` and `tf.float64` tensors with at
+      least 1024 elements (such as model weights) of the values created or
+      computed with `lossy_float_transport=True` are cast to this dtype while
+      they are transferred, losing precision; other values are sent exactly.
+      Falls back to sending tensors in their own dtype to workers which do not
+      support the cast.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -974,14 +1120,25 @@ def remote_executor_factory(
   py_typecheck.check_type(dispose_batch_size, int)
   py_typecheck.check_type(max_fanout, int)
   py_typecheck.check_type(default_num_clients, int)
+  py_typecheck.check_type(batch_operations, bool)
+  if stream_chunk_size_bytes is not None:
+    py_typecheck.check_type(stream_chunk_size_bytes, int)
+  if value_cache_min_size_bytes is not None:
+    py_typecheck.check_type(value_cache_min_size_bytes, int)
+  if compression is not None:
+    py_typecheck.check_type(compression, str)
+    # Raises if the compression is unknown, rather than when the executors are
+    # first created.
+    value_compression.compression_from_name(compression)
 
   stubs = [
       remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
       for channel in channels
   ]
-  return remote_executor_factory_from_stubs(stubs, thread_pool_executor,
-                                            dispose_batch_size, max_fanout,
-                                            default_num_clients)
+  return remote_executor_factory_from_stubs(
+      stubs, thread_pool_executor, dispose_batch_size, max_fanout,
+      default_num_clients, batch_operations, stream_chunk_size_bytes,
+      value_cache_min_size_bytes, compression, float_transport_dtype)
 
 
 def remote_executor_factory_from_stubs(
@@ -991,6 +1148,11 @@ def remote_executor_factory_from_stubs(
     dispose_batch_size: int = 20,
     max_fanout: int = 100,
     default_num_clients: int = 0,
+    batch_operations: bool = False,
+    stream_chunk_size_bytes: Optional[int] = None,
+    value_cache_min_size_bytes: Optional[int] = None,
+    compression: Optional[str] = None,
+    float_transport_dtype: Optional[tf.dtypes.DType] = None,
 ) -> executor_factory.ExecutorFactory:
   """Create an executor backed by remote workers.
 
@@ -1013,6 +1175,32 @@ def remote_executor_factory_from_stubs(
       client-placed values. However, when this inference isn't possible (such as
       in the case of a no-argument or non-federated computation) this default
       will be used instead.
+    batch_operations: Whether to batch the operations sent to each remote
+      worker into a single `ExecutePlan` request per computed value, rather than
+      sending one request per operation. Falls back to one request per
+      operation for workers which do not support `ExecutePlan`.
+    stream_chunk_size_bytes: Optional maximum number of bytes of value content
+      in each message sent to or received from a remote worker. If specified,
+      values are transferred as streams of chunks, so that their size is not
+      limited by the maximum size of a gRPC message. Falls back to one message
+      per value for workers which do not support streaming.
+    value_cache_min_size_bytes: Optional minimum serialized size of the values
+      which remote workers cache by their content. If specified, a value which
+      a worker already holds (such as a computation or server state sent in
+      every round) is not uploaded to it again. Falls back to uploading every
+      value to workers which do not support caching values.
+    compression: Optional name of a lossless compression (`'zlib'`, `'zstd'`
+      or `'lz4'`) of the values sent to and received from remote workers. The
+      `'zstd'` and `'lz4'` compressions require the `zstandard` and `lz4`
+      packages. Falls back to uncompressed values for workers which do not
+      support the compression.
+    float_transport_dtype: Optional `tf.float16` or `tf.bfloat16` to negotiate
+      with remote workers. The `tf.float32` and `tf.float64` tensors with at
+      least 1024 elements (such as model weights) of the values created or
+      computed with `lossy_float_transport=True` are cast to this dtype while
+      they are transferred, losing precision; other values are sent exactly.
+      Falls back to sending tensors in their own dtype to workers which do not
+      support the cast.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -1026,11 +1214,24 @@ def remote_executor_factory_from_stubs(
   py_typecheck.check_type(dispose_batch_size, int)
   py_typecheck.check_type(max_fanout, int)
   py_typecheck.check_type(default_num_clients, int)
+  py_typecheck.check_type(batch_operations, bool)
+  if stream_chunk_size_bytes is not None:
+    py_typecheck.check_type(stream_chunk_size_bytes, int)
+  if value_cache_min_size_bytes is not None:
+    py_typecheck.check_type(value_cache_min_size_bytes, int)
+  if compression is not None:
+    py_typecheck.check_type(compression, str)
+    # Raises if the compression is unknown, rather than when the executors are
+    # first created.
+    value_compression.compression_from_name(compression)
 
   def _flat_stack_fn(cardinalities):
     num_clients = cardinalities.get(placements.CLIENTS, default_num_clients)
     return _configure_remote_workers(num_clients, stubs, thread_pool_executor,
-                                     dispose_batch_size)
+                                     dispose_batch_size, batch_operations,
+                                     stream_chunk_size_bytes,
+                                     value_cache_min_size_bytes, compression,
+                                     float_transport_dtype)
 
   unplaced_ex_factory = UnplacedExecutorFactory()
   composing_executor_factory = ComposingExecutorFactory(
@@ -319,6 +319,114 @@ class ExecutorStacksTest(parameterized.TestCase):
 
     self.assertEqual(result, 55)
 
+  @parameterized.named_parameters(
+      ('flat_stack', 100, 1),
+      ('flat_stack_shared_client_executors', 100, 3),
+      ('composing_stack', 3, 1),
+  )
+  def test_execution_with_reduction_arity(self, max_fanout, clients_per_thread):
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.int32))
+    def foo(x):
+      return intrinsics.federated_sum(x)
+
+    executor = python_executor_stacks.local_executor_factory(
+        max_fanout=max_fanout,
+        clients_per_thread=clients_per_thread,
+        reduction_arity=2)
+    with executor_test_utils.install_executor(executor):
+      result = foo([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    self.assertEqual(result, 55)
+
+  def test_construction_raises_with_reduction_arity_one(self):
+    with self.assertRaises(ValueError):
+      python_executor_stacks.local_executor_factory(reduction_arity=1)
+
+  @parameterized.named_parameters(
+      ('flat_stack_shared_client_executors', 100, 3),
+      ('composing_stack', 3, 1),
+  )
+  def test_execution_with_client_processes(self, max_fanout,
+                                           clients_per_thread):
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.int32))
+    def foo(x):
+      return intrinsics.federated_sum(intrinsics.federated_map(add_one, x))
+
+    executor = python_executor_stacks.local_executor_factory(
+        max_fanout=max_fanout,
+        clients_per_thread=clients_per_thread,
+        num_client_processes=2)
+    with executor_test_utils.install_executor(executor):
+      result = foo([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    self.assertEqual(result, 65)
+
+  def test_construction_raises_with_negative_client_processes(self):
+    with self.assertRaises(ValueError):
+      python_executor_stacks.local_executor_factory(num_client_processes=-1)
+
+  @parameterized.named_parameters(
+      ('flat_stack', 100, 1),
+      ('flat_stack_shared_client_executors', 100, 3),
+      ('composing_stack_shared_client_executors', 3, 2),
+  )
+  def test_execution_with_vectorized_client_map(self, max_fanout,
+                                                clients_per_thread):
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.int32))
+    def foo(x):
+      return intrinsics.federated_map(add_one, x)
+
+    executor = python_executor_stacks.local_executor_factory(
+        max_fanout=max_fanout,
+        clients_per_thread=clients_per_thread,
+        vectorize_client_map=True)
+    with executor_test_utils.install_executor(executor):
+      result = foo([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    self.assertEqual(result, [2, 3, 4, 5, 6, 7, 8, 9, 10, 11])
+
+  @parameterized.named_parameters(
+      ('flat_stack', 100),
+      ('composing_stack', 3),
+  )
+  def test_execution_with_delta_broadcast(self, max_fanout):
+
+    @tensorflow_computation.tf_computation(tf.int32, tf.TensorSpec([4],
+                                                                   tf.int32))
+    def add(x, y):
+      return x + y
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.int32),
+        computation_types.at_server(tf.TensorSpec([4], tf.int32)))
+    def foo(x, y):
+      return intrinsics.federated_map(add,
+                                      (x, intrinsics.federated_broadcast(y)))
+
+    executor = python_executor_stacks.local_executor_factory(
+        max_fanout=max_fanout, delta_broadcast=True)
+    with executor_test_utils.install_executor(executor):
+      result_1 = foo([1, 2, 3, 4, 5, 6, 7, 8], [0, 0, 0, 0])
+      result_2 = foo([1, 2, 3, 4, 5, 6, 7, 8], [0, 10, 0, 0])
+
+    np.testing.assert_array_equal(result_1, [[x] * 4 for x in range(1, 9)])
+    np.testing.assert_array_equal(result_2,
+                                  [[x, x + 10, x, x] for x in range(1, 9)])
+
   @parameterized.named_parameters(
       ('local_executor_none_clients',
        python_executor_stacks.local_executor_factory()),
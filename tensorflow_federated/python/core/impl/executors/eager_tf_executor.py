@@ -19,7 +19,8 @@
 """A simple executor that operates synchronously in eager TensorFlow mode."""
 
 import itertools
-from typing import Any, Iterable, MutableMapping, Optional
+import threading
+from typing import Any, Callable, Iterable, MutableMapping, Optional, Tuple
 import uuid
 
 from absl import logging
@@ -45,6 +46,7 @@ from tensorflow_federated.python.core.impl.utils import tensorflow_utils
 
 # Cache size here is simply heuristic, no formal analysis.
 _TF_FUNCTION_CACHE_SIZE = 100
+_SHARED_TF_FUNCTION_CACHE_SIZE = 1000
 
 
 def _all_graph_def_nodes(
@@ -264,6 +266,25 @@ def embed_tensorflow_computation(comp, type_spec=None, device=None):
     TypeError: If arguments are of the wrong types, e.g., in `comp` is not a
       TensorFlow computation.
   """
+  embedded_fn, _ = _embed_tensorflow_computation(comp, type_spec, device)
+  return embedded_fn
+
+
+def _embed_tensorflow_computation(
+    comp, type_spec=None, device=None) -> Tuple[Callable[..., Any], bool]:
+  """Embeds a TensorFlow computation, as in `embed_tensorflow_computation`.
+
+  Args:
+    comp: An instance of `pb.Computation`.
+    type_spec: An optional `tff.Type` instance or something convertible to it.
+    device: An optional `tf.config.LogicalDevice`.
+
+  Returns:
+    A tuple `(fn, is_stateless)`, where `fn` is the callable returned by
+    `embed_tensorflow_computation`, and `is_stateless` is `True` if `fn` owns no
+    resources (such as hash tables or variables) which are destroyed upon
+    invocation, in which case `fn` can be invoked concurrently.
+  """
   # TODO(b/134543154): Decide whether this belongs in `tensorflow_utils.py`
   # since it deals exclusively with eager mode. Incubate here, and potentially
   # move there, once stable.
@@ -375,10 +396,70 @@ def embed_tensorflow_computation(comp, type_spec=None, device=None):
 
   # pylint: enable=function-redefined
 
+  is_stateless = not destroy_before_invocation and not destroy_after_invocation
   if param_type is not None:
-    return lambda arg: fn_to_return(arg)  # pylint: disable=unnecessary-lambda
+    return lambda arg: fn_to_return(arg), is_stateless  # pylint: disable=unnecessary-lambda
   else:
-    return lambda: fn_to_return(None)
+    return lambda: fn_to_return(None), is_stateless
+
+
+class TFFunctionCache(object):
+  """A thread-safe, size-bounded cache of embedded TensorFlow computations.
+
+  Entries are evicted in least recently used order. The cache counts the number
+  of lookups which found an entry (`hits`) and which did not (`misses`).
+  """
+
+  def __init__(self, maxsize: int):
+    py_typecheck.check_type(maxsize, int)
+    self._cache = cachetools.LRUCache(maxsize)
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+
+  def get(self, key) -> Optional[Callable[..., Any]]:
+    with self._lock:
+      fn = self._cache.get(key)
+      if fn is None:
+        self._misses += 1
+      else:
+        self._hits += 1
+      return fn
+
+  def __setitem__(self, key, fn: Callable[..., Any]):
+    with self._lock:
+      self._cache[key] = fn
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._cache)
+
+  @property
+  def hits(self) -> int:
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    return self._misses
+
+  def clear(self):
+    """Removes all the entries, and resets the counters."""
+    with self._lock:
+      self._cache.clear()
+      self._hits = 0
+      self._misses = 0
+
+
+# Embedded computations which can be invoked concurrently are shared by all the
+# `EagerTFExecutor`s of the process, so that executors constructed for new
+# cardinalities do not re-embed the computations of previous rounds. The cache
+# keys include the device, so executors only share the functions of a device.
+_shared_tf_function_cache = TFFunctionCache(_SHARED_TF_FUNCTION_CACHE_SIZE)
+
+
+def shared_tf_function_cache() -> TFFunctionCache:
+  """Returns the cache of embedded computations shared by the process."""
+  return _shared_tf_function_cache
 
 
 @tracing.trace
@@ -401,8 +482,17 @@ def _to_computation_internal_rep(*, value: pb.Computation,
   cached_fn = tf_function_cache.get(key)
   if cached_fn is not None:
     return cached_fn
-  embedded_fn = embed_tensorflow_computation(value, type_spec, device)
-  tf_function_cache[key] = embedded_fn
+  cached_fn = _shared_tf_function_cache.get(key)
+  if cached_fn is not None:
+    return cached_fn
+  embedded_fn, is_stateless = _embed_tensorflow_computation(
+      value, type_spec, device)
+  # Functions owning resources destroyed upon invocation must not be invoked
+  # concurrently, so they are only cached for the calling executor.
+  if is_stateless:
+    _shared_tf_function_cache[key] = embedded_fn
+  else:
+    tf_function_cache[key] = embedded_fn
   return embedded_fn
 
 
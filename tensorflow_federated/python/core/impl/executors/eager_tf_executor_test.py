@@ -569,6 +569,88 @@ class EagerTFExecutorTest(tf.test.TestCase, parameterized.TestCase):
     self.assertEqual(self.evaluate(result_1.internal_representation), 0)
     self.assertEqual(self.evaluate(result_2.internal_representation), 3)
 
+  def test_executors_share_embedded_computation(self):
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def comp(x):
+      return x + 1
+
+    cache = eager_tf_executor.shared_tf_function_cache()
+    cache.clear()
+    ex_1 = eager_tf_executor.EagerTFExecutor()
+    ex_2 = eager_tf_executor.EagerTFExecutor()
+
+    fn_1 = asyncio.run(ex_1.create_value(comp))
+    self.assertEqual(cache.hits, 0)
+    self.assertLen(cache, 1)
+    fn_2 = asyncio.run(ex_2.create_value(comp))
+
+    self.assertEqual(cache.hits, 1)
+    self.assertLen(cache, 1)
+    self.assertIs(fn_1.internal_representation, fn_2.internal_representation)
+    arg = asyncio.run(ex_2.create_value(10, tf.int32))
+    result = asyncio.run(ex_2.create_call(fn_2, arg))
+    self.assertEqual(result.internal_representation, 11)
+
+  def test_executors_do_not_share_embedded_computation_with_variables(self):
+
+    @tensorflow_computation.tf_computation
+    def comp():
+      return tf.Variable(10)
+
+    cache = eager_tf_executor.shared_tf_function_cache()
+    cache.clear()
+    ex_1 = eager_tf_executor.EagerTFExecutor()
+    ex_2 = eager_tf_executor.EagerTFExecutor()
+
+    fn_1 = asyncio.run(ex_1.create_value(comp))
+    fn_2 = asyncio.run(ex_2.create_value(comp))
+
+    self.assertEmpty(cache)
+    self.assertIsNot(fn_1.internal_representation,
+                     fn_2.internal_representation)
+    result = asyncio.run(ex_2.create_call(fn_2))
+    self.assertEqual(result.internal_representation, 10)
+
+
+class TFFunctionCacheTest(tf.test.TestCase):
+
+  def test_get_counts_hits_and_misses(self):
+    cache = eager_tf_executor.TFFunctionCache(10)
+    fn = lambda: None
+
+    self.assertIsNone(cache.get('a'))
+    cache['a'] = fn
+    self.assertIs(cache.get('a'), fn)
+    self.assertIs(cache.get('a'), fn)
+
+    self.assertEqual(cache.hits, 2)
+    self.assertEqual(cache.misses, 1)
+
+  def test_evicts_least_recently_used_entry(self):
+    cache = eager_tf_executor.TFFunctionCache(2)
+    cache['a'] = lambda: 'a'
+    cache['b'] = lambda: 'b'
+    cache.get('a')
+
+    cache['c'] = lambda: 'c'
+
+    self.assertLen(cache, 2)
+    self.assertIsNotNone(cache.get('a'))
+    self.assertIsNone(cache.get('b'))
+
+  def test_clear_resets_counters(self):
+    cache = eager_tf_executor.TFFunctionCache(10)
+    cache['a'] = lambda: None
+    cache.get('a')
+    cache.get('b')
+
+    cache.clear()
+
+    self.assertEmpty(cache)
+    self.assertEqual(cache.hits, 0)
+    self.assertEqual(cache.misses, 0)
+
   # TODO(b/137602785): bring GPU test back after the fix for `wrap_function`.
   @tensorflow_test_utils.skip_test_for_gpu
   def test_executor_create_call_take_two_int_from_finite_dataset(self):
@@ -22,14 +22,16 @@ import asyncio
 import collections
 import contextlib
 import functools
+import itertools
 import threading
 import traceback
-from typing import Any
+from typing import Any, Iterator, Optional
 import uuid
 import weakref
 
 from absl import logging
 import grpc
+import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.proto.v0 import executor_pb2_grpc
@@ -39,6 +41,7 @@ from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_factory
 from tensorflow_federated.python.core.impl.executors import executors_errors
+from tensorflow_federated.python.core.impl.executors import value_compression
 from tensorflow_federated.python.core.impl.executors import value_serialization
 
 
@@ -70,12 +73,97 @@ def _get_hashable_key(cardinalities: executor_factory.CardinalitiesType) -> str:
   return str(tuple(sorted((str(k), v) for k, v in cardinalities.items())))
 
 
-class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
-  """A wrapper around a target executor that makes it into a gRPC service."""
+def _negotiate_transport(request: executor_pb2.GetExecutorRequest,
+                         response: executor_pb2.GetExecutorResponse):
+  """Sets the compression and float transport dtype accepted for `request`."""
+  for compression in request.compressions:
+    if value_compression.is_supported(compression):
+      response.compression = compression
+      break
+  if request.float_transport_dtype:
+    float_transport_dtype = tf.dtypes.as_dtype(request.float_transport_dtype)
+    if float_transport_dtype in value_serialization.FLOAT_TRANSPORT_DTYPES:
+      response.float_transport_dtype = request.float_transport_dtype
+
+
+def _float_transport_dtype(
+    request: executor_pb2.ComputeRequest) -> Optional[tf.dtypes.DType]:
+  if not request.float_transport_dtype:
+    return None
+  return tf.dtypes.as_dtype(request.float_transport_dtype)
+
+
+# The default maximum total size of the values cached by their content digest.
+DEFAULT_VALUE_CACHE_SIZE_BYTES = 256 * (1024**2)  # 256 MB
+
+
+class _ValueCache:
+  """A least recently used cache of values keyed by their content digest.
+
+  The cache holds the futures of values embedded in the executors of the
+  service, and is bounded by the total serialized size of the cached values.
+  This class is not thread-safe.
+  """
+
+  def __init__(self, max_size_bytes: int):
+    self._max_size_bytes = max_size_bytes
+    self._size_bytes = 0
+    # Maps `(executor_id, digest)` to `(future_val, size_bytes)`, from the
+    # least to the most recently used.
+    self._entries = collections.OrderedDict()
+
+  def get(self, executor_id: str, digest: bytes):
+    """Returns the future of a cached value, or `None` if it is not cached."""
+    key = (executor_id, digest)
+    entry = self._entries.get(key)
+    if entry is None:
+      return None
+    future_val, _ = entry
+    if future_val.done() and future_val.exception() is not None:
+      # A value which failed to be created must be uploaded again.
+      self._remove(key)
+      return None
+    self._entries.move_to_end(key)
+    return future_val
+
+  def put(self, executor_id: str, digest: bytes, future_val, size_bytes: int):
+    """Caches `future_val`, evicting the least recently used values."""
+    key = (executor_id, digest)
+    if key in self._entries:
+      self._remove(key)
+    if size_bytes > self._max_size_bytes:
+      return
+    while self._size_bytes + size_bytes > self._max_size_bytes:
+      self._remove(next(iter(self._entries)))
+    self._entries[key] = (future_val, size_bytes)
+    self._size_bytes += size_bytes
+
+  def remove_executor(self, executor_id: str):
+    """Removes all the values embedded in the executor `executor_id`."""
+    for key in [key for key in self._entries if key[0] == executor_id]:
+      self._remove(key)
+
+  def _remove(self, key):
+    _, size_bytes = self._entries.pop(key)
+    self._size_bytes -= size_bytes
+
 
-  def __init__(self, ex_factory: executor_factory.ExecutorFactory, *args,
+class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
+  """A wrapper around a target executor that makes it into a gRPC service.
+
+  Values created with a `value_digest` are cached by their content, so that
+  clients can later create the same value by sending only its digest. The cache
+  holds at most `value_cache_size_bytes` of serialized values; the least
+  recently used values are evicted first.
+  """
+
+  def __init__(self,
+               ex_factory: executor_factory.ExecutorFactory,
+               *args,
+               value_cache_size_bytes: int = DEFAULT_VALUE_CACHE_SIZE_BYTES,
                **kwargs):
     py_typecheck.check_type(ex_factory, executor_factory.ExecutorFactory)
+    py_typecheck.check_type(value_cache_size_bytes, int)
     super().__init__(*args, **kwargs)
     self._ex_factory = ex_factory
     self._executors = {}
@@ -88,6 +176,7 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     # instances (this may, and probably will change as we flesh out the rest
     # of this implementation).
     self._values = {}
+    self._value_cache = _ValueCache(value_cache_size_bytes)
 
     def run_loop(loop):
       loop.run_forever()
@@ -143,8 +232,10 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
               cardinalities_dict)
         self._executor_ref_counts[key] += 1
         self._ids_to_cardinalities[key] = cardinalities_dict
-      return executor_pb2.GetExecutorResponse(
+      response = executor_pb2.GetExecutorResponse(
           executor=executor_pb2.ExecutorId(id=key))
+      _negotiate_transport(request, response)
+      return response
 
   def DestroyExecutor(self, request):
     with self._lock:
@@ -155,6 +246,7 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
         self._ex_factory.clean_up_executor(cardinalities)
         del self._ids_to_cardinalities[key]
         self._executor_ref_counts[key] = 0
+        self._value_cache.remove_executor(key)
 
   def DisposeExecutor(
       self,
@@ -172,6 +264,7 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
         cardinalities = self._ids_to_cardinalities[key]
         self._ex_factory.clean_up_executor(cardinalities)
         del self._ids_to_cardinalities[key]
+        self._value_cache.remove_executor(key)
     return executor_pb2.DisposeExecutorResponse()
 
   @contextlib.contextmanager
@@ -206,6 +299,136 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
       _set_invalid_arg_err(context, err)
       return blank_response_fn()
 
+  def _add_value(self, value_id: str, future_val):
+    with self._lock:
+      self._values[value_id] = future_val
+
+  def _create_value(self, request: executor_pb2.CreateValueRequest,
+                    context: grpc.ServicerContext, value_id: str):
+    """Embeds the value in `request` in the executor under `value_id`."""
+    if not request.HasField('value') and request.value_digest:
+      if not self._create_cached_value(request, value_id):
+        raise ValueError('No value is cached under the `value_digest` of the '
+                         'request.')
+      return
+    value_digest = None
+    if request.value_digest:
+      value_digest = value_serialization.ValueDigest()
+      value_digest.update(request.value)
+    with tracing.span('ExecutorService.CreateValue', 'deserialize_value'):
+      value, value_type = (value_serialization.deserialize_value(request.value))
+    self._embed_value(request, context, value_id, value, value_type,
+                      value_digest)
+
+  def _create_cached_value(self, request: executor_pb2.CreateValueRequest,
+                           value_id: str) -> bool:
+    """Adds the value cached under the digest in `request` as `value_id`.
+
+    Args:
+      request: An instance of `executor_pb2.CreateValueRequest` with a
+        `value_digest`.
+      value_id: The id under which to add the cached value.
+
+    Returns:
+      `True` if the value was cached, or `False` otherwise.
+    """
+    with self._lock:
+      future_val = self._value_cache.get(request.executor.id,
+                                         request.value_digest)
+      if future_val is None:
+        return False
+      self._values[value_id] = future_val
+      return True
+
+  def _embed_value(
+      self,
+      request: Any,
+      context: grpc.ServicerContext,
+      value_id: str,
+      value: Any,
+      value_type,
+      value_digest: Optional[value_serialization.ValueDigest] = None):
+    """Embeds a deserialized value in the executor under `value_id`.
+
+    Args:
+      request: The request creating the value, which names the executor.
+      context: The `grpc.ServicerContext` of the request.
+      value_id: The id under which to add the value.
+      value: The deserialized value.
+      value_type: The type of `value`.
+      value_digest: An optional `value_serialization.ValueDigest` of the
+        serialized value. If specified, it must match the `value_digest` of
+        `request`, and the value is cached under this digest.
+
+    Raises:
+      ValueError: If `value_digest` does not match the digest in `request`.
+    """
+    if (value_digest is not None and
+        value_digest.digest() != request.value_digest):
+      raise ValueError('The `value_digest` does not match the digest of the '
+                       'serialized value.')
+    coro = self.executor(request, context).create_value(value, value_type)
+    future_val = self._run_coro_threadsafe_with_tracing(coro)
+    with self._lock:
+      self._values[value_id] = future_val
+      if value_digest is not None:
+        self._value_cache.put(request.executor.id, request.value_digest,
+                              future_val, value_digest.size_bytes)
+
+  def _create_call(self, request: executor_pb2.CreateCallRequest,
+                   context: grpc.ServicerContext, value_id: str):
+    """Embeds the call in `request` in the executor under `value_id`."""
+    function_id = str(request.function_ref.id)
+    argument_id = str(request.argument_ref.id)
+    with self._lock:
+      function_val = self._values[function_id]
+      argument_val = self._values[argument_id] if argument_id else None
+
+    async def _process_create_call():
+      function = await asyncio.wrap_future(function_val)
+      argument = await asyncio.wrap_future(
+          argument_val) if argument_val is not None else None
+      return await self.executor(request,
+                                 context).create_call(function, argument)
+
+    coro = _process_create_call()
+    self._add_value(value_id, self._run_coro_threadsafe_with_tracing(coro))
+
+  def _create_struct(self, request: executor_pb2.CreateStructRequest,
+                     context: grpc.ServicerContext, value_id: str):
+    """Embeds the struct in `request` in the executor under `value_id`."""
+    with self._lock:
+      elem_futures = [self._values[e.value_ref.id] for e in request.element]
+    elem_names = [
+        str(elem.name) if elem.name else None for elem in request.element
+    ]
+
+    async def _process_create_struct():
+      elem_values = await asyncio.gather(
+          *[asyncio.wrap_future(v) for v in elem_futures])
+      elements = list(zip(elem_names, elem_values))
+      struct = structure.Struct(elements)
+      return await self.executor(request, context).create_struct(struct)
+
+    self._add_value(
+        value_id,
+        self._run_coro_threadsafe_with_tracing(_process_create_struct()))
+
+  def _create_selection(self, request: executor_pb2.CreateSelectionRequest,
+                        context: grpc.ServicerContext, value_id: str):
+    """Embeds the selection in `request` in the executor under `value_id`."""
+    with self._lock:
+      source_fut = self._values[request.source_ref.id]
+
+    async def _process_create_selection():
+      source = await asyncio.wrap_future(source_fut)
+      return await self.executor(request, context).create_selection(
+          source, request.index)
+
+    self._add_value(
+        value_id,
+        self._run_coro_threadsafe_with_tracing(_process_create_selection()))
+
   def CreateValue(
       self,
       request: executor_pb2.CreateValueRequest,
@@ -215,14 +438,43 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.CreateValueRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.CreateValueResponse):
-      with tracing.span('ExecutorService.CreateValue', 'deserialize_value'):
-        value, value_type = (
-            value_serialization.deserialize_value(request.value))
       value_id = str(uuid.uuid4())
-      coro = self.executor(request, context).create_value(value, value_type)
-      future_val = self._run_coro_threadsafe_with_tracing(coro)
-      with self._lock:
-        self._values[value_id] = future_val
+      if not request.HasField('value') and request.value_digest:
+        # Looks up the value, letting the client send it if it is not cached.
+        if not self._create_cached_value(request, value_id):
+          return executor_pb2.CreateValueResponse()
+      else:
+        self._create_value(request, context, value_id)
+      return executor_pb2.CreateValueResponse(
+          value_ref=executor_pb2.ValueRef(id=value_id))
+
+  def CreateValueStream(
+      self,
+      request_iterator: Iterator[executor_pb2.CreateValueStreamRequest],
+      context: grpc.ServicerContext,
+  ) -> executor_pb2.CreateValueResponse:
+    """Creates a value embedded in the executor from a stream of chunks."""
+    # An empty stream is rejected by the deserializer as a missing header.
+    first_request = next(request_iterator,
+                         executor_pb2.CreateValueStreamRequest())
+    py_typecheck.check_type(first_request,
+                            executor_pb2.CreateValueStreamRequest)
+    with self._try_handle_request_context(first_request, context,
+                                          executor_pb2.CreateValueResponse):
+      with tracing.span('ExecutorService.CreateValueStream',
+                        'deserialize_value'):
+        deserializer = value_serialization.ValueChunkDeserializer()
+        value_digest = None
+        if first_request.value_digest:
+          value_digest = value_serialization.ValueDigest()
+        for request in itertools.chain([first_request], request_iterator):
+          deserializer.add_chunk(request.chunk)
+          if value_digest is not None:
+            value_digest.update(request.chunk)
+        value, value_type = deserializer.result()
+      value_id = str(uuid.uuid4())
+      self._embed_value(first_request, context, value_id, value, value_type,
+                        value_digest)
       return executor_pb2.CreateValueResponse(
           value_ref=executor_pb2.ValueRef(id=value_id))
 
@@ -235,24 +487,8 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.CreateCallRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.CreateCallResponse):
-      function_id = str(request.function_ref.id)
-      argument_id = str(request.argument_ref.id)
-      with self._lock:
-        function_val = self._values[function_id]
-        argument_val = self._values[argument_id] if argument_id else None
-
-      async def _process_create_call():
-        function = await asyncio.wrap_future(function_val)
-        argument = await asyncio.wrap_future(
-            argument_val) if argument_val is not None else None
-        return await self.executor(request,
-                                   context).create_call(function, argument)
-
-      coro = _process_create_call()
-      result_fut = self._run_coro_threadsafe_with_tracing(coro)
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._create_call(request, context, result_id)
       return executor_pb2.CreateCallResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
 
@@ -265,24 +501,8 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.CreateStructRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.CreateStructResponse):
-      with self._lock:
-        elem_futures = [self._values[e.value_ref.id] for e in request.element]
-      elem_names = [
-          str(elem.name) if elem.name else None for elem in request.element
-      ]
-
-      async def _process_create_struct():
-        elem_values = await asyncio.gather(
-            *[asyncio.wrap_future(v) for v in elem_futures])
-        elements = list(zip(elem_names, elem_values))
-        struct = structure.Struct(elements)
-        return await self.executor(request, context).create_struct(struct)
-
-      result_fut = self._run_coro_threadsafe_with_tracing(
-          _process_create_struct())
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._create_struct(request, context, result_id)
       return executor_pb2.CreateStructResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
 
@@ -295,19 +515,8 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.CreateSelectionRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.CreateSelectionResponse):
-      with self._lock:
-        source_fut = self._values[request.source_ref.id]
-
-      async def _process_create_selection():
-        source = await asyncio.wrap_future(source_fut)
-        return await self.executor(request, context).create_selection(
-            source, request.index)
-
-      result_fut = self._run_coro_threadsafe_with_tracing(
-          _process_create_selection())
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._create_selection(request, context, result_id)
       return executor_pb2.CreateSelectionResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
 
@@ -329,15 +538,46 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     py_typecheck.check_type(request, executor_pb2.ComputeRequest)
     with self._try_handle_request_context(request, context,
                                           executor_pb2.ComputeResponse):
-      value_id = str(request.value_ref.id)
-      with self._lock:
-        future_val = asyncio.wrap_future(self._values[value_id])
-      val = await future_val
-      result_val = await val.compute()
-      val_type = val.type_signature
-      value_proto, _ = value_serialization.serialize_value(result_val, val_type)
+      value_proto = await self._compute_value(request)
       return executor_pb2.ComputeResponse(value=value_proto)
 
+  async def _compute_value(
+      self, request: executor_pb2.ComputeRequest) -> executor_pb2.Value:
+    """Computes the value in `request` and serializes it as requested."""
+    result_val, val_type = await self._compute_result(str(request.value_ref.id))
+    value_proto, _ = value_serialization.serialize_value(
+        result_val,
+        val_type,
+        raw_tensors=request.raw_tensors,
+        float_transport_dtype=_float_transport_dtype(request))
+    return value_compression.compress_value(value_proto, request.compression)
+
+  async def _compute_result(self, value_id: str):
+    """Computes the value stored under `value_id` with its type signature."""
+    with self._lock:
+      future_val = asyncio.wrap_future(self._values[value_id])
+    val = await future_val
+    result_val = await val.compute()
+    return result_val, val.type_signature
+
+  def ComputeStream(
+      self,
+      request: executor_pb2.ComputeStreamRequest,
+      context: grpc.ServicerContext,
+  ) -> Iterator[executor_pb2.ValueChunk]:
+    """Computes a value embedded in the executor and streams it in chunks."""
+    py_typecheck.check_type(request, executor_pb2.ComputeStreamRequest)
+    with self._try_handle_request_context(request, context,
+                                          executor_pb2.ValueChunk):
+      coro = self._compute_result(str(request.value_ref.id))
+      value, value_type = self._run_coro_threadsafe_with_tracing(coro).result()
+      chunk_size_bytes = (
+          request.chunk_size_bytes or
+          value_serialization.DEFAULT_CHUNK_SIZE_BYTES)
+      chunks, _ = value_serialization.serialize_value_to_chunks(
+          value, value_type, chunk_size_bytes)
+      yield from chunks
+
   def Dispose(
       self,
       request: executor_pb2.DisposeRequest,
@@ -346,9 +586,68 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     """Disposes of a value, making it no longer available for future calls."""
     py_typecheck.check_type(request, executor_pb2.DisposeRequest)
     try:
-      with self._lock:
-        for value_ref in request.value_ref:
-          del self._values[value_ref.id]
+      self._dispose_values(request.value_ref)
     except KeyError as err:
       _set_invalid_arg_err(context, err)
     return executor_pb2.DisposeResponse()
+
+  def _dispose_values(self, value_refs):
+    with self._lock:
+      for value_ref in value_refs:
+        del self._values[value_ref.id]
+
+  def ExecutePlan(
+      self,
+      request: executor_pb2.ExecutePlanRequest,
+      context: grpc.ServicerContext,
+  ) -> executor_pb2.ExecutePlanResponse:
+    """Executes an ordered list of operations in the executor.
+
+    The values created by the operations are stored under the references chosen
+    by the client, so that later operations in the plan can refer to them. If
+    an operation fails, the operations before it have already taken effect and
+    the remaining operations are not executed.
+
+    Args:
+      request: An instance of `executor_pb2.ExecutePlanRequest`.
+      context: The `grpc.ServicerContext` of the request.
+
+    Returns:
+      An instance of `executor_pb2.ExecutePlanResponse` with one result per
+      operation in `request`.
+    """
+    py_typecheck.check_type(request, executor_pb2.ExecutePlanRequest)
+    with self._try_handle_request_context(request, context,
+                                          executor_pb2.ExecutePlanResponse):
+      create_fns = {
+          'create_value': self._create_value,
+          'create_call': self._create_call,
+          'create_struct': self._create_struct,
+          'create_selection': self._create_selection,
+      }
+      response = executor_pb2.ExecutePlanResponse()
+      for operation in request.operation:
+        kind = operation.WhichOneof('operation')
+        result = response.result.add()
+        if kind in create_fns:
+          value_id = str(operation.result_ref.id)
+          if not value_id:
+            raise ValueError(
+                f'Operation `{kind}` in the plan is missing a `result_ref`.')
+          with self._lock:
+            if value_id in self._values:
+              raise ValueError(f'The value ref {value_id} is already in use.')
+          op_request = getattr(operation, kind)
+          op_request.executor.CopyFrom(request.executor)
+          create_fns[kind](op_request, context, value_id)
+          getattr(result, kind).value_ref.id = value_id
+        elif kind == 'compute':
+          coro = self._compute_value(operation.compute)
+          value_proto = self._run_coro_threadsafe_with_tracing(coro).result()
+          result.compute.value.CopyFrom(value_proto)
+        elif kind == 'dispose':
+          self._dispose_values(operation.dispose.value_ref)
+          result.dispose.SetInParent()
+        else:
+          raise ValueError(f'Unsupported operation in the plan: {kind}')
+      return response
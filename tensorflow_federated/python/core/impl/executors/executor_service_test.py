@@ -18,6 +18,7 @@ from unittest import mock
 from absl.testing import absltest
 import grpc
 from grpc.framework.foundation import logging_pool
+import numpy as np
 import portpicker
 import tensorflow as tf
 
@@ -32,6 +33,7 @@ from tensorflow_federated.python.core.impl.executors import executor_test_utils
 from tensorflow_federated.python.core.impl.executors import executor_value_base
 from tensorflow_federated.python.core.impl.executors import value_serialization
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
+from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 
 
@@ -40,12 +42,15 @@ class TestEnv(object):
 
   def __init__(self,
                ex_factory: executor_factory.ExecutorFactory,
-               num_clients: int = 0):
+               num_clients: int = 0,
+               value_cache_size_bytes: int = executor_service
+               .DEFAULT_VALUE_CACHE_SIZE_BYTES):
     port = portpicker.pick_unused_port()
     self._server_pool = logging_pool.pool(max_workers=1)
     self._server = grpc.server(self._server_pool)
     self._server.add_insecure_port('[::]:{}'.format(port))
-    self._service = executor_service.ExecutorService(ex_factory=ex_factory)
+    self._service = executor_service.ExecutorService(
+        ex_factory=ex_factory, value_cache_size_bytes=value_cache_size_bytes)
     executor_pb2_grpc.add_ExecutorGroupServicer_to_server(
         self._service, self._server)
     self._server.start()
@@ -383,6 +388,323 @@ class ExecutorServiceTest(absltest.TestCase):
                      grpc.StatusCode.FAILED_PRECONDITION)
     self.assertIn('No executor found', rpc_err.exception.exception().details())
 
+  def test_execute_plan_creates_and_computes_values(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def comp(x):
+      return tf.add(x, 1)
+
+    comp_proto, _ = value_serialization.serialize_value(comp)
+    arg_proto, _ = value_serialization.serialize_value(10, tf.int32)
+    comp_ref = executor_pb2.ValueRef(id='comp')
+    arg_ref = executor_pb2.ValueRef(id='arg')
+    result_ref = executor_pb2.ValueRef(id='result')
+    operation = executor_pb2.ExecutePlanRequest.Operation
+    request = executor_pb2.ExecutePlanRequest(
+        executor=env.executor_pb,
+        operation=[
+            operation(
+                create_value=executor_pb2.CreateValueRequest(value=comp_proto),
+                result_ref=comp_ref),
+            operation(
+                create_value=executor_pb2.CreateValueRequest(value=arg_proto),
+                result_ref=arg_ref),
+            operation(
+                create_call=executor_pb2.CreateCallRequest(
+                    function_ref=comp_ref, argument_ref=arg_ref),
+                result_ref=result_ref),
+            operation(
+                compute=executor_pb2.ComputeRequest(value_ref=result_ref)),
+            operation(
+                dispose=executor_pb2.DisposeRequest(
+                    value_ref=[comp_ref, arg_ref])),
+        ])
+
+    response = env.stub.ExecutePlan(request)
+
+    self.assertLen(response.result, 5)
+    self.assertEqual(response.result[0].create_value.value_ref, comp_ref)
+    self.assertEqual(response.result[2].create_call.value_ref, result_ref)
+    value, _ = value_serialization.deserialize_value(
+        response.result[3].compute.value)
+    self.assertEqual(value, 11)
+    self.assertEqual(env.get_value('result'), 11)
+    with self.assertRaises(KeyError):
+      env.get_value_future_directly('comp')
+
+  def test_execute_plan_raises_on_value_ref_in_use(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = value_serialization.serialize_value(10, tf.int32)
+    operation = executor_pb2.ExecutePlanRequest.Operation(
+        create_value=executor_pb2.CreateValueRequest(value=value_proto),
+        result_ref=executor_pb2.ValueRef(id='value'))
+    request = executor_pb2.ExecutePlanRequest(
+        executor=env.executor_pb, operation=[operation, operation])
+
+    with self.assertRaises(grpc.RpcError) as rpc_err:
+      env.stub.ExecutePlan(request)
+
+    self.assertEqual(rpc_err.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+  def test_compute_with_raw_tensors_returns_raw_tensor(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = value_serialization.serialize_value(
+        [1.0, 2.0],
+        computation_types.TensorType(tf.float32, [2]),
+        raw_tensors=True)
+    response = env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(
+            executor=env.executor_pb, value=value_proto))
+
+    result = env.stub.Compute(
+        executor_pb2.ComputeRequest(
+            executor=env.executor_pb,
+            value_ref=response.value_ref,
+            raw_tensors=True))
+
+    self.assertEqual(result.value.WhichOneof('value'), 'raw_tensor')
+    value, _ = value_serialization.deserialize_value(result.value)
+    np.testing.assert_array_equal(value, [1.0, 2.0])
+
+  def test_create_value_stream_and_compute_stream_roundtrip_tensor(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    x = np.arange(1000, dtype=np.float32).reshape([10, 100])
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        x,
+        computation_types.TensorType(tf.float32, [10, 100]),
+        chunk_size_bytes=256)
+    requests = [
+        executor_pb2.CreateValueStreamRequest(
+            executor=env.executor_pb, chunk=chunk) for chunk in chunks
+    ]
+
+    response = env.stub.CreateValueStream(iter(requests))
+
+    self.assertIsInstance(response, executor_pb2.CreateValueResponse)
+    np.testing.assert_array_equal(env.get_value(response.value_ref.id), x)
+    result_chunks = list(
+        env.stub.ComputeStream(
+            executor_pb2.ComputeStreamRequest(
+                executor=env.executor_pb,
+                value_ref=response.value_ref,
+                chunk_size_bytes=512)))
+    self.assertLen(result_chunks, 1 + 4000 // 512 + 1)
+    value, _ = value_serialization.deserialize_value_from_chunks(result_chunks)
+    np.testing.assert_array_equal(value, x)
+
+  def test_create_value_stream_raises_on_empty_stream(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+
+    with self.assertRaises(grpc.RpcError) as rpc_err:
+      env.stub.CreateValueStream(iter([]))
+
+    self.assertEqual(rpc_err.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+
+class ExecutorServiceTransportTest(absltest.TestCase):
+
+  def _get_executor(self, service, **kwargs):
+    request = executor_pb2.GetExecutorRequest(
+        cardinalities=value_serialization.serialize_cardinalities(
+            {placements.CLIENTS: 0}),
+        **kwargs)
+    return service.GetExecutor(request, mock.Mock())
+
+  def test_get_executor_accepts_first_supported_compression(self):
+    service = executor_service.ExecutorService(
+        executor_test_utils.BasicTestExFactory(
+            eager_tf_executor.EagerTFExecutor()))
+
+    response = self._get_executor(
+        service, compressions=[100, executor_pb2.COMPRESSION_ZLIB])
+
+    self.assertEqual(response.compression, executor_pb2.COMPRESSION_ZLIB)
+
+  def test_get_executor_accepts_no_unsupported_compression(self):
+    service = executor_service.ExecutorService(
+        executor_test_utils.BasicTestExFactory(
+            eager_tf_executor.EagerTFExecutor()))
+
+    response = self._get_executor(service, compressions=[100])
+
+    self.assertEqual(response.compression, executor_pb2.COMPRESSION_UNSPECIFIED)
+
+  def test_get_executor_accepts_float_transport_dtype(self):
+    service = executor_service.ExecutorService(
+        executor_test_utils.BasicTestExFactory(
+            eager_tf_executor.EagerTFExecutor()))
+
+    accepted_response = self._get_executor(
+        service, float_transport_dtype=tf.bfloat16.as_datatype_enum)
+    rejected_response = self._get_executor(
+        service, float_transport_dtype=tf.int8.as_datatype_enum)
+
+    self.assertEqual(accepted_response.float_transport_dtype,
+                     tf.bfloat16.as_datatype_enum)
+    self.assertFalse(rejected_response.float_transport_dtype)
+
+  def test_compute_with_compression_and_float_transport_dtype(self):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    x = np.zeros([64, 64], dtype=np.float32)
+    value_proto, _ = value_serialization.serialize_value(
+        x, computation_types.TensorType(tf.float32, [64, 64]))
+    response = env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(
+            executor=env.executor_pb, value=value_proto))
+
+    result = env.stub.Compute(
+        executor_pb2.ComputeRequest(
+            executor=env.executor_pb,
+            value_ref=response.value_ref,
+            compression=executor_pb2.COMPRESSION_ZLIB,
+            float_transport_dtype=tf.float16.as_datatype_enum))
+
+    self.assertEqual(result.value.WhichOneof('value'), 'compressed')
+    value, _ = value_serialization.deserialize_value(result.value)
+    self.assertEqual(value.dtype, np.float32)
+    np.testing.assert_array_equal(value, x)
+
+
+def _value_digest(*messages):
+  value_digest = value_serialization.ValueDigest()
+  for message in messages:
+    value_digest.update(message)
+  return value_digest.digest()
+
+
+class ExecutorServiceValueCacheTest(absltest.TestCase):
+
+  def _create_env(self, **kwargs):
+    ex_factory = executor_test_utils.BasicTestExFactory(
+        eager_tf_executor.EagerTFExecutor())
+    return TestEnv(ex_factory, **kwargs)
+
+  def _create_value(self, env, value, value_digest=None):
+    value_proto, _ = value_serialization.serialize_value(
+        value, computation_types.TensorType(tf.float32, [len(value)]))
+    if value_digest is None:
+      value_digest = _value_digest(value_proto)
+    return env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(
+            executor=env.executor_pb,
+            value=value_proto,
+            value_digest=value_digest))
+
+  def _create_cached_value(self, env, value):
+    value_proto, _ = value_serialization.serialize_value(
+        value, computation_types.TensorType(tf.float32, [len(value)]))
+    return env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(
+            executor=env.executor_pb, value_digest=_value_digest(value_proto)))
+
+  def test_create_value_with_digest_returns_cached_value(self):
+    env = self._create_env()
+    response = self._create_value(env, [1.0, 2.0])
+
+    cached_response = self._create_cached_value(env, [1.0, 2.0])
+
+    self.assertTrue(cached_response.HasField('value_ref'))
+    self.assertNotEqual(cached_response.value_ref.id, response.value_ref.id)
+    np.testing.assert_array_equal(
+        env.get_value(cached_response.value_ref.id), [1.0, 2.0])
+
+  def test_create_value_with_unknown_digest_returns_no_value_ref(self):
+    env = self._create_env()
+    self._create_value(env, [1.0, 2.0])
+
+    response = self._create_cached_value(env, [3.0, 4.0])
+
+    self.assertFalse(response.HasField('value_ref'))
+
+  def test_cached_value_is_available_after_dispose(self):
+    env = self._create_env()
+    response = self._create_value(env, [1.0, 2.0])
+    env.stub.Dispose(
+        executor_pb2.DisposeRequest(
+            executor=env.executor_pb, value_ref=[response.value_ref]))
+
+    cached_response = self._create_cached_value(env, [1.0, 2.0])
+
+    np.testing.assert_array_equal(
+        env.get_value(cached_response.value_ref.id), [1.0, 2.0])
+
+  def test_create_value_raises_on_mismatched_digest(self):
+    env = self._create_env()
+
+    with self.assertRaises(grpc.RpcError) as rpc_err:
+      self._create_value(env, [1.0, 2.0], value_digest=b'digest')
+
+    self.assertEqual(rpc_err.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+  def test_cache_evicts_least_recently_used_values(self):
+    value_proto, _ = value_serialization.serialize_value(
+        [1.0] * 10, computation_types.TensorType(tf.float32, [10]))
+    # Only two of the values fit in the cache.
+    env = self._create_env(
+        value_cache_size_bytes=int(2.5 * value_proto.ByteSize()))
+    self._create_value(env, [1.0] * 10)
+    self._create_value(env, [2.0] * 10)
+    self._create_cached_value(env, [1.0] * 10)
+
+    self._create_value(env, [3.0] * 10)
+
+    self.assertTrue(
+        self._create_cached_value(env, [1.0] * 10).HasField('value_ref'))
+    self.assertFalse(
+        self._create_cached_value(env, [2.0] * 10).HasField('value_ref'))
+    self.assertTrue(
+        self._create_cached_value(env, [3.0] * 10).HasField('value_ref'))
+
+  def test_execute_plan_creates_cached_value(self):
+    env = self._create_env()
+    value_proto, _ = value_serialization.serialize_value(
+        [1.0, 2.0], computation_types.TensorType(tf.float32, [2]))
+    self._create_value(env, [1.0, 2.0])
+    operation = executor_pb2.ExecutePlanRequest.Operation(
+        create_value=executor_pb2.CreateValueRequest(
+            value_digest=_value_digest(value_proto)),
+        result_ref=executor_pb2.ValueRef(id='value'))
+
+    env.stub.ExecutePlan(
+        executor_pb2.ExecutePlanRequest(
+            executor=env.executor_pb, operation=[operation]))
+
+    np.testing.assert_array_equal(env.get_value('value'), [1.0, 2.0])
+
+  def test_create_value_stream_with_digest_caches_value(self):
+    env = self._create_env()
+    x = np.arange(100, dtype=np.float32)
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        x, computation_types.TensorType(tf.float32, [100]), chunk_size_bytes=64)
+    chunks = list(chunks)
+    value_digest = _value_digest(*chunks)
+    requests = [
+        executor_pb2.CreateValueStreamRequest(
+            executor=env.executor_pb,
+            chunk=chunks[0],
+            value_digest=value_digest)
+    ] + [executor_pb2.CreateValueStreamRequest(chunk=c) for c in chunks[1:]]
+    env.stub.CreateValueStream(iter(requests))
+
+    response = env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(
+            executor=env.executor_pb, value_digest=value_digest))
+
+    np.testing.assert_array_equal(env.get_value(response.value_ref.id), x)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -19,7 +19,7 @@
 """Utility functions for writing executors."""
 
 import asyncio
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import tensorflow as tf
 
@@ -80,6 +80,93 @@ async def delegate_entirely_to_executor(arg, arg_type, executor):
     return arg
 
 
+async def move_value(
+    value: executor_value_base.ExecutorValue, source: executor_base.Executor,
+    target: executor_base.Executor) -> executor_value_base.ExecutorValue:
+  """Moves `value` embedded in the `source` executor into `target`.
+
+  Args:
+    value: An instance of `executor_value_base.ExecutorValue` embedded in
+      `source`.
+    source: The executor in which `value` is embedded.
+    target: The executor to move `value` into.
+
+  Returns:
+    An instance of `executor_value_base.ExecutorValue` embedded in `target`. If
+    `source` and `target` are the same executor, this is `value` itself, and the
+    value is not computed.
+  """
+  if source is target:
+    return value
+  return await target.create_value(await value.compute(), value.type_signature)
+
+
+async def tree_reduce(
+    values: Sequence[Tuple[executor_base.Executor,
+                           executor_value_base.ExecutorValue]],
+    merge: pb.Computation,
+    merge_type: computation_types.FunctionType,
+    arity: int,
+) -> Tuple[executor_base.Executor, executor_value_base.ExecutorValue]:
+  """Reduces `values` with the binary operator `merge` in a tree.
+
+  The values are reduced in levels. At each level, the values are split into
+  groups of up to `arity` values, and the values of each group are merged in
+  the executor of the first value of the group, with the groups being merged
+  concurrently. The values are first ordered so that values embedded in the
+  same executor are adjacent; values embedded in the executor in which they are
+  merged are not moved.
+
+  Since the values are reordered, `merge` must be associative and commutative.
+
+  Args:
+    values: A non-empty sequence of `(executor, value)` tuples, where `value`
+      is an instance of `executor_value_base.ExecutorValue` embedded in
+      `executor`.
+    merge: An instance of `pb.Computation`, a binary operator on the values.
+    merge_type: The type of `merge`.
+    arity: The maximum number of values to merge into each value of the next
+      level, an integer greater than 1.
+
+  Returns:
+    A tuple of the executor in which the result is embedded, and the result.
+
+  Raises:
+    ValueError: If `values` is empty, or `arity` is less than 2.
+  """
+  if not values:
+    raise ValueError('Expected at least one value to reduce.')
+  if arity < 2:
+    raise ValueError(f'Expected an arity greater than 1, found {arity}.')
+  executor_order = {}
+  for executor, _ in values:
+    executor_order.setdefault(id(executor), len(executor_order))
+  values = sorted(values, key=lambda x: executor_order[id(x[0])])
+  merge_fns: Dict[int, asyncio.Future] = {}
+
+  async def _merge_group(group):
+    executor, result = group[0]
+    if id(executor) not in merge_fns:
+      merge_fns[id(executor)] = asyncio.ensure_future(
+          executor.create_value(merge, merge_type))
+    merge_fn, others = await asyncio.gather(
+        merge_fns[id(executor)],
+        asyncio.gather(*[
+            move_value(value, source, executor) for source, value in group[1:]
+        ]))
+    for other in others:
+      merge_arg = await executor.create_struct(
+          structure.Struct([(None, result), (None, other)]))
+      result = await executor.create_call(merge_fn, merge_arg)
+    return executor, result
+
+  while len(values) > 1:
+    values = await asyncio.gather(*[
+        _merge_group(values[i:i + arity]) for i in range(0, len(values), arity)
+    ])
+  return values[0]
+
+
 def parse_federated_aggregate_argument_types(type_spec):
   """Verifies and parses `type_spec` into constituents.
 
@@ -19,6 +19,7 @@ from absl.testing import parameterized
 import tensorflow as tf
 
 from tensorflow_federated.python.core.impl.compiler import building_block_factory
+from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_factory
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
 from tensorflow_federated.python.core.impl.executors import executor_utils
@@ -275,6 +276,77 @@ class ComputeIntrinsicFederatedWeightedMeanTest(
           executor, arg)
 
 
+class MoveValueTest(unittest.IsolatedAsyncioTestCase):
+
+  async def test_returns_value_with_same_executor(self):
+    executor = eager_tf_executor.EagerTFExecutor()
+    value = await executor.create_value(10, tf.int32)
+
+    result = await executor_utils.move_value(value, executor, executor)
+
+    self.assertIs(result, value)
+
+  async def test_returns_value_in_target_executor(self):
+    source = eager_tf_executor.EagerTFExecutor()
+    target = eager_tf_executor.EagerTFExecutor()
+    value = await source.create_value(10, tf.int32)
+
+    result = await executor_utils.move_value(value, source, target)
+
+    self.assertIsNot(result, value)
+    self.assertEqual(result.type_signature, value.type_signature)
+    self.assertEqual(await result.compute(), 10)
+
+
+class TreeReduceTest(unittest.IsolatedAsyncioTestCase, parameterized.TestCase):
+
+  async def _create_values(self, num_values, num_executors):
+    executors = [
+        eager_tf_executor.EagerTFExecutor() for _ in range(num_executors)
+    ]
+    values = []
+    for i in range(num_values):
+      executor = executors[i % num_executors]
+      values.append((executor, await executor.create_value(i, tf.int32)))
+    return values
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('one_value', 1, 1, 2),
+      ('arity_2', 7, 7, 2),
+      ('arity_3', 7, 7, 3),
+      ('arity_larger_than_values', 7, 7, 10),
+      ('shared_executors', 7, 3, 2),
+      ('one_executor', 7, 1, 2),
+  )
+  # pyformat: enable
+  async def test_reduces_values(self, num_values, num_executors, arity):
+    values = await self._create_values(num_values, num_executors)
+    merge, merge_type = tensorflow_computation_factory.create_binary_operator(
+        tf.add, computation_types.TensorType(tf.int32))
+
+    executor, result = await executor_utils.tree_reduce(
+        values, merge, merge_type, arity)
+
+    self.assertIn(executor, [e for e, _ in values])
+    self.assertEqual(await result.compute(), sum(range(num_values)))
+
+  async def test_raises_value_error_with_no_values(self):
+    merge, merge_type = tensorflow_computation_factory.create_binary_operator(
+        tf.add, computation_types.TensorType(tf.int32))
+
+    with self.assertRaises(ValueError):
+      await executor_utils.tree_reduce([], merge, merge_type, 2)
+
+  async def test_raises_value_error_with_arity_less_than_two(self):
+    values = await self._create_values(num_values=2, num_executors=1)
+    merge, merge_type = tensorflow_computation_factory.create_binary_operator(
+        tf.add, computation_types.TensorType(tf.int32))
+
+    with self.assertRaises(ValueError):
+      await executor_utils.tree_reduce(values, merge, merge_type, 1)
+
+
 class TypeUtilsTest(parameterized.TestCase):
 
   # pyformat: disable
@@ -49,7 +49,7 @@
 """
 
 import asyncio
-from typing import Any, List
+from typing import Any, List, Optional
 
 import tensorflow as tf
 
@@ -148,6 +148,11 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
 
   * `tff.SERVER`
   * `tff.CLIENTS`
+
+  By default, the results of `tff.federated_aggregate` in the child executors
+  are merged at the parent one at a time, in the order in which they complete.
+  If a `reduction_arity` is given, they are instead merged in a tree of that
+  arity, with the merges at each level issued concurrently.
   """
 
   @classmethod
@@ -156,13 +161,15 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
               target_executors: List[executor_base.Executor],
               local_computation_factory: local_computation_factory_base
               .LocalComputationFactory = tensorflow_computation_factory
-              .TensorFlowComputationFactory()):
+              .TensorFlowComputationFactory(),
+              reduction_arity: Optional[int] = None):
     # pylint:disable=g-long-lambda
     return lambda executor: cls(
         executor,
         server_executor,
         target_executors,
-        local_computation_factory=local_computation_factory)
+        local_computation_factory=local_computation_factory,
+        reduction_arity=reduction_arity)
     # pylint:enable=g-long-lambda
 
   def __init__(self,
@@ -171,7 +178,8 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
                target_executors: List[executor_base.Executor],
                local_computation_factory: local_computation_factory_base
                .LocalComputationFactory = tensorflow_computation_factory
-               .TensorFlowComputationFactory()):
+               .TensorFlowComputationFactory(),
+               reduction_arity: Optional[int] = None):
     """Creates a `FederatedComposingStrategy`.
 
     Args:
@@ -186,10 +194,15 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
         to construct local computations used as parameters in certain federated
         operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
         computation factory that generates TensorFlow code.
+      reduction_arity: An optional integer greater than 1, the arity of the
+        tree in which the results of the child executors are merged by
+        `tff.federated_aggregate`. If `None`, the default, the results are
+        merged one at a time.
 
     Raises:
       TypeError: If `server_executor` is not an `executor_base.Executor` or if
         `target_executors` is not a `list` of `executor_base.Executor`s.
+      ValueError: If `reduction_arity` is less than 2.
     """
     super().__init__(executor)
     py_typecheck.check_type(server_executor, executor_base.Executor)
@@ -197,6 +210,12 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
     py_typecheck.check_type(
         local_computation_factory,
         local_computation_factory_base.LocalComputationFactory)
+    if reduction_arity is not None:
+      py_typecheck.check_type(reduction_arity, int)
+      if reduction_arity < 2:
+        raise ValueError('Expected `reduction_arity` to be greater than 1, '
+                         f'found {reduction_arity}.')
+    self._reduction_arity = reduction_arity
     self._local_computation_factory = local_computation_factory
     for e in target_executors:
       py_typecheck.check_type(e, executor_base.Executor)
@@ -346,7 +365,13 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
         self._server_executor.create_value(merge, merge_type),
         self._server_executor.create_value(report, report_type))
 
-    if self._target_executors:
+    if self._target_executors and self._reduction_arity is not None:
+      child_results = await asyncio.gather(
+          *[_child_fn(c, v) for c, v in zip(self._target_executors, val)])
+      _, merge_result = await executor_utils.tree_reduce(
+          [(self._server_executor, r) for r in child_results], merge,
+          merge_type, self._reduction_arity)
+    elif self._target_executors:
       val_futures = asyncio.as_completed(
           [_child_fn(c, v) for c, v in zip(self._target_executors, val)])
       merge_result = await next(val_futures)
@@ -41,27 +41,35 @@ def _create_bottom_stack():
   return reference_resolving_executor.ReferenceResolvingExecutor(executor)
 
 
-def _create_worker_stack():
-  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory({
-      placements.SERVER: _create_bottom_stack(),
-      placements.CLIENTS: [_create_bottom_stack() for _ in range(2)],
-  })
+def _create_worker_stack(reduction_arity=None):
+  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+      {
+          placements.SERVER: _create_bottom_stack(),
+          placements.CLIENTS: [_create_bottom_stack() for _ in range(2)],
+      },
+      reduction_arity=reduction_arity)
   return federating_executor.FederatingExecutor(factory, _create_bottom_stack())
 
 
-def _create_middle_stack(children):
+def _create_middle_stack(children, reduction_arity=None):
   factory = federated_composing_strategy.FederatedComposingStrategy.factory(
-      _create_bottom_stack(), children)
+      _create_bottom_stack(), children, reduction_arity=reduction_arity)
   executor = federating_executor.FederatingExecutor(factory,
                                                     _create_bottom_stack())
   return reference_resolving_executor.ReferenceResolvingExecutor(executor)
 
 
-def _create_test_executor():
+def _create_test_executor(reduction_arity=None):
+
+  def _create_middle_stack_of_workers():
+    return _create_middle_stack(
+        [_create_worker_stack(reduction_arity) for _ in range(3)],
+        reduction_arity)
+
   executor = _create_middle_stack([
-      _create_middle_stack([_create_worker_stack() for _ in range(3)]),
-      _create_middle_stack([_create_worker_stack() for _ in range(3)]),
-  ])
+      _create_middle_stack_of_workers(),
+      _create_middle_stack_of_workers(),
+  ], reduction_arity)
   # 2 clients per worker stack * 3 worker stacks * 2 middle stacks
   num_clients = 12
   return executor, num_clients
@@ -233,6 +241,51 @@ class FederatedComposingStrategyTest(parameterized.TestCase):
     ])
     self.assertEqual(result, expected_result)
 
+  @parameterized.named_parameters(
+      ('arity_2', 2),
+      ('arity_3', 3),
+  )
+  def test_federated_aggregate_with_reduction_arity(self, reduction_arity):
+
+    @tensorflow_computation.tf_computation(tf.int32, tf.int32)
+    def add_int(x, y):
+      return x + y
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_five(x):
+      return x + 5
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.int32))
+    def comp(value):
+      return intrinsics.federated_aggregate(value, 0, add_int, add_int,
+                                            add_five)
+
+    executor, num_clients = _create_test_executor(reduction_arity)
+    result = _invoke(executor, comp, list(range(num_clients)))
+    self.assertEqual(result, sum(range(num_clients)) + 5)
+
+  @parameterized.named_parameters(
+      ('arity_2', 2),
+      ('arity_3', 3),
+  )
+  def test_federated_sum_with_reduction_arity(self, reduction_arity):
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.float32))
+    def comp(value):
+      return intrinsics.federated_sum(value)
+
+    executor, num_clients = _create_test_executor(reduction_arity)
+    result = _invoke(executor, comp, [float(x) for x in range(num_clients)])
+    self.assertEqual(result, float(sum(range(num_clients))))
+
+  def test_raises_value_error_with_reduction_arity_less_than_two(self):
+    factory = federated_composing_strategy.FederatedComposingStrategy.factory(
+        _create_bottom_stack(), [_create_worker_stack()], reduction_arity=1)
+    with self.assertRaises(ValueError):
+      federating_executor.FederatingExecutor(factory, _create_bottom_stack())
+
   def test_federated_broadcast(self):
 
     @tensorflow_computation.tf_computation(tf.int32)
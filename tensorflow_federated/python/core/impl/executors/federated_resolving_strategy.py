@@ -47,9 +47,11 @@
 """
 
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from absl import logging
+import cachetools
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -66,8 +68,18 @@ from tensorflow_federated.python.core.impl.executors import federating_executor
 from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 from tensorflow_federated.python.core.impl.types import type_analysis
+from tensorflow_federated.python.core.impl.types import type_conversions
 from tensorflow_federated.python.core.impl.types import type_transformations
 
+# The number of vectorized computations cached by each strategy.
+_VECTORIZED_COMPUTATION_CACHE_SIZE = 100
+# The number of distinct types of broadcast values kept resident in the client
+# executors by each strategy, when broadcasting deltas.
+_DELTA_BROADCAST_CACHE_SIZE = 10
+# The largest fraction of the rows of a tensor which may change for the tensor
+# to be updated by sending only the changed rows, when broadcasting deltas.
+_MAX_ROW_UPDATE_FRACTION = 0.5
+
 
 class FederatedResolvingStrategyValue(executor_value_base.ExecutorValue):
   """A value embedded in a `FederatedExecutor`."""
@@ -128,6 +140,83 @@ class FederatedResolvingStrategyValue(executor_value_base.ExecutorValue):
                                   py_typecheck.type_string(type(self._value))))
 
 
+def _is_vectorizable(fn: pb.Computation,
+                     fn_type: computation_types.FunctionType) -> bool:
+  """Returns whether `fn` can be mapped with a vectorized computation."""
+  return (fn.WhichOneof('computation') == 'tensorflow' and
+          not fn.tensorflow.initialize_op and fn_type.parameter is not None and
+          type_analysis.is_generic_op_compatible_type(fn_type.parameter) and
+          not type_analysis.contains(
+              fn_type.parameter,
+              lambda t: t.is_tensor() and not t.shape.is_fully_defined()) and
+          type_analysis.is_generic_op_compatible_type(fn_type.result))
+
+
+def _is_batched_selectable(
+    select_fn: pb.Computation,
+    select_fn_type: computation_types.FunctionType) -> bool:
+  """Returns whether `select_fn` can be invoked on a batch of keys at once."""
+  return (select_fn.WhichOneof('computation') == 'tensorflow' and
+          not select_fn.tensorflow.initialize_op and
+          type_analysis.is_generic_op_compatible_type(
+              select_fn_type.parameter[0]) and
+          type_analysis.is_generic_op_compatible_type(select_fn_type.result) and
+          not type_analysis.contains(
+              select_fn_type.result,
+              lambda t: t.is_tensor() and not t.shape.is_fully_defined()))
+
+
+def _map_tensors(fn: Callable[[Any], Any], value: Any) -> Any:
+  """Applies `fn` to the tensors of `value`, a tensor or a `Struct` of them."""
+  if isinstance(value, structure.Struct):
+    return structure.map_structure(fn, value)
+  return fn(value)
+
+
+def _flatten_tensors(value: Any,
+                     type_spec: computation_types.Type) -> List[np.ndarray]:
+  """Returns the leaves of `value`, a value of tensors of type `type_spec`."""
+  if type_spec.is_tensor():
+    return [np.asarray(value, dtype=type_spec.dtype.as_numpy_dtype)]
+  if not isinstance(value, structure.Struct):
+    value = structure.from_container(value)
+  if len(value) != len(type_spec):
+    raise TypeError(f'Expected a value of type {type_spec}, found {value}.')
+  leaves = []
+  for element, element_type in zip(value, type_spec):
+    leaves.extend(_flatten_tensors(element, element_type))
+  return leaves
+
+
+def _changed_rows(old: np.ndarray, new: np.ndarray) -> Optional[np.ndarray]:
+  """Returns the indices of the rows in which `new` differs from `old`.
+
+  Rows are compared bitwise, so that e.g. `NaN`s are equal to themselves.
+
+  Args:
+    old: An array.
+    new: An array of the same shape and dtype as `old`.
+
+  Returns:
+    An array of row indices, or `None` if the rows of `old` and `new` can not
+    be compared, e.g. for scalars or strings.
+  """
+  if new.ndim < 1 or new.dtype == object:
+    return None
+  if new.size == 0:
+    return np.zeros([0], np.int32)
+  num_rows = new.shape[0]
+  old_rows = np.ascontiguousarray(old).reshape(num_rows, -1).view(np.uint8)
+  new_rows = np.ascontiguousarray(new).reshape(num_rows, -1).view(np.uint8)
+  return np.flatnonzero(np.any(old_rows != new_rows, axis=1)).astype(np.int32)
+
+
+def _leaves_equal(old: np.ndarray, new: np.ndarray) -> bool:
+  if new.dtype == object:
+    return np.array_equal(old, new)
+  return old.tobytes() == new.tobytes()
+
+
 class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
   """A strategy for resolving federated types and intrinsics.
 
@@ -143,6 +232,31 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
 
   Note that this strategy does not have a built-in concept of intermediate
   aggregation, partitioning placements, clustering clients, etc.
+
+  By default, values are aggregated by moving every client value to the server,
+  and folding them into the result one at a time. If a `reduction_arity` is
+  given, `tff.federated_aggregate` and `tff.federated_sum` instead accumulate
+  each client value in its client executor, and merge the results in a tree of
+  that arity, with the merges at each level running concurrently in the client
+  executors. Values of clients sharing an executor are merged in that executor
+  without being moved.
+
+  By default, `tff.federated_map` invokes the mapped function once for each
+  client. If `vectorize_client_map` is `True`, the values of the clients sharing
+  an executor are instead stacked and mapped with a single call to a vectorized
+  TensorFlow computation in that executor, and the results are split back per
+  client. Only TensorFlow computations whose parameters contain only tensors
+  with fully defined shapes, and whose results contain only tensors, are
+  vectorized; other functions are mapped once for each client.
+
+  By default, every value broadcast to the clients (e.g. by
+  `tff.federated_broadcast`) is sent in full to every client executor. If
+  `delta_broadcast` is `True`, the last broadcast value of each type is kept
+  resident in the client executors, and a value of the same type is broadcast
+  by sending only the tensors which changed. Tensors in which few rows changed,
+  such as embeddings updated for a small fraction of the vocabulary, are
+  updated in the client executors by sending only the changed rows. Only
+  values containing only tensors are broadcast as deltas.
   """
 
   @classmethod
@@ -150,12 +264,18 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
               target_executors: Dict[str, executor_base.Executor],
               local_computation_factory: local_computation_factory_base
               .LocalComputationFactory = tensorflow_computation_factory
-              .TensorFlowComputationFactory()):
+              .TensorFlowComputationFactory(),
+              reduction_arity: Optional[int] = None,
+              vectorize_client_map: bool = False,
+              delta_broadcast: bool = False):
     # pylint:disable=g-long-lambda
     return lambda executor: cls(
         executor,
         target_executors,
-        local_computation_factory=local_computation_factory)
+        local_computation_factory=local_computation_factory,
+        reduction_arity=reduction_arity,
+        vectorize_client_map=vectorize_client_map,
+        delta_broadcast=delta_broadcast)
     # pylint:enable=g-long-lambda
 
   def __init__(self,
@@ -163,7 +283,10 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
                target_executors: Dict[str, executor_base.Executor],
                local_computation_factory: local_computation_factory_base
                .LocalComputationFactory = tensorflow_computation_factory
-               .TensorFlowComputationFactory()):
+               .TensorFlowComputationFactory(),
+               reduction_arity: Optional[int] = None,
+               vectorize_client_map: bool = False,
+               delta_broadcast: bool = False):
     """Creates a `FederatedResolvingStrategy`.
 
     Args:
@@ -178,6 +301,16 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         to construct local computations used as parameters in certain federated
         operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
         computation factory that generates TensorFlow code.
+      reduction_arity: An optional integer greater than 1, the arity of the
+        tree in which client values are merged by `tff.federated_aggregate` and
+        `tff.federated_sum`. If `None`, the default, client values are folded
+        into the result one at a time at the server.
+      vectorize_client_map: A boolean indicating whether `tff.federated_map`
+        should map the values of the clients sharing an executor with a single
+        vectorized call, rather than with one call for each client.
+      delta_broadcast: A boolean indicating whether values broadcast to the
+        clients should be sent as deltas to the last broadcast value of the
+        same type, kept resident in the client executors, rather than in full.
 
     Raises:
       TypeError: If `target_executors` is not a `dict`, where each key is a
@@ -185,13 +318,31 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         `executor_base.Executor` or a list of `executor_base.Executor`s.
       ValueError: If `target_executors` contains a
         `placements.PlacementLiteral` key that is not a kind supported
-        by the `FederatedResolvingStrategy`.
+        by the `FederatedResolvingStrategy`, or if `reduction_arity` is less
+        than 2.
     """
     super().__init__(executor)
     py_typecheck.check_type(target_executors, dict)
     py_typecheck.check_type(
         local_computation_factory,
         local_computation_factory_base.LocalComputationFactory)
+    if reduction_arity is not None:
+      py_typecheck.check_type(reduction_arity, int)
+      if reduction_arity < 2:
+        raise ValueError('Expected `reduction_arity` to be greater than 1, '
+                         f'found {reduction_arity}.')
+    self._reduction_arity = reduction_arity
+    py_typecheck.check_type(vectorize_client_map, bool)
+    self._vectorize_client_map = vectorize_client_map
+    self._vectorized_computation_cache = cachetools.LRUCache(
+        _VECTORIZED_COMPUTATION_CACHE_SIZE)
+    py_typecheck.check_type(delta_broadcast, bool)
+    self._delta_broadcast = delta_broadcast
+    # Maps the string representation of the type of each resident broadcast
+    # value to a tuple of its leaves, and of a dict mapping the id of each
+    # client executor to the values of the leaves embedded in that executor.
+    self._resident_broadcasts = cachetools.LRUCache(_DELTA_BROADCAST_CACHE_SIZE)
+    self._row_update_operators = {}
     self._target_executors = {}
     self._local_computation_factory = local_computation_factory
     for k, v in target_executors.items():
@@ -283,6 +434,12 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     children = self._target_executors[type_signature.placement]
     self._check_value_compatible_with_placement(value, type_signature.placement,
                                                 type_signature.all_equal)
+    if (self._delta_broadcast and type_signature.all_equal and
+        type_signature.placement is placements.CLIENTS and
+        type_analysis.is_generic_op_compatible_type(type_signature.member)):
+      result = await self._broadcast_delta(value, type_signature.member,
+                                           children)
+      return FederatedResolvingStrategyValue(result, type_signature)
     if type_signature.all_equal:
       value = [value for _ in children]
     result = await asyncio.gather(*[
@@ -291,6 +448,82 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     ])
     return FederatedResolvingStrategyValue(result, type_signature)
 
+  async def _embed_leaf(self, child, old_value, old_leaf, new_leaf, leaf_type):
+    """Embeds `new_leaf` in `child`, as an update of `old_value` if possible."""
+    if old_value is None or old_leaf.shape != new_leaf.shape:
+      return await child.create_value(new_leaf, leaf_type)
+    if _leaves_equal(old_leaf, new_leaf):
+      return old_value
+    rows = _changed_rows(old_leaf, new_leaf)
+    if (rows is None or
+        rows.size > _MAX_ROW_UPDATE_FRACTION * new_leaf.shape[0]):
+      return await child.create_value(new_leaf, leaf_type)
+    operand_type = old_value.type_signature
+    key = str(operand_type)
+    if key not in self._row_update_operators:
+      self._row_update_operators[key] = (
+          tensorflow_computation_factory.create_row_update_operator(
+              operand_type))
+    update_fn, update_fn_type = self._row_update_operators[key]
+    _, indices_type, rows_type = update_fn_type.parameter
+    update_fn_at_child, indices_at_child, rows_at_child = await asyncio.gather(
+        child.create_value(update_fn, update_fn_type),
+        child.create_value(rows, indices_type),
+        child.create_value(new_leaf[rows], rows_type))
+    update_arg = await child.create_struct(
+        structure.Struct([(None, old_value), (None, indices_at_child),
+                          (None, rows_at_child)]))
+    return await child.create_call(update_fn_at_child, update_arg)
+
+  async def _pack_leaves(self, child, leaf_values, type_spec):
+    """Packs `leaf_values` embedded in `child` into a value of `type_spec`."""
+    if type_spec.is_tensor():
+      return leaf_values.pop(0)
+    elements = []
+    for name, element_type in structure.iter_elements(type_spec):
+      elements.append((name, await self._pack_leaves(child, leaf_values,
+                                                     element_type)))
+    return await child.create_struct(structure.Struct(elements))
+
+  @tracing.trace
+  async def _broadcast_delta(self, value, type_spec, children):
+    """Embeds `value` in `children` as a delta to the resident broadcast."""
+    leaves = _flatten_tensors(value, type_spec)
+    leaf_types = structure.flatten(type_spec)
+    key = str(type_spec)
+    old_leaves, old_values_by_child = self._resident_broadcasts.get(
+        key, (None, {}))
+    unique_children = {id(child): child for child in children}
+
+    async def _embed(child):
+      old_values = old_values_by_child.get(id(child))
+      if old_values is None:
+        leaf_values = await asyncio.gather(*[
+            child.create_value(leaf, leaf_type)
+            for leaf, leaf_type in zip(leaves, leaf_types)
+        ])
+      else:
+        leaf_values = await asyncio.gather(*[
+            self._embed_leaf(child, old_value, old_leaf, leaf, leaf_type)
+            for old_value, old_leaf, leaf, leaf_type in zip(
+                old_values, old_leaves, leaves, leaf_types)
+        ])
+      value_at_child = await self._pack_leaves(child, list(leaf_values),
+                                               type_spec)
+      return leaf_values, value_at_child
+
+    results = await asyncio.gather(
+        *[_embed(child) for child in unique_children.values()])
+    self._resident_broadcasts[key] = (leaves, {
+        child_id: leaf_values
+        for child_id, (leaf_values, _) in zip(unique_children, results)
+    })
+    values_by_child = {
+        child_id: value_at_child
+        for child_id, (_, value_at_child) in zip(unique_children, results)
+    }
+    return [values_by_child[id(child)] for child in children]
+
   @tracing.trace
   async def _eval(self, arg, placement, all_equal):
     py_typecheck.check_type(arg.type_signature, computation_types.FunctionType)
@@ -337,15 +570,66 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
       fn_at_child = await child.create_value(fn, fn_type)
       return await child.create_call(fn_at_child, value)
 
-    results = await asyncio.gather(*[
-        _map_child(fn, fn_type, value, child)
-        for (value, child) in zip(val, children)
-    ])
+    if (self._vectorize_client_map and
+        val_type.placement is placements.CLIENTS and
+        _is_vectorizable(fn, fn_type)):
+      results = await self._vectorized_map(fn, fn_type, val, children)
+    else:
+      results = await asyncio.gather(*[
+          _map_child(fn, fn_type, value, child)
+          for (value, child) in zip(val, children)
+      ])
     return FederatedResolvingStrategyValue(
         results,
         computation_types.FederatedType(
             fn_type.result, val_type.placement, all_equal=all_equal))
 
+  def _get_vectorized_computation(
+      self, fn: pb.Computation,
+      count: int) -> tensorflow_computation_factory.ComputationProtoAndType:
+    """Returns `fn` vectorized over `count` inputs, constructing it once."""
+    if fn.tensorflow.cache_key.id:
+      key = (fn.tensorflow.cache_key.id, count)
+    else:
+      key = (fn.SerializeToString(deterministic=True), count)
+    vectorized_fn = self._vectorized_computation_cache.get(key)
+    if vectorized_fn is None:
+      vectorized_fn = tensorflow_computation_factory.create_vectorized_computation(
+          fn, count)
+      self._vectorized_computation_cache[key] = vectorized_fn
+    return vectorized_fn
+
+  async def _vectorized_map(self, fn, fn_type, values, children):
+    """Maps `fn` on `values` with one vectorized call per child executor."""
+    # Executors are grouped by identity, preserving the order of the clients.
+    indices_by_child = {}
+    for index, child in enumerate(children):
+      indices_by_child.setdefault(id(child), (child, []))[1].append(index)
+
+    async def _map_group(child, indices):
+      if len(indices) == 1:
+        fn_at_child = await child.create_value(fn, fn_type)
+        return [await child.create_call(fn_at_child, values[indices[0]])]
+      vectorized_fn, vectorized_fn_type = self._get_vectorized_computation(
+          fn, len(indices))
+      fn_at_child, arg_at_child = await asyncio.gather(
+          child.create_value(vectorized_fn, vectorized_fn_type),
+          child.create_struct([values[i] for i in indices]))
+      result_at_child = await child.create_call(fn_at_child, arg_at_child)
+      return await asyncio.gather(*[
+          child.create_selection(result_at_child, i)
+          for i in range(len(indices))
+      ])
+
+    groups = list(indices_by_child.values())
+    group_results = await asyncio.gather(
+        *[_map_group(child, indices) for child, indices in groups])
+    results = [None] * len(children)
+    for (_, indices), group_result in zip(groups, group_results):
+      for index, result in zip(indices, group_result):
+        results[index] = result
+    return results
+
   async def _zip_struct_into_child(self, child, child_index, value, value_type):
     """Embeds `value` elements at `child_index` into `child`."""
     if value_type.is_federated():
@@ -395,21 +679,23 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     val_type, zero_type, accumulate_type, merge_type, report_type = (
         executor_utils.parse_federated_aggregate_argument_types(
             arg.type_signature))
-    del val_type, merge_type
+    del val_type
     py_typecheck.check_type(arg.internal_representation, structure.Struct)
     py_typecheck.check_len(arg.internal_representation, 5)
     val, zero, accumulate, merge, report = arg.internal_representation
 
-    # Discard `merge`. Since all aggregation happens on a single executor,
-    # there's no need for this additional layer.
-    del merge
-
     # Re-wrap `zero` in a `FederatingResolvingStrategyValue` to ensure that it
     # is an `ExecutorValue` rather than a `Struct` (since the internal
     # representation can include embedded values, lists of embedded values
     # (in the case of federated values), or `Struct`s.
     zero = FederatedResolvingStrategyValue(zero, zero_type)
-    pre_report = await self.reduce(val, zero, accumulate, accumulate_type)
+    if self._reduction_arity is not None:
+      pre_report = await self._tree_reduce(val, zero, merge, merge_type,
+                                           accumulate, accumulate_type)
+    else:
+      # Discard `merge`. Since all aggregation happens on a single executor,
+      # there's no need for this additional layer.
+      pre_report = await self.reduce(val, zero, accumulate, accumulate_type)
 
     py_typecheck.check_type(pre_report.type_signature,
                             computation_types.FederatedType)
@@ -520,6 +806,71 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
                                                placements.SERVER,
                                                all_equal=True))
 
+  @tracing.trace
+  async def _tree_reduce(
+      self,
+      val: List[executor_value_base.ExecutorValue],
+      zero: executor_value_base.ExecutorValue,
+      merge: pb.Computation,
+      merge_type: computation_types.FunctionType,
+      accumulate: Optional[pb.Computation] = None,
+      accumulate_type: Optional[computation_types.FunctionType] = None,
+  ) -> FederatedResolvingStrategyValue:
+    """Reduces the client values `val` in a tree of `self._reduction_arity`.
+
+    Args:
+      val: A list of values embedded in the client executors.
+      zero: The value with which to reduce an empty `val`, and to accumulate
+        each of the values of `val` into if `accumulate` is given.
+      merge: A binary operator merging accumulated values.
+      merge_type: The type of `merge`.
+      accumulate: An optional operator accumulating a value of `val` into
+        `zero`. If `None`, the values of `val` are merged directly.
+      accumulate_type: The type of `accumulate`.
+
+    Returns:
+      The result of the reduction, embedded in the server executor.
+    """
+    server = self._target_executors[placements.SERVER][0]
+    if not val:
+      result = await server.create_value(await zero.compute(),
+                                         zero.type_signature)
+      return FederatedResolvingStrategyValue([result],
+                                             computation_types.at_server(
+                                                 result.type_signature))
+    clients = self._target_executors[placements.CLIENTS]
+    values = list(zip(clients, val))
+
+    if accumulate is not None:
+      zero_value = await zero.compute()
+      accumulate_fns = {}
+
+      async def _embed_accumulate(child):
+        return await asyncio.gather(
+            child.create_value(zero_value, zero.type_signature),
+            child.create_value(accumulate, accumulate_type))
+
+      async def _accumulate(child, value):
+        if id(child) not in accumulate_fns:
+          accumulate_fns[id(child)] = asyncio.ensure_future(
+              _embed_accumulate(child))
+        zero_at_child, accumulate_at_child = await accumulate_fns[id(child)]
+        accumulate_arg = await child.create_struct(
+            structure.Struct([(None, zero_at_child), (None, value)]))
+        return child, await child.create_call(accumulate_at_child,
+                                              accumulate_arg)
+
+      values = await asyncio.gather(
+          *[_accumulate(child, value) for child, value in values])
+
+    executor, result = await executor_utils.tree_reduce(values, merge,
+                                                        merge_type,
+                                                        self._reduction_arity)
+    result = await executor_utils.move_value(result, executor, server)
+    return FederatedResolvingStrategyValue([result],
+                                           computation_types.at_server(
+                                               result.type_signature))
+
   @tracing.trace
   async def compute_federated_secure_sum_bitwidth(
       self,
@@ -559,49 +910,98 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     py_typecheck.check_type(server_val_at_server,
                             executor_value_base.ExecutorValue)
     py_typecheck.check_type(select_fn, pb.Computation)
-    server = self._target_executors[placements.SERVER][0]
     clients = self._target_executors[placements.CLIENTS]
-    single_key_type = computation_types.TensorType(tf.int32)
     client_keys_type.member.check_tensor()
     if (client_keys_type.member.dtype != tf.int32 or
         client_keys_type.member.shape.rank != 1):
       raise TypeError(f'Unexpected `client_keys_type`: {client_keys_type}')
-    num_keys_per_client: int = client_keys_type.member.shape.dims[0].value
     unplaced_result_type = computation_types.SequenceType(select_fn_type.result)
+
+    # Each key requested by any client is selected once, and the selected
+    # values are shared by all the clients requesting the key.
+    keys = [
+        np.asarray(k, dtype=np.int32) for k in await asyncio.gather(
+            *[keys_at_client.compute() for keys_at_client in client_keys])
+    ]
+    unique_keys = np.unique(np.concatenate(keys)) if keys else np.zeros(
+        [0], np.int32)
+    if unique_keys.size and _is_batched_selectable(select_fn, select_fn_type):
+      selected = await self._select_batched(server_val_at_server, select_fn,
+                                            unique_keys)
+
+      def _client_value(keys_at_client):
+        client_selected = _map_tensors(
+            lambda x: x[np.searchsorted(unique_keys, keys_at_client)], selected)
+        try:
+          return tf.data.Dataset.from_tensor_slices(
+              type_conversions.type_to_py_container(client_selected,
+                                                    select_fn_type.result))
+        except ValueError:
+          # The result type can not be represented with Python containers, so
+          # the sequence is constructed from its elements by the executor.
+          return [
+              _map_tensors(lambda x: x[i], client_selected)  # pylint: disable=cell-var-from-loop
+              for i in range(len(keys_at_client))
+          ]
+    else:
+      selected = await self._select_each(server_val_at_server, select_fn,
+                                         select_fn_type, unique_keys)
+      selected_by_key = dict(zip(unique_keys.tolist(), selected))
+
+      def _client_value(keys_at_client):
+        return [selected_by_key[k] for k in keys_at_client.tolist()]
+
+    return FederatedResolvingStrategyValue(
+        list(await asyncio.gather(*[
+            client.create_value(_client_value(k), unplaced_result_type)
+            for client, k in zip(clients, keys)
+        ])), computation_types.at_clients(unplaced_result_type))
+
+  async def _select_batched(self, server_val, select_fn, keys):
+    """Selects all the `keys` from `server_val` with a single call."""
+    server = self._target_executors[placements.SERVER][0]
+    batched_fn, batched_fn_type = self._get_batched_select_computation(
+        select_fn)
+    batched_fn_at_server, keys_at_server = await asyncio.gather(
+        server.create_value(batched_fn, batched_fn_type),
+        server.create_value(keys, batched_fn_type.parameter[1]))
+    batched_fn_arg = await server.create_struct(
+        structure.Struct([(None, server_val), (None, keys_at_server)]))
+    selected = await server.create_call(batched_fn_at_server, batched_fn_arg)
+    selected = await selected.compute()
+    return _map_tensors(np.asarray, selected)
+
+  async def _select_each(self, server_val, select_fn, select_fn_type, keys):
+    """Selects each of the `keys` from `server_val` with one call per key."""
+    server = self._target_executors[placements.SERVER][0]
     select_fn_at_server = await server.create_value(select_fn, select_fn_type)
-    index_fn_at_server = await executor_utils.embed_indexing_operator(
-        server, client_keys_type.member, single_key_type)
+    key_type = select_fn_type.parameter[1]
 
-    async def select_single_key(keys_at_server, key_index):
-      # Grab the `key_index`th key from the keys tensor.
-      index_arg = await server.create_struct(
-          structure.Struct([
-              (None, keys_at_server),
-              (None, await server.create_value(key_index, single_key_type)),
-          ]))
-      key_at_server = await server.create_call(index_fn_at_server, index_arg)
+    async def _select_key(key):
       select_fn_arg = await server.create_struct(
           structure.Struct([
-              (None, server_val_at_server),
-              (None, key_at_server),
+              (None, server_val),
+              (None, await server.create_value(key, key_type)),
           ]))
       selected = await server.create_call(select_fn_at_server, select_fn_arg)
       return await selected.compute()
 
-    async def select_single_client(client, keys_at_client):
-      keys_at_server = await server.create_value(await keys_at_client.compute(),
-                                                 client_keys_type.member)
-      unplaced_values = await asyncio.gather(*[
-          select_single_key(keys_at_server, i)
-          for i in range(num_keys_per_client)
-      ])
-      return await client.create_value(unplaced_values, unplaced_result_type)
+    return await asyncio.gather(*[_select_key(key) for key in keys])
 
-    return FederatedResolvingStrategyValue(
-        list(await asyncio.gather(*[
-            select_single_client(client, keys_at_client)
-            for client, keys_at_client in zip(clients, client_keys)
-        ])), computation_types.at_clients(unplaced_result_type))
+  def _get_batched_select_computation(
+      self, select_fn: pb.Computation
+  ) -> tensorflow_computation_factory.ComputationProtoAndType:
+    """Returns `select_fn` batched over keys, constructing it once."""
+    if select_fn.tensorflow.cache_key.id:
+      key = ('select', select_fn.tensorflow.cache_key.id)
+    else:
+      key = ('select', select_fn.SerializeToString(deterministic=True))
+    batched_fn = self._vectorized_computation_cache.get(key)
+    if batched_fn is None:
+      batched_fn = tensorflow_computation_factory.create_batched_select_computation(
+          select_fn)
+      self._vectorized_computation_cache[key] = batched_fn
+    return batched_fn
 
   @tracing.trace
   async def compute_federated_sum(
@@ -618,6 +1018,10 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
             self._executor,
             arg.type_signature.member,
             local_computation_factory=self._local_computation_factory))
+    if self._reduction_arity is not None:
+      return await self._tree_reduce(arg.internal_representation, zero,
+                                     plus.internal_representation,
+                                     plus.type_signature)
     return await self.reduce(arg.internal_representation, zero,
                              plus.internal_representation, plus.type_signature)
 
@@ -15,12 +15,79 @@
 import unittest
 
 from absl.testing import absltest
+from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
+from tensorflow_federated.python.core.impl.executors import federating_executor
+from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
+from tensorflow_federated.python.core.impl.federated_context import federated_computation
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
 from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+
+
+class _RecordingExecutor(eager_tf_executor.EagerTFExecutor):
+  """An executor recording the arrays it is given to embed, and its calls."""
+
+  def __init__(self):
+    super().__init__()
+    self.arrays = []
+    self.num_calls = 0
+
+  async def create_value(self, value, type_spec=None):
+    if isinstance(value, np.ndarray):
+      self.arrays.append(value)
+    return await super().create_value(value, type_spec)
+
+  async def create_call(self, comp, arg=None):
+    self.num_calls += 1
+    return await super().create_call(comp, arg)
+
+
+def _create_bottom_stack(executor=None):
+  if executor is None:
+    executor = eager_tf_executor.EagerTFExecutor()
+  return reference_resolving_executor.ReferenceResolvingExecutor(executor)
+
+
+def _create_test_executor(num_clients,
+                          num_client_executors,
+                          reduction_arity=None,
+                          vectorize_client_map=False,
+                          delta_broadcast=False,
+                          client_executors=None,
+                          server_executor=None):
+  if client_executors is None:
+    client_executors = [
+        _create_bottom_stack() for _ in range(num_client_executors)
+    ]
+  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+      {
+          placements.SERVER:
+              _create_bottom_stack(server_executor),
+          placements.CLIENTS: [
+              client_executors[i % num_client_executors]
+              for i in range(num_clients)
+          ],
+      },
+      reduction_arity=reduction_arity,
+      vectorize_client_map=vectorize_client_map,
+      delta_broadcast=delta_broadcast)
+  executor = federating_executor.FederatingExecutor(factory,
+                                                    _create_bottom_stack())
+  return reference_resolving_executor.ReferenceResolvingExecutor(executor)
+
+
+async def _invoke(executor, comp, arg):
+  fn = await executor.create_value(comp)
+  arg = await executor.create_value(arg, fn.type_signature.parameter)
+  result = await executor.create_call(fn, arg)
+  return await result.compute()
 
 
 class FederatedResolvingStrategyValueComputeTest(
@@ -109,5 +176,298 @@ class FederatedResolvingStrategyValueComputeTest(
       await value.compute()
 
 
+class FederatedResolvingStrategyTreeReductionTest(
+    unittest.IsolatedAsyncioTestCase, parameterized.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('linear', 7, 7, None),
+      ('arity_2', 7, 7, 2),
+      ('arity_3', 7, 7, 3),
+      ('arity_2_shared_executors', 7, 3, 2),
+      ('arity_2_one_client', 1, 1, 2),
+      ('arity_2_no_clients', 0, 1, 2),
+  )
+  # pyformat: enable
+  async def test_federated_aggregate(self, num_clients, num_client_executors,
+                                     reduction_arity):
+
+    @tensorflow_computation.tf_computation(tf.int32, tf.int32)
+    def add_int(x, y):
+      return x + y
+
+    @tensorflow_computation.tf_computation(tf.int32)
+    def add_five(x):
+      return x + 5
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.int32))
+    def comp(value):
+      return intrinsics.federated_aggregate(value, 0, add_int, add_int,
+                                            add_five)
+
+    executor = _create_test_executor(num_clients, num_client_executors,
+                                     reduction_arity)
+
+    result = await _invoke(executor, comp, list(range(num_clients)))
+
+    self.assertEqual(result, sum(range(num_clients)) + 5)
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('linear', 7, 7, None),
+      ('arity_2', 7, 7, 2),
+      ('arity_4', 7, 7, 4),
+      ('arity_2_shared_executors', 7, 3, 2),
+      ('arity_2_no_clients', 0, 1, 2),
+  )
+  # pyformat: enable
+  async def test_federated_sum(self, num_clients, num_client_executors,
+                               reduction_arity):
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.float32))
+    def comp(value):
+      return intrinsics.federated_sum(value)
+
+    executor = _create_test_executor(num_clients, num_client_executors,
+                                     reduction_arity)
+
+    result = await _invoke(executor, comp,
+                           [float(x) for x in range(num_clients)])
+
+    self.assertEqual(result, float(sum(range(num_clients))))
+
+  def test_raises_value_error_with_reduction_arity_less_than_two(self):
+    with self.assertRaises(ValueError):
+      _create_test_executor(
+          num_clients=2, num_client_executors=2, reduction_arity=1)
+
+
+class FederatedResolvingStrategyVectorizedMapTest(
+    unittest.IsolatedAsyncioTestCase, parameterized.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('not_vectorized', 7, 3, False),
+      ('shared_executors', 7, 3, True),
+      ('one_executor', 7, 1, True),
+      ('unshared_executors', 3, 3, True),
+      ('one_client', 1, 1, True),
+  )
+  # pyformat: enable
+  async def test_federated_map(self, num_clients, num_client_executors,
+                               vectorize_client_map):
+
+    @tensorflow_computation.tf_computation(tf.TensorSpec([2], tf.float32))
+    def scale_and_sum(x):
+      return x * 2.0, tf.reduce_sum(x)
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.TensorSpec([2], tf.float32)))
+    def comp(value):
+      return intrinsics.federated_map(scale_and_sum, value)
+
+    executor = _create_test_executor(
+        num_clients,
+        num_client_executors,
+        vectorize_client_map=vectorize_client_map)
+
+    result = await _invoke(executor, comp,
+                           [[float(x), 1.0] for x in range(num_clients)])
+
+    self.assertLen(result, num_clients)
+    for x, (scaled, total) in enumerate(result):
+      self.assertSequenceEqual(list(scaled), [2.0 * x, 2.0])
+      self.assertEqual(total, x + 1.0)
+
+  async def test_federated_map_with_struct_type(self):
+
+    @tensorflow_computation.tf_computation(
+        computation_types.StructType([('a', tf.int32), ('b', tf.int32)]))
+    def add(x):
+      return x.a + x.b
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(
+            computation_types.StructType([('a', tf.int32), ('b', tf.int32)])))
+    def comp(value):
+      return intrinsics.federated_map(add, value)
+
+    executor = _create_test_executor(4, 2, vectorize_client_map=True)
+
+    result = await _invoke(
+        executor, comp,
+        [structure.Struct([('a', x), ('b', 10 * x)]) for x in range(4)])
+
+    self.assertEqual(result, [11 * x for x in range(4)])
+
+  async def test_federated_map_falls_back_with_undefined_shape(self):
+
+    @tensorflow_computation.tf_computation(tf.TensorSpec([None], tf.int32))
+    def total(x):
+      return tf.reduce_sum(x)
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.TensorSpec([None], tf.int32)))
+    def comp(value):
+      return intrinsics.federated_map(total, value)
+
+    executor = _create_test_executor(3, 1, vectorize_client_map=True)
+
+    result = await _invoke(executor, comp, [[1], [1, 2], [1, 2, 3]])
+
+    self.assertEqual(result, [1, 3, 6])
+
+
+_BROADCAST_TYPE = computation_types.StructType([
+    ('embeddings', computation_types.TensorType(tf.float32, [8, 2])),
+    ('step', computation_types.TensorType(tf.int32)),
+    ('name', computation_types.TensorType(tf.string)),
+])
+
+
+def _create_broadcast_computation():
+
+  @tensorflow_computation.tf_computation(_BROADCAST_TYPE)
+  def identity(x):
+    return x
+
+  @federated_computation.federated_computation(
+      computation_types.at_server(_BROADCAST_TYPE))
+  def comp(value):
+    return intrinsics.federated_map(identity,
+                                    intrinsics.federated_broadcast(value))
+
+  return comp
+
+
+def _create_broadcast_value(embeddings, step, name='model'):
+  return structure.Struct([('embeddings', embeddings), ('step', step),
+                           ('name', name)])
+
+
+class FederatedResolvingStrategyDeltaBroadcastTest(
+    unittest.IsolatedAsyncioTestCase, parameterized.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('full', 5, 2, False),
+      ('delta', 5, 2, True),
+      ('delta_unshared_executors', 3, 3, True),
+  )
+  # pyformat: enable
+  async def test_federated_broadcast_over_rounds(self, num_clients,
+                                                 num_client_executors,
+                                                 delta_broadcast):
+    comp = _create_broadcast_computation()
+    executor = _create_test_executor(
+        num_clients, num_client_executors, delta_broadcast=delta_broadcast)
+    embeddings = np.zeros([8, 2], np.float32)
+    rounds = [
+        (0, 'model'),
+        (1, 'model'),  # Changes one row.
+        (2, 'model'),  # Changes every row.
+        (2, 'model'),  # Changes nothing.
+        (3, 'other'),  # Changes one row and the name.
+    ]
+
+    for step, name in rounds:
+      if step == 2:
+        embeddings = np.full([8, 2], 2.0, np.float32)
+      else:
+        embeddings = embeddings.copy()
+        embeddings[step] = [step, -step]
+      value = _create_broadcast_value(embeddings, step, name)
+
+      result = await _invoke(executor, comp, value)
+
+      self.assertLen(result, num_clients)
+      for client_value in result:
+        np.testing.assert_array_equal(client_value.embeddings, embeddings)
+        self.assertEqual(client_value.step, step)
+        self.assertEqual(client_value.name, name.encode())
+
+  async def test_federated_broadcast_sends_changed_rows(self):
+    recording_executor = _RecordingExecutor()
+    executor = _create_test_executor(
+        2,
+        1,
+        delta_broadcast=True,
+        client_executors=[_create_bottom_stack(recording_executor)])
+    comp = _create_broadcast_computation()
+    embeddings = np.zeros([8, 2], np.float32)
+    await _invoke(executor, comp, _create_broadcast_value(embeddings, 0))
+    recording_executor.arrays.clear()
+    embeddings = embeddings.copy()
+    embeddings[5] = [1.0, 2.0]
+
+    result = await _invoke(executor, comp,
+                           _create_broadcast_value(embeddings, 0))
+
+    self.assertEqual([a.tolist() for a in recording_executor.arrays],
+                     [[5], [[1.0, 2.0]]])
+    for client_value in result:
+      np.testing.assert_array_equal(client_value.embeddings, embeddings)
+
+
+class FederatedResolvingStrategySelectTest(unittest.IsolatedAsyncioTestCase,
+                                           absltest.TestCase):
+
+  async def test_federated_select_selects_each_key_once(self):
+
+    @tensorflow_computation.tf_computation(
+        tf.TensorSpec([4, 2], tf.float32), tf.int32)
+    def select_fn(value, key):
+      return tf.gather(value, key)
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.TensorSpec([3], tf.int32)),
+        computation_types.at_server(tf.TensorSpec([4, 2], tf.float32)))
+    def comp(client_keys, server_val):
+      max_key = intrinsics.federated_value(4, placements.SERVER)
+      return intrinsics.federated_select(client_keys, max_key, server_val,
+                                         select_fn)
+
+    server_executor = _RecordingExecutor()
+    executor = _create_test_executor(3, 2, server_executor=server_executor)
+    client_keys = [[0, 1, 3], [3, 3, 0], [2, 1, 0]]
+    server_val = np.arange(8, dtype=np.float32).reshape([4, 2])
+
+    result = await _invoke(executor, comp, [client_keys, server_val])
+
+    self.assertLen(result, 3)
+    for keys, client_result in zip(client_keys, result):
+      np.testing.assert_array_equal(
+          list(client_result.as_numpy_iterator()), server_val[keys])
+    self.assertEqual(server_executor.num_calls, 4)
+
+  async def test_federated_select_with_batched_select_fn_calls_it_once(self):
+
+    # Unnamed parameters, so that `select_fn` is not wrapped in a lambda.
+    @tensorflow_computation.tf_computation(
+        computation_types.StructType([tf.TensorSpec([4], tf.int32), tf.int32]))
+    def select_fn(arg):
+      return tf.gather(arg[0], arg[1])
+
+    @federated_computation.federated_computation(
+        computation_types.at_clients(tf.TensorSpec([2], tf.int32)),
+        computation_types.at_server(tf.TensorSpec([4], tf.int32)))
+    def comp(client_keys, server_val):
+      max_key = intrinsics.federated_value(4, placements.SERVER)
+      return intrinsics.federated_select(client_keys, max_key, server_val,
+                                         select_fn)
+
+    server_executor = _RecordingExecutor()
+    executor = _create_test_executor(4, 4, server_executor=server_executor)
+
+    result = await _invoke(executor, comp,
+                           [[[0, 1], [1, 2], [2, 3], [3, 0]], [5, 6, 7, 8]])
+
+    self.assertEqual([list(r.as_numpy_iterator()) for r in result],
+                     [[5, 6], [6, 7], [7, 8], [8, 5]])
+    self.assertEqual(server_executor.num_calls, 1)
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,600 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Executors hosted in a pool of local worker processes.
+
+A `ProcessPool` starts a number of worker processes, each of which hosts any
+number of executors constructed by an `executor_fn`. A `ProcessPoolExecutor` is
+a local proxy for one of these executors: the values it creates stay in the
+worker process, and are referred to by an integer id.
+
+Since each worker process runs its own Python interpreter, the executors hosted
+in different worker processes do not contend for the global interpreter lock.
+The worker processes, and the executors hosted in them, are reused until the
+pool is closed, so any state they cache (such as the `tf.function`s embedded by
+an `eager_tf_executor.EagerTFExecutor`) survives across invocations.
+
+Values of numeric tensors, or structures of them, move between processes in
+blocks of shared memory, rather than being pickled. Other values are serialized
+with `value_serialization`.
+"""
+
+import asyncio
+import collections
+import itertools
+import multiprocessing
+from multiprocessing import shared_memory
+import pickle
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import weakref
+
+from absl import logging
+import numpy as np
+
+from tensorflow_federated.proto.v0 import computation_pb2
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.executors import executor_base
+from tensorflow_federated.python.core.impl.executors import executor_value_base
+from tensorflow_federated.python.core.impl.executors import value_serialization
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import type_analysis
+from tensorflow_federated.python.core.impl.types import type_serialization
+from tensorflow_federated.python.core.impl.types import typed_object
+
+# Tensors smaller than this many bytes in total are sent inline with a request,
+# since creating a block of shared memory costs several system calls.
+_MIN_SHARED_MEMORY_BYTES = 1 << 16
+# The alignment of tensors within a block of shared memory.
+_SHARED_MEMORY_ALIGNMENT = 64
+_WORKER_SHUTDOWN_TIMEOUT_SECONDS = 10
+
+ExecutorFn = Callable[..., executor_base.Executor]
+
+
+def _write_arrays(arrays: Sequence[np.ndarray]) -> Tuple[Any, ...]:
+  """Returns an encoding of `arrays` which can be sent to another process."""
+  if (any(a.dtype.hasobject for a in arrays) or
+      sum(a.nbytes for a in arrays) < _MIN_SHARED_MEMORY_BYTES):
+    return ('inline', list(arrays))
+  layout = []
+  size = 0
+  for array in arrays:
+    offset = -(-size // _SHARED_MEMORY_ALIGNMENT) * _SHARED_MEMORY_ALIGNMENT
+    layout.append((array.dtype.str, array.shape, offset))
+    size = offset + array.nbytes
+  block = shared_memory.SharedMemory(create=True, size=size)
+  try:
+    for array, (_, shape, offset) in zip(arrays, layout):
+      view = np.ndarray(shape, array.dtype, buffer=block.buf, offset=offset)
+      view[...] = array
+      del view
+  except BaseException:
+    block.close()
+    block.unlink()
+    raise
+  block.close()
+  # The receiving process unlinks the block once it has read the arrays.
+  return ('shared', block.name, layout)
+
+
+def _read_arrays(encoded_arrays: Tuple[Any, ...]) -> List[np.ndarray]:
+  """Returns the arrays encoded by `_write_arrays`."""
+  if encoded_arrays[0] == 'inline':
+    return encoded_arrays[1]
+  _, name, layout = encoded_arrays
+  block = shared_memory.SharedMemory(name=name)
+  try:
+    return [
+        np.array(np.ndarray(shape, dtype, buffer=block.buf, offset=offset))
+        for dtype, shape, offset in layout
+    ]
+  finally:
+    block.close()
+    block.unlink()
+
+
+def _unlink_arrays(encoded_arrays: Tuple[Any, ...]):
+  """Unlinks the block of shared memory of `encoded_arrays`, if not read.
+
+  The block of shared memory holding arrays encoded by `_write_arrays` is
+  unlinked by the process reading them. Arrays which will not be read, e.g.
+  the result of a request that was cancelled, must be unlinked with this
+  function instead, or the block persists until the host restarts.
+
+  Args:
+    encoded_arrays: Arrays encoded by `_write_arrays`.
+  """
+  if encoded_arrays[0] != 'shared':
+    return
+  try:
+    block = shared_memory.SharedMemory(name=encoded_arrays[1])
+  except FileNotFoundError:
+    # The arrays were already read.
+    return
+  block.close()
+  block.unlink()
+
+
+def _discard_result(result: Any):
+  """Releases the resources held by a result which will not be decoded."""
+  if isinstance(result, tuple) and result and result[0] == 'tensors':
+    _unlink_arrays(result[-1])
+
+
+def _is_tensor_structure_type(type_spec: computation_types.Type) -> bool:
+  return (type_spec is not None and
+          type_analysis.is_generic_op_compatible_type(type_spec))
+
+
+def _encode_value(value: Any,
+                  type_spec: computation_types.Type) -> Tuple[Any, ...]:
+  """Returns an encoding of `value` which can be sent to another process."""
+  if _is_tensor_structure_type(type_spec):
+    if type_spec.is_struct():
+      try:
+        parts = structure.flatten(structure.from_container(value, True))
+      except TypeError:
+        parts = None
+    else:
+      parts = [value]
+    tensor_types = structure.flatten(type_spec)
+    if parts is not None and len(parts) == len(tensor_types):
+      arrays = [
+          np.asarray(part, dtype=tensor_type.dtype.as_numpy_dtype)
+          for part, tensor_type in zip(parts, tensor_types)
+      ]
+      type_proto = type_serialization.serialize_type(type_spec)
+      return ('tensors', type_proto.SerializeToString(), _write_arrays(arrays))
+  value_proto, _ = value_serialization.serialize_value(value, type_spec)
+  return ('serialized', value_proto.SerializeToString())
+
+
+def _decode_value(
+    encoded_value: Tuple[Any, ...]) -> Tuple[Any, computation_types.Type]:
+  """Returns the value and type encoded by `_encode_value`."""
+  if encoded_value[0] == 'tensors':
+    _, type_bytes, encoded_arrays = encoded_value
+    type_spec = type_serialization.deserialize_type(
+        computation_pb2.Type.FromString(type_bytes))
+    arrays = _read_arrays(encoded_arrays)
+    if type_spec.is_struct():
+      return structure.pack_sequence_as(type_spec, arrays), type_spec
+    return arrays[0], type_spec
+  _, value_bytes = encoded_value
+  return value_serialization.deserialize_value(
+      executor_pb2.Value.FromString(value_bytes))
+
+
+class _Worker(object):
+  """Hosts the executors of a `ProcessPool` in a worker process."""
+
+  def __init__(self, connection, executor_fn: ExecutorFn):
+    self._connection = connection
+    self._executor_fn = executor_fn
+    self._executors = {}
+    self._values = {}
+    self._values_by_executor = {}
+
+  def _add_value(self, executor_id, value_id, value):
+    self._values[value_id] = value
+    self._values_by_executor[executor_id].add(value_id)
+
+  def _dispose(self, value_ids):
+    for executor_id, value_id in value_ids:
+      self._values.pop(value_id, None)
+      self._values_by_executor.get(executor_id, set()).discard(value_id)
+
+  def _create_executor(self, executor_id, kwargs):
+    self._executors[executor_id] = self._executor_fn(**kwargs)
+    self._values_by_executor[executor_id] = set()
+
+  def _close_executor(self, executor_id):
+    executor = self._executors.pop(executor_id, None)
+    for value_id in self._values_by_executor.pop(executor_id, ()):
+      self._values.pop(value_id, None)
+    if executor is not None:
+      executor.close()
+
+  async def _create_value(self, executor_id, value_id, encoded_value):
+    value, type_spec = _decode_value(encoded_value)
+    result = await self._executors[executor_id].create_value(value, type_spec)
+    self._add_value(executor_id, value_id, result)
+
+  async def _create_call(self, executor_id, value_id, comp_id, arg_id):
+    arg = self._values[arg_id] if arg_id is not None else None
+    result = await self._executors[executor_id].create_call(
+        self._values[comp_id], arg)
+    self._add_value(executor_id, value_id, result)
+
+  async def _create_struct(self, executor_id, value_id, elements):
+    result = await self._executors[executor_id].create_struct(
+        structure.Struct([(k, self._values[v]) for k, v in elements]))
+    self._add_value(executor_id, value_id, result)
+
+  async def _create_selection(self, executor_id, value_id, source_id, index):
+    result = await self._executors[executor_id].create_selection(
+        self._values[source_id], index)
+    self._add_value(executor_id, value_id, result)
+
+  async def _compute(self, value_id):
+    value = self._values[value_id]
+    result = await value.compute()
+    type_spec = value.type_signature
+    if _is_tensor_structure_type(type_spec):
+      arrays = [np.asarray(x) for x in structure.flatten(result)]
+      return ('tensors', _write_arrays(arrays))
+    value_proto, _ = value_serialization.serialize_value(result, type_spec)
+    return ('serialized', value_proto.SerializeToString())
+
+  async def _handle_request(self, request_id, method, args):
+    try:
+      result = await getattr(self, method)(*args)
+      response = (request_id, None, result)
+    except Exception as e:  # pylint: disable=broad-except
+      response = (request_id, _picklable_exception(e), None)
+    try:
+      self._connection.send(response)
+    except (BrokenPipeError, OSError):
+      # The pool was closed, so the result will not be read.
+      _discard_result(response[2])
+
+  def handle_message(self, message):
+    request_id, method, args = message
+    if request_id is None:
+      # Notifications are handled in order and do not expect a response.
+      getattr(self, method)(*args)
+    else:
+      asyncio.create_task(self._handle_request(request_id, method, args))
+
+
+def _picklable_exception(error: Exception) -> Exception:
+  """Returns `error`, or a `RuntimeError` describing it if it can't pickle."""
+  try:
+    pickle.dumps(error)
+    return error
+  except Exception:  # pylint: disable=broad-except
+    return RuntimeError(f'{type(error).__name__}: {error}')
+
+
+def _run_worker(connection, executor_fn: ExecutorFn):
+  """The entry point of a worker process of a `ProcessPool`."""
+  loop = asyncio.new_event_loop()
+  asyncio.set_event_loop(loop)
+  worker = _Worker(connection, executor_fn)
+
+  def _read_messages():
+    while True:
+      try:
+        message = connection.recv()
+      except (EOFError, OSError):
+        message = None
+      if message is None:
+        loop.call_soon_threadsafe(loop.stop)
+        return
+      loop.call_soon_threadsafe(worker.handle_message, message)
+
+  threading.Thread(target=_read_messages, daemon=True).start()
+  try:
+    loop.run_forever()
+  finally:
+    connection.close()
+
+
+def _set_future_result(future: asyncio.Future, error: Optional[Exception],
+                       result: Any):
+  if future.cancelled():
+    # The result will not be read, e.g. by `ProcessPoolExecutor._compute`.
+    _discard_result(result)
+    return
+  if error is not None:
+    future.set_exception(error)
+  else:
+    future.set_result(result)
+
+
+class _WorkerProcess(object):
+  """A connection to a worker process of a `ProcessPool`."""
+
+  def __init__(self, context, executor_fn: ExecutorFn):
+    self._connection, child_connection = context.Pipe()
+    self._process = context.Process(
+        target=_run_worker, args=(child_connection, executor_fn), daemon=True)
+    self._process.start()
+    child_connection.close()
+    # Requests can be sent from any thread.
+    self._lock = threading.Lock()
+    self._pending_requests = {}
+    # The ids of values to release in the worker process, sent with the next
+    # message. The finalizers of `ProcessPoolValue`s may run while a message is
+    # being sent, so they can not send messages themselves, nor take the lock.
+    # Instead they only append to the deque, which is drained with `popleft`;
+    # both are atomic.
+    self._pending_disposals = collections.deque()
+    self._request_ids = itertools.count()
+    self._closed = False
+    threading.Thread(target=self._read_responses, daemon=True).start()
+
+  def _read_responses(self):
+    while True:
+      try:
+        request_id, error, result = self._connection.recv()
+      except (EOFError, OSError):
+        break
+      with self._lock:
+        loop, future = self._pending_requests.pop(request_id)
+      try:
+        loop.call_soon_threadsafe(_set_future_result, future, error, result)
+      except RuntimeError:
+        # The event loop of the request was closed, e.g. after the request was
+        # cancelled, so the result will not be read.
+        _discard_result(result)
+    with self._lock:
+      self._closed = True
+      pending_requests = list(self._pending_requests.values())
+      self._pending_requests.clear()
+    for loop, future in pending_requests:
+      try:
+        loop.call_soon_threadsafe(_set_future_result, future,
+                                  RuntimeError('The worker process exited.'),
+                                  None)
+      except RuntimeError:
+        pass
+
+  def _send(self, message):
+    """Sends `message`, after any pending disposals. Must hold the lock."""
+    disposals = []
+    while self._pending_disposals:
+      disposals.append(self._pending_disposals.popleft())
+    if disposals:
+      self._connection.send((None, '_dispose', (disposals,)))
+    self._connection.send(message)
+
+  def dispose(self, executor_id: int, value_id: Tuple[int, int]):
+    """Releases a value in the worker process with the next message."""
+    self._pending_disposals.append((executor_id, value_id))
+
+  async def request(self, method: str, *args) -> Any:
+    """Invokes `method` in the worker process, and returns its result."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    with self._lock:
+      if self._closed:
+        raise RuntimeError('The worker process exited.')
+      request_id = next(self._request_ids)
+      self._pending_requests[request_id] = (loop, future)
+      self._send((request_id, method, args))
+    try:
+      return await future
+    except asyncio.CancelledError:
+      # The request may have completed before the caller was cancelled.
+      if future.done() and not future.cancelled():
+        if future.exception() is None:
+          _discard_result(future.result())
+      raise
+
+  def notify(self, method: str, *args):
+    """Invokes `method` in the worker process without awaiting it."""
+    with self._lock:
+      if self._closed:
+        return
+      try:
+        self._send((None, method, args))
+      except (BrokenPipeError, OSError):
+        pass
+
+  def close(self):
+    with self._lock:
+      if not self._closed:
+        self._closed = True
+        try:
+          self._connection.send(None)
+        except (BrokenPipeError, OSError):
+          pass
+    self._process.join(_WORKER_SHUTDOWN_TIMEOUT_SECONDS)
+    if self._process.is_alive():
+      logging.warning('Terminating worker process %d.', self._process.pid)
+      self._process.terminate()
+    self._connection.close()
+
+
+def _close_workers(workers: Sequence[_WorkerProcess]):
+  for worker in workers:
+    worker.close()
+
+
+class ProcessPool(object):
+  """A pool of worker processes hosting executors.
+
+  The worker processes are started with the `spawn` method, so `executor_fn`
+  must be picklable, e.g. a module-level function or a `functools.partial` of
+  one. The worker processes are stopped when the pool is closed or garbage
+  collected, or when the interpreter exits.
+  """
+
+  def __init__(self,
+               num_processes: int,
+               executor_fn: ExecutorFn,
+               *,
+               start_method: str = 'spawn'):
+    """Creates a `ProcessPool`.
+
+    Args:
+      num_processes: The positive number of worker processes to start.
+      executor_fn: A callable constructing an `executor_base.Executor` in a
+        worker process. It is called with the keyword arguments given to
+        `create_executor`.
+      start_method: The `multiprocessing` start method used to start the worker
+        processes.
+
+    Raises:
+      ValueError: If `num_processes` is not positive.
+    """
+    py_typecheck.check_type(num_processes, int)
+    py_typecheck.check_callable(executor_fn)
+    if num_processes < 1:
+      raise ValueError('Expected `num_processes` to be positive, found '
+                       f'{num_processes}.')
+    context = multiprocessing.get_context(start_method)
+    self._workers = [
+        _WorkerProcess(context, executor_fn) for _ in range(num_processes)
+    ]
+    self._next_worker_index = 0
+    self._executor_ids = itertools.count()
+    self._finalizer = weakref.finalize(self, _close_workers, self._workers)
+
+  @property
+  def num_processes(self) -> int:
+    return len(self._workers)
+
+  def create_executor(self, **kwargs) -> 'ProcessPoolExecutor':
+    """Returns an executor hosted in the next worker process of the pool.
+
+    Args:
+      **kwargs: Picklable keyword arguments passed to the `executor_fn` of the
+        pool.
+    """
+    if not self._finalizer.alive:
+      raise RuntimeError('The process pool is closed.')
+    worker = self._workers[self._next_worker_index]
+    self._next_worker_index = (self._next_worker_index + 1) % len(self._workers)
+    return ProcessPoolExecutor(worker, next(self._executor_ids), kwargs)
+
+  def close(self):
+    """Stops the worker processes of the pool."""
+    self._finalizer()
+
+
+class ProcessPoolValue(executor_value_base.ExecutorValue):
+  """A reference to a value embedded in an executor in a worker process."""
+
+  def __init__(self, value_id: int, type_spec: computation_types.Type,
+               executor: 'ProcessPoolExecutor'):
+    """Creates the value.
+
+    Args:
+      value_id: The integer id of the value in the worker process.
+      type_spec: An instance of `computation_types.Type`.
+      executor: The executor that created this value.
+    """
+    py_typecheck.check_type(type_spec, computation_types.Type)
+    py_typecheck.check_type(executor, ProcessPoolExecutor)
+    self._value_id = value_id
+    self._type_signature = type_spec
+    self._executor = executor
+
+    # Release the value in the worker process when no references to it remain.
+    weakref.finalize(self, executor._dispose, value_id)  # pylint: disable=protected-access
+
+  @property
+  def type_signature(self):
+    return self._type_signature
+
+  @property
+  def value_id(self) -> int:
+    return self._value_id
+
+  @tracing.trace(span=True)
+  async def compute(self):
+    return await self._executor._compute(self)  # pylint: disable=protected-access
+
+
+class ProcessPoolExecutor(executor_base.Executor):
+  """A local proxy for an executor hosted in a worker process of a pool.
+
+  Instances are constructed with `ProcessPool.create_executor`.
+  """
+
+  def __init__(self, worker: _WorkerProcess, executor_id: int, executor_kwargs):
+    self._worker = worker
+    self._executor_id = executor_id
+    self._value_ids = itertools.count()
+    self._worker.notify('_create_executor', executor_id, executor_kwargs)
+
+  def _new_value_id(self) -> Tuple[int, int]:
+    return (self._executor_id, next(self._value_ids))
+
+  def _dispose(self, value_id):
+    self._worker.dispose(self._executor_id, value_id)
+
+  def close(self):
+    self._worker.notify('_close_executor', self._executor_id)
+
+  @tracing.trace(span=True)
+  async def create_value(self, value, type_spec=None):
+    if type_spec is None:
+      py_typecheck.check_type(value, typed_object.TypedObject)
+      type_spec = value.type_signature
+    else:
+      type_spec = computation_types.to_type(type_spec)
+    encoded_value = _encode_value(value, type_spec)
+    value_id = self._new_value_id()
+    try:
+      await self._worker.request('_create_value', self._executor_id, value_id,
+                                 encoded_value)
+    except BaseException:
+      # The worker process may not have read the value, e.g. if it exited.
+      _discard_result(encoded_value)
+      raise
+    return ProcessPoolValue(value_id, type_spec, self)
+
+  @tracing.trace(span=True)
+  async def create_call(self, comp, arg=None):
+    py_typecheck.check_type(comp, ProcessPoolValue)
+    py_typecheck.check_type(comp.type_signature, computation_types.FunctionType)
+    if arg is not None:
+      py_typecheck.check_type(arg, ProcessPoolValue)
+    value_id = self._new_value_id()
+    await self._worker.request('_create_call', self._executor_id, value_id,
+                               comp.value_id,
+                               arg.value_id if arg is not None else None)
+    return ProcessPoolValue(value_id, comp.type_signature.result, self)
+
+  @tracing.trace(span=True)
+  async def create_struct(self, elements):
+    elements = structure.to_elements(structure.from_container(elements))
+    element_ids = []
+    element_types = []
+    for name, value in elements:
+      py_typecheck.check_type(value, ProcessPoolValue)
+      element_ids.append((name, value.value_id))
+      element_types.append((name, value.type_signature))
+    value_id = self._new_value_id()
+    await self._worker.request('_create_struct', self._executor_id, value_id,
+                               element_ids)
+    return ProcessPoolValue(value_id,
+                            computation_types.StructType(element_types), self)
+
+  @tracing.trace(span=True)
+  async def create_selection(self, source, index):
+    py_typecheck.check_type(source, ProcessPoolValue)
+    py_typecheck.check_type(source.type_signature, computation_types.StructType)
+    py_typecheck.check_type(index, int)
+    value_id = self._new_value_id()
+    await self._worker.request('_create_selection', self._executor_id, value_id,
+                               source.value_id, index)
+    return ProcessPoolValue(value_id, source.type_signature[index], self)
+
+  async def _compute(self, value: ProcessPoolValue):
+    encoded_result = await self._worker.request('_compute', value.value_id)
+    if encoded_result[0] == 'tensors':
+      arrays = _read_arrays(encoded_result[1])
+      if value.type_signature.is_struct():
+        return structure.pack_sequence_as(value.type_signature, arrays)
+      return arrays[0]
+    result, _ = value_serialization.deserialize_value(
+        executor_pb2.Value.FromString(encoded_result[1]), value.type_signature)
+    return result
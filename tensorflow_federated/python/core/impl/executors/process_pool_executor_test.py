@@ -0,0 +1,204 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import collections
+from multiprocessing import shared_memory
+import os
+import time
+
+from absl.testing import absltest
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import process_pool_executor
+from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
+from tensorflow_federated.python.core.impl.types import computation_types
+
+
+def _invoke(ex, comp, arg=None):
+  v1 = asyncio.run(ex.create_value(comp))
+  if arg is not None:
+    type_spec = v1.type_signature.parameter
+    v2 = asyncio.run(ex.create_value(arg, type_spec))
+  else:
+    v2 = None
+  v3 = asyncio.run(ex.create_call(v1, v2))
+  return asyncio.run(v3.compute())
+
+
+def _list_shared_memory_blocks():
+  return set(name for name in os.listdir('/dev/shm') if name.startswith('psm_'))
+
+
+class SharedArraysTest(absltest.TestCase):
+
+  def test_roundtrip_small_arrays_inline(self):
+    arrays = [np.arange(3, dtype=np.int32), np.array(b'abc', dtype=object)]
+
+    encoded_arrays = process_pool_executor._write_arrays(arrays)
+
+    self.assertEqual(encoded_arrays[0], 'inline')
+    result = process_pool_executor._read_arrays(encoded_arrays)
+    np.testing.assert_array_equal(result[0], arrays[0])
+    self.assertEqual(result[1], arrays[1])
+
+  def test_roundtrip_large_arrays_in_shared_memory(self):
+    arrays = [
+        np.arange(100000, dtype=np.float32),
+        np.array(7, dtype=np.int64),
+        np.ones([3, 5], dtype=np.bool_),
+    ]
+
+    encoded_arrays = process_pool_executor._write_arrays(arrays)
+
+    self.assertEqual(encoded_arrays[0], 'shared')
+    result = process_pool_executor._read_arrays(encoded_arrays)
+    self.assertLen(result, 3)
+    for actual, expected in zip(result, arrays):
+      self.assertEqual(actual.dtype, expected.dtype)
+      np.testing.assert_array_equal(actual, expected)
+    # The block is unlinked once it has been read.
+    with self.assertRaises(FileNotFoundError):
+      shared_memory.SharedMemory(name=encoded_arrays[1])
+
+
+class ProcessPoolExecutorTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls._pool = process_pool_executor.ProcessPool(
+        2, eager_tf_executor.EagerTFExecutor)
+
+  @classmethod
+  def tearDownClass(cls):
+    cls._pool.close()
+    super().tearDownClass()
+
+  def test_create_value_and_compute_tensor(self):
+    ex = self._pool.create_executor()
+
+    value = asyncio.run(ex.create_value(10, tf.int32))
+    result = asyncio.run(value.compute())
+
+    self.assertIsInstance(value, process_pool_executor.ProcessPoolValue)
+    self.assertEqual(str(value.type_signature), 'int32')
+    self.assertEqual(result, 10)
+
+  def test_create_value_and_compute_large_struct(self):
+    ex = self._pool.create_executor()
+    type_spec = computation_types.StructType([
+        ('a', computation_types.TensorType(tf.float32, [100000])),
+        ('b', computation_types.TensorType(tf.string)),
+    ])
+    arg = collections.OrderedDict(
+        a=np.arange(100000, dtype=np.float32), b='hello')
+
+    value = asyncio.run(ex.create_value(arg, type_spec))
+    result = asyncio.run(value.compute())
+
+    self.assertIsInstance(result, structure.Struct)
+    np.testing.assert_array_equal(result.a, arg['a'])
+    self.assertEqual(result.b, b'hello')
+
+  def test_create_value_and_compute_sequence(self):
+    ex = self._pool.create_executor()
+    type_spec = computation_types.SequenceType(tf.int64)
+
+    value = asyncio.run(ex.create_value(tf.data.Dataset.range(5), type_spec))
+    result = asyncio.run(value.compute())
+
+    self.assertEqual(list(result.as_numpy_iterator()), list(range(5)))
+
+  def test_create_call(self):
+
+    @tensorflow_computation.tf_computation(tf.TensorSpec([None], tf.float32))
+    def comp(x):
+      return tf.reduce_sum(x)
+
+    ex = self._pool.create_executor()
+
+    result = _invoke(ex, comp, np.ones([100000], dtype=np.float32))
+
+    self.assertEqual(result, 100000.0)
+
+  def test_create_struct_and_selection(self):
+    ex = self._pool.create_executor()
+    a = asyncio.run(ex.create_value(1, tf.int32))
+    b = asyncio.run(ex.create_value(2.0, tf.float32))
+
+    value = asyncio.run(ex.create_struct(collections.OrderedDict(a=a, b=b)))
+    selection = asyncio.run(ex.create_selection(value, 1))
+
+    self.assertEqual(str(value.type_signature), '<a=int32,b=float32>')
+    self.assertEqual(
+        asyncio.run(value.compute()), structure.Struct([('a', 1), ('b', 2.0)]))
+    self.assertEqual(asyncio.run(selection.compute()), 2.0)
+
+  def test_executors_share_worker_processes(self):
+    executors = [self._pool.create_executor() for _ in range(5)]
+
+    values = [
+        asyncio.run(ex.create_value(i, tf.int32))
+        for i, ex in enumerate(executors)
+    ]
+
+    self.assertEqual([asyncio.run(v.compute()) for v in values], list(range(5)))
+
+  def test_cancelled_compute_unlinks_shared_memory(self):
+    ex = self._pool.create_executor()
+    type_spec = computation_types.TensorType(tf.float32, [100000])
+    value = asyncio.run(
+        ex.create_value(np.zeros([100000], dtype=np.float32), type_spec))
+    blocks = _list_shared_memory_blocks()
+
+    async def _cancel_compute():
+      task = asyncio.create_task(value.compute())
+      # Let the request be sent to the worker process.
+      await asyncio.sleep(0)
+      task.cancel()
+      with self.assertRaises(asyncio.CancelledError):
+        await task
+      # Wait for the response of the worker process, and for its block of
+      # shared memory to be unlinked.
+      worker = ex._worker  # pylint: disable=protected-access
+      deadline = time.time() + 10
+      while time.time() < deadline:
+        if (not worker._pending_requests and  # pylint: disable=protected-access
+            not _list_shared_memory_blocks() - blocks):
+          break
+        await asyncio.sleep(0.01)
+
+    asyncio.run(_cancel_compute())
+
+    self.assertEmpty(_list_shared_memory_blocks() - blocks)
+
+  def test_raises_error_from_worker_process(self):
+    ex = self._pool.create_executor()
+    value = asyncio.run(ex.create_value(1, tf.int32))
+    ex.close()
+
+    with self.assertRaises(KeyError):
+      asyncio.run(value.compute())
+
+  def test_raises_value_error_with_no_processes(self):
+    with self.assertRaises(ValueError):
+      process_pool_executor.ProcessPool(0, eager_tf_executor.EagerTFExecutor)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,386 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A `TracingProvider` profiling the calls of the executor stacks.
+
+The `ProfilingTracingProvider` records a `ProfiledSpan` for each call traced
+with `tracing.trace` or `tracing.span`, e.g. for each intrinsic computed by a
+federating strategy (`compute_federated_map`, `compute_federated_aggregate`,
+...), with its wall time, queue time, the bytes of its arguments and results,
+and the number of child executors it fans out to. Spans are grouped in rounds,
+each of which is an invocation of a computation by the execution context.
+
+The recorded spans can be exported to the Chrome trace event format, and viewed
+in `chrome://tracing` or Perfetto, with one timeline for each round:
+
+```python
+profiler = profiling_tracing_provider.ProfilingTracingProvider(
+    scopes=['FederatedResolvingStrategy', 'ExecutionContext'])
+tracing.add_tracing_provider(profiler)
+... # Run some rounds.
+with open('/tmp/trace.json', 'w') as f:
+  f.write(profiler.to_chrome_trace())
+print(profiler.format_summary())
+```
+"""
+
+import asyncio
+import collections
+import json
+import threading
+import time
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
+
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import typed_object
+
+# The span invoking a computation in the execution context, which starts a
+# round.
+_ROUND_SCOPE = 'ExecutionContext'
+_ROUND_SUB_SCOPE = 'Invoke'
+
+
+def _type_bytes(type_spec: computation_types.Type) -> int:
+  """Returns the bytes of the tensors of fully defined shapes in `type_spec`."""
+  if type_spec.is_tensor():
+    num_elements = type_spec.shape.num_elements()
+    if num_elements is None or type_spec.dtype == tf.string:
+      return 0
+    return num_elements * type_spec.dtype.size
+  elif type_spec.is_struct():
+    return sum(_type_bytes(element_type) for element_type in type_spec)
+  elif type_spec.is_federated():
+    return _type_bytes(type_spec.member)
+  return 0
+
+
+def _value_bytes_and_fan_out(
+    value: Any, type_spec: computation_types.Type) -> Tuple[int, int]:
+  """Returns the bytes of `value`, and the number of executors holding it.
+
+  Federated values are represented by a list of the values in each of the child
+  executors, so the bytes of their members are counted once for each child.
+
+  Args:
+    value: The internal representation of a value embedded in an executor.
+    type_spec: The type of `value`.
+
+  Returns:
+    A tuple of the bytes of the tensors of fully defined shapes in `value`, and
+    of the largest number of child executors holding the values of any of its
+    federated members.
+  """
+  if type_spec.is_federated():
+    num_children = len(value) if isinstance(value, list) else 1
+    return num_children * _type_bytes(type_spec.member), num_children
+  elif type_spec.is_struct() and isinstance(value, structure.Struct):
+    num_bytes = 0
+    fan_out = 0
+    for element, element_type in zip(value, type_spec):
+      element_bytes, element_fan_out = _value_bytes_and_fan_out(
+          element, element_type)
+      num_bytes += element_bytes
+      fan_out = max(fan_out, element_fan_out)
+    return num_bytes, fan_out
+  return _type_bytes(type_spec), 0
+
+
+def _typed_values_bytes_and_fan_out(values: Collection[Any]) -> Tuple[int, int]:
+  """Returns the total bytes, and largest fan out, of the typed `values`."""
+  num_bytes = 0
+  fan_out = 0
+  for value in values:
+    if not isinstance(value, typed_object.TypedObject):
+      continue
+    type_spec = value.type_signature
+    if type_spec is None:
+      continue
+    value_bytes, value_fan_out = _value_bytes_and_fan_out(
+        getattr(value, 'internal_representation', None), type_spec)
+    num_bytes += value_bytes
+    fan_out = max(fan_out, value_fan_out)
+  return num_bytes, fan_out
+
+
+def _current_task_id() -> Optional[int]:
+  try:
+    task = asyncio.current_task()
+  except RuntimeError:
+    return None
+  return id(task) if task is not None else None
+
+
+class ProfiledSpan(object):
+  """A call recorded by a `ProfilingTracingProvider`.
+
+  Attributes:
+    scope: The name of the scope of the span, often the class name.
+    sub_scope: The name of the sub-scope of the span, often the method name.
+    name: The name of the span, `'{scope}.{sub_scope}'`.
+    parent: The `ProfiledSpan` enclosing this span, or `None`.
+    round_index: The index of the round in which the span ran, or `None` if it
+      ran outside of a round.
+    start_time: The time at which the span started, in seconds, as given by
+      `time.perf_counter()`.
+    end_time: The time at which the span ended, or `None` while it is running.
+    wall_time: The duration of the span, in seconds.
+    queue_time: The time, in seconds, between the scheduling of the task
+      running the span and the start of the span, if the span is the first in
+      its task, and the time at which the task was scheduled is known; else 0.
+    bytes_in: The estimated bytes of the arguments of the span.
+    bytes_out: The estimated bytes of the result of the span.
+    fan_out: The number of child executors holding the federated arguments or
+      result of the span, or 0 if it has none.
+    thread_id: The identifier of the thread running the span.
+    task_id: The identifier of the `asyncio.Task` running the span, or `None`.
+    error: Whether the span raised an exception.
+  """
+
+  def __init__(self, scope: str, sub_scope: str,
+               parent: Optional['ProfiledSpan'], round_index: Optional[int]):
+    self.scope = scope
+    self.sub_scope = sub_scope
+    self.parent = parent
+    self.round_index = round_index
+    self.start_time = time.perf_counter()
+    self.end_time = None
+    self.queue_time = 0.0
+    self.bytes_in = 0
+    self.bytes_out = 0
+    self.fan_out = 0
+    self.thread_id = threading.get_ident()
+    self.task_id = _current_task_id()
+    self.error = False
+
+  @property
+  def name(self) -> str:
+    return f'{self.scope}.{self.sub_scope}'
+
+  @property
+  def wall_time(self) -> float:
+    end_time = self.end_time if self.end_time is not None else time.perf_counter(
+    )
+    return end_time - self.start_time
+
+  def __repr__(self):
+    return (f'ProfiledSpan(name={self.name!r}, round_index={self.round_index}, '
+            f'wall_time={self.wall_time:.6f})')
+
+
+class ProfilingTracingProvider(tracing.TracingProvider):
+  """A `TracingProvider` recording the timing and sizes of the traced calls.
+
+  The bytes of the arguments and results of a call are estimated from the types
+  of the executor values they contain: the tensors of fully defined shapes are
+  counted, once for each child executor holding a federated value, while
+  strings and tensors of unknown shapes are not. The queue time of a call is
+  only known for calls run in tasks created by
+  `tracing.propagate_trace_context_task_factory`, as in the event loops of the
+  `async_utils.AsyncThreadRunner`s used by the execution contexts.
+  """
+
+  def __init__(self, scopes: Optional[Collection[str]] = None):  # pylint: disable=super-init-not-called
+    """Creates a `ProfilingTracingProvider`.
+
+    Args:
+      scopes: An optional collection of the scopes to record, e.g.
+        `['FederatedResolvingStrategy']` to only record the intrinsics. If
+        `None`, all the spans are recorded. The spans starting rounds are always
+        recorded.
+    """
+    self._scopes = frozenset(scopes) if scopes is not None else None
+    self._lock = threading.Lock()
+    self._spans = []
+    self._num_rounds = 0
+
+  def span(
+      self,
+      scope: str,
+      sub_scope: str,
+      nonce: int,
+      parent_span_yield: Optional[ProfiledSpan],
+      fn_args: Optional[Tuple[Any, ...]],
+      fn_kwargs: Optional[Dict[str, Any]],
+      trace_opts: Dict[str, Any],
+  ) -> Iterator[Optional[ProfiledSpan]]:
+    del nonce, trace_opts  # Unused.
+    starts_round = (
+        scope == _ROUND_SCOPE and sub_scope == _ROUND_SUB_SCOPE and
+        (parent_span_yield is None or parent_span_yield.round_index is None))
+    if (not starts_round and self._scopes is not None and
+        scope not in self._scopes):
+      # The span is not recorded, but its children inherit its parent.
+      yield parent_span_yield
+      return
+    if starts_round:
+      with self._lock:
+        round_index = self._num_rounds
+        self._num_rounds += 1
+    else:
+      round_index = (
+          parent_span_yield.round_index
+          if parent_span_yield is not None else None)
+    profiled_span = ProfiledSpan(scope, sub_scope, parent_span_yield,
+                                 round_index)
+    if (parent_span_yield is None or
+        parent_span_yield.task_id != profiled_span.task_id):
+      scheduled_time = tracing.current_task_scheduled_time()
+      if scheduled_time is not None:
+        profiled_span.queue_time = max(
+            0.0, profiled_span.start_time - scheduled_time)
+    if fn_args is not None:
+      profiled_span.bytes_in, profiled_span.fan_out = (
+          _typed_values_bytes_and_fan_out(
+              list(fn_args) + list((fn_kwargs or {}).values())))
+    result = yield profiled_span
+    profiled_span.end_time = time.perf_counter()
+    if isinstance(result, tracing.TracedFunctionReturned):
+      profiled_span.bytes_out, result_fan_out = _typed_values_bytes_and_fan_out(
+          [result.value])
+      profiled_span.fan_out = max(profiled_span.fan_out, result_fan_out)
+    elif isinstance(result, tracing.TracedFunctionThrew):
+      profiled_span.error = True
+    with self._lock:
+      self._spans.append(profiled_span)
+
+  @property
+  def spans(self) -> List[ProfiledSpan]:
+    """The recorded spans, in the order in which they ended."""
+    with self._lock:
+      return list(self._spans)
+
+  @property
+  def num_rounds(self) -> int:
+    return self._num_rounds
+
+  def clear(self):
+    """Discards the recorded spans, and restarts counting rounds from 0."""
+    with self._lock:
+      self._spans = []
+      self._num_rounds = 0
+
+  def to_chrome_trace(self) -> str:
+    """Returns the recorded spans in the Chrome trace event JSON format.
+
+    Each round is represented by a process, and each task or thread running
+    spans in that round by a thread of that process, so that the spans of each
+    round are shown in a timeline of their own.
+    """
+    spans = sorted(self.spans, key=lambda s: s.start_time)
+    if not spans:
+      return json.dumps({'traceEvents': [], 'displayTimeUnit': 'ms'})
+    origin = spans[0].start_time
+    events = []
+    named_processes = set()
+    lane_ids = {}
+    for s in spans:
+      pid = s.round_index + 1 if s.round_index is not None else 0
+      if pid not in named_processes:
+        named_processes.add(pid)
+        events.append({
+            'name': 'process_name',
+            'ph': 'M',
+            'pid': pid,
+            'args': {
+                'name':
+                    f'Round {s.round_index}'
+                    if s.round_index is not None else 'Outside of rounds'
+            },
+        })
+      lane = (pid, s.thread_id, s.task_id)
+      tid = lane_ids.setdefault(lane, len(lane_ids))
+      events.append({
+          'name': s.name,
+          'cat': s.scope,
+          'ph': 'X',
+          'ts': (s.start_time - origin) * 1e6,
+          'dur': s.wall_time * 1e6,
+          'pid': pid,
+          'tid': tid,
+          'args': {
+              'queue_time_us': s.queue_time * 1e6,
+              'bytes_in': s.bytes_in,
+              'bytes_out': s.bytes_out,
+              'fan_out': s.fan_out,
+              'error': s.error,
+          },
+      })
+    return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'})
+
+  def summary(self, round_index: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Returns a summary of the recorded spans, aggregated by name.
+
+    Args:
+      round_index: An optional index of a round, to only summarize the spans of
+        that round. If `None`, the spans of all the rounds are summarized.
+
+    Returns:
+      A list of dicts, one for each distinct span name, in decreasing order of
+      total wall time, with the keys `name`, `count`, `total_time`,
+      `mean_time`, `max_time`, `queue_time` (all in seconds), `bytes_in`,
+      `bytes_out` (totals) and `max_fan_out`.
+    """
+    rows = collections.OrderedDict()
+    for s in self.spans:
+      if round_index is not None and s.round_index != round_index:
+        continue
+      row = rows.get(s.name)
+      if row is None:
+        row = rows[s.name] = {
+            'name': s.name,
+            'count': 0,
+            'total_time': 0.0,
+            'max_time': 0.0,
+            'queue_time': 0.0,
+            'bytes_in': 0,
+            'bytes_out': 0,
+            'max_fan_out': 0,
+        }
+      wall_time = s.wall_time
+      row['count'] += 1
+      row['total_time'] += wall_time
+      row['max_time'] = max(row['max_time'], wall_time)
+      row['queue_time'] += s.queue_time
+      row['bytes_in'] += s.bytes_in
+      row['bytes_out'] += s.bytes_out
+      row['max_fan_out'] = max(row['max_fan_out'], s.fan_out)
+    for row in rows.values():
+      row['mean_time'] = row['total_time'] / row['count']
+    return sorted(rows.values(), key=lambda r: r['total_time'], reverse=True)
+
+  def format_summary(self, round_index: Optional[int] = None) -> str:
+    """Returns the output of `summary` formatted as a text table."""
+    header = ('name', 'count', 'total_ms', 'mean_ms', 'max_ms', 'queue_ms',
+              'bytes_in', 'bytes_out', 'fan_out')
+    lines = [header]
+    for row in self.summary(round_index):
+      lines.append((
+          row['name'],
+          str(row['count']),
+          f'{row["total_time"] * 1e3:.3f}',
+          f'{row["mean_time"] * 1e3:.3f}',
+          f'{row["max_time"] * 1e3:.3f}',
+          f'{row["queue_time"] * 1e3:.3f}',
+          str(row['bytes_in']),
+          str(row['bytes_out']),
+          str(row['max_fan_out']),
+      ))
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return '\n'.join('  '.join(
+        cell.ljust(width) if i == 0 else cell.rjust(width)
+        for i, (cell, width) in enumerate(zip(line, widths)))
+                     for line in lines)
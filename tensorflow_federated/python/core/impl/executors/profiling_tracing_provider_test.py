@@ -0,0 +1,198 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
+from tensorflow_federated.python.core.impl.executors import federating_executor
+from tensorflow_federated.python.core.impl.executors import profiling_tracing_provider
+from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
+from tensorflow_federated.python.core.impl.federated_context import federated_computation
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+
+
+def _create_bottom_stack():
+  return reference_resolving_executor.ReferenceResolvingExecutor(
+      eager_tf_executor.EagerTFExecutor())
+
+
+def _create_test_executor(num_clients):
+  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory({
+      placements.SERVER: _create_bottom_stack(),
+      placements.CLIENTS: [_create_bottom_stack() for _ in range(num_clients)],
+  })
+  executor = federating_executor.FederatingExecutor(factory,
+                                                    _create_bottom_stack())
+  return reference_resolving_executor.ReferenceResolvingExecutor(executor)
+
+
+def _create_round_comp():
+
+  @tensorflow_computation.tf_computation(tf.float32)
+  def add_one(x):
+    return x + 1.0
+
+  @federated_computation.federated_computation(
+      computation_types.FederatedType(
+          computation_types.TensorType(tf.float32, [4]), placements.SERVER))
+  def comp(x):
+    del x  # Unused.
+    value = intrinsics.federated_value(1.0, placements.CLIENTS)
+    return intrinsics.federated_sum(intrinsics.federated_map(add_one, value))
+
+  return comp
+
+
+async def _run_round(executor, comp):
+  # Mirrors the span under which the execution context invokes computations.
+  with tracing.span('ExecutionContext', 'Invoke'):
+    fn = await executor.create_value(comp)
+    arg = await executor.create_value(
+        tf.zeros([4], tf.float32), comp.type_signature.parameter)
+    result = await executor.create_call(fn, arg)
+    return await result.compute()
+
+
+class ProfilingTracingProviderTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.profiler = profiling_tracing_provider.ProfilingTracingProvider(
+        scopes=['FederatedResolvingStrategy'])
+    tracing.set_tracing_providers([self.profiler])
+
+  def tearDown(self):
+    tracing.set_tracing_providers([])
+    super().tearDown()
+
+  def _run_rounds(self, num_rounds, num_clients=3):
+    executor = _create_test_executor(num_clients)
+    comp = _create_round_comp()
+    # Like the event loops of the execution contexts, propagates the spans to
+    # the tasks created by the executors.
+    loop = asyncio.new_event_loop()
+    loop.set_task_factory(tracing.propagate_trace_context_task_factory)
+    for _ in range(num_rounds):
+      result = loop.run_until_complete(_run_round(executor, comp))
+      self.assertEqual(result, 2.0 * num_clients)
+    loop.close()
+
+  def test_records_intrinsics_in_rounds(self):
+    self._run_rounds(2)
+
+    self.assertEqual(self.profiler.num_rounds, 2)
+    spans = self.profiler.spans
+    self.assertEqual({s.scope for s in spans},
+                     {'ExecutionContext', 'FederatedResolvingStrategy'})
+    for round_index in range(2):
+      names = [
+          s.sub_scope for s in spans if s.round_index == round_index and
+          s.scope == 'FederatedResolvingStrategy'
+      ]
+      self.assertContainsSubset([
+          'compute_federated_value_at_clients', 'compute_federated_map',
+          'compute_federated_sum'
+      ], names)
+    for s in spans:
+      self.assertIsNotNone(s.end_time)
+      self.assertGreaterEqual(s.wall_time, 0.0)
+      self.assertFalse(s.error)
+      if s.sub_scope.startswith('compute_federated_'):
+        self.assertEqual(s.parent.name, 'ExecutionContext.Invoke')
+        self.assertEqual(s.parent.round_index, s.round_index)
+
+  def test_records_bytes_and_fan_out(self):
+    self._run_rounds(1, num_clients=3)
+
+    spans = {s.sub_scope: s for s in self.profiler.spans}
+    federated_map = spans['compute_federated_map']
+    # Three clients each receive and produce a float32 scalar.
+    self.assertEqual(federated_map.fan_out, 3)
+    self.assertEqual(federated_map.bytes_in, 3 * 4)
+    self.assertEqual(federated_map.bytes_out, 3 * 4)
+    federated_sum = spans['compute_federated_sum']
+    self.assertEqual(federated_sum.bytes_in, 3 * 4)
+    self.assertEqual(federated_sum.bytes_out, 4)
+
+  def test_records_errors(self):
+
+    @tracing.trace
+    def fail():
+      raise ValueError()
+
+    profiler = profiling_tracing_provider.ProfilingTracingProvider()
+    tracing.set_tracing_providers([profiler])
+    with self.assertRaises(ValueError):
+      fail()
+
+    self.assertLen(profiler.spans, 1)
+    self.assertTrue(profiler.spans[0].error)
+    self.assertIsNone(profiler.spans[0].round_index)
+
+  def test_to_chrome_trace(self):
+    self._run_rounds(2)
+
+    trace = json.loads(self.profiler.to_chrome_trace())
+    events = trace['traceEvents']
+    process_names = {
+        e['pid']: e['args']['name'] for e in events if e['ph'] == 'M'
+    }
+    self.assertEqual(process_names, {1: 'Round 0', 2: 'Round 1'})
+    complete_events = [e for e in events if e['ph'] == 'X']
+    self.assertLen(complete_events, len(self.profiler.spans))
+    for e in complete_events:
+      self.assertGreaterEqual(e['ts'], 0.0)
+      self.assertGreaterEqual(e['dur'], 0.0)
+      self.assertContainsSubset(
+          ['queue_time_us', 'bytes_in', 'bytes_out', 'fan_out'], e['args'])
+
+  def test_to_chrome_trace_without_spans(self):
+    trace = json.loads(self.profiler.to_chrome_trace())
+    self.assertEqual(trace['traceEvents'], [])
+
+  def test_summary(self):
+    self._run_rounds(2)
+
+    rows = {row['name']: row for row in self.profiler.summary()}
+    self.assertEqual(rows['ExecutionContext.Invoke']['count'], 2)
+    self.assertEqual(
+        rows['FederatedResolvingStrategy.compute_federated_map']['count'], 2)
+    self.assertEqual(
+        rows['FederatedResolvingStrategy.compute_federated_map']['max_fan_out'],
+        3)
+    round_rows = {row['name']: row for row in self.profiler.summary(1)}
+    self.assertEqual(round_rows['ExecutionContext.Invoke']['count'], 1)
+    table = self.profiler.format_summary()
+    self.assertIn('compute_federated_sum', table)
+    self.assertLen(table.splitlines(), len(rows) + 1)
+
+  def test_clear(self):
+    self._run_rounds(1)
+    self.profiler.clear()
+
+    self.assertEmpty(self.profiler.spans)
+    self.assertEqual(self.profiler.num_rounds, 0)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -18,11 +18,16 @@
 # information.
 """A local proxy for a remote executor service hosted on a separate machine."""
 
-from typing import Mapping
+import asyncio
+import collections
+import inspect
+from typing import List, Mapping, Optional, Sequence, Union
+import uuid
 import weakref
 
 from absl import logging
 import grpc
+import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -32,12 +37,41 @@ from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_value_base
 from tensorflow_federated.python.core.impl.executors import executors_errors
 from tensorflow_federated.python.core.impl.executors import remote_executor_stub
+from tensorflow_federated.python.core.impl.executors import value_compression
 from tensorflow_federated.python.core.impl.executors import value_serialization
 from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 
 _STREAM_CLOSE_WAIT_SECONDS = 10
 
+# The maximum number of digests of values uploaded to the remote executor
+# service that a `RemoteExecutor` remembers.
+_MAX_CACHED_DIGESTS = 1000
+
+
+async def _resolve_response(response):
+  """Awaits `response` if it was returned by an asynchronous stub."""
+  if inspect.isawaitable(response):
+    return await response
+  return response
+
+
+async def _add_chunks(chunks,
+                      deserializer: value_serialization.ValueChunkDeserializer):
+  """Adds the chunks streamed by a synchronous or an asynchronous stub."""
+  if hasattr(chunks, '__aiter__'):
+    async for chunk in chunks:
+      deserializer.add_chunk(chunk)
+  else:
+    for chunk in chunks:
+      deserializer.add_chunk(chunk)
+
+
+def _is_unimplemented_error(error: Exception) -> bool:
+  """Returns `True` if `error` signals that a stub method is not supported."""
+  return isinstance(error, NotImplementedError) or (isinstance(
+      error, grpc.RpcError) and error.code() == grpc.StatusCode.UNIMPLEMENTED)
+
 
 class RemoteValue(executor_value_base.ExecutorValue):
   """A reference to a value embedded in a remotely deployed executor service."""
@@ -71,8 +105,21 @@ class RemoteValue(executor_value_base.ExecutorValue):
     return self._type_signature
 
   @tracing.trace(span=True)
-  async def compute(self):
-    return await self._executor._compute(self._value_ref, self._type_signature)  # pylint: disable=protected-access
+  async def compute(self, *, lossy_float_transport: bool = False):
+    """Computes the value.
+
+    Args:
+      lossy_float_transport: Whether the large floating point tensors of the
+        value may be cast to the `float_transport_dtype` of the executor while
+        they are transferred, losing precision.
+
+    Returns:
+      The computed value.
+    """
+    return await self._executor._compute(  # pylint: disable=protected-access
+        self._value_ref,
+        self._type_signature,
+        lossy_float_transport=lossy_float_transport)
 
   @property
   def value_ref(self):
@@ -80,15 +127,58 @@ class RemoteValue(executor_value_base.ExecutorValue):
 
 
 class RemoteExecutor(executor_base.Executor):
-  """The remote executor is a local proxy for a remote executor instance."""
-
-  # TODO(b/134543154): Switch to using an asynchronous gRPC client so we don't
-  # have to block on all those calls.
+  """The remote executor is a local proxy for a remote executor instance.
+
+  If the `stub` returns awaitables from `create_value`, `create_call`,
+  `create_struct`, `create_selection` and `compute` (as
+  `remote_executor_grpc_aio_stub.RemoteExecutorGrpcAioStub` does), these
+  requests are awaited rather than blocked on, so that many requests to the
+  same remote executor service can be in flight concurrently.
+
+  If `batch_operations` is enabled, the `create_*` methods return immediately
+  with a value reference chosen by this executor, and the operations are sent
+  to the remote executor service in a single `ExecutePlan` request together
+  with the next request to compute a value.
+
+  If `stream_chunk_size_bytes` is set, values are uploaded with
+  `CreateValueStream` and downloaded with `ComputeStream` in chunks of at most
+  that many bytes, so that the size of a value is not limited by the maximum
+  size of a gRPC message, and the serialized value is never held in memory as a
+  whole.
+
+  If `raw_tensors` is enabled, values are sent to and requested from the remote
+  executor service with their numeric tensors in the raw-buffer `raw_tensor`
+  encoding of `executor_pb2.Value`, which is cheaper to serialize and
+  deserialize than a `tensorflow.TensorProto`. The remote executor service must
+  be able to deserialize this encoding (as the Python `ExecutorService` does).
+
+  If `value_cache_min_size_bytes` is set, values which serialize to at least
+  that many bytes are uploaded together with a digest of their content, which
+  the remote executor service uses to cache them. When the same value is
+  created again, only its digest is sent, and the value is uploaded again only
+  if the remote executor service no longer holds it.
+
+  If `compression` or `float_transport_dtype` are set, they are negotiated with
+  the remote executor service when this executor is configured with
+  `set_cardinalities`, and used only if the remote executor service accepts
+  them. The values sent in either direction are then compressed. Since the
+  cast to `float_transport_dtype` loses precision, it is opt-in for each value:
+  the large floating point tensors of a value are only cast if
+  `lossy_float_transport=True` is passed to `create_value` or to the `compute`
+  method of the `RemoteValue`. Values transferred as streams of chunks are
+  neither compressed nor cast.
+  """
 
   def __init__(self,
                stub: remote_executor_stub.RemoteExecutorStub,
                thread_pool_executor=None,
-               dispose_batch_size=20):
+               dispose_batch_size=20,
+               batch_operations=False,
+               stream_chunk_size_bytes=None,
+               raw_tensors=False,
+               value_cache_min_size_bytes=None,
+               compression=None,
+               float_transport_dtype=None):
     """Creates a remote executor.
 
     Args:
@@ -101,9 +191,54 @@ class RemoteExecutor(executor_base.Executor):
         worker values. Lower values will result in more requests to the remote
         worker, but will result in values being cleaned up sooner and therefore
         may result in lower memory usage on the remote worker.
+      batch_operations: Whether to batch the operations on this executor into
+        `ExecutePlan` requests. If the remote executor service does not support
+        `ExecutePlan`, this executor falls back to one request per operation.
+      stream_chunk_size_bytes: Optional maximum number of bytes of value
+        content in each chunk sent to or received from the remote executor
+        service. If specified, values are transferred as streams of chunks. If
+        the remote executor service does not support streaming, this executor
+        falls back to transferring each value in a single message.
+      raw_tensors: Whether to transfer numeric tensors in the `raw_tensor`
+        encoding of `executor_pb2.Value`.
+      value_cache_min_size_bytes: Optional minimum serialized size of the
+        values which are cached by the remote executor service. If specified,
+        such values are only uploaded again if the remote executor service no
+        longer holds them. If the remote executor service does not support
+        caching values, this executor falls back to uploading every value.
+      compression: Optional name of a lossless compression of values (one of
+        `'zlib'`, `'zstd'` or `'lz4'`), which is used if the remote executor
+        service supports it.
+      float_transport_dtype: Optional `tf.float16` or `tf.bfloat16`. If
+        specified, and the remote executor service supports it, the
+        `tf.float32` and `tf.float64` tensors with at least 1024 elements of
+        the values created or computed with `lossy_float_transport=True` are
+        cast to this dtype while they are transferred, losing precision.
+        Tensors with values outside of the range of this dtype are not cast.
+
+    Raises:
+      ValueError: If `compression` is unknown or not installed, or if
+        `float_transport_dtype` is not supported.
     """
 
     py_typecheck.check_type(dispose_batch_size, int)
+    py_typecheck.check_type(batch_operations, bool)
+    py_typecheck.check_type(raw_tensors, bool)
+    if stream_chunk_size_bytes is not None:
+      py_typecheck.check_type(stream_chunk_size_bytes, int)
+      if stream_chunk_size_bytes <= 0:
+        raise ValueError('Expected a positive `stream_chunk_size_bytes`, '
+                         f'found {stream_chunk_size_bytes}.')
+    if value_cache_min_size_bytes is not None:
+      py_typecheck.check_type(value_cache_min_size_bytes, int)
+    if compression is not None:
+      compression = value_compression.compression_from_name(compression)
+    if float_transport_dtype is not None:
+      float_transport_dtype = tf.dtypes.as_dtype(float_transport_dtype)
+      supported_dtypes = value_serialization.FLOAT_TRANSPORT_DTYPES
+      if float_transport_dtype not in supported_dtypes:
+        raise ValueError('Expected `float_transport_dtype` to be one of '
+                         f'{supported_dtypes}, found {float_transport_dtype}.')
 
     logging.debug('Creating new ExecutorStub')
 
@@ -111,8 +246,29 @@ class RemoteExecutor(executor_base.Executor):
     # object from being GC'ed and the callback above from no-op'ing.
     self._stub = stub
     self._executor_id = None
-    self._dispose_request = None
+    self._disposed_value_refs = collections.deque()
     self._dispose_batch_size = dispose_batch_size
+    self._batch_operations = batch_operations
+    self._execute_plan_supported = None
+    # Values may be disposed of by finalizers running on any thread, so the
+    # disposed values and the pending operations are only appended to and
+    # drained with `popleft`, which are atomic.
+    self._pending_operations = collections.deque()
+    self._previous_plan = None
+    self._stream_chunk_size_bytes = stream_chunk_size_bytes
+    self._streaming_supported = None
+    self._raw_tensors = raw_tensors
+    self._value_cache_min_size_bytes = value_cache_min_size_bytes
+    self._value_cache_supported = None
+    # The digests of the values uploaded to the remote executor service, from
+    # the least to the most recently used.
+    self._cached_digests = collections.OrderedDict()
+    self._requested_compression = compression
+    self._requested_float_transport_dtype = float_transport_dtype
+    # The compression and float transport dtype accepted by the remote executor
+    # service.
+    self._compression = executor_pb2.COMPRESSION_UNSPECIFIED
+    self._float_transport_dtype = None
 
   def close(self):
     logging.debug('Clearing executor state on server.')
@@ -131,13 +287,273 @@ class RemoteExecutor(executor_base.Executor):
       # The executor this value corresponds to was already disposed, so we can
       # skip disposing this value.
       return
-    self._dispose_request.value_ref.append(value_ref)
-    if len(self._dispose_request.value_ref) < self._dispose_batch_size:
+    self._disposed_value_refs.append(value_ref)
+    if len(self._disposed_value_refs) < self._dispose_batch_size:
+      return
+    dispose_request = executor_pb2.DisposeRequest(executor=self._executor_id)
+    try:
+      for _ in range(self._dispose_batch_size):
+        dispose_request.value_ref.append(self._disposed_value_refs.popleft())
+    except IndexError:
+      # Another thread took the remaining values.
+      if not dispose_request.value_ref:
+        return
+    if self._execute_plan_supported:
+      # The values may not have been created on the remote executor service
+      # yet, so they must be disposed of in order with the pending operations.
+      self._pending_operations.append(
+          executor_pb2.ExecutePlanRequest.Operation(dispose=dispose_request))
+    else:
+      self._stub.dispose(dispose_request)
+
+  async def _use_execute_plan(self) -> bool:
+    """Returns `True` if operations should be batched into `ExecutePlan`."""
+    if not self._batch_operations:
+      return False
+    if self._execute_plan_supported is None:
+      request = executor_pb2.ExecutePlanRequest(executor=self._executor_id)
+      try:
+        await _resolve_response(self._stub.execute_plan(request))
+        self._execute_plan_supported = True
+      except (NotImplementedError, grpc.RpcError) as e:
+        if not _is_unimplemented_error(e):
+          raise
+        self._execute_plan_supported = False
+      if not self._execute_plan_supported:
+        logging.info('The remote executor service does not support '
+                     '`ExecutePlan`; falling back to one request per '
+                     'operation.')
+    return self._execute_plan_supported
+
+  def _add_pending_operation(self, **kwargs) -> executor_pb2.ValueRef:
+    """Adds an operation to the next plan and returns its value reference."""
+    value_ref = executor_pb2.ValueRef(id=str(uuid.uuid4()))
+    self._pending_operations.append(
+        executor_pb2.ExecutePlanRequest.Operation(
+            result_ref=value_ref, **kwargs))
+    return value_ref
+
+  def _take_plan(
+      self, operations: List[executor_pb2.ExecutePlanRequest.Operation]
+  ) -> executor_pb2.ExecutePlanRequest:
+    """Returns a plan of the pending operations followed by `operations`."""
+    pending_operations = []
+    while self._pending_operations:
+      pending_operations.append(self._pending_operations.popleft())
+    return executor_pb2.ExecutePlanRequest(
+        executor=self._executor_id, operation=pending_operations + operations)
+
+  async def _register_pending_operations(self):
+    """Sends the pending operations after all previously sent operations."""
+    previous_plan = self._previous_plan
+    request = self._take_plan([])
+
+    async def _register():
+      if previous_plan is not None:
+        try:
+          await previous_plan
+        except Exception:  # pylint: disable=broad-except
+          pass  # The error is reported to the caller of the previous plan.
+      if request.operation:
+        await self._stub.execute_plan(request)
+
+    self._previous_plan = asyncio.ensure_future(_register())
+    await self._previous_plan
+
+  async def _send_pending_operations(self):
+    """Sends the pending operations without computing a value."""
+    if inspect.iscoroutinefunction(self._stub.execute_plan):
+      await self._register_pending_operations()
+    elif self._pending_operations:
+      self._stub.execute_plan(self._take_plan([]))
+
+  def _use_streaming(self) -> bool:
+    """Returns `True` if values should be transferred as streams of chunks."""
+    return (self._stream_chunk_size_bytes is not None and
+            self._streaming_supported is not False)
+
+  def _disable_streaming(self):
+    logging.info('The remote executor service does not support streaming '
+                 'values; falling back to one message per value.')
+    self._streaming_supported = False
+
+  def _value_digest(
+      self, messages: Sequence[Union[executor_pb2.Value,
+                                     executor_pb2.ValueChunk]]
+  ) -> Optional[bytes]:
+    """Returns the digest of a value which should be cached, or `None`."""
+    if (self._value_cache_min_size_bytes is None or
+        self._value_cache_supported is False):
+      return None
+    size_bytes = sum(message.ByteSize() for message in messages)
+    if size_bytes < self._value_cache_min_size_bytes:
+      return None
+    value_digest = value_serialization.ValueDigest()
+    for message in messages:
+      value_digest.update(message)
+    return value_digest.digest()
+
+  def _add_cached_digest(self, value_digest: Optional[bytes]):
+    """Records that the value with `value_digest` was uploaded."""
+    if value_digest is None:
       return
-    dispose_request = self._dispose_request
-    self._dispose_request = executor_pb2.DisposeRequest(
-        executor=self._executor_id)
-    self._stub.dispose(dispose_request)
+    self._cached_digests[value_digest] = None
+    self._cached_digests.move_to_end(value_digest)
+    while len(self._cached_digests) > _MAX_CACHED_DIGESTS:
+      self._cached_digests.popitem(last=False)
+
+  @tracing.trace(span=True)
+  async def _create_cached_value(self, value_digest: Optional[bytes],
+                                 type_spec) -> Optional[RemoteValue]:
+    """Creates a value cached by the remote executor service.
+
+    Args:
+      value_digest: The digest of the value, or `None` if it is not cached.
+      type_spec: The type of the value.
+
+    Returns:
+      A `RemoteValue`, or `None` if the remote executor service does not hold
+      the value and it must be uploaded.
+    """
+    if value_digest is None or value_digest not in self._cached_digests:
+      return None
+    request = executor_pb2.CreateValueRequest(
+        executor=self._executor_id, value_digest=value_digest)
+    try:
+      response = await _resolve_response(self._stub.create_value(request))
+    except (NotImplementedError, grpc.RpcError) as e:
+      # Remote executor services which do not support caching values fail to
+      # deserialize the missing value.
+      if self._value_cache_supported or not (
+          _is_unimplemented_error(e) or
+          e.code() == grpc.StatusCode.INVALID_ARGUMENT):
+        raise
+      logging.info('The remote executor service does not support caching '
+                   'values; falling back to uploading every value.')
+      self._value_cache_supported = False
+      return None
+    py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
+    self._value_cache_supported = True
+    if not response.HasField('value_ref'):
+      # The value was evicted from the cache of the remote executor service.
+      del self._cached_digests[value_digest]
+      return None
+    self._cached_digests.move_to_end(value_digest)
+    return RemoteValue(response.value_ref, type_spec, self)
+
+  @tracing.trace(span=True)
+  async def _create_value_stream(self, value, type_spec):
+    """Uploads `value` in chunks, returning `None` if this is not supported."""
+    chunks, type_spec = value_serialization.serialize_value_to_chunks(
+        value, type_spec, self._stream_chunk_size_bytes)
+    value_digest = None
+    if self._value_cache_min_size_bytes is not None:
+      # The digest covers all the chunks, so they are serialized upfront.
+      chunks = list(chunks)
+      value_digest = self._value_digest(chunks)
+      remote_value = await self._create_cached_value(value_digest, type_spec)
+      if remote_value is not None:
+        return remote_value
+    serialization_errors = []
+
+    def _requests():
+      executor_id = self._executor_id
+      digest = value_digest
+      try:
+        for chunk in chunks:
+          # Only the first request of the stream needs to name the executor and
+          # the digest of the value.
+          yield executor_pb2.CreateValueStreamRequest(
+              executor=executor_id, chunk=chunk, value_digest=digest)
+          executor_id = None
+          digest = None
+      except Exception as e:  # pylint: disable=broad-except
+        serialization_errors.append(e)
+        raise
+
+    try:
+      response = await _resolve_response(
+          self._stub.create_value_stream(_requests()))
+    except Exception as e:  # pylint: disable=broad-except
+      if serialization_errors:
+        # Errors raised while iterating the requests are reported by gRPC as
+        # a cancelled call, so the original error is raised instead.
+        raise serialization_errors[0]
+      if not _is_unimplemented_error(e):
+        raise
+      self._disable_streaming()
+      return None
+    py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
+    self._streaming_supported = True
+    self._add_cached_digest(value_digest)
+    return RemoteValue(response.value_ref, type_spec, self)
+
+  @tracing.trace(span=True)
+  async def _compute_stream(self, value_ref, type_spec):
+    """Downloads a value in chunks, returning `None` if this is not supported.
+
+    Args:
+      value_ref: The `executor_pb2.ValueRef` of the value to compute.
+      type_spec: The type of the value.
+
+    Returns:
+      A 1-tuple with the computed value, or `None` if the remote executor
+      service does not support streaming values.
+    """
+    request = executor_pb2.ComputeStreamRequest(
+        executor=self._executor_id,
+        value_ref=value_ref,
+        chunk_size_bytes=self._stream_chunk_size_bytes)
+    deserializer = value_serialization.ValueChunkDeserializer(type_spec)
+    try:
+      await _add_chunks(self._stub.compute_stream(request), deserializer)
+    except (NotImplementedError, grpc.RpcError) as e:
+      if not _is_unimplemented_error(e):
+        raise
+      self._disable_streaming()
+      return None
+    self._streaming_supported = True
+    value, _ = deserializer.result()
+    return (value,)
+
+  def _compute_request(
+      self, value_ref: executor_pb2.ValueRef,
+      executor_id: Optional[executor_pb2.ExecutorId],
+      lossy_float_transport: bool) -> executor_pb2.ComputeRequest:
+    """Returns a request to compute `value_ref` in the negotiated encoding."""
+    if lossy_float_transport and self._float_transport_dtype is not None:
+      float_transport_dtype = self._float_transport_dtype.as_datatype_enum
+    else:
+      float_transport_dtype = None
+    return executor_pb2.ComputeRequest(
+        executor=executor_id,
+        value_ref=value_ref,
+        raw_tensors=self._raw_tensors,
+        compression=self._compression,
+        float_transport_dtype=float_transport_dtype)
+
+  @tracing.trace(span=True)
+  async def _compute_with_plan(
+      self, value_ref: executor_pb2.ValueRef,
+      lossy_float_transport: bool) -> executor_pb2.Value:
+    """Computes `value_ref` together with the pending operations."""
+    compute = executor_pb2.ExecutePlanRequest.Operation(
+        compute=self._compute_request(
+            value_ref,
+            executor_id=None,
+            lossy_float_transport=lossy_float_transport))
+    if inspect.iscoroutinefunction(self._stub.execute_plan):
+      # Requests sent through an asynchronous stub can be in flight at the same
+      # time and processed in any order, so the pending operations are created
+      # before the value is computed in a separate request.
+      await self._register_pending_operations()
+      request = executor_pb2.ExecutePlanRequest(
+          executor=self._executor_id, operation=[compute])
+      response = await self._stub.execute_plan(request)
+    else:
+      response = self._stub.execute_plan(self._take_plan([compute]))
+    py_typecheck.check_type(response, executor_pb2.ExecutePlanResponse)
+    return response.result[-1].compute.value
 
   @tracing.trace(span=True)
   def set_cardinalities(self,
@@ -149,9 +565,28 @@ class RemoteExecutor(executor_base.Executor):
         cardinalities)
     request = executor_pb2.GetExecutorRequest(
         cardinalities=serialized_cardinalities)
-    self._executor_id = self._stub.get_executor(request).executor
-    self._dispose_request = executor_pb2.DisposeRequest(
-        executor=self._executor_id)
+    if self._requested_compression is not None:
+      request.compressions.append(self._requested_compression)
+    if self._requested_float_transport_dtype is not None:
+      request.float_transport_dtype = (
+          self._requested_float_transport_dtype.as_datatype_enum)
+    response = self._stub.get_executor(request)
+    self._executor_id = response.executor
+    # Only read the negotiated transport if one was requested, so responses of
+    # services which do not support negotiation are never inspected.
+    self._compression = executor_pb2.COMPRESSION_UNSPECIFIED
+    self._float_transport_dtype = None
+    if self._requested_compression is not None:
+      self._compression = response.compression
+    if (self._requested_float_transport_dtype is not None and
+        response.float_transport_dtype):
+      self._float_transport_dtype = tf.dtypes.as_dtype(
+          response.float_transport_dtype)
+    self._disposed_value_refs.clear()
+    self._execute_plan_supported = None
+    self._streaming_supported = None
+    self._value_cache_supported = None
+    self._cached_digests.clear()
 
   @tracing.trace(span=True)
   def _clear_executor(self):
@@ -165,22 +600,69 @@ class RemoteExecutor(executor_base.Executor):
                     'server; this likely indicates a broken connection, and '
                     'therefore there is no state to clear.')
     self._executor_id = None
-    self._dispose_request = None
+    self._disposed_value_refs.clear()
+    self._pending_operations.clear()
+    self._previous_plan = None
+    self._cached_digests.clear()
     return
 
   @tracing.trace(span=True)
-  async def create_value(self, value, type_spec=None):
+  async def create_value(self,
+                         value,
+                         type_spec=None,
+                         *,
+                         lossy_float_transport: bool = False):
+    """Creates a value on the remote executor service.
+
+    Args:
+      value: The value to create.
+      type_spec: An optional TFF type of `value`.
+      lossy_float_transport: Whether the large floating point tensors of
+        `value` may be cast to `float_transport_dtype` while they are
+        transferred, losing precision.
+
+    Returns:
+      A `RemoteValue` referencing the created value.
+    """
     self._check_has_executor_id()
+    if lossy_float_transport:
+      float_transport_dtype = self._float_transport_dtype
+    else:
+      float_transport_dtype = None
 
     @tracing.trace
     def serialize_value():
-      return value_serialization.serialize_value(value, type_spec)
-
+      value_proto, value_type = value_serialization.serialize_value(
+          value,
+          type_spec,
+          raw_tensors=self._raw_tensors,
+          float_transport_dtype=float_transport_dtype)
+      return (value_compression.compress_value(value_proto,
+                                               self._compression), value_type)
+
+    if self._use_streaming():
+      remote_value = await self._create_value_stream(value, type_spec)
+      if remote_value is not None:
+        return remote_value
     value_proto, type_spec = serialize_value()
+    value_digest = self._value_digest([value_proto])
+    remote_value = await self._create_cached_value(value_digest, type_spec)
+    if remote_value is not None:
+      return remote_value
+    if await self._use_execute_plan():
+      value_ref = self._add_pending_operation(
+          create_value=executor_pb2.CreateValueRequest(
+              value=value_proto, value_digest=value_digest))
+      self._add_cached_digest(value_digest)
+      return RemoteValue(value_ref, type_spec, self)
     create_value_request = executor_pb2.CreateValueRequest(
-        executor=self._executor_id, value=value_proto)
-    response = self._stub.create_value(create_value_request)
+        executor=self._executor_id,
+        value=value_proto,
+        value_digest=value_digest)
+    response = await _resolve_response(
+        self._stub.create_value(create_value_request))
     py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
+    self._add_cached_digest(value_digest)
     return RemoteValue(response.value_ref, type_spec, self)
 
   @tracing.trace(span=True)
@@ -190,11 +672,18 @@ class RemoteExecutor(executor_base.Executor):
     py_typecheck.check_type(comp.type_signature, computation_types.FunctionType)
     if arg is not None:
       py_typecheck.check_type(arg, RemoteValue)
+    if await self._use_execute_plan():
+      value_ref = self._add_pending_operation(
+          create_call=executor_pb2.CreateCallRequest(
+              function_ref=comp.value_ref,
+              argument_ref=(arg.value_ref if arg is not None else None)))
+      return RemoteValue(value_ref, comp.type_signature.result, self)
     create_call_request = executor_pb2.CreateCallRequest(
         executor=self._executor_id,
         function_ref=comp.value_ref,
         argument_ref=(arg.value_ref if arg is not None else None))
-    response = self._stub.create_call(create_call_request)
+    response = await _resolve_response(
+        self._stub.create_call(create_call_request))
     py_typecheck.check_type(response, executor_pb2.CreateCallResponse)
     return RemoteValue(response.value_ref, comp.type_signature.result, self)
 
@@ -211,9 +700,13 @@ class RemoteExecutor(executor_base.Executor):
               name=(k if k else None), value_ref=v.value_ref))
       type_elem.append((k, v.type_signature) if k else v.type_signature)
     result_type = computation_types.StructType(type_elem)
+    if await self._use_execute_plan():
+      value_ref = self._add_pending_operation(
+          create_struct=executor_pb2.CreateStructRequest(element=proto_elem))
+      return RemoteValue(value_ref, result_type, self)
     request = executor_pb2.CreateStructRequest(
         executor=self._executor_id, element=proto_elem)
-    response = self._stub.create_struct(request)
+    response = await _resolve_response(self._stub.create_struct(request))
     py_typecheck.check_type(response, executor_pb2.CreateStructResponse)
     return RemoteValue(response.value_ref, result_type, self)
 
@@ -224,19 +717,39 @@ class RemoteExecutor(executor_base.Executor):
     py_typecheck.check_type(source.type_signature, computation_types.StructType)
     py_typecheck.check_type(index, int)
     result_type = source.type_signature[index]
+    if await self._use_execute_plan():
+      value_ref = self._add_pending_operation(
+          create_selection=executor_pb2.CreateSelectionRequest(
+              source_ref=source.value_ref, index=index))
+      return RemoteValue(value_ref, result_type, self)
     request = executor_pb2.CreateSelectionRequest(
         executor=self._executor_id, source_ref=source.value_ref, index=index)
-    response = self._stub.create_selection(request)
+    response = await _resolve_response(self._stub.create_selection(request))
     py_typecheck.check_type(response, executor_pb2.CreateSelectionResponse)
     return RemoteValue(response.value_ref, result_type, self)
 
   @tracing.trace(span=True)
-  async def _compute(self, value_ref, type_spec):
+  async def _compute(self,
+                     value_ref,
+                     type_spec,
+                     lossy_float_transport: bool = False):
     self._check_has_executor_id()
     py_typecheck.check_type(value_ref, executor_pb2.ValueRef)
-    request = executor_pb2.ComputeRequest(
-        executor=self._executor_id, value_ref=value_ref)
-    response = self._stub.compute(request)
-    py_typecheck.check_type(response, executor_pb2.ComputeResponse)
-    value, _ = value_serialization.deserialize_value(response.value, type_spec)
+    use_execute_plan = await self._use_execute_plan()
+    if self._use_streaming():
+      if use_execute_plan:
+        await self._send_pending_operations()
+      result = await self._compute_stream(value_ref, type_spec)
+      if result is not None:
+        return result[0]
+    if use_execute_plan:
+      value_proto = await self._compute_with_plan(value_ref,
+                                                  lossy_float_transport)
+    else:
+      request = self._compute_request(value_ref, self._executor_id,
+                                      lossy_float_transport)
+      response = await _resolve_response(self._stub.compute(request))
+      py_typecheck.check_type(response, executor_pb2.ComputeResponse)
+      value_proto = response.value
+    value, _ = value_serialization.deserialize_value(value_proto, type_spec)
     return value
@@ -0,0 +1,282 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# pytype: skip-file
+# This modules disables the Pytype analyzer, see
+# https://github.com/tensorflow/federated/blob/main/docs/pytype.md for more
+# information.
+"""A stub connects to a remote executor over an asynchronous gRPC channel."""
+
+import concurrent.futures
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Tuple
+import weakref
+
+from absl import logging
+import grpc
+
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.proto.v0 import executor_pb2_grpc
+from tensorflow_federated.python.common_libs import async_utils
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.executors import executors_errors
+from tensorflow_federated.python.core.impl.executors import remote_executor_stub
+
+
+def _is_retryable_grpc_error(error):
+  """Predicate defining what is a retryable gRPC error."""
+  return (isinstance(error, grpc.RpcError) and
+          error.code() in executors_errors.get_grpc_retryable_error_codes())
+
+
+@tracing.trace(span=True)
+async def _request(rpc_func, request):
+  """Populates trace context and reraises gRPC errors with retryable info."""
+  with tracing.wrap_rpc_in_trace_context():
+    try:
+      return await rpc_func(request)
+    except grpc.RpcError as e:
+      if _is_retryable_grpc_error(e):
+        logging.info('Received retryable gRPC error: %s', e)
+        raise executors_errors.RetryableGRPCError(e)
+      else:
+        raise
+
+
+async def _read_from_stream(call):
+  """Reads the next message of a streaming `call`, like `_request`."""
+  try:
+    return await call.read()
+  except grpc.RpcError as e:
+    if _is_retryable_grpc_error(e):
+      logging.info('Received retryable gRPC error: %s', e)
+      raise executors_errors.RetryableGRPCError(e)
+    else:
+      raise
+
+
+def _log_dispose_error(future):
+  if future.cancelled():
+    return
+  error = future.exception()
+  if error is not None:
+    logging.debug('Error disposing of remote values: %s', error)
+
+
+async def _watch_connectivity(channel: grpc.aio.Channel,
+                              status: List[Optional[grpc.ChannelConnectivity]]):
+  """Records the connectivity state of `channel` in `status` until cancelled."""
+  state = channel.get_state(try_to_connect=True)
+  while True:
+    status[0] = state
+    await channel.wait_for_state_change(state)
+    state = channel.get_state(try_to_connect=True)
+
+
+def _close_channel(async_runner: async_utils.AsyncThreadRunner,
+                   channel: grpc.aio.Channel,
+                   watch_future) -> concurrent.futures.Future:
+  """Stops watching `channel` and closes it, without waiting for either."""
+  # Only references the resources of the stub, not the stub itself, so it can
+  # be used as the finalizer of the stub. It may run on the thread driving the
+  # channel, so it must never block.
+  watch_future.cancel()
+
+  async def _close():
+    await channel.close()
+
+  return async_runner.submit_coro(_close())
+
+
+class RemoteExecutorGrpcAioStub(remote_executor_stub.RemoteExecutorStub):
+  """A stub connects to a remote executor service over `grpc.aio`.
+
+  Unlike `RemoteExecutorGrpcStub`, the `create_value`, `create_call`,
+  `create_struct`, `create_selection`, `compute`, `execute_plan` and
+  `create_value_stream` methods of this stub are coroutine functions, and
+  `compute_stream` returns an asynchronous iterator. Calls are issued on a
+  `grpc.aio` channel driven by an event loop owned by this stub, so any number
+  of requests can be outstanding on the same connection without blocking the
+  event loop of the caller.
+  `RemoteExecutor` awaits these responses rather than blocking on them.
+
+  The remaining methods (`get_executor`, `dispose`, `dispose_executor`) keep
+  the synchronous interface of `remote_executor_stub.RemoteExecutorStub`.
+  Requests to `dispose` are sent in the background and do not wait for the
+  reply.
+
+  The channel is closed by `close`, or when the stub is garbage collected.
+  """
+
+  def __init__(self,
+               target: str,
+               credentials: Optional[grpc.ChannelCredentials] = None,
+               options: Optional[Sequence[Tuple[str, str]]] = None):
+    """Initialize the stub by establishing the connection.
+
+    Args:
+      target: The address of the remote executor service, e.g.
+        `'localhost:8000'`.
+      credentials: Optional `grpc.ChannelCredentials`. If specified, a secure
+        channel is created, otherwise the channel is insecure.
+      options: Optional sequence of key-value pairs used to configure the
+        channel.
+    """
+    py_typecheck.check_type(target, str)
+    if credentials is not None:
+      py_typecheck.check_type(credentials, grpc.ChannelCredentials)
+
+    # `grpc.aio` channels are bound to the event loop they are created in, so
+    # the channel is created and driven exclusively on the loop owned by
+    # `self._async_runner`.
+    self._async_runner = async_utils.AsyncThreadRunner()
+
+    async def _create_channel():
+      if credentials is None:
+        return grpc.aio.insecure_channel(target, options=options)
+      else:
+        return grpc.aio.secure_channel(target, credentials, options=options)
+
+    self._channel = self._async_runner.run_coro_and_return_result(
+        _create_channel())
+    self._stub = executor_pb2_grpc.ExecutorGroupStub(self._channel)
+    # A single element list updated by the watcher, which must not hold a
+    # reference to `self` for the finalizer below to run.
+    self._channel_status = [None]
+    watch_future = self._async_runner.submit_coro(
+        _watch_connectivity(self._channel, self._channel_status))
+    self._finalizer = weakref.finalize(self, _close_channel, self._async_runner,
+                                       self._channel, watch_future)
+
+  def close(self):
+    """Stops watching the connectivity of the channel and closes it.
+
+    Outstanding calls on the channel are cancelled. Calling `close` more than
+    once has no effect.
+    """
+    future = self._finalizer()
+    if future is not None:
+      future.result()
+
+  def _run_sync(self, rpc_func, request):
+    coro = tracing.wrap_coroutine_in_current_trace_context(
+        _request(rpc_func, request))
+    return self._async_runner.run_coro_and_return_result(coro)
+
+  async def _run_async(self, rpc_func, request):
+    coro = tracing.wrap_coroutine_in_current_trace_context(
+        _request(rpc_func, request))
+    return await self._async_runner.await_coro_and_return_result(coro)
+
+  def get_executor(
+      self, request: executor_pb2.GetExecutorRequest
+  ) -> executor_pb2.GetExecutorResponse:
+    """Dispatches a GetExecutor gRPC."""
+    return self._run_sync(self._stub.GetExecutor, request)
+
+  async def create_value(
+      self, request: executor_pb2.CreateValueRequest
+  ) -> executor_pb2.CreateValueResponse:
+    """Dispatches a CreateValue gRPC."""
+    return await self._run_async(self._stub.CreateValue, request)
+
+  async def create_struct(
+      self, request: executor_pb2.CreateStructRequest
+  ) -> executor_pb2.CreateStructResponse:
+    """Dispatches a CreateStruct gRPC."""
+    return await self._run_async(self._stub.CreateStruct, request)
+
+  async def create_call(
+      self, request: executor_pb2.CreateCallRequest
+  ) -> executor_pb2.CreateCallResponse:
+    """Dispatches a CreateCall gRPC."""
+    return await self._run_async(self._stub.CreateCall, request)
+
+  async def create_selection(
+      self, request: executor_pb2.CreateSelectionRequest
+  ) -> executor_pb2.CreateSelectionResponse:
+    """Dispatches a CreateSelection gRPC."""
+    return await self._run_async(self._stub.CreateSelection, request)
+
+  async def compute(
+      self,
+      request: executor_pb2.ComputeRequest) -> executor_pb2.ComputeResponse:
+    """Dispatches a Compute gRPC."""
+    return await self._run_async(self._stub.Compute, request)
+
+  async def execute_plan(
+      self, request: executor_pb2.ExecutePlanRequest
+  ) -> executor_pb2.ExecutePlanResponse:
+    """Dispatches an ExecutePlan gRPC."""
+    return await self._run_async(self._stub.ExecutePlan, request)
+
+  async def create_value_stream(
+      self, requests: Iterable[executor_pb2.CreateValueStreamRequest]
+  ) -> executor_pb2.CreateValueResponse:
+    """Dispatches a CreateValueStream gRPC."""
+    return await self._run_async(self._stub.CreateValueStream, iter(requests))
+
+  async def compute_stream(
+      self, request: executor_pb2.ComputeStreamRequest
+  ) -> AsyncIterator[executor_pb2.ValueChunk]:
+    """Dispatches a ComputeStream gRPC.
+
+    Args:
+      request: ComputeStreamRequest.
+
+    Yields:
+      The ValueChunks of the computed value, as they are received.
+    """
+
+    async def _start_call():
+      with tracing.wrap_rpc_in_trace_context():
+        return self._stub.ComputeStream(request)
+
+    call = await self._async_runner.await_coro_and_return_result(_start_call())
+
+    async def _cancel_call():
+      call.cancel()
+
+    try:
+      while True:
+        chunk = await self._async_runner.await_coro_and_return_result(
+            _read_from_stream(call))
+        if chunk is grpc.aio.EOF:
+          return
+        yield chunk
+    finally:
+      # Stops the server from sending the rest of the value if the caller stops
+      # iterating early. This is a no-op if the call has already finished.
+      self._async_runner.submit_coro(_cancel_call())
+
+  def dispose(
+      self,
+      request: executor_pb2.DisposeRequest) -> executor_pb2.DisposeResponse:
+    """Dispatches a Dispose gRPC without waiting for the reply."""
+    # Dispose is invoked from finalizers, which may run on any thread
+    # (including the thread driving the channel), so it must never block.
+    future = self._async_runner.submit_coro(
+        _request(self._stub.Dispose, request))
+    future.add_done_callback(_log_dispose_error)
+    return executor_pb2.DisposeResponse()
+
+  def dispose_executor(
+      self, request: executor_pb2.DisposeExecutorRequest
+  ) -> executor_pb2.DisposeExecutorResponse:
+    return self._run_sync(self._stub.DisposeExecutor, request)
+
+  @property
+  def is_ready(self) -> bool:
+    """True if the gRPC connection is ready."""
+    return self._channel_status[0] == grpc.ChannelConnectivity.READY
@@ -0,0 +1,229 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for remote_executor_grpc_aio_stub."""
+
+import asyncio
+import contextlib
+import gc
+import time
+from unittest import mock
+
+from absl.testing import absltest
+import grpc
+from grpc.framework.foundation import logging_pool
+import portpicker
+import tensorflow as tf
+
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.proto.v0 import executor_pb2_grpc
+from tensorflow_federated.python.core.impl.executors import executors_errors
+from tensorflow_federated.python.core.impl.executors import remote_executor_grpc_aio_stub
+from tensorflow_federated.python.core.impl.executors import value_serialization
+from tensorflow_federated.python.core.impl.types import computation_types
+
+
+@contextlib.contextmanager
+def _server_context(servicer):
+  port = portpicker.pick_unused_port()
+  server = grpc.server(logging_pool.pool(max_workers=10))
+  server.add_insecure_port('[::]:{}'.format(port))
+  executor_pb2_grpc.add_ExecutorGroupServicer_to_server(servicer, server)
+  server.start()
+  try:
+    yield remote_executor_grpc_aio_stub.RemoteExecutorGrpcAioStub(
+        'localhost:{}'.format(port))
+  finally:
+    server.stop(None)
+
+
+def _create_servicer():
+  return mock.create_autospec(
+      executor_pb2_grpc.ExecutorGroupServicer, instance=True)
+
+
+class RemoteExecutorGrpcAioStubTest(absltest.TestCase):
+
+  def test_is_ready_when_connected(self):
+    with _server_context(_create_servicer()) as stub:
+      deadline = time.time() + 10
+      while not stub.is_ready and time.time() < deadline:
+        time.sleep(0.01)
+      self.assertTrue(stub.is_ready)
+
+  def test_get_executor_returns_response(self):
+    servicer = _create_servicer()
+    response = executor_pb2.GetExecutorResponse(
+        executor=executor_pb2.ExecutorId(id='id'))
+    servicer.GetExecutor.return_value = response
+
+    with _server_context(servicer) as stub:
+      result = stub.get_executor(executor_pb2.GetExecutorRequest())
+
+    servicer.GetExecutor.assert_called_once()
+    self.assertEqual(result, response)
+
+  def test_compute_returns_result(self):
+    servicer = _create_servicer()
+    value, _ = value_serialization.serialize_value(1, tf.int32)
+    servicer.Compute.return_value = executor_pb2.ComputeResponse(value=value)
+
+    with _server_context(servicer) as stub:
+      result = asyncio.run(
+          stub.compute(
+              executor_pb2.ComputeRequest(value_ref=executor_pb2.ValueRef())))
+
+    servicer.Compute.assert_called_once()
+    value, _ = value_serialization.deserialize_value(result.value)
+    self.assertEqual(value, 1)
+
+  def test_compute_stream_returns_chunks(self):
+    servicer = _create_servicer()
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        list(range(10)),
+        computation_types.TensorType(tf.int32, [10]),
+        chunk_size_bytes=8)
+    servicer.ComputeStream.return_value = iter(list(chunks))
+
+    async def _compute(stub):
+      return [
+          chunk async for chunk in stub.compute_stream(
+              executor_pb2.ComputeStreamRequest())
+      ]
+
+    with _server_context(servicer) as stub:
+      result = asyncio.run(_compute(stub))
+
+    servicer.ComputeStream.assert_called_once()
+    value, _ = value_serialization.deserialize_value_from_chunks(result)
+    self.assertEqual(list(value), list(range(10)))
+
+  def test_create_value_stream_returns_response(self):
+    servicer = _create_servicer()
+    received_chunks = []
+
+    def _create_value_stream(request_iterator, context):
+      del context  # Unused.
+      received_chunks.extend(request.chunk for request in request_iterator)
+      return executor_pb2.CreateValueResponse(
+          value_ref=executor_pb2.ValueRef(id='value'))
+
+    servicer.CreateValueStream.side_effect = _create_value_stream
+    chunks, _ = value_serialization.serialize_value_to_chunks(1, tf.int32)
+    chunks = list(chunks)
+
+    with _server_context(servicer) as stub:
+      result = asyncio.run(
+          stub.create_value_stream(
+              executor_pb2.CreateValueStreamRequest(chunk=chunk)
+              for chunk in chunks))
+
+    self.assertEqual(result.value_ref.id, 'value')
+    self.assertEqual(received_chunks, chunks)
+
+  def test_create_value_requests_are_concurrent(self):
+    servicer = _create_servicer()
+    num_requests = 10
+
+    def _create_value(request, context):
+      del request, context  # Unused.
+      # The requests only complete in well under the serial time if they are
+      # outstanding at the same time.
+      time.sleep(0.5)
+      return executor_pb2.CreateValueResponse()
+
+    servicer.CreateValue.side_effect = _create_value
+
+    async def _create_values(stub):
+      return await asyncio.gather(*[
+          stub.create_value(executor_pb2.CreateValueRequest())
+          for _ in range(num_requests)
+      ])
+
+    with _server_context(servicer) as stub:
+      start_time = time.time()
+      results = asyncio.run(_create_values(stub))
+      elapsed_time = time.time() - start_time
+
+    self.assertLen(results, num_requests)
+    self.assertEqual(servicer.CreateValue.call_count, num_requests)
+    self.assertLess(elapsed_time, 0.5 * num_requests / 2)
+
+  def test_create_value_reraises_grpc_error(self):
+    servicer = _create_servicer()
+
+    def _abort(request, context):
+      del request  # Unused.
+      context.abort(grpc.StatusCode.ABORTED, 'Aborted.')
+
+    servicer.CreateValue.side_effect = _abort
+
+    with _server_context(servicer) as stub:
+      with self.assertRaises(grpc.RpcError) as context:
+        asyncio.run(stub.create_value(executor_pb2.CreateValueRequest()))
+
+    self.assertEqual(context.exception.code(), grpc.StatusCode.ABORTED)
+
+  def test_create_call_raises_retryable_error_on_grpc_error_unavailable(self):
+    port = portpicker.pick_unused_port()
+    stub = remote_executor_grpc_aio_stub.RemoteExecutorGrpcAioStub(
+        'localhost:{}'.format(port))
+
+    with self.assertRaises(executors_errors.RetryableError):
+      asyncio.run(stub.create_call(executor_pb2.CreateCallRequest()))
+
+  def test_dispose_does_not_wait_for_response(self):
+    port = portpicker.pick_unused_port()
+    stub = remote_executor_grpc_aio_stub.RemoteExecutorGrpcAioStub(
+        'localhost:{}'.format(port))
+
+    result = stub.dispose(executor_pb2.DisposeRequest())
+
+    self.assertEqual(result, executor_pb2.DisposeResponse())
+
+  def test_close_closes_channel(self):
+    servicer = _create_servicer()
+    servicer.GetExecutor.return_value = executor_pb2.GetExecutorResponse()
+
+    with _server_context(servicer) as stub:
+      stub.close()
+      stub.close()
+
+      with self.assertRaises(grpc.aio.UsageError):
+        stub.get_executor(executor_pb2.GetExecutorRequest())
+    servicer.GetExecutor.assert_not_called()
+
+  def test_garbage_collection_closes_channel(self):
+    port = portpicker.pick_unused_port()
+    stub = remote_executor_grpc_aio_stub.RemoteExecutorGrpcAioStub(
+        'localhost:{}'.format(port))
+    channel = stub._channel
+    async_runner = stub._async_runner
+
+    del stub
+    gc.collect()
+
+    async def _get_state():
+      return channel.get_state()
+
+    deadline = time.time() + 10
+    state = async_runner.run_coro_and_return_result(_get_state())
+    while (state != grpc.ChannelConnectivity.SHUTDOWN and
+           time.time() < deadline):
+      time.sleep(0.01)
+      state = async_runner.run_coro_and_return_result(_get_state())
+    self.assertEqual(state, grpc.ChannelConnectivity.SHUTDOWN)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -18,6 +18,8 @@
 # information.
 """A stub connects to a remote executor over gRPC."""
 
+from typing import Iterable, Iterator
+
 from absl import logging
 import grpc
 
@@ -48,6 +50,19 @@ def _request(rpc_func, request):
         raise
 
 
+def _stream_response(rpc_func, request):
+  """Like `_request`, but for RPCs which stream their response."""
+  with tracing.wrap_rpc_in_trace_context():
+    try:
+      yield from rpc_func(request)
+    except grpc.RpcError as e:
+      if _is_retryable_grpc_error(e):
+        logging.info("Received retryable gRPC error: %s", e)
+        raise executors_errors.RetryableGRPCError(e)
+      else:
+        raise
+
+
 class RemoteExecutorGrpcStub(remote_executor_stub.RemoteExecutorStub):
   """A stub connects to a remote executor service over gRPC."""
 
@@ -116,6 +131,24 @@ class RemoteExecutorGrpcStub(remote_executor_stub.RemoteExecutorStub):
   ) -> executor_pb2.DisposeExecutorResponse:
     return _request(self._stub.DisposeExecutor, request)
 
+  def execute_plan(
+      self, request: executor_pb2.ExecutePlanRequest
+  ) -> executor_pb2.ExecutePlanResponse:
+    """Dispatches an ExecutePlan gRPC."""
+    return _request(self._stub.ExecutePlan, request)
+
+  def create_value_stream(
+      self, requests: Iterable[executor_pb2.CreateValueStreamRequest]
+  ) -> executor_pb2.CreateValueResponse:
+    """Dispatches a CreateValueStream gRPC."""
+    return _request(self._stub.CreateValueStream, iter(requests))
+
+  def compute_stream(
+      self, request: executor_pb2.ComputeStreamRequest
+  ) -> Iterator[executor_pb2.ValueChunk]:
+    """Dispatches a ComputeStream gRPC."""
+    return _stream_response(self._stub.ComputeStream, request)
+
   @property
   def is_ready(self) -> bool:
     """True if the gRPC connection is ready."""
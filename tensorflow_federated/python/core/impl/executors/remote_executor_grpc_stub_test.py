@@ -268,6 +268,47 @@ class RemoteExecutorGrpcStubTest(absltest.TestCase):
     with self.assertRaises(TypeError):
       stub.create_selection(request=executor_pb2.CreateSelectionRequest())
 
+  def test_create_value_stream_sends_requests(self, mock_executor_grpc_stub):
+    instance = mock_executor_grpc_stub.return_value
+    received_requests = []
+
+    def _create_value_stream(request_iterator):
+      received_requests.extend(request_iterator)
+      return executor_pb2.CreateValueResponse()
+
+    instance.CreateValueStream = mock.Mock(side_effect=_create_value_stream)
+    stub = create_stub()
+    chunks, _ = value_serialization.serialize_value_to_chunks(1, tf.int32)
+    requests = [
+        executor_pb2.CreateValueStreamRequest(chunk=chunk) for chunk in chunks
+    ]
+
+    result = stub.create_value_stream(requests)
+
+    self.assertEqual(result, executor_pb2.CreateValueResponse())
+    self.assertEqual(received_requests, requests)
+
+  def test_compute_stream_returns_chunks(self, mock_executor_grpc_stub):
+    chunks, _ = value_serialization.serialize_value_to_chunks(1, tf.int32)
+    instance = mock_executor_grpc_stub.return_value
+    instance.ComputeStream = mock.Mock(return_value=iter(list(chunks)))
+    stub = create_stub()
+
+    result = stub.compute_stream(executor_pb2.ComputeStreamRequest())
+
+    value, _ = value_serialization.deserialize_value_from_chunks(result)
+    self.assertEqual(value, 1)
+
+  def test_compute_stream_raises_retryable_error_on_grpc_error_unavailable(
+      self, mock_executor_grpc_stub):
+    instance = mock_executor_grpc_stub.return_value
+    instance.ComputeStream = mock.Mock(
+        side_effect=_raise_grpc_error_unavailable)
+    stub = create_stub()
+
+    with self.assertRaises(executors_errors.RetryableError):
+      list(stub.compute_stream(executor_pb2.ComputeStreamRequest()))
+
 
 if __name__ == '__main__':
   absltest.main()
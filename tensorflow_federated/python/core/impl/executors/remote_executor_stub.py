@@ -19,6 +19,7 @@
 """A base Python interface for all stubs handles remote executions."""
 
 import abc
+from typing import Iterable, Iterator
 
 from tensorflow_federated.proto.v0 import executor_pb2
 
@@ -124,6 +125,54 @@ class RemoteExecutorStub(abc.ABC):
     """Invokes `DisposeExecutor` in a remote TFF runtime."""
     raise NotImplementedError
 
+  def execute_plan(
+      self, request: executor_pb2.ExecutePlanRequest
+  ) -> executor_pb2.ExecutePlanResponse:
+    """Invokes ExecutePlan in a remote TFF runtime.
+
+    Stubs which do not override this method do not support batched execution,
+    and callers are expected to fall back to the individual methods above.
+
+    Args:
+      request: ExecutePlanRequest.
+
+    Returns:
+      ExecutePlanResponse.
+    """
+    raise NotImplementedError
+
+  def create_value_stream(
+      self, requests: Iterable[executor_pb2.CreateValueStreamRequest]
+  ) -> executor_pb2.CreateValueResponse:
+    """Invokes CreateValueStream in a remote TFF runtime.
+
+    Stubs which do not override this method do not support streaming values,
+    and callers are expected to fall back to `create_value`.
+
+    Args:
+      requests: An iterable of CreateValueStreamRequest.
+
+    Returns:
+      CreateValueResponse.
+    """
+    raise NotImplementedError
+
+  def compute_stream(
+      self, request: executor_pb2.ComputeStreamRequest
+  ) -> Iterator[executor_pb2.ValueChunk]:
+    """Invokes ComputeStream in a remote TFF runtime.
+
+    Stubs which do not override this method do not support streaming values,
+    and callers are expected to fall back to `compute`.
+
+    Args:
+      request: ComputeStreamRequest.
+
+    Returns:
+      An iterator over the ValueChunks of the computed value.
+    """
+    raise NotImplementedError
+
   @property
   def is_ready(self) -> bool:
     """Tells if the connection to remote is established."""
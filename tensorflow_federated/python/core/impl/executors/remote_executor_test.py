@@ -15,12 +15,14 @@
 import asyncio
 import collections
 import contextlib
+import threading
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
 import grpc
 from grpc.framework.foundation import logging_pool
+import numpy as np
 import portpicker
 import tensorflow as tf
 
@@ -31,8 +33,10 @@ from tensorflow_federated.python.core.impl.executors import executor_service
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
 from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
 from tensorflow_federated.python.core.impl.executors import remote_executor
+from tensorflow_federated.python.core.impl.executors import remote_executor_grpc_aio_stub
 from tensorflow_federated.python.core.impl.executors import remote_executor_grpc_stub
 from tensorflow_federated.python.core.impl.executors import remote_executor_stub
+from tensorflow_federated.python.core.impl.executors import value_serialization
 from tensorflow_federated.python.core.impl.federated_context import federated_computation
 from tensorflow_federated.python.core.impl.federated_context import intrinsics
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
@@ -41,9 +45,16 @@ from tensorflow_federated.python.core.impl.types import placements
 
 
 @contextlib.contextmanager
-def test_context():
+def test_context(use_aio_stub=False,
+                 max_workers=1,
+                 batch_operations=False,
+                 stream_chunk_size_bytes=None,
+                 raw_tensors=False,
+                 value_cache_min_size_bytes=None,
+                 compression=None,
+                 float_transport_dtype=None):
   port = portpicker.pick_unused_port()
-  server_pool = logging_pool.pool(max_workers=1)
+  server_pool = logging_pool.pool(max_workers=max_workers)
   server = grpc.server(server_pool)
   server.add_insecure_port('[::]:{}'.format(port))
   target_factory = executor_test_utils.LocalTestExecutorFactory(
@@ -61,21 +72,34 @@ def test_context():
   executor_pb2_grpc.add_ExecutorGroupServicer_to_server(service, server)
   server.start()
 
-  channel = grpc.insecure_channel('localhost:{}'.format(port))
-
-  stub = remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
-  remote_exec = remote_executor.RemoteExecutor(stub)
+  if use_aio_stub:
+    channel = None
+    stub = remote_executor_grpc_aio_stub.RemoteExecutorGrpcAioStub(
+        'localhost:{}'.format(port))
+  else:
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    stub = remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
+  remote_exec = remote_executor.RemoteExecutor(
+      stub,
+      batch_operations=batch_operations,
+      stream_chunk_size_bytes=stream_chunk_size_bytes,
+      raw_tensors=raw_tensors,
+      value_cache_min_size_bytes=value_cache_min_size_bytes,
+      compression=compression,
+      float_transport_dtype=float_transport_dtype)
   remote_exec.set_cardinalities({placements.CLIENTS: 3})
   executor = reference_resolving_executor.ReferenceResolvingExecutor(
       remote_exec)
   try:
-    yield collections.namedtuple('_', 'executor tracers')(executor, tracers)
+    yield collections.namedtuple('_', 'executor tracers remote_executor')(
+        executor, tracers, remote_exec)
   finally:
     executor.close()
     for tracer in tracers:
       tracer.close()
     try:
-      channel.close()
+      if channel is not None:
+        channel.close()
     except AttributeError:
       pass  # Public gRPC channel doesn't support close()
     finally:
@@ -107,6 +131,13 @@ def _raise_non_retryable_grpc_error(*args):
   raise error
 
 
+def _raise_grpc_error_invalid_argument(*args):
+  del args  # Unused
+  error = grpc.RpcError()
+  error.code = lambda: grpc.StatusCode.INVALID_ARGUMENT
+  raise error
+
+
 def _set_cardinalities_with_mock(executor: remote_executor.RemoteExecutor,
                                  mock_stub: mock.Mock):
   mock_stub.get_executor.return_value = executor_pb2.GetExecutorResponse(
@@ -321,6 +352,425 @@ class RemoteExecutorTest(absltest.TestCase):
     with self.assertRaises(TypeError):
       asyncio.run(executor.create_selection(source, 0))
 
+  def test_create_value_awaits_asynchronous_stub(self, mock_stub):
+    mock_stub.create_value = mock.AsyncMock(
+        return_value=executor_pb2.CreateValueResponse())
+    executor = remote_executor.RemoteExecutor(mock_stub)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    result = asyncio.run(executor.create_value(1, tf.int32))
+
+    mock_stub.create_value.assert_awaited_once()
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+
+  def test_compute_awaits_asynchronous_stub(self, mock_stub):
+    tensor_proto = tf.make_tensor_proto(1)
+    any_pb = any_pb2.Any()
+    any_pb.Pack(tensor_proto)
+    value = executor_pb2.Value(tensor=any_pb)
+    mock_stub.compute = mock.AsyncMock(
+        return_value=executor_pb2.ComputeResponse(value=value))
+    executor = remote_executor.RemoteExecutor(mock_stub)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    type_signature = computation_types.FunctionType(None, tf.int32)
+    comp = remote_executor.RemoteValue(executor_pb2.ValueRef(), type_signature,
+                                       executor)
+
+    result = asyncio.run(comp.compute())
+
+    mock_stub.compute.assert_awaited_once()
+    self.assertEqual(result, 1)
+
+  def test_create_value_with_batch_operations_does_not_send_request(
+      self, mock_stub):
+    executor = remote_executor.RemoteExecutor(mock_stub, batch_operations=True)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    mock_stub.execute_plan.return_value = executor_pb2.ExecutePlanResponse()
+
+    result = asyncio.run(executor.create_value(1, tf.int32))
+
+    mock_stub.create_value.assert_not_called()
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+
+  def test_compute_with_batch_operations_sends_one_plan(self, mock_stub):
+    executor = remote_executor.RemoteExecutor(mock_stub, batch_operations=True)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    mock_stub.execute_plan.return_value = executor_pb2.ExecutePlanResponse()
+    type_signature = computation_types.FunctionType(tf.int32, tf.int32)
+    fn = remote_executor.RemoteValue(
+        executor_pb2.ValueRef(id='fn'), type_signature, executor)
+
+    async def _create_and_compute():
+      arg = await executor.create_value(1, tf.int32)
+      call = await executor.create_call(fn, arg)
+      value, _ = value_serialization.serialize_value(2, tf.int32)
+      result = executor_pb2.ExecutePlanResponse.Result(
+          compute=executor_pb2.ComputeResponse(value=value))
+      mock_stub.execute_plan.return_value = executor_pb2.ExecutePlanResponse(
+          result=[result])
+      return await call.compute()
+
+    result = asyncio.run(_create_and_compute())
+
+    self.assertEqual(result, 2)
+    # One request to check for support, and one request for the plan.
+    self.assertEqual(mock_stub.execute_plan.call_count, 2)
+    request = mock_stub.execute_plan.call_args[0][0]
+    self.assertEqual([o.WhichOneof('operation') for o in request.operation],
+                     ['create_value', 'create_call', 'compute'])
+    mock_stub.compute.assert_not_called()
+
+  def test_batch_operations_sends_values_disposed_on_other_threads(
+      self, mock_stub):
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, dispose_batch_size=1, batch_operations=True)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    mock_stub.execute_plan.return_value = executor_pb2.ExecutePlanResponse()
+    # Checks for support of `ExecutePlan`, keeping the value from being disposed.
+    value = asyncio.run(executor.create_value(1, tf.int32))
+    num_threads = 4
+    num_values = 1000
+    type_signature = computation_types.TensorType(tf.int32)
+
+    def _create_and_dispose_values(thread_index):
+      for value_index in range(num_values):
+        value_ref = executor_pb2.ValueRef(id=f'{thread_index}_{value_index}')
+        remote_executor.RemoteValue(value_ref, type_signature, executor)
+
+    threads = [
+        threading.Thread(target=_create_and_dispose_values, args=(i,))
+        for i in range(num_threads)
+    ]
+    for thread in threads:
+      thread.start()
+    while any(thread.is_alive() for thread in threads):
+      asyncio.run(executor._send_pending_operations())
+    for thread in threads:
+      thread.join()
+    asyncio.run(executor._send_pending_operations())
+    del value
+
+    disposed_ids = []
+    for call in mock_stub.execute_plan.call_args_list:
+      for operation in call[0][0].operation:
+        if operation.WhichOneof('operation') == 'dispose':
+          disposed_ids.extend(v.id for v in operation.dispose.value_ref)
+    self.assertCountEqual(
+        disposed_ids,
+        [f'{i}_{j}' for i in range(num_threads) for j in range(num_values)])
+
+  def test_batch_operations_falls_back_if_unimplemented(self, mock_stub):
+
+    def _raise_unimplemented(*args):
+      del args  # Unused
+      error = grpc.RpcError()
+      error.code = lambda: grpc.StatusCode.UNIMPLEMENTED
+      raise error
+
+    mock_stub.execute_plan = mock.Mock(side_effect=_raise_unimplemented)
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(mock_stub, batch_operations=True)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1, tf.int32))
+    asyncio.run(executor.create_value(2, tf.int32))
+
+    mock_stub.execute_plan.assert_called_once()
+    self.assertEqual(mock_stub.create_value.call_count, 2)
+
+  def test_create_value_with_raw_tensors_sends_raw_tensor(self, mock_stub):
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(mock_stub, raw_tensors=True)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1.0, tf.float32))
+
+    request = mock_stub.create_value.call_args[0][0]
+    self.assertEqual(request.value.WhichOneof('value'), 'raw_tensor')
+
+  def test_compute_with_raw_tensors_requests_raw_tensor(self, mock_stub):
+    value_proto, _ = value_serialization.serialize_value(
+        1, tf.int32, raw_tensors=True)
+    mock_stub.compute.return_value = executor_pb2.ComputeResponse(
+        value=value_proto)
+    executor = remote_executor.RemoteExecutor(mock_stub, raw_tensors=True)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    value = remote_executor.RemoteValue(executor_pb2.ValueRef(),
+                                        computation_types.TensorType(tf.int32),
+                                        executor)
+
+    result = asyncio.run(value.compute())
+
+    self.assertEqual(result, 1)
+    self.assertTrue(mock_stub.compute.call_args[0][0].raw_tensors)
+
+  def test_create_value_with_streaming_sends_chunks(self, mock_stub):
+    requests = []
+
+    def _create_value_stream(request_iterator):
+      requests.extend(request_iterator)
+      return executor_pb2.CreateValueResponse()
+
+    mock_stub.create_value_stream.side_effect = _create_value_stream
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, stream_chunk_size_bytes=8)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    result = asyncio.run(
+        executor.create_value([1, 2, 3, 4, 5],
+                              computation_types.TensorType(tf.int32, [5])))
+
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+    mock_stub.create_value.assert_not_called()
+    # One header and three chunks of at most 8 bytes of content.
+    self.assertLen(requests, 4)
+    self.assertEqual(requests[0].executor.id, 'id')
+    self.assertFalse(requests[1].HasField('executor'))
+    value, _ = value_serialization.deserialize_value_from_chunks(
+        [r.chunk for r in requests])
+    self.assertEqual(list(value), [1, 2, 3, 4, 5])
+
+  def test_create_value_with_streaming_reraises_type_error(self, mock_stub):
+    mock_stub.create_value_stream.side_effect = list
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, stream_chunk_size_bytes=8)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    with self.assertRaises(TypeError):
+      asyncio.run(
+          executor.create_value((1, 2),
+                                computation_types.StructType([tf.int32])))
+
+  def test_compute_with_streaming_receives_chunks(self, mock_stub):
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        [1, 2, 3], computation_types.TensorType(tf.int32, [3]))
+    mock_stub.compute_stream.return_value = chunks
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, stream_chunk_size_bytes=8)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    value = remote_executor.RemoteValue(
+        executor_pb2.ValueRef(id='value'),
+        computation_types.TensorType(tf.int32, [3]), executor)
+
+    result = asyncio.run(value.compute())
+
+    self.assertEqual(list(result), [1, 2, 3])
+    mock_stub.compute.assert_not_called()
+    request = mock_stub.compute_stream.call_args[0][0]
+    self.assertEqual(request.value_ref.id, 'value')
+    self.assertEqual(request.chunk_size_bytes, 8)
+
+  def test_streaming_falls_back_if_not_implemented(self, mock_stub):
+    mock_stub.create_value_stream.side_effect = NotImplementedError
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, stream_chunk_size_bytes=8)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1, tf.int32))
+    asyncio.run(executor.create_value(2, tf.int32))
+
+    mock_stub.create_value_stream.assert_called_once()
+    self.assertEqual(mock_stub.create_value.call_count, 2)
+
+  def test_create_value_with_value_cache_sends_digest_of_known_value(
+      self, mock_stub):
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse(
+        value_ref=executor_pb2.ValueRef(id='value'))
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, value_cache_min_size_bytes=0)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1, tf.int32))
+    result = asyncio.run(executor.create_value(1, tf.int32))
+
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+    self.assertEqual(result.value_ref.id, 'value')
+    self.assertEqual(mock_stub.create_value.call_count, 2)
+    upload_request, lookup_request = [
+        call[0][0] for call in mock_stub.create_value.call_args_list
+    ]
+    self.assertTrue(upload_request.HasField('value'))
+    self.assertNotEmpty(upload_request.value_digest)
+    self.assertFalse(lookup_request.HasField('value'))
+    self.assertEqual(lookup_request.value_digest, upload_request.value_digest)
+
+  def test_create_value_with_value_cache_uploads_evicted_value(self, mock_stub):
+    mock_stub.create_value.side_effect = [
+        executor_pb2.CreateValueResponse(
+            value_ref=executor_pb2.ValueRef(id='value')),
+        executor_pb2.CreateValueResponse(),
+        executor_pb2.CreateValueResponse(
+            value_ref=executor_pb2.ValueRef(id='value')),
+    ]
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, value_cache_min_size_bytes=0)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1, tf.int32))
+    asyncio.run(executor.create_value(1, tf.int32))
+
+    self.assertEqual(mock_stub.create_value.call_count, 3)
+    self.assertTrue(mock_stub.create_value.call_args[0][0].HasField('value'))
+
+  def test_create_value_with_value_cache_skips_small_values(self, mock_stub):
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, value_cache_min_size_bytes=1000)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1, tf.int32))
+    asyncio.run(executor.create_value(1, tf.int32))
+
+    self.assertEqual(mock_stub.create_value.call_count, 2)
+    for call in mock_stub.create_value.call_args_list:
+      self.assertEmpty(call[0][0].value_digest)
+
+  def test_value_cache_falls_back_if_not_supported(self, mock_stub):
+
+    def _create_value(request):
+      if not request.HasField('value'):
+        _raise_grpc_error_invalid_argument()
+      return executor_pb2.CreateValueResponse()
+
+    mock_stub.create_value.side_effect = _create_value
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, value_cache_min_size_bytes=0)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    for _ in range(3):
+      asyncio.run(executor.create_value(1, tf.int32))
+
+    # One upload, one failed lookup, and two uploads without a lookup.
+    self.assertEqual(mock_stub.create_value.call_count, 4)
+
+  def test_create_value_with_value_cache_and_streaming_sends_digest(
+      self, mock_stub):
+    requests = []
+
+    def _create_value_stream(request_iterator):
+      requests.extend(request_iterator)
+      return executor_pb2.CreateValueResponse()
+
+    mock_stub.create_value_stream.side_effect = _create_value_stream
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse(
+        value_ref=executor_pb2.ValueRef(id='value'))
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, stream_chunk_size_bytes=8, value_cache_min_size_bytes=0)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    type_spec = computation_types.TensorType(tf.int32, [5])
+
+    asyncio.run(executor.create_value([1, 2, 3, 4, 5], type_spec))
+    result = asyncio.run(executor.create_value([1, 2, 3, 4, 5], type_spec))
+
+    self.assertEqual(result.value_ref.id, 'value')
+    mock_stub.create_value_stream.assert_called_once()
+    self.assertNotEmpty(requests[0].value_digest)
+    self.assertEmpty(requests[1].value_digest)
+    lookup_request = mock_stub.create_value.call_args[0][0]
+    self.assertEqual(lookup_request.value_digest, requests[0].value_digest)
+
+  def test_set_cardinalities_negotiates_transport(self, mock_stub):
+    mock_stub.get_executor.return_value = executor_pb2.GetExecutorResponse(
+        executor=executor_pb2.ExecutorId(id='id'),
+        compression=executor_pb2.COMPRESSION_ZLIB,
+        float_transport_dtype=tf.float16.as_datatype_enum)
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, compression='zlib', float_transport_dtype=tf.float16)
+
+    executor.set_cardinalities({placements.CLIENTS: 3})
+    asyncio.run(
+        executor.create_value(
+            np.zeros([64, 64], np.float32),
+            computation_types.TensorType(tf.float32, [64, 64])))
+
+    get_executor_request = mock_stub.get_executor.call_args[0][0]
+    self.assertEqual(
+        list(get_executor_request.compressions),
+        [executor_pb2.COMPRESSION_ZLIB])
+    self.assertEqual(get_executor_request.float_transport_dtype,
+                     tf.float16.as_datatype_enum)
+    value_proto = mock_stub.create_value.call_args[0][0].value
+    self.assertEqual(value_proto.WhichOneof('value'), 'compressed')
+    value, _ = value_serialization.deserialize_value(value_proto)
+    self.assertEqual(value.dtype, np.float32)
+    np.testing.assert_array_equal(value, np.zeros([64, 64], np.float32))
+
+  def test_compute_requests_negotiated_transport(self, mock_stub):
+    value_proto, _ = value_serialization.serialize_value(1, tf.int32)
+    mock_stub.compute.return_value = executor_pb2.ComputeResponse(
+        value=value_proto)
+    mock_stub.get_executor.return_value = executor_pb2.GetExecutorResponse(
+        executor=executor_pb2.ExecutorId(id='id'),
+        compression=executor_pb2.COMPRESSION_ZLIB,
+        float_transport_dtype=tf.bfloat16.as_datatype_enum)
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, compression='zlib', float_transport_dtype=tf.bfloat16)
+    executor.set_cardinalities({placements.CLIENTS: 3})
+    value = remote_executor.RemoteValue(executor_pb2.ValueRef(),
+                                        computation_types.TensorType(tf.int32),
+                                        executor)
+
+    asyncio.run(value.compute())
+    asyncio.run(value.compute(lossy_float_transport=True))
+
+    request, lossy_request = [c[0][0] for c in mock_stub.compute.call_args_list]
+    self.assertEqual(request.compression, executor_pb2.COMPRESSION_ZLIB)
+    self.assertFalse(request.float_transport_dtype)
+    self.assertEqual(lossy_request.compression, executor_pb2.COMPRESSION_ZLIB)
+    self.assertEqual(lossy_request.float_transport_dtype,
+                     tf.bfloat16.as_datatype_enum)
+
+  def test_create_value_casts_float_tensors_only_if_requested(self, mock_stub):
+    mock_stub.get_executor.return_value = executor_pb2.GetExecutorResponse(
+        executor=executor_pb2.ExecutorId(id='id'),
+        float_transport_dtype=tf.float16.as_datatype_enum)
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, float_transport_dtype=tf.float16)
+    executor.set_cardinalities({placements.CLIENTS: 3})
+    value = np.ones([64, 64], np.float32)
+    type_spec = computation_types.TensorType(tf.float32, [64, 64])
+
+    asyncio.run(executor.create_value(value, type_spec))
+    asyncio.run(
+        executor.create_value(value, type_spec, lossy_float_transport=True))
+
+    value_proto, lossy_value_proto = [
+        c[0][0].value for c in mock_stub.create_value.call_args_list
+    ]
+    self.assertEqual(value_proto.WhichOneof('value'), 'tensor')
+    self.assertEqual(lossy_value_proto.raw_tensor.transport_dtype,
+                     tf.float16.as_datatype_enum)
+    lossy_value, _ = value_serialization.deserialize_value(lossy_value_proto)
+    self.assertEqual(lossy_value.dtype, np.float32)
+    np.testing.assert_array_equal(lossy_value, value)
+
+  def test_create_value_without_accepted_transport_sends_plain_value(
+      self, mock_stub):
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, compression='zlib', float_transport_dtype=tf.float16)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(
+        executor.create_value(
+            np.zeros([64, 64], np.float32),
+            computation_types.TensorType(tf.float32, [64, 64]),
+            lossy_float_transport=True))
+
+    value_proto = mock_stub.create_value.call_args[0][0].value
+    self.assertEqual(value_proto.WhichOneof('value'), 'tensor')
+
+  def test_raises_on_unknown_compression(self, mock_stub):
+    with self.assertRaisesRegex(ValueError, 'Unknown compression'):
+      remote_executor.RemoteExecutor(mock_stub, compression='gzip')
+
+  def test_raises_on_unsupported_float_transport_dtype(self, mock_stub):
+    with self.assertRaisesRegex(ValueError, 'float_transport_dtype'):
+      remote_executor.RemoteExecutor(mock_stub, float_transport_dtype=tf.int32)
+
 
 class RemoteExecutorIntegrationTest(parameterized.TestCase):
 
@@ -425,5 +875,262 @@ class RemoteExecutorIntegrationTest(parameterized.TestCase):
       self.assertEqual(result, [51, 51, 51])
 
 
+class RemoteExecutorBatchOperationsIntegrationTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(('grpc_stub', False), ('aio_stub', True))
+  def test_with_selection(self, use_aio_stub):
+    with test_context(
+        use_aio_stub=use_aio_stub, batch_operations=True) as context:
+
+      @tensorflow_computation.tf_computation(tf.int32)
+      def foo(x):
+        return collections.OrderedDict([('A', x + 10), ('B', x + 20)])
+
+      @tensorflow_computation.tf_computation(tf.int32, tf.int32)
+      def bar(x, y):
+        return x + y
+
+      @federated_computation.federated_computation(tf.int32)
+      def baz(x):
+        return bar(foo(x).A, foo(x).B)
+
+      result = _invoke(context.executor, baz, 100)
+      self.assertEqual(result, 230)
+
+  @parameterized.named_parameters(('grpc_stub', False), ('aio_stub', True))
+  def test_with_federated_computations(self, use_aio_stub):
+    with test_context(
+        use_aio_stub=use_aio_stub, batch_operations=True) as context:
+
+      @tensorflow_computation.tf_computation(tf.int32)
+      def add_one(x):
+        return x + 1
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(tf.int32, placements.SERVER))
+      def baz(x):
+        value = intrinsics.federated_broadcast(x)
+        return intrinsics.federated_map(add_one, value)
+
+      result = _invoke(context.executor, baz, 50)
+      self.assertEqual(result, [51, 51, 51])
+
+  def test_concurrent_computes_with_aio_stub(self):
+    with test_context(
+        use_aio_stub=True, max_workers=10, batch_operations=True) as context:
+
+      @tensorflow_computation.tf_computation(tf.int32)
+      def comp(x):
+        return x * 2
+
+      async def _invoke_many(num_requests):
+        fn = await context.executor.create_value(comp)
+
+        async def _invoke_one(x):
+          arg = await context.executor.create_value(x, tf.int32)
+          result = await context.executor.create_call(fn, arg)
+          return await result.compute()
+
+        return await asyncio.gather(
+            *[_invoke_one(x) for x in range(num_requests)])
+
+      results = asyncio.run(_invoke_many(50))
+      self.assertEqual(results, [x * 2 for x in range(50)])
+
+
+class RemoteExecutorRawTensorsIntegrationTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('default', False),
+      ('batch_operations', True),
+  )
+  def test_with_federated_computations(self, batch_operations):
+    with test_context(
+        batch_operations=batch_operations, raw_tensors=True) as context:
+
+      @tensorflow_computation.tf_computation(tf.float32)
+      def add_one(x):
+        return x + 1.0
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(tf.float32, placements.CLIENTS))
+      def baz(x):
+        return intrinsics.federated_map(add_one, x)
+
+      result = _invoke(context.executor, baz, [1.0, 2.0, 3.0])
+      self.assertEqual(result, [2.0, 3.0, 4.0])
+
+
+class RemoteExecutorStreamingIntegrationTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(('grpc_stub', False), ('aio_stub', True))
+  def test_one_arg_tf_computation_with_large_value(self, use_aio_stub):
+    with test_context(
+        use_aio_stub=use_aio_stub, stream_chunk_size_bytes=1024) as context:
+
+      @tensorflow_computation.tf_computation(
+          computation_types.TensorType(tf.float32, [100, 100]))
+      def comp(x):
+        return x * 2.0
+
+      arg = np.ones([100, 100], dtype=np.float32)
+      result = _invoke(context.executor, comp, arg)
+      np.testing.assert_array_equal(result, arg * 2.0)
+
+  @parameterized.named_parameters(('grpc_stub', False), ('aio_stub', True))
+  def test_with_federated_computations_and_batch_operations(self, use_aio_stub):
+    with test_context(
+        use_aio_stub=use_aio_stub,
+        batch_operations=True,
+        stream_chunk_size_bytes=16) as context:
+
+      @tensorflow_computation.tf_computation(tf.int32)
+      def add_one(x):
+        return x + 1
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(tf.int32, placements.SERVER))
+      def baz(x):
+        value = intrinsics.federated_broadcast(x)
+        return intrinsics.federated_map(add_one, value)
+
+      result = _invoke(context.executor, baz, 50)
+      self.assertEqual(result, [51, 51, 51])
+
+
+class RemoteExecutorValueCacheIntegrationTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('default', {}),
+      ('batch_operations', {
+          'batch_operations': True
+      }),
+      ('streaming', {
+          'stream_chunk_size_bytes': 64
+      }),
+      ('aio_stub', {
+          'use_aio_stub': True
+      }),
+  )
+  def test_repeated_values_are_created_from_cache(self, kwargs):
+    with test_context(value_cache_min_size_bytes=0, **kwargs) as context:
+
+      @tensorflow_computation.tf_computation(
+          computation_types.TensorType(tf.float32, [10]))
+      def comp(x):
+        return x * 2.0
+
+      arg = np.arange(10, dtype=np.float32)
+      for _ in range(2):
+        result = _invoke(context.executor, comp, arg)
+        np.testing.assert_array_equal(result, arg * 2.0)
+
+      created_values = [
+          entry for tracer in context.tracers for entry in tracer.trace
+          if entry[0] == 'create_value'
+      ]
+      # Only the first invocation uploads the computation and its argument.
+      self.assertLen(created_values, 2)
+
+
+class RemoteExecutorTransportIntegrationTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('default', False),
+      ('batch_operations', True),
+  )
+  def test_with_compression_and_float_transport_dtype(self, batch_operations):
+    with test_context(
+        batch_operations=batch_operations,
+        compression='zlib',
+        float_transport_dtype=tf.bfloat16) as context:
+
+      @tensorflow_computation.tf_computation(
+          computation_types.TensorType(tf.float32, [32, 64]))
+      def add_one(x):
+        return x + 1.0
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(
+              computation_types.TensorType(tf.float32, [32, 64]),
+              placements.SERVER))
+      def baz(x):
+        value = intrinsics.federated_broadcast(x)
+        return intrinsics.federated_map(add_one, value)
+
+      arg = np.full([32, 64], 0.5, dtype=np.float32)
+      result = _invoke(context.executor, baz, arg)
+      for client_result in result:
+        np.testing.assert_allclose(client_result, arg + 1.0, rtol=1e-2)
+
+  @parameterized.named_parameters(
+      ('default', False),
+      ('batch_operations', True),
+  )
+  def test_with_lossy_float_transport(self, batch_operations):
+    with test_context(
+        batch_operations=batch_operations,
+        float_transport_dtype=tf.bfloat16) as context:
+      arg = np.linspace(0.0, 1.0, 32 * 64, dtype=np.float32).reshape([32, 64])
+      type_spec = computation_types.TensorType(tf.float32, [32, 64])
+
+      async def _create_and_compute(lossy_float_transport):
+        value = await context.remote_executor.create_value(
+            arg, type_spec, lossy_float_transport=lossy_float_transport)
+        return await value.compute(lossy_float_transport=lossy_float_transport)
+
+      exact_result = asyncio.run(_create_and_compute(False))
+      lossy_result = asyncio.run(_create_and_compute(True))
+
+    np.testing.assert_array_equal(exact_result, arg)
+    self.assertFalse(np.array_equal(lossy_result, arg))
+    np.testing.assert_allclose(lossy_result, arg, atol=1e-2)
+
+
+class RemoteExecutorAioIntegrationTest(absltest.TestCase):
+
+  def test_one_arg_tf_computation(self):
+    with test_context(use_aio_stub=True) as context:
+
+      @tensorflow_computation.tf_computation(tf.int32)
+      def comp(x):
+        return x + 1
+
+      result = _invoke(context.executor, comp, 10)
+      self.assertEqual(result, 11)
+
+  def test_with_federated_computations(self):
+    with test_context(use_aio_stub=True) as context:
+
+      @federated_computation.federated_computation(
+          computation_types.FederatedType(tf.int32, placements.CLIENTS))
+      def foo(x):
+        return intrinsics.federated_sum(x)
+
+      result = _invoke(context.executor, foo, [10, 20, 30])
+      self.assertEqual(result, 60)
+
+  def test_concurrent_requests_on_one_event_loop(self):
+    with test_context(use_aio_stub=True, max_workers=10) as context:
+
+      @tensorflow_computation.tf_computation(tf.int32)
+      def comp(x):
+        return x * 2
+
+      async def _invoke_many(num_requests):
+        fn = await context.executor.create_value(comp)
+
+        async def _invoke_one(x):
+          arg = await context.executor.create_value(x, tf.int32)
+          result = await context.executor.create_call(fn, arg)
+          return await result.compute()
+
+        return await asyncio.gather(
+            *[_invoke_one(x) for x in range(num_requests)])
+
+      results = asyncio.run(_invoke_many(100))
+      self.assertEqual(results, [x * 2 for x in range(100)])
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,146 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Lossless compression of serialized `executor_pb2.Value`s.
+
+The `zlib` compression is always supported. The `zstd` and `lz4` compressions
+are faster at a similar ratio, and are supported if the `zstandard` and `lz4`
+packages are installed.
+"""
+
+from typing import Callable, Dict, Tuple
+import zlib
+
+from tensorflow_federated.proto.v0 import executor_pb2
+
+try:
+  import lz4.frame  # pylint: disable=g-import-not-at-top
+except ImportError:
+  lz4 = None
+try:
+  import zstandard  # pylint: disable=g-import-not-at-top
+except ImportError:
+  zstandard = None
+
+# Values which serialize to fewer bytes than this are not compressed.
+_MIN_COMPRESSED_SIZE_BYTES = 1024
+
+_COMPRESSIONS_BY_NAME = {
+    'zlib': executor_pb2.COMPRESSION_ZLIB,
+    'zstd': executor_pb2.COMPRESSION_ZSTD,
+    'lz4': executor_pb2.COMPRESSION_LZ4,
+}
+
+_Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+
+def _create_codecs() -> Dict[int, _Codec]:
+  """Returns the `(compress, decompress)` functions of each compression."""
+  # The fastest levels are used, since compression is only worthwhile if it is
+  # faster than sending the uncompressed bytes.
+  codecs = {
+      executor_pb2.COMPRESSION_ZLIB:
+          (lambda data: zlib.compress(data, 1), zlib.decompress),
+  }
+  if zstandard is not None:
+    codecs[executor_pb2.COMPRESSION_ZSTD] = (
+        lambda data: zstandard.ZstdCompressor(level=1).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data))
+  if lz4 is not None:
+    codecs[executor_pb2.COMPRESSION_LZ4] = (lz4.frame.compress,
+                                            lz4.frame.decompress)
+  return codecs
+
+
+_CODECS = _create_codecs()
+
+
+def _unsupported_compression_message(compression: int) -> str:
+  if compression in executor_pb2.Compression.values():
+    compression = executor_pb2.Compression.Name(compression)
+  return f'The compression {compression} is not supported.'
+
+
+def compression_from_name(name: str) -> int:
+  """Returns the `executor_pb2.Compression` named `name`.
+
+  Args:
+    name: One of `'zlib'`, `'zstd'` or `'lz4'`.
+
+  Raises:
+    ValueError: If `name` is not the name of a compression, or if the package
+      implementing the compression is not installed.
+  """
+  compression = _COMPRESSIONS_BY_NAME.get(name)
+  if compression is None:
+    raise ValueError(f'Unknown compression {name!r}, expected one of '
+                     f'{sorted(_COMPRESSIONS_BY_NAME)}.')
+  if not is_supported(compression):
+    raise ValueError(f'The {name!r} compression requires a package which is '
+                     'not installed.')
+  return compression
+
+
+def is_supported(compression: int) -> bool:
+  """Returns `True` if values can be compressed with `compression`."""
+  return compression in _CODECS
+
+
+def compress_value(value_proto: executor_pb2.Value,
+                   compression: int) -> executor_pb2.Value:
+  """Compresses `value_proto` with `compression`.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value`.
+    compression: A supported `executor_pb2.Compression`, or
+      `COMPRESSION_UNSPECIFIED` to not compress the value.
+
+  Returns:
+    An instance of `executor_pb2.Value` holding the compressed serialization of
+    `value_proto`, or `value_proto` itself if it is too small to be worth
+    compressing or does not get smaller when compressed.
+
+  Raises:
+    ValueError: If `compression` is not supported.
+  """
+  if compression == executor_pb2.COMPRESSION_UNSPECIFIED:
+    return value_proto
+  if not is_supported(compression):
+    raise ValueError(_unsupported_compression_message(compression))
+  if value_proto.ByteSize() < _MIN_COMPRESSED_SIZE_BYTES:
+    return value_proto
+  compress, _ = _CODECS[compression]
+  content = compress(value_proto.SerializeToString())
+  if len(content) >= value_proto.ByteSize():
+    return value_proto
+  compressed_proto = executor_pb2.Value()
+  compressed_proto.compressed.compression = compression
+  compressed_proto.compressed.content = content
+  return compressed_proto
+
+
+def decompress_value(value_proto: executor_pb2.Value) -> executor_pb2.Value:
+  """Returns the `executor_pb2.Value` compressed in `value_proto`.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value` with a `compressed` value.
+
+  Raises:
+    ValueError: If the compression of the value is not supported.
+  """
+  compression = value_proto.compressed.compression
+  if not is_supported(compression):
+    raise ValueError(_unsupported_compression_message(compression))
+  _, decompress = _CODECS[compression]
+  return executor_pb2.Value.FromString(
+      decompress(value_proto.compressed.content))
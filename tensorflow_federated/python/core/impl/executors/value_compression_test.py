@@ -0,0 +1,96 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.python.core.impl.executors import value_compression
+
+
+def _raw_tensor_value(content):
+  value_proto = executor_pb2.Value()
+  value_proto.raw_tensor.content = content
+  return value_proto
+
+
+class ValueCompressionTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('zlib', 'zlib'),
+      ('zstd', 'zstd'),
+      ('lz4', 'lz4'),
+  )
+  def test_compress_and_decompress_roundtrip(self, name):
+    try:
+      compression = value_compression.compression_from_name(name)
+    except ValueError:
+      self.skipTest(f'The {name} compression is not installed.')
+    value_proto = _raw_tensor_value(b'a' * 10_000)
+
+    compressed_proto = value_compression.compress_value(value_proto,
+                                                        compression)
+
+    self.assertEqual(compressed_proto.WhichOneof('value'), 'compressed')
+    self.assertEqual(compressed_proto.compressed.compression, compression)
+    self.assertLess(compressed_proto.ByteSize(), value_proto.ByteSize())
+    self.assertEqual(
+        value_compression.decompress_value(compressed_proto), value_proto)
+
+  def test_compress_value_returns_small_value(self):
+    value_proto = _raw_tensor_value(b'a' * 10)
+
+    compressed_proto = value_compression.compress_value(
+        value_proto, executor_pb2.COMPRESSION_ZLIB)
+
+    self.assertIs(compressed_proto, value_proto)
+
+  def test_compress_value_returns_incompressible_value(self):
+    value_proto = _raw_tensor_value(os.urandom(10_000))
+
+    compressed_proto = value_compression.compress_value(
+        value_proto, executor_pb2.COMPRESSION_ZLIB)
+
+    self.assertIs(compressed_proto, value_proto)
+
+  def test_compress_value_without_compression_returns_value(self):
+    value_proto = _raw_tensor_value(b'a' * 10_000)
+
+    compressed_proto = value_compression.compress_value(
+        value_proto, executor_pb2.COMPRESSION_UNSPECIFIED)
+
+    self.assertIs(compressed_proto, value_proto)
+
+  def test_decompress_value_raises_on_unsupported_compression(self):
+    value_proto = executor_pb2.Value(
+        compressed=executor_pb2.Value.Compressed(compression=100))
+
+    with self.assertRaisesRegex(ValueError, 'not supported'):
+      value_compression.decompress_value(value_proto)
+
+  def test_compression_from_name_raises_on_unknown_name(self):
+    with self.assertRaisesRegex(ValueError, 'Unknown compression'):
+      value_compression.compression_from_name('gzip')
+
+  def test_zlib_is_supported(self):
+    self.assertTrue(
+        value_compression.is_supported(executor_pb2.COMPRESSION_ZLIB))
+    self.assertFalse(
+        value_compression.is_supported(executor_pb2.COMPRESSION_UNSPECIFIED))
+
+
+if __name__ == '__main__':
+  absltest.main()
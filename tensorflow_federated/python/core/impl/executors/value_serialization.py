@@ -19,10 +19,11 @@
 """A set of utility methods for serializing Value protos using pybind11 bindings."""
 
 import collections
+import hashlib
 import os
 import os.path
 import tempfile
-from typing import Any, Collection, List, Mapping, Optional, Sequence, Tuple, Union
+from typing import Any, Collection, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import warnings
 import zipfile
 
@@ -37,6 +38,7 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.computation import computation_impl
 from tensorflow_federated.python.core.impl.executors import executor_utils
+from tensorflow_federated.python.core.impl.executors import value_compression
 from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 from tensorflow_federated.python.core.impl.types import type_analysis
@@ -54,6 +56,18 @@ _DeserializeReturnType = Tuple[Any, computation_types.Type]
 # variables from the graph.
 _DEFAULT_MAX_SERIALIZED_SEQUENCE_SIZE_BYTES = 20 * (1024**2)  # 20 MB
 
+# The default maximum number of bytes of tensor or serialized value content in
+# a single `executor_pb2.ValueChunk`.
+DEFAULT_CHUNK_SIZE_BYTES = 1024**2  # 1 MB
+
+# The dtypes which floating point tensors can be cast to for transport.
+FLOAT_TRANSPORT_DTYPES = (tf.float16, tf.bfloat16)
+
+# Floating point tensors with fewer elements than this (such as metrics and
+# hyperparameters) are never cast for transport, since they are not worth the
+# loss of precision.
+_MIN_FLOAT_TRANSPORT_NUM_ELEMENTS = 1024
+
 
 class DatasetSerializationError(Exception):
   """Error raised during Dataset serialization or deserialization."""
@@ -80,15 +94,59 @@ def _value_proto_for_np_array(
   return executor_pb2.Value(tensor=any_pb)
 
 
+def _raw_value_proto_for_np_array(
+    value: np.ndarray,
+    transport_dtype: Optional[tf.dtypes.DType] = None) -> executor_pb2.Value:
+  """Creates value proto with the raw bytes of a numeric np array."""
+  value_proto = executor_pb2.Value()
+  # The fields are set in place, since passing a `RawTensor` message to the
+  # `Value` constructor would copy the content again.
+  raw_tensor = value_proto.raw_tensor
+  raw_tensor.type.dtype = tf.as_dtype(value.dtype).as_datatype_enum
+  raw_tensor.type.dims.extend(value.shape)
+  if transport_dtype is not None:
+    raw_tensor.transport_dtype = transport_dtype.as_datatype_enum
+    value = value.astype(transport_dtype.as_numpy_dtype)
+  # `tobytes` makes a copy of the content; protobuf `bytes` fields cannot be
+  # assigned from a `memoryview`.
+  raw_tensor.content = np.asarray(value, order='C').tobytes()
+  return value_proto
+
+
+def _fits_in_dtype(value: np.ndarray, dtype: tf.dtypes.DType) -> bool:
+  """Returns `True` if the finite elements of `value` do not overflow `dtype`."""
+  finite_value = value[np.isfinite(value)]
+  if not finite_value.size:
+    return True
+  return np.max(np.abs(finite_value)) <= float(dtype.max)
+
+
+def _check_float_transport_dtype(
+    float_transport_dtype: Optional[tf.dtypes.DType]):
+  if (float_transport_dtype is not None and
+      float_transport_dtype not in FLOAT_TRANSPORT_DTYPES):
+    raise ValueError(
+        'Expected `float_transport_dtype` to be one of '
+        f'{FLOAT_TRANSPORT_DTYPES}, found {float_transport_dtype}.')
+
+
 @tracing.trace
 def _serialize_tensor_value(
-    value: Any, type_spec: computation_types.TensorType
+    value: Any,
+    type_spec: computation_types.TensorType,
+    raw_tensors: bool = False,
+    float_transport_dtype: Optional[tf.dtypes.DType] = None
 ) -> Tuple[executor_pb2.Value, computation_types.TensorType]:
   """Serializes a tensor value into `executor_pb2.Value`.
 
   Args:
     value: A Numpy array or other object understood by `tf.make_tensor_proto`.
     type_spec: A `tff.TensorType`.
+    raw_tensors: Whether to serialize tensors of numeric dtypes in the
+      `raw_tensor` encoding.
+    float_transport_dtype: An optional dtype in `FLOAT_TRANSPORT_DTYPES` that
+      large `tf.float32` and `tf.float64` tensors are cast to in the
+      `raw_tensor` encoding, unless their values overflow it.
 
   Returns:
     A tuple `(value_proto, ret_type_spec)` in which `value_proto` is an instance
@@ -101,6 +159,21 @@ def _serialize_tensor_value(
     TypeError: If the arguments are of the wrong types.
     ValueError: If the value is malformed.
   """
+  value = _to_ndarray(value, type_spec)
+  if (float_transport_dtype is not None and
+      type_spec.dtype in (tf.float32, tf.float64) and
+      value.size >= _MIN_FLOAT_TRANSPORT_NUM_ELEMENTS and
+      _fits_in_dtype(value, float_transport_dtype)):
+    value_proto = _raw_value_proto_for_np_array(value, float_transport_dtype)
+  elif raw_tensors and type_spec.dtype != tf.string:
+    value_proto = _raw_value_proto_for_np_array(value)
+  else:
+    value_proto = _value_proto_for_np_array(value, type_spec)
+  return value_proto, type_spec
+
+
+def _to_ndarray(value: Any, type_spec: computation_types.TensorType):
+  """Converts a tensor value to a Numpy array of the dtype of `type_spec`."""
   original_value = value
   if tf.is_tensor(value):
     if isinstance(value, tf.Variable):
@@ -130,9 +203,7 @@ def _serialize_tensor_value(
       raise TypeError(
           f'Failed to serialize value of Python type {value_type_string} to '
           f'a tensor of type {type_spec}.\nValue: {original_value}') from te
-
-  value_proto = _value_proto_for_np_array(value, type_spec)
-  return value_proto, type_spec
+  return value
 
 
 def _serialize_dataset(
@@ -143,7 +214,8 @@ def _serialize_dataset(
   Args:
     dataset: A `tf.data.Dataset`.
     max_serialized_size_bytes: An `int` size in bytes designating the threshold
-      on when to raise an error if the resulting serialization is too big.
+      on when to raise an error if the resulting serialization is too big, or
+      `None` if the size is not limited.
 
   Returns:
     A `bytes` object that can be sent to
@@ -162,7 +234,8 @@ def _serialize_dataset(
     dataset_graph_def_bytes = dataset_graph.numpy()
   else:
     dataset_graph_def_bytes = tf.compat.v1.Session().run(dataset_graph)
-  if len(dataset_graph_def_bytes) > max_serialized_size_bytes:
+  if (max_serialized_size_bytes is not None and
+      len(dataset_graph_def_bytes) > max_serialized_size_bytes):
     raise ValueError('Serialized size of Dataset ({:d} bytes) exceeds maximum '
                      'allowed ({:d} bytes)'.format(
                          len(dataset_graph_def_bytes),
@@ -220,7 +293,10 @@ def _check_container_compat_with_tf_nest(type_spec: computation_types.Type):
 @tracing.trace
 def _serialize_sequence_value(
     value: Union[Union[type_conversions.TF_DATASET_REPRESENTATION_TYPES],
-                 List[Any]], type_spec: computation_types.SequenceType
+                 List[Any]],
+    type_spec: computation_types.SequenceType,
+    max_serialized_size_bytes: Optional[
+        int] = _DEFAULT_MAX_SERIALIZED_SEQUENCE_SIZE_BYTES
 ) -> computation_types.SequenceType:
   """Serializes a `tf.data.Dataset` value into `executor_pb2.Value`.
 
@@ -229,6 +305,8 @@ def _serialize_sequence_value(
       (potentially structures of) tensors.
     type_spec: A `computation_types.Type` specifying the TFF sequence type of
       `value.`
+    max_serialized_size_bytes: The maximum size of the serialized sequence, or
+      `None` if the size is not limited.
 
   Returns:
     A tuple `(value_proto, type_spec)` in which `value_proto` is an instance
@@ -255,7 +333,8 @@ def _serialize_sequence_value(
   # names for `tf.data.Dataset` that return elements of
   # `collections.abc.Mapping` type. This allows TFF to preserve and restore the
   # key ordering upon deserialization.
-  value_proto.sequence.serialized_graph_def = _serialize_dataset(value)
+  value_proto.sequence.serialized_graph_def = _serialize_dataset(
+      value, max_serialized_size_bytes)
   value_proto.sequence.element_type.CopyFrom(
       type_serialization.serialize_type(element_type))
   return value_proto, type_spec
@@ -265,6 +344,8 @@ def _serialize_sequence_value(
 def _serialize_struct_type(
     struct_typed_value: Any,
     type_spec: computation_types.StructType,
+    raw_tensors: bool = False,
+    float_transport_dtype: Optional[tf.dtypes.DType] = None,
 ) -> computation_types.StructType:
   """Serializes a value of tuple type."""
   value_structure = structure.from_container(struct_typed_value)
@@ -277,7 +358,11 @@ def _serialize_struct_type(
   val_elem_iter = structure.iter_elements(value_structure)
   elements = []
   for (e_name, e_type), (_, e_val) in zip(type_elem_iter, val_elem_iter):
-    e_value, _ = serialize_value(e_val, e_type)
+    e_value, _ = serialize_value(
+        e_val,
+        e_type,
+        raw_tensors=raw_tensors,
+        float_transport_dtype=float_transport_dtype)
     if e_name:
       element = executor_pb2.Value.Struct.Element(name=e_name, value=e_value)
     else:
@@ -290,7 +375,10 @@ def _serialize_struct_type(
 
 @tracing.trace
 def _serialize_federated_value(
-    federated_value: Any, type_spec: computation_types.FederatedType
+    federated_value: Any,
+    type_spec: computation_types.FederatedType,
+    raw_tensors: bool = False,
+    float_transport_dtype: Optional[tf.dtypes.DType] = None,
 ) -> computation_types.FederatedType:
   """Serializes a value of federated type."""
   if type_spec.all_equal:
@@ -300,7 +388,11 @@ def _serialize_federated_value(
   py_typecheck.check_type(value, list)
   value_proto = executor_pb2.Value()
   for v in value:
-    federated_value_proto, it_type = serialize_value(v, type_spec.member)
+    federated_value_proto, it_type = serialize_value(
+        v,
+        type_spec.member,
+        raw_tensors=raw_tensors,
+        float_transport_dtype=float_transport_dtype)
     type_spec.member.check_assignable_from(it_type)
     value_proto.federated.value.append(federated_value_proto)
   value_proto.federated.type.CopyFrom(
@@ -312,6 +404,9 @@ def _serialize_federated_value(
 def serialize_value(
     value: Any,
     type_spec: Optional[computation_types.Type] = None,
+    *,
+    raw_tensors: bool = False,
+    float_transport_dtype: Optional[tf.dtypes.DType] = None,
 ) -> _SerializeReturnType:
   """Serializes a value into `executor_pb2.Value`.
 
@@ -321,6 +416,16 @@ def serialize_value(
   Args:
     value: A value to be serialized.
     type_spec: Optional type spec, a `tff.Type` or something convertible to it.
+    raw_tensors: Whether to serialize tensors of numeric dtypes in the
+      `raw_tensor` encoding, which is faster to serialize and deserialize than
+      a `tensorflow.TensorProto` but is only understood by `deserialize_value`
+      (and not by the C++ runtime).
+    float_transport_dtype: An optional dtype in `FLOAT_TRANSPORT_DTYPES`. If
+      specified, `tf.float32` and `tf.float64` tensors with at least 1024
+      elements are cast to this dtype in the `raw_tensor` encoding, losing
+      precision to halve (or quarter) their size. `deserialize_value` casts
+      them back to their own dtype. Tensors with finite values outside of the
+      range of this dtype, which would overflow to infinity, are not cast.
 
   Returns:
     A 2-tuple of serialized value and `tff.Type` that represents the TFF type of
@@ -330,6 +435,7 @@ def serialize_value(
     TypeError: If the arguments are of the wrong types.
     ValueError: If the value is malformed.
   """
+  _check_float_transport_dtype(float_transport_dtype)
   type_spec = computation_types.to_type(type_spec)
   if isinstance(value, computation_pb2.Computation):
     return _serialize_computation(value, type_spec)
@@ -343,13 +449,16 @@ def serialize_value(
                     ' of type {t} with None type spec.'.format(
                         v=value, t=type(value)))
   elif type_spec.is_tensor():
-    return _serialize_tensor_value(value, type_spec)
+    return _serialize_tensor_value(value, type_spec, raw_tensors,
+                                   float_transport_dtype)
   elif type_spec.is_sequence():
     return _serialize_sequence_value(value, type_spec)
   elif type_spec.is_struct():
-    return _serialize_struct_type(value, type_spec)
+    return _serialize_struct_type(value, type_spec, raw_tensors,
+                                  float_transport_dtype)
   elif type_spec.is_federated():
-    return _serialize_federated_value(value, type_spec)
+    return _serialize_federated_value(value, type_spec, raw_tensors,
+                                      float_transport_dtype)
   else:
     raise ValueError(
         'Unable to serialize value with Python type {} and {} TFF type.'.format(
@@ -399,6 +508,45 @@ def _deserialize_tensor_value(
   return value, value_type
 
 
+@tracing.trace
+def _deserialize_raw_tensor_value(
+    value_proto: executor_pb2.Value) -> _DeserializeReturnType:
+  """Deserializes a tensor value from the `raw_tensor` encoding.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value`.
+
+  Returns:
+    A tuple `(value, type_spec)`, where `value` is a read-only Numpy array that
+    shares memory with the content of `value_proto` (unless the tensor was cast
+    for transport), and `type_spec` is an instance of `tff.TensorType` that
+    represents its type.
+
+  Raises:
+    ValueError: If the value is malformed.
+  """
+  raw_tensor = value_proto.raw_tensor
+  dtype = tf.dtypes.as_dtype(raw_tensor.type.dtype)
+  shape = list(raw_tensor.type.dims)
+  if raw_tensor.transport_dtype:
+    transport_dtype = tf.dtypes.as_dtype(raw_tensor.transport_dtype)
+    value = np.frombuffer(
+        raw_tensor.content,
+        dtype=transport_dtype.as_numpy_dtype).astype(dtype.as_numpy_dtype)
+  else:
+    value = np.frombuffer(raw_tensor.content, dtype=dtype.as_numpy_dtype)
+  try:
+    value = value.reshape(shape)
+  except ValueError as e:
+    raise ValueError(f'Cannot deserialize a raw tensor of {value.size} '
+                     f'elements to shape {shape}.') from e
+  value_type = computation_types.TensorType(dtype=dtype, shape=value.shape)
+  if not value.shape:
+    # Unwrap the scalar array as just a primitive numeric.
+    value = value.dtype.type(value)
+  return value, value_type
+
+
 def _deserialize_dataset_from_zipped_saved_model(serialized_bytes):
   """Deserializes a zipped SavedModel `bytes` object to a `tf.data.Dataset`.
 
@@ -675,6 +823,8 @@ def deserialize_value(
   which_value = value_proto.WhichOneof('value')
   if which_value == 'tensor':
     return _deserialize_tensor_value(value_proto)
+  elif which_value == 'raw_tensor':
+    return _deserialize_raw_tensor_value(value_proto)
   elif which_value == 'computation':
     return _deserialize_computation(value_proto)
   elif which_value == 'sequence':
@@ -683,11 +833,387 @@ def deserialize_value(
     return _deserialize_struct_value(value_proto, type_hint)
   elif which_value == 'federated':
     return _deserialize_federated_value(value_proto, type_hint)
+  elif which_value == 'compressed':
+    return deserialize_value(
+        value_compression.decompress_value(value_proto), type_hint)
   else:
     raise ValueError(
         'Unable to deserialize a value of type {}.'.format(which_value))
 
 
+def _content_chunks(content,
+                    chunk_size_bytes: int) -> Iterator[executor_pb2.ValueChunk]:
+  """Splits a bytes-like `content` into `content` chunks."""
+  content = memoryview(content)
+  for start in range(0, len(content), chunk_size_bytes):
+    yield executor_pb2.ValueChunk(content=content[start:start +
+                                                  chunk_size_bytes].tobytes())
+
+
+def _serialized_value_chunks(
+    value_proto: executor_pb2.Value,
+    chunk_size_bytes: int) -> Iterator[executor_pb2.ValueChunk]:
+  """Splits a `executor_pb2.Value` into a header and `content` chunks."""
+  serialized_value = value_proto.SerializeToString()
+  yield executor_pb2.ValueChunk(
+      serialized_value_header=executor_pb2.ValueChunk.SerializedValueHeader(
+          size_bytes=len(serialized_value)))
+  yield from _content_chunks(serialized_value, chunk_size_bytes)
+
+
+def _serialize_value_chunks(
+    value: Any, type_spec: computation_types.Type,
+    chunk_size_bytes: int) -> Iterator[executor_pb2.ValueChunk]:
+  """Yields the chunks of `value` in pre-order."""
+  if isinstance(
+      value,
+      (computation_pb2.Computation, computation_impl.ConcreteComputation)):
+    value_proto, _ = serialize_value(value, type_spec)
+    yield from _serialized_value_chunks(value_proto, chunk_size_bytes)
+  elif type_spec.is_tensor() and type_spec.dtype != tf.string:
+    array = np.asarray(_to_ndarray(value, type_spec), order='C')
+    tensor_type = computation_pb2.TensorType(
+        dtype=type_spec.dtype.as_datatype_enum, dims=array.shape)
+    yield executor_pb2.ValueChunk(
+        tensor_header=executor_pb2.ValueChunk.TensorHeader(type=tensor_type))
+    # Slices of the array are copied into the chunks one at a time, rather than
+    # copying the content of the whole array up front.
+    yield from _content_chunks(
+        array.reshape(-1).view(np.uint8), chunk_size_bytes)
+  elif type_spec.is_sequence():
+    # The sequence is sent in as many chunks as needed, so the size of the
+    # serialized sequence does not need to be limited.
+    value_proto, _ = _serialize_sequence_value(
+        value, type_spec, max_serialized_size_bytes=None)
+    yield from _serialized_value_chunks(value_proto, chunk_size_bytes)
+  elif type_spec.is_struct():
+    value_structure = structure.from_container(value)
+    if len(value_structure) != len(type_spec):
+      raise TypeError('Cannot serialize a struct value of '
+                      f'{len(value_structure)} elements to a struct type '
+                      f'requiring {len(type_spec)} elements. Trying to '
+                      f'serialize\n{value!r}\nto\n{type_spec}.')
+    names = [name or '' for name, _ in structure.iter_elements(type_spec)]
+    yield executor_pb2.ValueChunk(
+        struct_header=executor_pb2.ValueChunk.StructHeader(name=names))
+    for element_type, element in zip(type_spec, value_structure):
+      yield from _serialize_value_chunks(element, element_type,
+                                         chunk_size_bytes)
+  elif type_spec.is_federated():
+    members = [value] if type_spec.all_equal else value
+    py_typecheck.check_type(members, list)
+    yield executor_pb2.ValueChunk(
+        federated_header=executor_pb2.ValueChunk.FederatedHeader(
+            type=type_serialization.serialize_type(type_spec).federated,
+            num_members=len(members)))
+    for member in members:
+      yield from _serialize_value_chunks(member, type_spec.member,
+                                         chunk_size_bytes)
+  else:
+    value_proto, _ = serialize_value(value, type_spec)
+    yield from _serialized_value_chunks(value_proto, chunk_size_bytes)
+
+
+def serialize_value_to_chunks(
+    value: Any,
+    type_spec: Optional[computation_types.Type] = None,
+    chunk_size_bytes: int = DEFAULT_CHUNK_SIZE_BYTES
+) -> Tuple[Iterator[executor_pb2.ValueChunk], computation_types.Type]:
+  """Serializes a value into a stream of `executor_pb2.ValueChunk`s.
+
+  Unlike `serialize_value`, the value is not serialized into a single message.
+  The raw bytes of tensors are split across as many chunks as needed, and the
+  chunks are produced lazily, so that only one chunk of a tensor is copied at a
+  time. Sequences are not subject to the size limit of `serialize_value`.
+
+  Args:
+    value: A value to be serialized.
+    type_spec: Optional type spec, a `tff.Type` or something convertible to it.
+    chunk_size_bytes: The maximum number of bytes of tensor or serialized value
+      content in each chunk.
+
+  Returns:
+    A 2-tuple of an iterator over the chunks of the serialized value, and the
+    `tff.Type` that represents the TFF type of the serialized value. Errors
+    serializing the elements of `value` are raised while iterating.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types.
+    ValueError: If `chunk_size_bytes` is not positive.
+  """
+  py_typecheck.check_type(chunk_size_bytes, int)
+  if chunk_size_bytes <= 0:
+    raise ValueError(
+        f'Expected a positive chunk size, found {chunk_size_bytes}.')
+  type_spec = computation_types.to_type(type_spec)
+  if isinstance(
+      value,
+      (computation_pb2.Computation, computation_impl.ConcreteComputation)):
+    value_proto, type_spec = serialize_value(value, type_spec)
+    return _serialized_value_chunks(value_proto, chunk_size_bytes), type_spec
+  elif type_spec is None:
+    raise TypeError('A type hint is required when serializing a value which '
+                    'is not a TFF computation. Asked to serialized value {v} '
+                    ' of type {t} with None type spec.'.format(
+                        v=value, t=type(value)))
+  return _serialize_value_chunks(value, type_spec, chunk_size_bytes), type_spec
+
+
+class _StructChunkFrame:
+  """The elements of a struct received so far."""
+
+  def __init__(self, header: executor_pb2.ValueChunk.StructHeader,
+               type_hint: Optional[computation_types.Type]):
+    self._names = [name if name else None for name in header.name]
+    if type_hint is not None and type_hint.is_struct():
+      self._element_type_hints = tuple(type_hint)
+    else:
+      self._element_type_hints = [None] * len(self._names)
+    self._values = []
+    self._types = []
+
+  @property
+  def complete(self) -> bool:
+    return len(self._values) == len(self._names)
+
+  def next_type_hint(self) -> Optional[computation_types.Type]:
+    return self._element_type_hints[len(self._values)]
+
+  def add(self, value: Any, type_spec: computation_types.Type):
+    self._values.append(value)
+    self._types.append(type_spec)
+
+  def finish(self) -> _DeserializeReturnType:
+    type_elems = [
+        (name, t) if name else t for name, t in zip(self._names, self._types)
+    ]
+    return (structure.Struct(list(zip(self._names, self._values))),
+            computation_types.StructType(type_elems))
+
+
+class _FederatedChunkFrame:
+  """The members of a federated value received so far."""
+
+  def __init__(self, header: executor_pb2.ValueChunk.FederatedHeader,
+               type_hint: Optional[computation_types.Type]):
+    if header.num_members <= 0:
+      raise ValueError(
+          'Attempting to deserialize federated value with no data.')
+    if type_hint is not None and type_hint.is_federated():
+      self._all_equal = type_hint.all_equal
+      self._member_type_hint = type_hint.member
+    else:
+      self._all_equal = header.type.all_equal
+      self._member_type_hint = None
+    self._placement = placements.uri_to_placement_literal(
+        header.type.placement.value.uri)
+    self._num_members = header.num_members
+    self._values = []
+    self._member_type = None
+
+  @property
+  def complete(self) -> bool:
+    return len(self._values) == self._num_members
+
+  def next_type_hint(self) -> Optional[computation_types.Type]:
+    return self._member_type_hint
+
+  def add(self, value: Any, type_spec: computation_types.Type):
+    self._member_type = _ensure_deserialized_types_compatible(
+        self._member_type, type_spec)
+    self._values.append(value)
+
+  def finish(self) -> _DeserializeReturnType:
+    type_spec = computation_types.FederatedType(
+        self._member_type, placement=self._placement, all_equal=self._all_equal)
+    if self._all_equal:
+      return self._values[0], type_spec
+    return self._values, type_spec
+
+
+class _ContentChunkFrame:
+  """The content of a tensor or serialized value received so far."""
+
+  def __init__(self, buffer: np.ndarray):
+    self._buffer = buffer
+    self._offset = 0
+
+  @property
+  def complete(self) -> bool:
+    return self._offset == self._buffer.size
+
+  def add_content(self, content: bytes):
+    end = self._offset + len(content)
+    if end > self._buffer.size:
+      raise ValueError('Received more content than expected for a value.')
+    self._buffer[self._offset:end] = np.frombuffer(content, dtype=np.uint8)
+    self._offset = end
+
+
+class _TensorChunkFrame(_ContentChunkFrame):
+  """The content of a tensor, copied into a preallocated Numpy array."""
+
+  def __init__(self, header: executor_pb2.ValueChunk.TensorHeader):
+    dims = list(header.type.dims)
+    if any(dim < 0 for dim in dims):
+      raise ValueError(f'Expected a fully defined tensor shape, found {dims}.')
+    dtype = tf.dtypes.as_dtype(header.type.dtype)
+    self._value = np.empty(dims, dtype=dtype.as_numpy_dtype)
+    super().__init__(self._value.reshape(-1).view(np.uint8))
+
+  def finish(self) -> _DeserializeReturnType:
+    value = self._value
+    value_type = computation_types.TensorType(
+        dtype=value.dtype, shape=value.shape)
+    if not value.shape:
+      # Unwrap the scalar array as just a primitive numeric.
+      value = value.dtype.type(value)
+    return value, value_type
+
+
+class _SerializedValueChunkFrame(_ContentChunkFrame):
+  """The content of a serialized `executor_pb2.Value`."""
+
+  def __init__(self, header: executor_pb2.ValueChunk.SerializedValueHeader,
+               type_hint: Optional[computation_types.Type]):
+    super().__init__(np.empty([header.size_bytes], dtype=np.uint8))
+    self._type_hint = type_hint
+
+  def finish(self) -> _DeserializeReturnType:
+    value_proto = executor_pb2.Value.FromString(self._buffer.tobytes())
+    return deserialize_value(value_proto, self._type_hint)
+
+
+class ValueChunkDeserializer:
+  """Incrementally deserializes a value from a stream of `ValueChunk`s.
+
+  The chunks must be added in the order produced by
+  `serialize_value_to_chunks`. The content of each tensor is copied into a
+  preallocated Numpy array as it arrives, so that the chunks do not need to be
+  held until the whole value has been received.
+  """
+
+  def __init__(self, type_hint: Optional[computation_types.Type] = None):
+    """Creates the deserializer.
+
+    Args:
+      type_hint: A `computation_types.Type` that hints at what the value type
+        should be, as in `deserialize_value`.
+    """
+    self._type_hint = type_hint
+    self._frames = []
+    self._result = None
+
+  @property
+  def done(self) -> bool:
+    """True if all of the chunks of the value have been added."""
+    return self._result is not None
+
+  def add_chunk(self, chunk: executor_pb2.ValueChunk):
+    """Adds the next chunk of the value.
+
+    Args:
+      chunk: An instance of `executor_pb2.ValueChunk`.
+
+    Raises:
+      ValueError: If the chunk is not expected at this point of the stream.
+    """
+    py_typecheck.check_type(chunk, executor_pb2.ValueChunk)
+    if self.done:
+      raise ValueError('Received a chunk after the end of the value.')
+    which_chunk = chunk.WhichOneof('chunk')
+    if self._frames and isinstance(self._frames[-1], _ContentChunkFrame):
+      if which_chunk != 'content':
+        raise ValueError(f'Expected a `content` chunk, found `{which_chunk}`.')
+      self._frames[-1].add_content(chunk.content)
+    else:
+      if self._frames:
+        type_hint = self._frames[-1].next_type_hint()
+      else:
+        type_hint = self._type_hint
+      if which_chunk == 'struct_header':
+        frame = _StructChunkFrame(chunk.struct_header, type_hint)
+      elif which_chunk == 'federated_header':
+        frame = _FederatedChunkFrame(chunk.federated_header, type_hint)
+      elif which_chunk == 'tensor_header':
+        frame = _TensorChunkFrame(chunk.tensor_header)
+      elif which_chunk == 'serialized_value_header':
+        frame = _SerializedValueChunkFrame(chunk.serialized_value_header,
+                                           type_hint)
+      else:
+        raise ValueError(f'Expected a header chunk, found `{which_chunk}`.')
+      self._frames.append(frame)
+    while self._frames and self._frames[-1].complete:
+      value, type_spec = self._frames.pop().finish()
+      if self._frames:
+        self._frames[-1].add(value, type_spec)
+      else:
+        self._result = (value, type_spec)
+
+  def result(self) -> _DeserializeReturnType:
+    """Returns the deserialized value and its type.
+
+    Raises:
+      ValueError: If not all of the chunks of the value have been added.
+    """
+    if not self.done:
+      raise ValueError('The stream of chunks ended before the end of the '
+                       'value.')
+    return self._result
+
+
+def deserialize_value_from_chunks(
+    chunks: Iterable[executor_pb2.ValueChunk],
+    type_hint: Optional[computation_types.Type] = None
+) -> _DeserializeReturnType:
+  """Deserializes a value from chunks produced by `serialize_value_to_chunks`.
+
+  Args:
+    chunks: An iterable of `executor_pb2.ValueChunk`s.
+    type_hint: A `comptuations_types.Type` that hints at what the value type
+      should be for executors that only return values.
+
+  Returns:
+    A tuple `(value, type_spec)`, as in `deserialize_value`.
+
+  Raises:
+    ValueError: If the chunks are malformed.
+  """
+  deserializer = ValueChunkDeserializer(type_hint)
+  for chunk in chunks:
+    deserializer.add_chunk(chunk)
+  return deserializer.result()
+
+
+class ValueDigest:
+  """Computes the content digest of a serialized value.
+
+  The digest is the SHA-256 digest of the deterministic serializations of the
+  messages passed to `update`, in order. A value serialized with
+  `serialize_value` is digested as its single `executor_pb2.Value`, and a value
+  serialized with `serialize_value_to_chunks` as its sequence of
+  `executor_pb2.ValueChunk`s, so the two digests of the same value differ.
+  """
+
+  def __init__(self):
+    self._hash = hashlib.sha256()
+    self._size_bytes = 0
+
+  def update(self, message: Union[executor_pb2.Value, executor_pb2.ValueChunk]):
+    """Adds the next serialized message of the value to the digest."""
+    serialized_message = message.SerializeToString(deterministic=True)
+    self._hash.update(serialized_message)
+    self._size_bytes += len(serialized_message)
+
+  @property
+  def size_bytes(self) -> int:
+    """The total size of the messages added to the digest."""
+    return self._size_bytes
+
+  def digest(self) -> bytes:
+    return self._hash.digest()
+
+
 CardinalitiesType = Mapping[placements.PlacementLiteral, int]
 
 
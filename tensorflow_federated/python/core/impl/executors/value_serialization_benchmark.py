@@ -0,0 +1,92 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the tensor encodings of `value_serialization`.
+
+Compares serializing and deserializing float32 tensors of increasing size as a
+`tensorflow.TensorProto` packed into an `Any` (the `tensor` encoding) and as
+raw bytes (the `raw_tensor` encoding). The timings include converting the
+`executor_pb2.Value` to and from its wire format.
+
+To run the benchmarks:
+
+  bazel run //tensorflow_federated/python/core/impl/executors:value_serialization_benchmark -- --benchmark_filter=.
+"""
+
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.python.core.impl.executors import value_serialization
+from tensorflow_federated.python.core.impl.types import computation_types
+
+# The number of elements of the benchmarked tensors.
+_NUM_ELEMENTS = (10, 1_000, 100_000, 10_000_000)
+
+# The approximate number of elements processed by each benchmark, which bounds
+# the number of iterations for large tensors.
+_ELEMENTS_PER_BENCHMARK = 100_000_000
+_MAX_ITERS = 1_000
+
+
+class ValueSerializationBenchmark(tf.test.Benchmark):
+
+  def _run_benchmark(self, name: str, fn, num_iters: int, num_bytes: int):
+    fn()  # Warm up.
+    start_time = time.perf_counter()
+    for _ in range(num_iters):
+      fn()
+    wall_time = (time.perf_counter() - start_time) / num_iters
+    self.report_benchmark(
+        name=name,
+        iters=num_iters,
+        wall_time=wall_time,
+        extras={'megabytes_per_second': num_bytes / wall_time / 1e6})
+
+  def _benchmark_tensor(self, num_elements: int, raw_tensors: bool):
+    value = np.random.rand(num_elements).astype(np.float32)
+    type_spec = computation_types.TensorType(tf.float32, [num_elements])
+    num_iters = min(_MAX_ITERS, max(1, _ELEMENTS_PER_BENCHMARK // num_elements))
+    encoding = 'raw_tensor' if raw_tensors else 'tensor'
+
+    def _serialize():
+      value_proto, _ = value_serialization.serialize_value(
+          value, type_spec, raw_tensors=raw_tensors)
+      return value_proto.SerializeToString()
+
+    serialized_value = _serialize()
+
+    def _deserialize():
+      value_proto = executor_pb2.Value.FromString(serialized_value)
+      return value_serialization.deserialize_value(value_proto)
+
+    self._run_benchmark(f'serialize_{encoding}_{num_elements}', _serialize,
+                        num_iters, value.nbytes)
+    self._run_benchmark(f'deserialize_{encoding}_{num_elements}', _deserialize,
+                        num_iters, value.nbytes)
+
+  def _benchmark_encoding(self, raw_tensors: bool):
+    for num_elements in _NUM_ELEMENTS:
+      self._benchmark_tensor(num_elements, raw_tensors)
+
+  def benchmark_tensor_encoding(self):
+    self._benchmark_encoding(raw_tensors=False)
+
+  def benchmark_raw_tensor_encoding(self):
+    self._benchmark_encoding(raw_tensors=True)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import collections
+from unittest import mock
 
 from absl.testing import parameterized
 import numpy as np
@@ -21,6 +22,7 @@ import tensorflow as tf
 from tensorflow_federated.proto.v0 import computation_pb2
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.core.impl.executors import value_compression
 from tensorflow_federated.python.core.impl.executors import value_serialization
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
 from tensorflow_federated.python.core.impl.types import computation_types
@@ -634,6 +636,369 @@ class DatasetSerializationTest(tf.test.TestCase):
       self.assertAllClose(actual, expected)
 
 
+class RawTensorSerializationTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(TENSOR_SERIALIZATION_TEST_PARAMS)
+  def test_roundtrip_tensor_value(self, x, serialize_type_spec):
+    value_proto, value_type = value_serialization.serialize_value(
+        x, serialize_type_spec, raw_tensors=True)
+    self.assertEqual(value_proto.WhichOneof('value'), 'raw_tensor')
+    type_test_utils.assert_types_identical(value_type, serialize_type_spec)
+    y, type_spec = value_serialization.deserialize_value(value_proto)
+    type_test_utils.assert_types_identical(type_spec, serialize_type_spec)
+    self.assertEqual(y.dtype, serialize_type_spec.dtype.as_numpy_dtype)
+    self.assertAllEqual(x, y)
+
+  @parameterized.named_parameters(
+      ('bool', np.array([True, False, True])),
+      ('uint16', np.arange(7, dtype=np.uint16)),
+      ('float64', np.linspace(0.0, 1.0, 11).reshape([11, 1])),
+      ('complex128', np.array([1 + 2j, 3 - 4j])),
+      ('bfloat16', tf.constant([1.5, -2.0], dtype=tf.bfloat16).numpy()),
+      ('empty', np.zeros([0, 3], dtype=np.float32)),
+      ('non_contiguous', np.arange(12, dtype=np.int32).reshape([3, 4]).T),
+  )
+  def test_roundtrip_tensor_value_with_dtype(self, x):
+    x_type = TensorType(x.dtype, x.shape)
+    value_proto, _ = value_serialization.serialize_value(
+        x, x_type, raw_tensors=True)
+    y, type_spec = value_serialization.deserialize_value(value_proto)
+    type_test_utils.assert_types_identical(type_spec, x_type)
+    self.assertAllEqual(x, y)
+
+  def test_deserialize_does_not_copy_content(self):
+    value_proto, _ = value_serialization.serialize_value(
+        np.ones([10]), TensorType(tf.float64, [10]), raw_tensors=True)
+    y, _ = value_serialization.deserialize_value(value_proto)
+    self.assertFalse(y.flags.owndata)
+    self.assertFalse(y.flags.writeable)
+
+  def test_serialize_string_value_as_tensor_proto(self):
+    value_proto, _ = value_serialization.serialize_value(
+        'abc', tf.string, raw_tensors=True)
+    self.assertEqual(value_proto.WhichOneof('value'), 'tensor')
+    y, _ = value_serialization.deserialize_value(value_proto)
+    self.assertEqual(y, b'abc')
+
+  def test_roundtrip_nested_federated_struct_value(self):
+    x = [collections.OrderedDict(a=1.0, b=[2, 3]) for _ in range(2)]
+    x_type = computation_types.at_clients(
+        collections.OrderedDict(a=tf.float32, b=[tf.int32, tf.int32]))
+    value_proto, _ = value_serialization.serialize_value(
+        x, x_type, raw_tensors=True)
+    member_proto = value_proto.federated.value[0]
+    self.assertEqual(member_proto.struct.element[0].value.WhichOneof('value'),
+                     'raw_tensor')
+    y, type_spec = value_serialization.deserialize_value(value_proto)
+    type_test_utils.assert_types_equivalent(type_spec, x_type)
+    self.assertEqual(y,
+                     [structure.from_container(v, recursive=True) for v in x])
+
+  def test_deserialize_raises_on_mismatched_shape(self):
+    value_proto = executor_pb2.Value(
+        raw_tensor=executor_pb2.Value.RawTensor(
+            type=computation_pb2.TensorType(
+                dtype=computation_pb2.TensorType.DT_INT32, dims=[3]),
+            content=b'\x00' * 8))
+    with self.assertRaisesRegex(ValueError, 'Cannot deserialize a raw tensor'):
+      value_serialization.deserialize_value(value_proto)
+
+
+class FloatTransportSerializationTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('float16_float32', tf.float16, np.float32),
+      ('bfloat16_float32', tf.bfloat16, np.float32),
+      ('float16_float64', tf.float16, np.float64),
+  )
+  def test_roundtrip_casts_large_float_tensor(self, transport_dtype, dtype):
+    x = np.linspace(-1.0, 1.0, 2048, dtype=dtype).reshape([32, 64])
+    x_type = TensorType(x.dtype, x.shape)
+
+    value_proto, _ = value_serialization.serialize_value(
+        x, x_type, float_transport_dtype=transport_dtype)
+    y, type_spec = value_serialization.deserialize_value(value_proto)
+
+    self.assertEqual(value_proto.raw_tensor.transport_dtype,
+                     transport_dtype.as_datatype_enum)
+    self.assertLen(value_proto.raw_tensor.content, x.size * 2)
+    type_test_utils.assert_types_identical(type_spec, x_type)
+    self.assertEqual(y.dtype, dtype)
+    self.assertAllClose(x, y, atol=1e-2)
+
+  def test_serialize_does_not_cast_small_float_tensor(self):
+    value_proto, _ = value_serialization.serialize_value(
+        [1.0, 2.0],
+        TensorType(tf.float32, [2]),
+        float_transport_dtype=tf.float16)
+
+    self.assertEqual(value_proto.WhichOneof('value'), 'tensor')
+
+  def test_serialize_does_not_cast_int_tensor(self):
+    value_proto, _ = value_serialization.serialize_value(
+        np.arange(2048, dtype=np.int32),
+        TensorType(tf.int32, [2048]),
+        float_transport_dtype=tf.float16)
+
+    self.assertEqual(value_proto.WhichOneof('value'), 'tensor')
+
+  @parameterized.named_parameters(
+      ('float16_float32', tf.float16, np.float32, 1e5),
+      ('float16_float64', tf.float16, np.float64, 1e5),
+      ('bfloat16_float64', tf.bfloat16, np.float64, 1e300),
+  )
+  def test_serialize_does_not_cast_float_tensor_out_of_range(
+      self, transport_dtype, dtype, max_value):
+    x = np.linspace(-1.0, max_value, 2048, dtype=dtype)
+
+    value_proto, _ = value_serialization.serialize_value(
+        x, TensorType(x.dtype, x.shape), float_transport_dtype=transport_dtype)
+    y, _ = value_serialization.deserialize_value(value_proto)
+
+    self.assertEqual(value_proto.WhichOneof('value'), 'tensor')
+    self.assertAllEqual(y, x)
+
+  def test_serialize_casts_float_tensor_with_non_finite_values(self):
+    x = np.ones([2048], dtype=np.float64)
+    x[0] = np.inf
+    x[1] = np.nan
+
+    value_proto, _ = value_serialization.serialize_value(
+        x, TensorType(x.dtype, x.shape), float_transport_dtype=tf.float16)
+    y, _ = value_serialization.deserialize_value(value_proto)
+
+    self.assertEqual(value_proto.raw_tensor.transport_dtype,
+                     tf.float16.as_datatype_enum)
+    self.assertAllEqual(y, x)
+
+  def test_serialize_casts_float_tensors_in_struct(self):
+    x = structure.Struct([('a', np.ones([2048], np.float32)), ('b', 1.0)])
+    x_type = computation_types.StructType([('a', TensorType(tf.float32,
+                                                            [2048])),
+                                           ('b', tf.float32)])
+
+    value_proto, _ = value_serialization.serialize_value(
+        x, x_type, float_transport_dtype=tf.bfloat16)
+    y, _ = value_serialization.deserialize_value(value_proto)
+
+    a_proto, b_proto = [e.value for e in value_proto.struct.element]
+    self.assertEqual(a_proto.raw_tensor.transport_dtype,
+                     tf.bfloat16.as_datatype_enum)
+    self.assertEqual(b_proto.WhichOneof('value'), 'tensor')
+    self.assertAllEqual(y.a, x.a)
+    self.assertEqual(y.b, 1.0)
+
+  def test_serialize_raises_on_unsupported_transport_dtype(self):
+    with self.assertRaisesRegex(ValueError, 'float_transport_dtype'):
+      value_serialization.serialize_value(
+          1.0, tf.float32, float_transport_dtype=tf.int8)
+
+
+class CompressedValueSerializationTest(tf.test.TestCase):
+
+  def test_deserialize_compressed_value(self):
+    x = np.zeros([100, 100], dtype=np.float32)
+    value_proto, _ = value_serialization.serialize_value(
+        x, TensorType(tf.float32, [100, 100]))
+    compressed_proto = value_compression.compress_value(
+        value_proto, executor_pb2.COMPRESSION_ZLIB)
+
+    y, type_spec = value_serialization.deserialize_value(compressed_proto)
+
+    self.assertEqual(compressed_proto.WhichOneof('value'), 'compressed')
+    type_test_utils.assert_types_identical(type_spec,
+                                           TensorType(tf.float32, [100, 100]))
+    self.assertAllEqual(x, y)
+
+
+class ValueChunkSerializationTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(TENSOR_SERIALIZATION_TEST_PARAMS)
+  def test_roundtrip_tensor_value(self, x, serialize_type_spec):
+    chunks, value_type = value_serialization.serialize_value_to_chunks(
+        x, serialize_type_spec)
+    type_test_utils.assert_types_identical(value_type, serialize_type_spec)
+    y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    type_test_utils.assert_types_identical(type_spec, serialize_type_spec)
+    self.assertEqual(y.dtype, serialize_type_spec.dtype.as_numpy_dtype)
+    self.assertAllEqual(x, y)
+
+  @parameterized.named_parameters(
+      ('bool', np.array([True, False, True])),
+      ('int8', np.arange(7, dtype=np.int8)),
+      ('float64', np.linspace(0.0, 1.0, 11)),
+      ('complex64', np.array([1 + 2j, 3 - 4j], dtype=np.complex64)),
+      ('bfloat16', tf.constant([1.5, -2.0], dtype=tf.bfloat16).numpy()),
+      ('empty', np.zeros([0, 3], dtype=np.float32)),
+  )
+  def test_roundtrip_tensor_value_with_dtype(self, x):
+    x_type = TensorType(x.dtype, x.shape)
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        x, x_type, chunk_size_bytes=3)
+    y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    type_test_utils.assert_types_identical(type_spec, x_type)
+    self.assertAllEqual(x, y)
+
+  def test_splits_tensor_content_into_chunks(self):
+    x = np.arange(100, dtype=np.float32)
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        x, TensorType(tf.float32, [100]), chunk_size_bytes=64)
+    chunks = list(chunks)
+    self.assertEqual(chunks[0].WhichOneof('chunk'), 'tensor_header')
+    self.assertLen(chunks, 1 + 400 // 64 + 1)
+    for chunk in chunks[1:]:
+      self.assertEqual(chunk.WhichOneof('chunk'), 'content')
+      self.assertLessEqual(len(chunk.content), 64)
+    y, _ = value_serialization.deserialize_value_from_chunks(chunks)
+    self.assertAllEqual(x, y)
+
+  def test_roundtrip_string_value(self):
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        'abc', tf.string, chunk_size_bytes=2)
+    chunks = list(chunks)
+    self.assertEqual(chunks[0].WhichOneof('chunk'), 'serialized_value_header')
+    y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    type_test_utils.assert_types_identical(type_spec, TensorType(tf.string))
+    self.assertEqual(y, b'abc')
+
+  def test_roundtrip_nested_struct_value(self):
+    x = collections.OrderedDict(
+        a=10, b=[np.ones([2, 2]), 30.0], c=collections.OrderedDict(d=40))
+    x_type = computation_types.to_type(
+        collections.OrderedDict(
+            a=tf.int32,
+            b=[TensorType(tf.float64, [2, 2]), tf.float32],
+            c=collections.OrderedDict(d=tf.int32)))
+    chunks, value_type = value_serialization.serialize_value_to_chunks(
+        x, x_type, chunk_size_bytes=8)
+    type_test_utils.assert_types_identical(value_type, x_type)
+    y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    type_test_utils.assert_types_equivalent(type_spec, x_type)
+    self.assertEqual(y.a, 10)
+    self.assertAllEqual(y.b[0], np.ones([2, 2]))
+    self.assertEqual(y.b[1], 30.0)
+    self.assertEqual(y.c.d, 40)
+
+  def test_roundtrip_empty_struct_value(self):
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        (), computation_types.StructType([]))
+    y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    type_test_utils.assert_types_identical(type_spec,
+                                           computation_types.StructType([]))
+    self.assertEqual(y, structure.Struct([]))
+
+  def test_roundtrip_federated_at_clients(self):
+    x = [10, 20]
+    x_type = computation_types.at_clients(tf.int32)
+    chunks, _ = value_serialization.serialize_value_to_chunks(x, x_type)
+    y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    type_test_utils.assert_types_identical(type_spec, x_type)
+    self.assertEqual(y, [10, 20])
+
+  def test_roundtrip_federated_at_server(self):
+    x_type = computation_types.at_server(tf.int32)
+    chunks, _ = value_serialization.serialize_value_to_chunks(10, x_type)
+    y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    type_test_utils.assert_types_identical(type_spec, x_type)
+    self.assertEqual(y, 10)
+
+  def test_roundtrip_computation_value(self):
+
+    @tensorflow_computation.tf_computation
+    def comp():
+      return tf.constant(10)
+
+    chunks, value_type = value_serialization.serialize_value_to_chunks(
+        comp, chunk_size_bytes=16)
+    expected_type = computation_types.FunctionType(
+        parameter=None, result=tf.int32)
+    type_test_utils.assert_types_identical(value_type, expected_type)
+    y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    self.assertIsInstance(y, computation_pb2.Computation)
+    type_test_utils.assert_types_identical(type_spec, expected_type)
+
+  def test_roundtrip_sequence_value_is_not_size_limited(self):
+    x = tf.data.Dataset.range(5)
+    x_type = computation_types.SequenceType(tf.int64)
+    with mock.patch.object(value_serialization,
+                           '_DEFAULT_MAX_SERIALIZED_SEQUENCE_SIZE_BYTES', 0):
+      chunks, _ = value_serialization.serialize_value_to_chunks(
+          x, x_type, chunk_size_bytes=64)
+      y, type_spec = value_serialization.deserialize_value_from_chunks(chunks)
+    type_test_utils.assert_types_identical(type_spec, x_type)
+    self.assertAllEqual(list(y), list(range(5)))
+
+  def test_serialize_raises_without_type_spec(self):
+    with self.assertRaisesRegex(TypeError, 'A type hint is required'):
+      value_serialization.serialize_value_to_chunks(10)
+
+  def test_serialize_raises_on_non_positive_chunk_size(self):
+    with self.assertRaises(ValueError):
+      value_serialization.serialize_value_to_chunks(
+          10, tf.int32, chunk_size_bytes=0)
+
+  def test_deserialize_raises_on_truncated_stream(self):
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        np.arange(10), TensorType(tf.int64, [10]), chunk_size_bytes=8)
+    with self.assertRaisesRegex(ValueError, 'ended before the end'):
+      value_serialization.deserialize_value_from_chunks(list(chunks)[:-1])
+
+  def test_deserialize_raises_on_unexpected_chunk(self):
+    deserializer = value_serialization.ValueChunkDeserializer()
+    with self.assertRaisesRegex(ValueError, 'Expected a header chunk'):
+      deserializer.add_chunk(executor_pb2.ValueChunk(content=b'abc'))
+
+  def test_deserialize_raises_on_chunk_after_end_of_value(self):
+    chunks, _ = value_serialization.serialize_value_to_chunks(10, tf.int32)
+    deserializer = value_serialization.ValueChunkDeserializer()
+    for chunk in chunks:
+      deserializer.add_chunk(chunk)
+    self.assertTrue(deserializer.done)
+    with self.assertRaisesRegex(ValueError, 'after the end of the value'):
+      deserializer.add_chunk(executor_pb2.ValueChunk(content=b'abc'))
+
+
+class ValueDigestTest(tf.test.TestCase):
+
+  def _digest(self, *messages):
+    value_digest = value_serialization.ValueDigest()
+    for message in messages:
+      value_digest.update(message)
+    return value_digest
+
+  def test_digest_is_equal_for_equal_values(self):
+    first_proto, _ = value_serialization.serialize_value([1, 2],
+                                                         (tf.int32, [2]))
+    second_proto, _ = value_serialization.serialize_value([1, 2],
+                                                          (tf.int32, [2]))
+
+    self.assertEqual(
+        self._digest(first_proto).digest(),
+        self._digest(second_proto).digest())
+
+  def test_digest_differs_for_different_values(self):
+    first_proto, _ = value_serialization.serialize_value([1, 2],
+                                                         (tf.int32, [2]))
+    second_proto, _ = value_serialization.serialize_value([1, 3],
+                                                          (tf.int32, [2]))
+
+    self.assertNotEqual(
+        self._digest(first_proto).digest(),
+        self._digest(second_proto).digest())
+
+  def test_size_bytes_is_total_size_of_messages(self):
+    chunks, _ = value_serialization.serialize_value_to_chunks(
+        list(range(10)),
+        computation_types.TensorType(tf.int32, [10]),
+        chunk_size_bytes=8)
+    chunks = list(chunks)
+
+    value_digest = self._digest(*chunks)
+
+    self.assertEqual(value_digest.size_bytes,
+                     sum(chunk.ByteSize() for chunk in chunks))
+
+
 class SerializeCardinalitiesTest(tf.test.TestCase):
 
   def test_serialize_deserialize_clients_and_server_cardinalities_roundtrip(
@@ -18,6 +18,7 @@
 # information.
 """Dataset reduce functions for federated optimization algorithms."""
 
+import functools
 from typing import Any, Callable, Iterable, Union
 
 import tensorflow as tf
@@ -49,6 +50,105 @@ def _for_iter_dataset_fn(
   return update_state
 
 
+def _fused_dataset_reduce_fn(reduce_fn: _ReduceFnCallable,
+                             dataset: tf.data.Dataset,
+                             initial_state_fn: Callable[
+                                 [], Any] = lambda: tf.constant(0),
+                             *,
+                             steps_per_iteration: int,
+                             jit_compile: bool = False) -> Any:
+  """Performs dataset reduce applying `reduce_fn` to several batches at once.
+
+  Each iteration of the loop gets the next `steps_per_iteration` batches of
+  `dataset` and applies `reduce_fn` to them in a single, unrolled function,
+  which amortizes the per-iteration overhead of the loop over several steps.
+  If fewer than `steps_per_iteration` batches remain, `reduce_fn` is applied to
+  each of the remaining batches.
+
+  Args:
+    reduce_fn: A callable taking the state and a batch, and returning the new
+      state, which must have the same structure and types as the state.
+    dataset: A `tf.data.Dataset`.
+    initial_state_fn: A no-arg callable returning the initial state.
+    steps_per_iteration: The number of batches processed by each iteration.
+    jit_compile: Whether to compile the function applying `reduce_fn` to
+      `steps_per_iteration` batches with XLA.
+
+  Returns:
+    The final state.
+  """
+
+  def fused_reduce_fn(state, batches):
+    for batch in batches:
+      state = reduce_fn(state, batch)
+    return state
+
+  if jit_compile:
+    fused_reduce_fn = tf.function(fused_reduce_fn, jit_compile=True)
+
+  iterator = iter(dataset)
+
+  def body(has_next_batches, state):
+    del has_next_batches  # Unused.
+    optionals = [
+        iterator.get_next_as_optional() for _ in range(steps_per_iteration)
+    ]
+
+    def reduce_batches():
+      return fused_reduce_fn(state, [x.get_value() for x in optionals])
+
+    def reduce_remaining_batches():
+      # The batches are returned in order, so only the last batches can be
+      # missing.
+      remaining_state = state
+      for optional in optionals[:-1]:
+        remaining_state = tf.cond(
+            optional.has_value(),
+            lambda s=remaining_state, x=optional: reduce_fn(s, x.get_value()),
+            lambda s=remaining_state: s)
+      return remaining_state
+
+    has_next_batches = optionals[-1].has_value()
+    state = tf.cond(has_next_batches, reduce_batches, reduce_remaining_batches)
+    return has_next_batches, state
+
+  _, state = tf.while_loop(
+      cond=lambda has_next_batches, state: has_next_batches,
+      body=body,
+      loop_vars=(tf.constant(True), initial_state_fn()))
+  return state
+
+
+def build_fused_dataset_reduce_fn(
+    steps_per_iteration: int,
+    jit_compile: bool = False
+) -> Callable[[_ReduceFnCallable, tf.data.Dataset, Any], Any]:
+  """Returns a reduce loop function processing several batches per iteration.
+
+  For small models, most of the time of a reduce loop can be spent in the
+  overhead of each iteration rather than in the computation of `reduce_fn`.
+  The returned function amortizes that overhead by applying `reduce_fn` to
+  `steps_per_iteration` batches in each iteration.
+
+  Args:
+    steps_per_iteration: A positive integer, the number of batches processed by
+      each iteration of the loop.
+    jit_compile: Whether to compile the function applying `reduce_fn` to
+      `steps_per_iteration` batches with XLA. `reduce_fn` must then only use
+      operations supported by XLA.
+
+  Raises:
+    ValueError: If `steps_per_iteration` is not a positive integer.
+  """
+  if not isinstance(steps_per_iteration, int) or steps_per_iteration < 1:
+    raise ValueError('Expected `steps_per_iteration` to be a positive integer, '
+                     f'found {steps_per_iteration}.')
+  return functools.partial(
+      _fused_dataset_reduce_fn,
+      steps_per_iteration=steps_per_iteration,
+      jit_compile=jit_compile)
+
+
 def build_dataset_reduce_fn(
     simulation_flag: bool = True
 ) -> Callable[[_ReduceFnCallable, Union[tf.data.Dataset, Iterable[Any]], Any],
@@ -86,5 +86,80 @@ class DatasetReduceTest(tf.test.TestCase, parameterized.TestCase):
       self.assertIn(DATASET_REDUCE_OP, _get_op_names(graph.as_graph_def()))
 
 
+class FusedDatasetReduceTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('steps_1', 1, False),
+      ('steps_3', 3, False),
+      ('steps_10', 10, False),
+      ('steps_16', 16, False),
+      ('steps_3_jit_compile', 3, True),
+  )
+  def test_build_fused_dataset_reduce_fn(self, steps_per_iteration,
+                                         jit_compile):
+    dataset_reduce_fn = tf.function(
+        dataset_reduce.build_fused_dataset_reduce_fn(steps_per_iteration,
+                                                     jit_compile))
+    ds = tf.data.Dataset.range(10, output_type=tf.int32)
+    total_cnt, total_sum = dataset_reduce_fn(
+        reduce_fn=lambda x, y: (x[0] + 1, x[1] + y),
+        dataset=ds,
+        initial_state_fn=lambda: (tf.constant(0), tf.constant(0)))
+    self.assertEqual(total_cnt, np.int32(10))
+    self.assertEqual(total_sum, np.int32(45))
+
+  def test_build_fused_dataset_reduce_fn_empty_dataset(self):
+    dataset_reduce_fn = tf.function(
+        dataset_reduce.build_fused_dataset_reduce_fn(3))
+    ds = tf.data.Dataset.range(0, output_type=tf.int32)
+    total_sum = dataset_reduce_fn(reduce_fn=lambda x, y: x + y, dataset=ds)
+    self.assertEqual(total_sum, np.int32(0))
+
+  def test_build_fused_dataset_reduce_fn_applies_in_order(self):
+    dataset_reduce_fn = tf.function(
+        dataset_reduce.build_fused_dataset_reduce_fn(4))
+    ds = tf.data.Dataset.range(1, 11, output_type=tf.int32)
+    # A reduction that depends on the order of the batches.
+    result = dataset_reduce_fn(
+        reduce_fn=lambda x, y: x * 10 % 1_000_003 + y, dataset=ds)
+    expected_result = 0
+    for i in range(1, 11):
+      expected_result = expected_result * 10 % 1_000_003 + i
+    self.assertEqual(result, np.int32(expected_result))
+
+  def test_build_fused_dataset_reduce_fn_updates_variables(self):
+    variable = tf.Variable(0.0)
+
+    def reduce_fn(state, batch):
+      variable.assign_add(tf.reduce_sum(batch))
+      return state + tf.shape(batch)[0]
+
+    dataset_reduce_fn = tf.function(
+        dataset_reduce.build_fused_dataset_reduce_fn(2, jit_compile=True))
+    # The last batch has a different shape than the others.
+    ds = tf.data.Dataset.range(7, output_type=tf.float32).batch(2)
+    num_examples = dataset_reduce_fn(reduce_fn=reduce_fn, dataset=ds)
+    self.assertEqual(num_examples, np.int32(7))
+    self.assertEqual(variable.numpy(), np.float32(21.0))
+
+  @parameterized.named_parameters(
+      ('zero', 0),
+      ('negative', -1),
+      ('float', 1.0),
+  )
+  def test_build_fused_dataset_reduce_fn_raises_value_error(
+      self, steps_per_iteration):
+    with self.assertRaises(ValueError):
+      dataset_reduce.build_fused_dataset_reduce_fn(steps_per_iteration)
+
+  def test_dataset_reduce_op_absence(self):
+    with tf.Graph().as_default() as graph:
+      dataset_reduce_fn = tf.function(
+          dataset_reduce.build_fused_dataset_reduce_fn(3))
+      ds = tf.data.Dataset.range(10, output_type=tf.int32)
+      dataset_reduce_fn(reduce_fn=lambda x, y: x + y, dataset=ds)
+    self.assertNotIn(DATASET_REDUCE_OP, _get_op_names(graph.as_graph_def()))
+
+
 if __name__ == '__main__':
   tf.test.main()
@@ -0,0 +1,122 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Helpers for applying optimizers to weights packed into flat buffers."""
+
+import collections
+from typing import Any, List, Tuple
+
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.learning.optimizers import optimizer as optimizer_base
+
+
+def flatten_weights(
+    optimizer: optimizer_base.Optimizer) -> optimizer_base.Optimizer:
+  """Returns an optimizer applying `optimizer` to flat buffers of the weights.
+
+  The returned optimizer concatenates the weights and the gradients passed to
+  its `next` method into a single vector for each dtype, and applies
+  `optimizer` to the tuple of these vectors. The state of `optimizer` is thus a
+  structure of a few contiguous buffers rather than of a tensor for each
+  weight, and each step of `optimizer` runs a single chain of vectorized
+  operations rather than a chain for each weight. For models with many small
+  weights, this reduces the overhead of launching the operations, which can
+  dominate the time of a step.
+
+  The returned optimizer has the same hyperparameters as `optimizer`. The
+  weights it returns have the same structure, shapes and dtypes as the weights
+  passed to `next`.
+
+  Note: The optimizer must update each element of the weights independently of
+  the others, as do the optimizers in `tff.learning.optimizers`. For example,
+  an optimizer normalizing each weight by its norm would compute a different
+  update when applied to the concatenated weights.
+
+  Args:
+    optimizer: A `tff.learning.optimizers.Optimizer`.
+
+  Returns:
+    A `tff.learning.optimizers.Optimizer`.
+  """
+  return _FlatBufferOptimizer(optimizer)
+
+
+def _group_by_dtype(tensors: List[Any]) -> List[Tuple[tf.DType, List[int]]]:
+  """Returns the indices of `tensors` grouped by dtype, in order."""
+  groups = collections.OrderedDict()
+  for index, tensor in enumerate(tensors):
+    groups.setdefault(tensor.dtype, []).append(index)
+  return list(groups.items())
+
+
+def _check_fully_defined(specs: List[tf.TensorSpec]):
+  for spec in specs:
+    if not spec.shape.is_fully_defined():
+      raise ValueError('Expected the shapes of the weights to be fully '
+                       f'defined, found {spec}.')
+
+
+class _FlatBufferOptimizer(optimizer_base.Optimizer):
+  """Optimizer applied to flat buffers of the weights."""
+
+  def __init__(self, optimizer: optimizer_base.Optimizer):
+    py_typecheck.check_type(optimizer, optimizer_base.Optimizer)
+    self._optimizer = optimizer
+
+  def initialize(self, specs):
+    flat_specs = tf.nest.flatten(specs)
+    _check_fully_defined(flat_specs)
+    buffer_specs = []
+    for dtype, indices in _group_by_dtype(flat_specs):
+      num_elements = sum(flat_specs[i].shape.num_elements() for i in indices)
+      buffer_specs.append(tf.TensorSpec([num_elements], dtype))
+    return self._optimizer.initialize(tuple(buffer_specs))
+
+  def next(self, state, weights, gradients):
+    gradients = optimizer_base.handle_indexed_slices_gradients(gradients)
+    optimizer_base.check_weights_gradients_match(weights, gradients)
+    flat_weights = [tf.convert_to_tensor(w) for w in tf.nest.flatten(weights)]
+    flat_gradients = [
+        tf.convert_to_tensor(g) for g in tf.nest.flatten(gradients)
+    ]
+    groups = _group_by_dtype(flat_weights)
+
+    def _concat(tensors: List[tf.Tensor], indices: List[int]) -> tf.Tensor:
+      vectors = [tf.reshape(tensors[i], [-1]) for i in indices]
+      if len(vectors) == 1:
+        return vectors[0]
+      return tf.concat(vectors, axis=0)
+
+    weight_buffers = tuple(_concat(flat_weights, i) for _, i in groups)
+    gradient_buffers = tuple(_concat(flat_gradients, i) for _, i in groups)
+    state, weight_buffers = self._optimizer.next(state, weight_buffers,
+                                                 gradient_buffers)
+
+    updated_weights = [None] * len(flat_weights)
+    for (_, indices), weight_buffer in zip(groups, weight_buffers):
+      if len(indices) == 1:
+        parts = [weight_buffer]
+      else:
+        sizes = [flat_weights[i].shape.num_elements() for i in indices]
+        parts = tf.split(weight_buffer, sizes)
+      for index, part in zip(indices, parts):
+        updated_weights[index] = tf.reshape(part, flat_weights[index].shape)
+    return state, tf.nest.pack_sequence_as(weights, updated_weights)
+
+  def get_hparams(self, state):
+    return self._optimizer.get_hparams(state)
+
+  def set_hparams(self, state, hparams):
+    return self._optimizer.set_hparams(state, hparams)
@@ -0,0 +1,77 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `flat_buffer.flatten_weights`.
+
+Compares a step of the optimizers of `tff.learning.optimizers` with a step of
+the same optimizers applied to flat buffers of the weights, for models with
+many small weights, as a server optimizer does once per round. Each step is
+traced once in a `tf.function`, and the reported `wall_time` is the time of a
+call of the traced function.
+
+To run the benchmarks:
+
+  bazel run //tensorflow_federated/python/learning/optimizers:flat_buffer_benchmark -- --benchmark_filter=.
+"""
+
+import time
+
+import tensorflow as tf
+
+from tensorflow_federated.python.learning.optimizers import adam
+from tensorflow_federated.python.learning.optimizers import flat_buffer
+from tensorflow_federated.python.learning.optimizers import sgdm
+
+# The numbers of weights of the benchmarked models, each weight with
+# `_WEIGHT_SIZE` elements.
+_NUM_WEIGHTS = (100, 1_000)
+_WEIGHT_SIZE = 16
+_NUM_ITERS = 10
+
+
+class FlatBufferBenchmark(tf.test.Benchmark):
+
+  def _benchmark_optimizer(self, name: str, optimizer, num_weights: int):
+    specs = tuple(
+        tf.TensorSpec([_WEIGHT_SIZE], tf.float32) for _ in range(num_weights))
+    weights = tuple(tf.zeros(s.shape, s.dtype) for s in specs)
+    gradients = tuple(tf.ones(s.shape, s.dtype) for s in specs)
+    state = optimizer.initialize(specs)
+    next_fn = tf.function(optimizer.next)
+    state, weights = next_fn(state, weights, gradients)  # Trace and warm up.
+
+    start_time = time.perf_counter()
+    for _ in range(_NUM_ITERS):
+      state, weights = next_fn(state, weights, gradients)
+    wall_time = (time.perf_counter() - start_time) / _NUM_ITERS
+    self.report_benchmark(
+        name=f'{name}_{num_weights}', iters=_NUM_ITERS, wall_time=wall_time)
+
+  def _benchmark_optimizers(self, name: str, build_optimizer_fn):
+    for num_weights in _NUM_WEIGHTS:
+      self._benchmark_optimizer(f'{name}_per_tensor', build_optimizer_fn(),
+                                num_weights)
+      self._benchmark_optimizer(
+          f'{name}_flat_buffer',
+          flat_buffer.flatten_weights(build_optimizer_fn()), num_weights)
+
+  def benchmark_adam(self):
+    self._benchmark_optimizers('adam', lambda: adam.build_adam(0.01))
+
+  def benchmark_sgdm(self):
+    self._benchmark_optimizers('sgdm',
+                               lambda: sgdm.build_sgdm(0.01, momentum=0.9))
+
+
+if __name__ == '__main__':
+  tf.test.main()
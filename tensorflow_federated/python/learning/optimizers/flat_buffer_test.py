@@ -0,0 +1,179 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+from absl.testing import parameterized
+import tensorflow as tf
+
+from tensorflow_federated.python.learning.optimizers import adagrad
+from tensorflow_federated.python.learning.optimizers import adam
+from tensorflow_federated.python.learning.optimizers import flat_buffer
+from tensorflow_federated.python.learning.optimizers import optimizer as optimizer_base
+from tensorflow_federated.python.learning.optimizers import rmsprop
+from tensorflow_federated.python.learning.optimizers import sgdm
+from tensorflow_federated.python.learning.optimizers import yogi
+
+_NESTED_SPEC = collections.OrderedDict(
+    kernel=tf.TensorSpec([3, 2], tf.float32),
+    bias=tf.TensorSpec([2], tf.float32),
+    other=[tf.TensorSpec([], tf.float32), [tf.TensorSpec([4], tf.float32)]])
+
+
+def _create_values(specs, seed):
+  return tf.nest.map_structure(
+      lambda s: tf.random.stateless_normal(s.shape, [seed, 0], dtype=s.dtype),
+      specs)
+
+
+class FlatBufferOptimizerTest(parameterized.TestCase, tf.test.TestCase):
+
+  @parameterized.named_parameters(
+      ('adagrad', adagrad.build_adagrad(0.1)),
+      ('adam', adam.build_adam(0.1)),
+      ('rmsprop', rmsprop.build_rmsprop(0.1)),
+      ('sgd', sgdm.build_sgdm(0.1)),
+      ('sgdm', sgdm.build_sgdm(0.1, momentum=0.9)),
+      ('yogi', yogi.build_yogi(0.1)),
+  )
+  def test_next_matches_optimizer(self, optimizer):
+    flat_optimizer = flat_buffer.flatten_weights(optimizer)
+    state = optimizer.initialize(_NESTED_SPEC)
+    flat_state = flat_optimizer.initialize(_NESTED_SPEC)
+    weights = _create_values(_NESTED_SPEC, seed=0)
+    flat_weights = weights
+
+    for step in range(5):
+      gradients = _create_values(_NESTED_SPEC, seed=step + 1)
+      state, weights = optimizer.next(state, weights, gradients)
+      flat_state, flat_weights = flat_optimizer.next(flat_state, flat_weights,
+                                                     gradients)
+
+    tf.nest.assert_same_structure(weights, flat_weights)
+    self.assertAllClose(weights, flat_weights)
+
+  def test_state_has_a_buffer_per_dtype(self):
+    optimizer = flat_buffer.flatten_weights(sgdm.build_sgdm(0.1, momentum=0.9))
+    specs = [
+        tf.TensorSpec([3, 2], tf.float32),
+        tf.TensorSpec([5], tf.float64),
+        tf.TensorSpec([2], tf.float32),
+    ]
+
+    state = optimizer.initialize(specs)
+
+    accumulator = state[sgdm._ACCUMULATOR_KEY]
+    self.assertIsInstance(accumulator, tuple)
+    self.assertLen(accumulator, 2)
+    self.assertEqual(accumulator[0].shape, [8])
+    self.assertEqual(accumulator[0].dtype, tf.float32)
+    self.assertEqual(accumulator[1].shape, [5])
+    self.assertEqual(accumulator[1].dtype, tf.float64)
+
+  def test_next_with_mixed_dtypes(self):
+    optimizer = flat_buffer.flatten_weights(sgdm.build_sgdm(0.5))
+    specs = [
+        tf.TensorSpec([2], tf.float32),
+        tf.TensorSpec([2], tf.float64),
+        tf.TensorSpec([], tf.float32),
+    ]
+    weights = [
+        tf.constant([1.0, 2.0], tf.float32),
+        tf.constant([3.0, 4.0], tf.float64),
+        tf.constant(5.0, tf.float32),
+    ]
+    gradients = [
+        tf.constant([2.0, 2.0], tf.float32),
+        tf.constant([4.0, 4.0], tf.float64),
+        tf.constant(6.0, tf.float32),
+    ]
+
+    state = optimizer.initialize(specs)
+    _, weights = optimizer.next(state, weights, gradients)
+
+    self.assertAllClose(weights, [[0.0, 1.0], [1.0, 2.0], 2.0])
+    self.assertEqual([w.dtype for w in weights],
+                     [tf.float32, tf.float64, tf.float32])
+
+  def test_next_with_single_weight(self):
+    optimizer = flat_buffer.flatten_weights(sgdm.build_sgdm(0.5))
+    state = optimizer.initialize(tf.TensorSpec([2, 2], tf.float32))
+
+    _, weights = optimizer.next(state, tf.ones([2, 2]), tf.ones([2, 2]))
+
+    self.assertAllClose(weights, [[0.5, 0.5], [0.5, 0.5]])
+
+  def test_next_with_indexed_slices_gradients(self):
+    optimizer = flat_buffer.flatten_weights(sgdm.build_sgdm(0.5))
+    specs = [tf.TensorSpec([3, 2], tf.float32), tf.TensorSpec([2], tf.float32)]
+    weights = [tf.ones([3, 2]), tf.ones([2])]
+    gradients = [
+        tf.IndexedSlices(
+            values=tf.constant([[2.0, 2.0]]),
+            indices=tf.constant([1]),
+            dense_shape=tf.constant([3, 2])),
+        tf.ones([2]),
+    ]
+
+    state = optimizer.initialize(specs)
+    _, weights = optimizer.next(state, weights, gradients)
+
+    self.assertAllClose(weights,
+                        [[[1.0, 1.0], [0.0, 0.0], [1.0, 1.0]], [0.5, 0.5]])
+
+  def test_next_in_tf_function(self):
+    optimizer = flat_buffer.flatten_weights(adam.build_adam(0.1))
+    state = optimizer.initialize(_NESTED_SPEC)
+    weights = _create_values(_NESTED_SPEC, seed=0)
+    gradients = _create_values(_NESTED_SPEC, seed=1)
+
+    expected_state, expected_weights = optimizer.next(state, weights, gradients)
+    state, weights = tf.function(optimizer.next)(state, weights, gradients)
+
+    self.assertAllClose(expected_state, state)
+    self.assertAllClose(expected_weights, weights)
+
+  def test_get_and_set_hparams(self):
+    optimizer = flat_buffer.flatten_weights(adam.build_adam(0.1))
+    state = optimizer.initialize(_NESTED_SPEC)
+
+    hparams = optimizer.get_hparams(state)
+    self.assertEqual(hparams[optimizer_base.LEARNING_RATE_KEY], 0.1)
+    hparams[optimizer_base.LEARNING_RATE_KEY] = 0.5
+    state = optimizer.set_hparams(state, hparams)
+
+    self.assertEqual(
+        optimizer.get_hparams(state)[optimizer_base.LEARNING_RATE_KEY], 0.5)
+
+  def test_initialize_raises_with_undefined_shape(self):
+    optimizer = flat_buffer.flatten_weights(sgdm.build_sgdm(0.1))
+
+    with self.assertRaises(ValueError):
+      optimizer.initialize(tf.TensorSpec([None, 2], tf.float32))
+
+  def test_next_raises_with_mismatched_gradients(self):
+    optimizer = flat_buffer.flatten_weights(sgdm.build_sgdm(0.1))
+    state = optimizer.initialize(_NESTED_SPEC)
+    weights = _create_values(_NESTED_SPEC, seed=0)
+
+    with self.assertRaises(ValueError):
+      optimizer.next(state, weights, [tf.ones([2])])
+
+  def test_keras_optimizer_raises(self):
+    with self.assertRaises(TypeError):
+      flat_buffer.flatten_weights(tf.keras.optimizers.SGD(1.0))
+
+
+if __name__ == '__main__':
+  tf.test.main()
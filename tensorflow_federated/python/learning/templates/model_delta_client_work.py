@@ -44,6 +44,7 @@ from tensorflow_federated.python.learning import model_utils
 from tensorflow_federated.python.learning.framework import dataset_reduce
 from tensorflow_federated.python.learning.metrics import aggregator
 from tensorflow_federated.python.learning.models import functional
+from tensorflow_federated.python.learning.optimizers import flat_buffer
 from tensorflow_federated.python.learning.optimizers import optimizer as optimizer_base
 from tensorflow_federated.python.learning.templates import client_works
 from tensorflow_federated.python.tensorflow_libs import tensor_utils
@@ -54,7 +55,9 @@ def build_model_delta_update_with_tff_optimizer(
     model_fn: Callable[[], model_lib.Model],
     *,
     weighting: client_weight_lib.ClientWeighting,
-    use_experimental_simulation_loop: bool = False):
+    use_experimental_simulation_loop: bool = False,
+    steps_per_iteration: Optional[int] = None,
+    jit_compile: bool = False):
   """Creates client update logic in FedAvg using a TFF optimizer.
 
   In contrast to using a `tf.keras.optimizers.Optimizer`, we avoid creating
@@ -64,21 +67,59 @@ def build_model_delta_update_with_tff_optimizer(
   the result to the model weights (while a `tf.keras.optimizers.Optimizer` will
   modify the model weight in place using `optimizer.apply_gradients`).
 
+  If `steps_per_iteration` is set, the client trains with a loop that applies
+  `steps_per_iteration` steps in each iteration (see
+  `dataset_reduce.build_fused_dataset_reduce_fn`), and the optimizer is applied
+  to flat buffers of the trainable weights (see
+  `tff.learning.optimizers.flatten_weights`), so that its state is a buffer per
+  dtype rather than a structure with a tensor per weight. Together with
+  `jit_compile`, this reduces the per-step overhead, which dominates the
+  training time of small models. Without `jit_compile`, the loop is typically
+  slower than the default one, so `steps_per_iteration` should be set together
+  with `jit_compile`. Like the experimental simulation loop, the loop iterates
+  over the dataset with an iterator, so it requires
+  `use_experimental_simulation_loop` to be `True`. The flat buffers require an
+  optimizer that updates each element of the weights independently of the
+  others, such as the optimizers in `tff.learning.optimizers`.
+
   Args:
     model_fn: A no-arg callable returning a `tff.learning.Model`.
     weighting: A `tff.learning.ClientWeighting` value.
     use_experimental_simulation_loop: Controls the reduce loop function for the
-      input dataset. An experimental reduce loop is used for simulation.
+      input dataset. An experimental reduce loop is used for simulation. Must be
+      `True` if `steps_per_iteration` is set.
+    steps_per_iteration: Optional, a positive integer, the number of training
+      steps applied by each iteration of the training loop. Requires
+      `use_experimental_simulation_loop` to be `True`, and should be used with
+      `jit_compile`.
+    jit_compile: Whether to compile the `steps_per_iteration` training steps of
+      an iteration with XLA. Requires `steps_per_iteration` to be set.
 
   Returns:
     A `tf.function`.
+
+  Raises:
+    ValueError: If `jit_compile` is set without `steps_per_iteration`, or if
+      `steps_per_iteration` is set without `use_experimental_simulation_loop`.
   """
   model = model_fn()
-  dataset_reduce_fn = dataset_reduce.build_dataset_reduce_fn(
-      use_experimental_simulation_loop)
+  if steps_per_iteration is None:
+    if jit_compile:
+      raise ValueError('Expected `steps_per_iteration` to be set when '
+                       '`jit_compile` is `True`.')
+    dataset_reduce_fn = dataset_reduce.build_dataset_reduce_fn(
+        use_experimental_simulation_loop)
+  else:
+    if not use_experimental_simulation_loop:
+      raise ValueError('Expected `use_experimental_simulation_loop` to be '
+                       '`True` when `steps_per_iteration` is set.')
+    dataset_reduce_fn = dataset_reduce.build_fused_dataset_reduce_fn(
+        steps_per_iteration, jit_compile)
 
   @tf.function
   def client_update(optimizer, initial_weights, data, optimizer_hparams=None):
+    if steps_per_iteration is not None:
+      optimizer = flat_buffer.flatten_weights(optimizer)
     model_weights = model_utils.ModelWeights.from_model(model)
     tf.nest.map_structure(lambda a, b: a.assign(b), model_weights,
                           initial_weights)
@@ -230,8 +271,9 @@ def build_model_delta_client_work(
         model_lib.MetricFinalizersType, computation_types.StructWithPythonType
     ], computation_base.Computation]] = None,
     *,
-    use_experimental_simulation_loop: bool = False
-) -> client_works.ClientWorkProcess:
+    use_experimental_simulation_loop: bool = False,
+    steps_per_iteration: Optional[int] = None,
+    jit_compile: bool = False) -> client_works.ClientWorkProcess:
   """Creates a `ClientWorkProcess` for federated averaging.
 
   This client work is constructed in slightly different manners depending on
@@ -267,9 +309,23 @@ def build_model_delta_client_work(
       input dataset. An experimental reduce loop is used for simulation. It is
       currently necessary to set this flag to True for performant GPU
       simulations.
+    steps_per_iteration: Optional, a positive integer. If set, the clients
+      train with a loop applying `steps_per_iteration` training steps in each
+      iteration, and with the optimizer applied to flat buffers of the trainable
+      weights. Requires `optimizer` to be a
+      `tff.learning.optimizers.Optimizer` and
+      `use_experimental_simulation_loop` to be `True`. Without `jit_compile`,
+      this is typically slower than the default loop.
+    jit_compile: Whether to compile the `steps_per_iteration` training steps of
+      an iteration with XLA. Requires `steps_per_iteration` to be set.
 
   Returns:
     A `ClientWorkProcess`.
+
+  Raises:
+    ValueError: If `steps_per_iteration` is set and `optimizer` is not a
+      `tff.learning.optimizers.Optimizer`, or `use_experimental_simulation_loop`
+      is `False`.
   """
   py_typecheck.check_callable(model_fn)
   py_typecheck.check_type(client_weighting, client_weight_lib.ClientWeighting)
@@ -279,6 +335,14 @@ def build_model_delta_client_work(
         'Provided optimizer must a either a tff.learning.optimizers.Optimizer '
         'or a no-arg callable returning an tf.keras.optimizers.Optimizer.')
 
+  if (steps_per_iteration is not None and
+      not isinstance(optimizer, optimizer_base.Optimizer)):
+    raise ValueError('Expected a `tff.learning.optimizers.Optimizer` when '
+                     f'`steps_per_iteration` is set, found {optimizer}.')
+  if steps_per_iteration is not None and not use_experimental_simulation_loop:
+    raise ValueError('Expected `use_experimental_simulation_loop` to be `True` '
+                     'when `steps_per_iteration` is set.')
+
   if metrics_aggregator is None:
     metrics_aggregator = aggregator.sum_then_finalize
 
@@ -325,7 +389,9 @@ def build_model_delta_client_work(
       client_update = build_model_delta_update_with_tff_optimizer(
           model_fn=model_fn,
           weighting=client_weighting,
-          use_experimental_simulation_loop=use_experimental_simulation_loop)
+          use_experimental_simulation_loop=use_experimental_simulation_loop,
+          steps_per_iteration=steps_per_iteration,
+          jit_compile=jit_compile)
       return client_update(optimizer, initial_model_weights, dataset,
                            optimizer_hparams)
 
@@ -496,6 +496,83 @@ class ModelDeltaClientWorkExecutionTest(tf.test.TestCase,
     self.assertEqual(result1[0].update_weight, result2[0].update_weight)
     self.assertAllClose(result1[1], result2[1])
 
+  @parameterized.named_parameters(
+      ('steps_1', 1, False),
+      ('steps_2', 2, False),
+      ('steps_5', 5, False),
+      ('steps_2_jit_compile', 2, True),
+  )
+  def test_tff_client_work_with_steps_per_iteration_equal(
+      self, steps_per_iteration, jit_compile):
+    dataset = create_test_dataset()
+    optimizer = sgdm.build_sgdm(learning_rate=0.1, momentum=0.9)
+    client_update = model_delta_client_work.build_model_delta_update_with_tff_optimizer(
+        model_fn=create_model,
+        weighting=client_weight_lib.ClientWeighting.NUM_EXAMPLES,
+        use_experimental_simulation_loop=True)
+    client_update_fused = model_delta_client_work.build_model_delta_update_with_tff_optimizer(
+        model_fn=create_model,
+        weighting=client_weight_lib.ClientWeighting.NUM_EXAMPLES,
+        use_experimental_simulation_loop=True,
+        steps_per_iteration=steps_per_iteration,
+        jit_compile=jit_compile)
+
+    result = client_update(optimizer, create_test_initial_weights(), dataset)
+    fused_result = client_update_fused(optimizer, create_test_initial_weights(),
+                                       dataset)
+
+    self.assertAllClose(result[0].update, fused_result[0].update)
+    self.assertEqual(result[0].update_weight, fused_result[0].update_weight)
+    self.assertAllClose(result[1], fused_result[1])
+
+  def test_tff_client_work_raises_with_jit_compile_without_steps(self):
+    with self.assertRaises(ValueError):
+      model_delta_client_work.build_model_delta_update_with_tff_optimizer(
+          model_fn=create_model,
+          weighting=client_weight_lib.ClientWeighting.NUM_EXAMPLES,
+          jit_compile=True)
+
+  def test_tff_client_work_raises_with_steps_without_simulation_loop(self):
+    with self.assertRaises(ValueError):
+      model_delta_client_work.build_model_delta_update_with_tff_optimizer(
+          model_fn=create_model,
+          weighting=client_weight_lib.ClientWeighting.NUM_EXAMPLES,
+          use_experimental_simulation_loop=False,
+          steps_per_iteration=2)
+
+  def test_execution_with_steps_per_iteration(self):
+    client_work_process = model_delta_client_work.build_model_delta_client_work(
+        create_model,
+        sgdm.build_sgdm(learning_rate=1.0),
+        client_weighting=client_weight_lib.ClientWeighting.NUM_EXAMPLES,
+        use_experimental_simulation_loop=True,
+        steps_per_iteration=2)
+    client_data = [create_test_dataset()]
+    client_model_weights = [create_test_initial_weights()]
+
+    state = client_work_process.initialize()
+    output = client_work_process.next(state, client_model_weights, client_data)
+
+    self.assertEqual(output.measurements['train']['num_examples'], 8)
+
+  def test_raises_with_steps_per_iteration_and_keras_optimizer(self):
+    with self.assertRaises(ValueError):
+      model_delta_client_work.build_model_delta_client_work(
+          create_model,
+          lambda: tf.keras.optimizers.SGD(learning_rate=1.0),
+          client_weighting=client_weight_lib.ClientWeighting.NUM_EXAMPLES,
+          use_experimental_simulation_loop=True,
+          steps_per_iteration=2)
+
+  def test_raises_with_steps_per_iteration_without_simulation_loop(self):
+    with self.assertRaises(ValueError):
+      model_delta_client_work.build_model_delta_client_work(
+          create_model,
+          sgdm.build_sgdm(learning_rate=1.0),
+          client_weighting=client_weight_lib.ClientWeighting.NUM_EXAMPLES,
+          use_experimental_simulation_loop=False,
+          steps_per_iteration=2)
+
 
 class FunctionalModelDeltaClientWorkExecutionTest(tf.test.TestCase,
                                                   parameterized.TestCase):
@@ -53,6 +53,12 @@ class Capability(enum.Enum):
   # samples of data are available for processing may not support this.
   SUPPORTS_REUSE = 4
 
+  # Selections of data from this data source are prepared ahead of time: once a
+  # selection is returned, the next selection of the same number of clients is
+  # prepared concurrently with the processing of the current one, so that the
+  # preparation of the data overlaps with the invocation of computations.
+  PREFETCH = 5
+
 
 class FederatedDataSourceIterator(metaclass=abc.ABCMeta):
   """An abstract interface for representing federated data source iterators.
@@ -21,11 +21,16 @@ means that this library:
 """
 
 import asyncio
+import base64
+import hashlib
+import json
 import os
 import os.path
-from typing import Any, List, Optional, Union
+import random
+from typing import Any, Dict, List, Optional, Union
 
 from absl import logging
+import numpy as np
 import tensorflow as tf
 import tree
 
@@ -153,6 +158,15 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
     basename = f'{self._prefix}{version}'
     return os.path.join(self._root_dir, basename)
 
+  async def _read_flattened_state(self, path: str) -> List[Any]:
+    """Returns the flattened program state saved to `path`."""
+    return await file_utils.read_saved_model(path)
+
+  async def _write_flattened_state(self, flattened_state: List[Any],
+                                   path: str) -> None:
+    """Saves the flattened program state `flattened_state` to `path`."""
+    await file_utils.write_saved_model(flattened_state, path)
+
   async def load(self, version: int, structure: Any) -> Any:
     """Returns the program state for the given `version`.
 
@@ -174,7 +188,7 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
     if not await file_utils.exists(path):
       raise program_state_manager.ProgramStateManagerStateNotFoundError(
           f'No program state found for version: {version}')
-    flattened_state = await file_utils.read_saved_model(path)
+    flattened_state = await self._read_flattened_state(path)
     try:
       program_state = tree.unflatten_as(structure, flattened_state)
     except ValueError as e:
@@ -245,6 +259,179 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
           f'Program state already exists for version: {version}')
     materialized_state = await value_reference.materialize_value(program_state)
     flattened_state = tree.flatten(materialized_state)
-    await file_utils.write_saved_model(flattened_state, path)
+    await self._write_flattened_state(flattened_state, path)
     logging.info('Program state saved: %s', path)
     await self._remove_old_program_state()
+
+
+class ShardedFileProgramStateManager(FileProgramStateManager):
+  """A `tff.program.ProgramStateManager` saving program state as array shards.
+
+  A `tff.program.ShardedFileProgramStateManager` is a utility for saving and
+  loading program state to a file system in a federated program, like a
+  `tff.program.FileProgramStateManager`, which is faster for large program
+  states: saving program state does not require tracing a `tf.function`, and
+  the values of the program state that did not change since a previously saved
+  version are not saved again.
+
+  When the program state is saved, if the program state is a value reference or
+  a structure containing value references, each value reference is
+  materialized. The program state is then flattened, and each value is
+  converted to a `numpy.ndarray` (see `tf.convert_to_tensor`) and saved in its
+  own shard, in the `.npy` format, named after a hash of its contents. Shards are
+  shared by all the versions of the program state, and saved in parallel. Each
+  version of the program state is a directory holding a manifest listing the
+  shard and the dtype of each value, as the `.npy` format does not record the
+  dtypes defined by TensorFlow (e.g. `tf.bfloat16`). Strings are saved in the
+  manifest. Shards no longer
+  listed by any version are removed with the old versions of the program state.
+
+  When the program state is loaded from a local file system, the shards are
+  memory-mapped, so that the values are only read when they are used.
+
+  Note: Only values that can be converted to a `tf.Tensor`, and `None`, can be
+  saved; in particular, a program state containing a `tf.data.Dataset` can not
+  be saved by this manager.
+  """
+
+  _MANIFEST_BASENAME = 'manifest.json'
+
+  def _get_shards_dir(self) -> str:
+    # Note: The shards directory is not a version, since its basename is not a
+    # prefix followed by an integer.
+    return os.path.join(self._root_dir, f'{self._prefix}shards')
+
+  def _get_path_for_shard(self, digest: str) -> str:
+    return os.path.join(self._get_shards_dir(), f'{digest}.npy')
+
+  def _write_shard(self, value: np.ndarray) -> str:
+    """Saves `value` to the shard named after its contents, if missing."""
+    # Note: `np.ascontiguousarray` would return scalars as arrays of shape [1].
+    value = np.require(value, requirements='C')
+    hasher = hashlib.sha256()
+    hasher.update(f'{value.dtype.name}{value.dtype.str}{value.shape}'.encode())
+    # Note: The buffer of an array of a dtype defined by TensorFlow, e.g.
+    # `tf.bfloat16`, can not be exported, so the bytes are viewed as `uint8`.
+    hasher.update(value.reshape([-1]).view(np.uint8).data)
+    digest = hasher.hexdigest()
+    path = self._get_path_for_shard(digest)
+    if not tf.io.gfile.exists(path):
+      # Write to a temporary file, and rename it to the final location
+      # atomically.
+      temp_path = f'{path}_temp{random.randint(1000, 9999)}'
+      with tf.io.gfile.GFile(temp_path, 'wb') as file:
+        np.save(file, value, allow_pickle=False)
+      tf.io.gfile.rename(temp_path, path, overwrite=True)
+    return digest
+
+  def _read_shard(self, digest: str) -> np.ndarray:
+    """Returns the value saved to the shard `digest`."""
+    path = self._get_path_for_shard(digest)
+    if '://' not in path:
+      # Copy-on-write, so that the loaded values can be modified without
+      # modifying the shard.
+      return np.asarray(np.load(path, mmap_mode='c', allow_pickle=False))
+    with tf.io.gfile.GFile(path, 'rb') as file:
+      return np.load(file, allow_pickle=False)
+
+  async def _write_flattened_state(self, flattened_state: List[Any],
+                                   path: str) -> None:
+    """Saves `flattened_state` as array shards listed in a manifest at `path`."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, tf.io.gfile.makedirs,
+                               self._get_shards_dir())
+
+    async def _write_value(value: Any) -> Dict[str, Any]:
+      if value is None:
+        return {'kind': 'none'}
+      if isinstance(value, tf.data.Dataset):
+        raise TypeError('Expected the program state to contain values that can '
+                        'be converted to a `tf.Tensor`, found a '
+                        '`tf.data.Dataset`.')
+      if not isinstance(value, np.ndarray):
+        value = np.asarray(tf.convert_to_tensor(value).numpy())
+      if value.dtype.kind in ('O', 'S', 'U'):
+        # Strings are converted to `bytes`, as by `tf.convert_to_tensor`, and
+        # saved in the manifest.
+        encoded = [
+            base64.b64encode(
+                x if isinstance(x, bytes) else str(x).encode()).decode('ascii')
+            for x in value.flat
+        ]
+        return {'kind': 'bytes', 'shape': list(value.shape), 'values': encoded}
+      digest = await loop.run_in_executor(None, self._write_shard, value)
+      return {'kind': 'array', 'shard': digest, 'dtype': value.dtype.name}
+
+    manifest = await asyncio.gather(
+        *[_write_value(value) for value in flattened_state])
+
+    def _write_manifest(path: str) -> None:
+      # Write to a temporary directory, and rename it to the final location
+      # atomically.
+      temp_path = f'{path}_temp{random.randint(1000, 9999)}'
+      if tf.io.gfile.exists(temp_path):
+        tf.io.gfile.rmtree(temp_path)
+      tf.io.gfile.makedirs(temp_path)
+      manifest_path = os.path.join(temp_path, self._MANIFEST_BASENAME)
+      with tf.io.gfile.GFile(manifest_path, 'w') as file:
+        json.dump(manifest, file)
+      tf.io.gfile.rename(temp_path, path)
+
+    await loop.run_in_executor(None, _write_manifest, path)
+
+  def _read_manifest(self, path: str) -> List[Dict[str, Any]]:
+    manifest_path = os.path.join(path, self._MANIFEST_BASENAME)
+    with tf.io.gfile.GFile(manifest_path, 'r') as file:
+      return json.load(file)
+
+  async def _read_flattened_state(self, path: str) -> List[Any]:
+    """Returns the flattened program state listed in the manifest at `path`."""
+    loop = asyncio.get_running_loop()
+    manifest = await loop.run_in_executor(None, self._read_manifest, path)
+
+    async def _read_value(entry: Dict[str, Any]) -> Any:
+      if entry['kind'] == 'none':
+        return None
+      elif entry['kind'] == 'bytes':
+        values = [base64.b64decode(x) for x in entry['values']]
+        value = np.empty(len(values), dtype=object)
+        value[:] = values
+        value = value.reshape(entry['shape'])
+      else:
+        value = await loop.run_in_executor(None, self._read_shard,
+                                           entry['shard'])
+        if value.dtype.name != entry['dtype']:
+          # The dtypes defined by TensorFlow are loaded as void dtypes.
+          value = value.view(tf.as_dtype(entry['dtype']).as_numpy_dtype)
+      # Scalars are loaded as NumPy scalars (or `bytes`), as from a SavedModel.
+      if not value.shape:
+        return value[()]
+      return value
+
+    return await asyncio.gather(*[_read_value(entry) for entry in manifest])
+
+  async def _remove_old_program_state(self) -> None:
+    """Removes old program state, and the shards no longer listed by any."""
+    await super()._remove_old_program_state()
+    if self._keep_total <= 0:
+      return
+
+    def _remove_unlisted_shards(versions: List[int]) -> None:
+      shards_dir = self._get_shards_dir()
+      if not tf.io.gfile.exists(shards_dir):
+        return
+      listed_digests = set()
+      for version in versions:
+        manifest = self._read_manifest(self._get_path_for_version(version))
+        listed_digests.update(
+            entry['shard'] for entry in manifest if entry['kind'] == 'array')
+      for basename in tf.io.gfile.listdir(shards_dir):
+        digest, _ = os.path.splitext(basename)
+        # Note: Shards still being written by a concurrent save are temporary
+        # files, which are not removed.
+        if basename.endswith('.npy') and digest not in listed_digests:
+          tf.io.gfile.remove(os.path.join(shards_dir, basename))
+
+    versions = await self.get_versions()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _remove_unlisted_shards, versions or [])
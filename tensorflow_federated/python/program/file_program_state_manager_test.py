@@ -639,5 +639,153 @@ class FileProgramStateManagerSaveTest(parameterized.TestCase,
       await program_state_mngr.save('state', version)
 
 
+
+class ShardedFileProgramStateManagerTest(parameterized.TestCase,
+                                         unittest.IsolatedAsyncioTestCase,
+                                         tf.test.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      # materialized values
+      ('none', None, None),
+      ('bool', True, np.bool_(True)),
+      ('int', 1, np.int32(1)),
+      ('str', 'a', b'a'),
+      ('tensor_int', tf.constant(1), np.int32(1)),
+      ('tensor_str', tf.constant('a'), b'a'),
+      ('tensor_array', tf.ones([3], tf.int32), np.ones([3], np.int32)),
+      ('numpy_int', np.int32(1), np.int32(1)),
+      ('numpy_array', np.ones([3], np.int32), np.ones([3], np.int32)),
+      ('tensor_bfloat16',
+       tf.constant(1.5, tf.bfloat16),
+       tf.bfloat16.as_numpy_dtype(1.5)),
+      ('tensor_array_bfloat16',
+       tf.ones([3], tf.bfloat16),
+       np.ones([3], tf.bfloat16.as_numpy_dtype)),
+
+      # value references
+      ('materializable_value_reference_tensor',
+       program_test_utils.TestMaterializableValueReference(1),
+       np.int32(1)),
+
+      # structures
+      ('list_nested',
+       [[True, program_test_utils.TestMaterializableValueReference(1)], ['a']],
+       [[np.bool_(True), np.int32(1)], [b'a']]),
+      ('dict_nested',
+       {'x': {'a': True,
+              'b': program_test_utils.TestMaterializableValueReference(1)},
+        'y': {'c': 'a'}},
+       {'x': {'a': np.bool_(True), 'b': np.int32(1)}, 'y': {'c': b'a'}}),
+      ('namedtuple',
+       program_test_utils.TestNamedtupleObj2(
+           True, program_test_utils.TestMaterializableValueReference(1)),
+       program_test_utils.TestNamedtupleObj2(np.bool_(True), np.int32(1))),
+  )
+  # pyformat: enable
+  async def test_returns_saved_program_state(self, program_state,
+                                             expected_state):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.ShardedFileProgramStateManager(
+            root_dir=root_dir, prefix='a_'))
+    await program_state_mngr.save(program_state, 1)
+    structure = program_state
+
+    actual_state = await program_state_mngr.load(1, structure)
+
+    program_test_utils.assert_types_equal(actual_state, expected_state)
+    if (isinstance(actual_state, np.ndarray) and
+        isinstance(expected_state, np.ndarray)):
+      self.assertEqual(actual_state.dtype, expected_state.dtype)
+      np.testing.assert_equal(actual_state, expected_state)
+    else:
+      self.assertEqual(actual_state, expected_state)
+
+  async def test_returns_saved_program_state_with_string_array(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.ShardedFileProgramStateManager(
+            root_dir=root_dir))
+    await program_state_mngr.save(tf.constant([['a', 'b\x00'], ['', 'c']]), 1)
+
+    actual_state = await program_state_mngr.load(1, None)
+
+    self.assertEqual(actual_state.tolist(), [[b'a', b'b\x00'], [b'', b'c']])
+
+  async def test_loaded_program_state_is_writable(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.ShardedFileProgramStateManager(
+            root_dir=root_dir))
+    await program_state_mngr.save([np.zeros([3], np.float32)], 1)
+
+    actual_state = await program_state_mngr.load(1, [None])
+    actual_state[0][0] = 1.0
+    reloaded_state = await program_state_mngr.load(1, [None])
+
+    np.testing.assert_equal(actual_state[0], [1.0, 0.0, 0.0])
+    np.testing.assert_equal(reloaded_state[0], [0.0, 0.0, 0.0])
+
+  async def test_does_not_save_unchanged_values_again(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.ShardedFileProgramStateManager(
+            root_dir=root_dir, prefix='a_', keep_total=0))
+    frozen = np.ones([10], np.float32)
+
+    with mock.patch.object(
+        program_state_mngr, '_write_shard',
+        wraps=program_state_mngr._write_shard):
+      await program_state_mngr.save([frozen, np.zeros([2], np.float32)], 1)
+      await program_state_mngr.save([frozen, np.ones([2], np.float32)], 2)
+      await program_state_mngr.save([frozen, np.ones([2], np.float32)], 3)
+
+    shards = os.listdir(os.path.join(root_dir, 'a_shards'))
+    self.assertLen(shards, 3)
+    self.assertCountEqual(await program_state_mngr.get_versions(), [1, 2, 3])
+    actual_state = await program_state_mngr.load(1, [None, None])
+    np.testing.assert_equal(actual_state, [frozen, np.zeros([2], np.float32)])
+
+  async def test_removes_unlisted_shards_with_old_program_state(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.ShardedFileProgramStateManager(
+            root_dir=root_dir, prefix='a_', keep_total=2, keep_first=False))
+    shards_dir = os.path.join(root_dir, 'a_shards')
+
+    for version in range(1, 5):
+      await program_state_mngr.save(
+          [np.ones([2], np.float32), np.int64(version)], version)
+
+    # One shared shard, and a shard for each of the two kept versions.
+    self.assertLen(os.listdir(shards_dir), 3)
+    self.assertEqual(await program_state_mngr.get_versions(), [3, 4])
+    actual_state = await program_state_mngr.load(3, [None, None])
+    np.testing.assert_equal(actual_state, [np.ones([2], np.float32), 3])
+
+  async def test_raises_type_error_with_dataset(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.ShardedFileProgramStateManager(
+            root_dir=root_dir))
+
+    with self.assertRaises(TypeError):
+      await program_state_mngr.save(
+          tf.data.Dataset.from_tensor_slices([1, 2, 3]), 1)
+
+  async def test_raises_version_already_exists_error_with_existing_version(
+      self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.ShardedFileProgramStateManager(
+            root_dir=root_dir))
+
+    await program_state_mngr.save('state_1', 1)
+
+    with self.assertRaises(
+        program_state_manager.ProgramStateManagerStateAlreadyExistsError):
+      await program_state_mngr.save('state_1', 1)
+
 if __name__ == '__main__':
   absltest.main()
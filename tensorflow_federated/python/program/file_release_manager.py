@@ -24,10 +24,11 @@ import asyncio
 import collections
 import csv
 import enum
+import json
 import os
 import os.path
 import random
-from typing import Any, Dict, Iterable, List, Mapping, Tuple, Sequence, Union
+from typing import Any, Dict, Iterable, List, Mapping, Optional, OrderedDict, Tuple, Sequence, Union
 
 import numpy as np
 import tensorflow as tf
@@ -49,6 +50,13 @@ class FileReleaseManagerPermissionDeniedError(Exception):
   pass
 
 
+def _normalize(value: Any) -> Any:
+  """Returns `value` as a Python scalar or a nested list of Python scalars."""
+  if isinstance(value, tf.data.Dataset):
+    value = list(value)
+  return np.array(value).tolist()
+
+
 @enum.unique
 class CSVSaveMode(enum.Enum):
   APPEND = 'append'
@@ -278,12 +286,6 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
         value_reference.materialize_value(value))
 
     flattened_value = structure_utils.flatten_with_name(materialized_value)
-
-    def _normalize(value: Any) -> Any:
-      if isinstance(value, tf.data.Dataset):
-        value = list(value)
-      return np.array(value).tolist()
-
     normalized_value = [(k, _normalize(v)) for k, v in flattened_value]
     normalized_value.insert(0, (self._key_fieldname, key))
     normalized_value = collections.OrderedDict(normalized_value)
@@ -294,6 +296,266 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
     self._latest_key = key
 
 
+class ColumnarFileReleaseManager(release_manager.ReleaseManager):
+  """A `tff.program.ReleaseManager` that releases values to a columnar file.
+
+  A `tff.program.ColumnarFileReleaseManager` is a utility for releasing values
+  from a federated program to a file system and is used to release values from
+  platform storage to customer storage in a federated program. It is intended
+  for releasing many small values, e.g. the metrics of each round of a long
+  running program, and releases each value in constant amortized time.
+
+  When the value is released, if the value is a value reference or a structure
+  containing value references, each value reference is materialized. The value
+  is then flattened, converted to a `numpy.ndarray`, and then converted to a
+  nested list of Python scalars, as in a `tff.program.CSVFileReleaseManager`.
+
+  Values are released to the file system in two files in `root_dir`:
+
+  * A log, to which each released value is appended as a JSON encoded line. The
+    log is never rewritten, so releasing a value with new names (e.g. a new
+    metric) does not require changing the previously released values, and
+    releasing a value with a key less than or equal to the latest released key
+    (e.g. when a program resumes from an earlier round) discards the values
+    previously released with a key greater than or equal to that key, without
+    requiring any value to be read.
+
+  * A columnar file, `columns.json`, holding a JSON object with the list of the
+    values of each name, and of each key, in the order of the keys. A value
+    missing a name has a value of `None` for that name. When the number of
+    values in the log reaches the number of values in the columnar file (or
+    `min_compaction_size`, if greater), the log is compacted into a new
+    columnar file, and a new log is started. The cost of each compaction is
+    proportional to the number of values released, but as the number of values
+    released between compactions grows as fast, it is constant per value
+    released.
+
+  Note: This manager appends to files, which is incompatible with compressed
+  files (e.g. `.bz2` formats) and encoded directories.
+  """
+
+  _COLUMNS_BASENAME = 'columns.json'
+  _LOG_PREFIX = 'log_'
+
+  def __init__(self,
+               root_dir: Union[str, os.PathLike[str]],
+               key_fieldname: str = 'key',
+               min_compaction_size: int = 100):
+    """Returns an initialized `tff.program.ColumnarFileReleaseManager`.
+
+    Args:
+      root_dir: A path on the file system to save the released values. If this
+        path does not exist it will be created.
+      key_fieldname: A `str` specifying the fieldname used for the key when
+        saving released value.
+      min_compaction_size: The minimum number of values released to the log
+        before it is compacted into the columnar file.
+
+    Raises:
+      ValueError: If `root_dir` or `key_fieldname` is an empty string, or if
+        `min_compaction_size` is not positive.
+      FileReleaseManagerIncompatibleFileError: If the columnar file exists but
+        does not contain a fieldname of `key_fieldname`.
+    """
+    py_typecheck.check_type(root_dir, (str, os.PathLike))
+    if not root_dir:
+      raise ValueError('Expected `root_dir` to not be an empty string.')
+    py_typecheck.check_type(key_fieldname, str)
+    if not key_fieldname:
+      raise ValueError('Expected `key_fieldname` to not be an empty string.')
+    py_typecheck.check_type(min_compaction_size, int)
+    if min_compaction_size < 1:
+      raise ValueError('Expected `min_compaction_size` to be positive, found '
+                       f'{min_compaction_size}.')
+
+    if not tf.io.gfile.exists(root_dir):
+      tf.io.gfile.makedirs(root_dir)
+    self._root_dir = root_dir
+    self._key_fieldname = key_fieldname
+    self._min_compaction_size = min_compaction_size
+
+    generation, fieldnames, columns = self._read_columns_file()
+    if columns is not None and self._key_fieldname not in fieldnames:
+      raise FileReleaseManagerIncompatibleFileError(
+          f'The file \'{self._get_columns_path()}\' exists but does not '
+          f'contain a fieldname of \'{self._key_fieldname}\'. It is possible '
+          'that this file was not created by a '
+          '`tff.program.ColumnarFileReleaseManager` or the '
+          '`tff.program.ColumnarFileReleaseManager` was constructed with a '
+          'different `key_fieldname`.')
+    self._generation = generation
+    self._remove_stale_logs()
+    self._num_log_records = self._terminate_log()
+    self._num_compacted_values = (
+        len(columns[self._key_fieldname]) if columns is not None else 0)
+
+  def _get_columns_path(self) -> str:
+    return os.path.join(self._root_dir, self._COLUMNS_BASENAME)
+
+  def _get_log_path(self, generation: int) -> str:
+    return os.path.join(self._root_dir, f'{self._LOG_PREFIX}{generation}')
+
+  def _read_columns_file(
+      self) -> Tuple[int, List[str], Optional[Dict[str, List[Any]]]]:
+    """Returns the generation, fieldnames and columns of the columnar file.
+
+    The generation is the generation of the log holding the values released
+    after the columnar file was written. If the columnar file does not exist,
+    the generation is 0 and the columns are `None`.
+    """
+    path = self._get_columns_path()
+    if not tf.io.gfile.exists(path):
+      return 0, [], None
+    with tf.io.gfile.GFile(path, 'r') as file:
+      contents = json.load(file)
+    return contents['generation'], contents['fieldnames'], contents['columns']
+
+  def _read_log(self) -> List[Dict[str, Any]]:
+    """Returns the records of the current log, in the order they were written.
+
+    Partially written lines, e.g. if the program was interrupted while releasing
+    a value, are ignored.
+    """
+    path = self._get_log_path(self._generation)
+    if not tf.io.gfile.exists(path):
+      return []
+    records = []
+    with tf.io.gfile.GFile(path, 'r') as file:
+      for line in file:
+        try:
+          records.append(json.loads(line))
+        except json.JSONDecodeError:
+          continue
+    return records
+
+  def _terminate_log(self) -> int:
+    """Terminates a partially written last line of the current log, if any.
+
+    Returns:
+      The number of lines of the current log, which is the number of its
+      records, counting a partially written line as a record.
+    """
+    path = self._get_log_path(self._generation)
+    if not tf.io.gfile.exists(path):
+      return 0
+    with tf.io.gfile.GFile(path, 'r') as file:
+      contents = file.read()
+    if contents and not contents.endswith('\n'):
+      with tf.io.gfile.GFile(path, 'a') as file:
+        file.write('\n')
+      return contents.count('\n') + 1
+    return contents.count('\n')
+
+  def _remove_stale_logs(self) -> None:
+    """Removes the logs already compacted into the columnar file."""
+    pattern = os.path.join(self._root_dir, f'{self._LOG_PREFIX}*')
+    for path in tf.io.gfile.glob(pattern):
+      suffix = os.path.basename(path)[len(self._LOG_PREFIX):]
+      if suffix.isdigit() and int(suffix) < self._generation:
+        tf.io.gfile.remove(path)
+
+  def _merge(self) -> Tuple[List[str], Dict[str, List[Any]]]:
+    """Returns the fieldnames and columns of all the released values.
+
+    The values in the log are applied in order to the values in the columnar
+    file: each value released with a key removes all the values released with a
+    key greater than or equal to that key, and is then appended.
+    """
+    _, fieldnames, columns = self._read_columns_file()
+    if columns is None:
+      fieldnames = [self._key_fieldname]
+      columns = {self._key_fieldname: []}
+    keys = columns[self._key_fieldname]
+    for record in self._read_log():
+      key = record[self._key_fieldname]
+      num_values = len(keys)
+      while num_values and keys[num_values - 1] >= key:
+        num_values -= 1
+      if num_values < len(keys):
+        for column in columns.values():
+          del column[num_values:]
+      for name in record:
+        if name not in columns:
+          fieldnames.append(name)
+          columns[name] = [None] * num_values
+      for name, column in columns.items():
+        column.append(record.get(name))
+    return fieldnames, columns
+
+  def read_columns(self) -> OrderedDict[str, List[Any]]:
+    """Returns the released values as an `OrderedDict` of columns.
+
+    The keys of the returned `OrderedDict` are `key_fieldname` followed by the
+    names of the released values, in the order they were first released, and
+    its values are the lists of the values of each name, in the order of the
+    keys.
+    """
+    fieldnames, columns = self._merge()
+    return collections.OrderedDict((name, columns[name]) for name in fieldnames)
+
+  def _compact(self) -> None:
+    """Compacts the current log into a new columnar file."""
+    fieldnames, columns = self._merge()
+    contents = {
+        'generation': self._generation + 1,
+        'fieldnames': fieldnames,
+        'columns': columns,
+    }
+    path = self._get_columns_path()
+    temp_path = f'{path}_temp{random.randint(1000, 9999)}'
+    with tf.io.gfile.GFile(temp_path, 'w') as file:
+      json.dump(contents, file, default=str)
+    # The columnar file is renamed atomically, after which the current log is
+    # stale and the values are released to a new log.
+    tf.io.gfile.rename(temp_path, path, overwrite=True)
+    tf.io.gfile.remove(self._get_log_path(self._generation))
+    self._generation += 1
+    self._num_compacted_values = len(columns[self._key_fieldname])
+    self._num_log_records = 0
+
+  def _append_record(self, record: Mapping[str, Any]) -> None:
+    """Appends `record` to the current log."""
+    line = json.dumps(record, default=str)
+    path = self._get_log_path(self._generation)
+    try:
+      with tf.io.gfile.GFile(path, 'a') as file:
+        file.write(f'{line}\n')
+    except tf.errors.PermissionDeniedError as e:
+      raise FileReleaseManagerPermissionDeniedError(
+          f'Could not append a value to the file \'{path}\'. It is possible '
+          'that this file is compressed or encoded.') from e
+    self._num_log_records += 1
+    if self._num_log_records >= max(self._min_compaction_size,
+                                    self._num_compacted_values):
+      self._compact()
+
+  async def release(self, value: Any, type_signature: computation_types.Type,
+                    key: int) -> None:
+    """Releases `value` from a federated program.
+
+    Values previously released with a key greater than or equal to `key` are
+    discarded.
+
+    Args:
+      value: A materialized value, a value reference, or a structure of
+        materialized values and value references representing the value to
+        release.
+      type_signature: The `tff.Type` of `value`.
+      key: An integer used to reference the released `value`, `key` represents a
+        step in a federated program.
+    """
+    del type_signature  # Unused.
+    py_typecheck.check_type(key, int)
+
+    materialized_value = await value_reference.materialize_value(value)
+    flattened_value = structure_utils.flatten_with_name(materialized_value)
+    record = collections.OrderedDict([(self._key_fieldname, key)])
+    for name, flattened in flattened_value:
+      record[name] = _normalize(flattened)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, self._append_record, record)
+
+
 class SavedModelFileReleaseManager(release_manager.ReleaseManager):
   """A `tff.program.ReleaseManager` that releases values to a file system.
 
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import collections
 import csv
 import os
@@ -873,6 +874,221 @@ class CSVFileReleaseManagerReleaseTest(parameterized.TestCase,
       await release_mngr.release(value, type_signature, key)
 
 
+class ColumnarFileReleaseManagerInitTest(parameterized.TestCase):
+
+  def test_creates_new_dir_with_root_dir_str(self):
+    root_dir = self.create_tempdir()
+    root_dir = root_dir.full_path
+    shutil.rmtree(root_dir)
+    self.assertFalse(os.path.exists(root_dir))
+
+    file_release_manager.ColumnarFileReleaseManager(root_dir=root_dir)
+
+    self.assertTrue(os.path.exists(root_dir))
+
+  def test_initializes_with_existing_values(self):
+    root_dir = self.create_tempdir()
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir, min_compaction_size=2)
+    type_signature = computation_types.TensorType(tf.int32)
+    for key in range(5):
+      asyncio.run(release_mngr.release(key * 10, type_signature, key))
+
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir, min_compaction_size=2)
+
+    # The values were compacted after 2 and 4 values.
+    self.assertEqual(release_mngr._num_compacted_values, 4)
+    self.assertEqual(release_mngr._num_log_records, 1)
+    self.assertEqual(release_mngr.read_columns(), {
+        'key': [0, 1, 2, 3, 4],
+        '': [0, 10, 20, 30, 40],
+    })
+
+  @parameterized.named_parameters(
+      ('none', None),
+      ('bool', True),
+      ('int', 1),
+      ('list', []),
+  )
+  def test_raises_type_error_with_root_dir(self, root_dir):
+    with self.assertRaises(TypeError):
+      file_release_manager.ColumnarFileReleaseManager(root_dir=root_dir)
+
+  def test_raises_value_error_with_root_dir_empty(self):
+    with self.assertRaises(ValueError):
+      file_release_manager.ColumnarFileReleaseManager(root_dir='')
+
+  def test_raises_value_error_with_key_fieldname_empty(self):
+    root_dir = self.create_tempdir()
+    with self.assertRaises(ValueError):
+      file_release_manager.ColumnarFileReleaseManager(
+          root_dir=root_dir, key_fieldname='')
+
+  def test_raises_value_error_with_min_compaction_size_zero(self):
+    root_dir = self.create_tempdir()
+    with self.assertRaises(ValueError):
+      file_release_manager.ColumnarFileReleaseManager(
+          root_dir=root_dir, min_compaction_size=0)
+
+  def test_raises_incompatible_file_error_with_unknown_key_fieldname(self):
+    root_dir = self.create_tempdir()
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir, key_fieldname='z', min_compaction_size=1)
+    asyncio.run(
+        release_mngr.release(1, computation_types.TensorType(tf.int32), 1))
+
+    with self.assertRaises(
+        file_release_manager.FileReleaseManagerIncompatibleFileError):
+      file_release_manager.ColumnarFileReleaseManager(root_dir=root_dir)
+
+
+class ColumnarFileReleaseManagerReleaseTest(parameterized.TestCase,
+                                            unittest.IsolatedAsyncioTestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('int',
+       1,
+       computation_types.TensorType(tf.int32),
+       {'key': [1], '': [1]}),
+      ('tensor_str',
+       tf.constant('a'),
+       computation_types.TensorType(tf.string),
+       {'key': [1], '': ['b\'a\'']}),
+      ('numpy_array',
+       np.ones([3], np.int32),
+       computation_types.TensorType(tf.int32, [3]),
+       {'key': [1], '': [[1, 1, 1]]}),
+      ('materializable_value_reference_sequence',
+       program_test_utils.TestMaterializableValueReference(
+           tf.data.Dataset.from_tensor_slices([1, 2, 3])),
+       computation_types.SequenceType(tf.int32),
+       {'key': [1], '': [[1, 2, 3]]}),
+      ('dict_nested',
+       {
+           'x': {
+               'a': True,
+               'b': program_test_utils.TestMaterializableValueReference(1),
+           },
+           'y': {
+               'c': 'a',
+           },
+       },
+       computation_types.StructWithPythonType([
+           ('x', computation_types.StructWithPythonType([
+               ('a', tf.bool),
+               ('b', tf.int32),
+           ], collections.OrderedDict)),
+           ('y', computation_types.StructWithPythonType([
+               ('c', tf.string),
+           ], collections.OrderedDict)),
+       ], collections.OrderedDict),
+       {'key': [1], 'x/a': [True], 'x/b': [1], 'y/c': ['a']}),
+  )
+  # pyformat: enable
+  async def test_writes_value(self, value, type_signature, expected_columns):
+    root_dir = self.create_tempdir()
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir)
+
+    await release_mngr.release(value, type_signature, 1)
+
+    self.assertEqual(release_mngr.read_columns(), expected_columns)
+
+  @parameterized.named_parameters(
+      ('without_compaction', 100),
+      ('with_compaction', 1),
+  )
+  async def test_writes_values_with_new_names(self, min_compaction_size):
+    root_dir = self.create_tempdir()
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir, min_compaction_size=min_compaction_size)
+    type_signature = computation_types.StructWithPythonType(
+        [('a', tf.int32)], collections.OrderedDict)
+
+    await release_mngr.release({'a': 1}, type_signature, 1)
+    await release_mngr.release({'a': 2, 'b': 3}, type_signature, 2)
+    await release_mngr.release({'b': 4}, type_signature, 3)
+
+    self.assertEqual(
+        list(release_mngr.read_columns().items()), [
+            ('key', [1, 2, 3]),
+            ('a', [1, 2, None]),
+            ('b', [None, 3, 4]),
+        ])
+
+  @parameterized.named_parameters(
+      ('without_compaction', 100),
+      ('with_compaction', 2),
+  )
+  async def test_removes_values_with_greater_or_equal_keys(
+      self, min_compaction_size):
+    root_dir = self.create_tempdir()
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir, min_compaction_size=min_compaction_size)
+    type_signature = computation_types.TensorType(tf.int32)
+    for key in range(1, 6):
+      await release_mngr.release(key, type_signature, key)
+
+    await release_mngr.release(30, type_signature, 3)
+    await release_mngr.release(40, type_signature, 4)
+
+    self.assertEqual(release_mngr.read_columns(), {
+        'key': [1, 2, 3, 4],
+        '': [1, 2, 30, 40],
+    })
+
+  async def test_compacts_log_geometrically(self):
+    root_dir = self.create_tempdir()
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir, min_compaction_size=2)
+    type_signature = computation_types.TensorType(tf.int32)
+
+    with mock.patch.object(
+        release_mngr, '_compact', wraps=release_mngr._compact) as mock_compact:
+      for key in range(16):
+        await release_mngr.release(key, type_signature, key)
+
+      # Compacts after 2, 4, 8 and 16 values.
+      self.assertEqual(mock_compact.call_count, 4)
+    self.assertEqual(os.listdir(root_dir), ['columns.json'])
+    self.assertEqual(release_mngr.read_columns()['key'], list(range(16)))
+
+  async def test_ignores_partially_written_value(self):
+    root_dir = self.create_tempdir()
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir)
+    type_signature = computation_types.TensorType(tf.int32)
+    await release_mngr.release(1, type_signature, 1)
+    with open(os.path.join(root_dir, 'log_0'), 'a') as file:
+      file.write('{"key": 2, "": ')
+
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir)
+    await release_mngr.release(3, type_signature, 3)
+
+    self.assertEqual(release_mngr.read_columns(), {
+        'key': [1, 3],
+        '': [1, 3],
+    })
+
+  @parameterized.named_parameters(
+      ('none', None),
+      ('str', 'a'),
+      ('list', []),
+  )
+  async def test_raises_type_error_with_key(self, key):
+    root_dir = self.create_tempdir()
+    release_mngr = file_release_manager.ColumnarFileReleaseManager(
+        root_dir=root_dir)
+    value = 1
+    type_signature = computation_types.TensorType(tf.int32)
+
+    with self.assertRaises(TypeError):
+      await release_mngr.release(value, type_signature, key)
+
+
 class SavedModelFileReleaseManagerInitTest(parameterized.TestCase):
 
   def test_creates_new_dir_with_root_dir_str(self):
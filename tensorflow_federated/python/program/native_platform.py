@@ -15,7 +15,9 @@
 
 import asyncio
 import collections
+import concurrent.futures
 import random
+import threading
 import typing
 from typing import Any, Awaitable, Coroutine, List, Optional, Sequence
 
@@ -316,6 +318,198 @@ class DatasetDataSource(data_source.FederatedDataSource):
     return DatasetDataSourceIterator(self._datasets, self._federated_type)
 
 
+class PrefetchingDatasetDataSourceIterator(DatasetDataSourceIterator):
+  """A `tff.program.DatasetDataSourceIterator` that prepares data concurrently.
+
+  A `tff.program.DatasetDataSourceIterator` that prepares the `tf.data.Dataset`
+  of each selected client in a pool of worker threads: the dataset is cached in
+  memory by iterating over it once, and then optionally shuffled and
+  prefetched. After each call to `select`, the next selection of the same
+  number of clients is prepared while the current one is processed.
+
+  Note: The cache is held in the memory of this process. When the selected
+  datasets are serialized, e.g. to be sent to a remote executor, the pipelines
+  of the datasets are run again where they are deserialized.
+  """
+
+  def __init__(self,
+               datasets: Sequence[tf.data.Dataset],
+               federated_type: computation_types.FederatedType,
+               *,
+               shuffle_buffer_size: Optional[int] = None,
+               prefetch_buffer_size: int = tf.data.AUTOTUNE,
+               prefetch_next_selection: bool = True,
+               max_workers: Optional[int] = None):
+    """Returns an initialized `tff.program.PrefetchingDatasetDataSourceIterator`.
+
+    Args:
+      datasets: A sequence of `tf.data.Dataset's to use to yield the data from
+        this data source.
+      federated_type: The type of the data returned by calling `select` on an
+        iterator.
+      shuffle_buffer_size: Optional, the size of the buffer used to shuffle
+        each selected `tf.data.Dataset`, or `None` to not shuffle.
+      prefetch_buffer_size: The number of elements prefetched by each selected
+        `tf.data.Dataset`, or `tf.data.AUTOTUNE`.
+      prefetch_next_selection: Whether to prepare the next selection of data
+        after each call to `select`.
+      max_workers: Optional, the maximum number of threads used to prepare the
+        selected `tf.data.Dataset`s.
+
+    Raises:
+      ValueError: If `datasets` is empty or if each `tf.data.Dataset` in
+        `datasets` does not have the same type specification, or if
+        `shuffle_buffer_size` is not a positive integer.
+    """
+    super().__init__(datasets, federated_type)
+    if shuffle_buffer_size is not None:
+      py_typecheck.check_type(shuffle_buffer_size, int)
+      if shuffle_buffer_size < 1:
+        raise ValueError('Expected `shuffle_buffer_size` to be a positive '
+                         f'integer, found {shuffle_buffer_size}.')
+    py_typecheck.check_type(prefetch_buffer_size, int)
+    py_typecheck.check_type(prefetch_next_selection, bool)
+
+    self._shuffle_buffer_size = shuffle_buffer_size
+    self._prefetch_buffer_size = prefetch_buffer_size
+    self._prefetch_next_selection = prefetch_next_selection
+    self._executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers)
+    self._lock = threading.Lock()
+    self._next_selection = None
+    self._next_number_of_clients = None
+
+  def _prepare_dataset(self, dataset: tf.data.Dataset) -> tf.data.Dataset:
+    """Returns `dataset` cached in memory, and shuffled and prefetched."""
+    dataset = dataset.cache()
+    for _ in dataset:
+      pass  # Iterating over the dataset once fills the cache.
+    if self._shuffle_buffer_size is not None:
+      dataset = dataset.shuffle(self._shuffle_buffer_size)
+    return dataset.prefetch(self._prefetch_buffer_size)
+
+  def _submit_selection(
+      self, number_of_clients: Optional[int]
+  ) -> List['concurrent.futures.Future[tf.data.Dataset]']:
+    datasets = super().select(number_of_clients)
+    return [
+        self._executor.submit(self._prepare_dataset, dataset)
+        for dataset in datasets
+    ]
+
+  def _get_selection(
+      self, number_of_clients: Optional[int]
+  ) -> List['concurrent.futures.Future[tf.data.Dataset]']:
+    """Returns the futures of a new selection, starting the next selection."""
+    with self._lock:
+      selection = self._next_selection
+      if (selection is None or
+          number_of_clients != self._next_number_of_clients):
+        selection = self._submit_selection(number_of_clients)
+        if self._next_selection is not None:
+          for future in self._next_selection:
+            future.cancel()
+      if self._prefetch_next_selection:
+        self._next_selection = self._submit_selection(number_of_clients)
+        self._next_number_of_clients = number_of_clients
+      else:
+        self._next_selection = None
+      return selection
+
+  def select(self,
+             number_of_clients: Optional[int] = None) -> List[tf.data.Dataset]:
+    """Returns a new selection of data from this iterator.
+
+    Blocks until the `tf.data.Dataset`s of the selection are prepared.
+
+    Args:
+      number_of_clients: A number of clients to use when selecting data, must be
+        a positive integer and less than the number of `datasets`.
+
+    Raises:
+      ValueError: If `number_of_clients` is not a positive integer or if
+        `number_of_clients` is not less than the number of `datasets`.
+    """
+    selection = self._get_selection(number_of_clients)
+    return [future.result() for future in selection]
+
+  async def select_async(self,
+                         number_of_clients: Optional[int] = None
+                        ) -> List[tf.data.Dataset]:
+    """Returns a new selection of data from this iterator.
+
+    Unlike `select`, does not block the event loop while the `tf.data.Dataset`s
+    of the selection are prepared.
+
+    Args:
+      number_of_clients: A number of clients to use when selecting data, must be
+        a positive integer and less than the number of `datasets`.
+
+    Raises:
+      ValueError: If `number_of_clients` is not a positive integer or if
+        `number_of_clients` is not less than the number of `datasets`.
+    """
+    selection = self._get_selection(number_of_clients)
+    return await asyncio.gather(
+        *[asyncio.wrap_future(future) for future in selection])
+
+
+class PrefetchingDatasetDataSource(DatasetDataSource):
+  """A `tff.program.DatasetDataSource` that prepares data concurrently.
+
+  See `tff.program.PrefetchingDatasetDataSourceIterator` for more information.
+  """
+
+  def __init__(self,
+               datasets: Sequence[tf.data.Dataset],
+               *,
+               shuffle_buffer_size: Optional[int] = None,
+               prefetch_buffer_size: int = tf.data.AUTOTUNE,
+               prefetch_next_selection: bool = True,
+               max_workers: Optional[int] = None):
+    """Returns an initialized `tff.program.PrefetchingDatasetDataSource`.
+
+    Args:
+      datasets: A sequence of `tf.data.Dataset's to use to yield the data from
+        this data source.
+      shuffle_buffer_size: Optional, the size of the buffer used to shuffle
+        each selected `tf.data.Dataset`, or `None` to not shuffle.
+      prefetch_buffer_size: The number of elements prefetched by each selected
+        `tf.data.Dataset`, or `tf.data.AUTOTUNE`.
+      prefetch_next_selection: Whether to prepare the next selection of data
+        after each call to `select`.
+      max_workers: Optional, the maximum number of threads used by each
+        iterator to prepare the selected `tf.data.Dataset`s.
+
+    Raises:
+      ValueError: If `datasets` is empty or if each `tf.data.Dataset` in
+        `datasets` does not have the same type specification.
+    """
+    super().__init__(datasets)
+    self._shuffle_buffer_size = shuffle_buffer_size
+    self._prefetch_buffer_size = prefetch_buffer_size
+    self._prefetch_next_selection = prefetch_next_selection
+    self._max_workers = max_workers
+
+  @property
+  def capabilities(self) -> List[data_source.Capability]:
+    """The list of capabilities supported by this data source."""
+    capabilities = [data_source.Capability.RANDOM_UNIFORM]
+    if self._prefetch_next_selection:
+      capabilities.append(data_source.Capability.PREFETCH)
+    return capabilities
+
+  def iterator(self) -> PrefetchingDatasetDataSourceIterator:
+    """Returns a new iterator for retrieving data from this data source."""
+    return PrefetchingDatasetDataSourceIterator(
+        self._datasets,
+        self._federated_type,
+        shuffle_buffer_size=self._shuffle_buffer_size,
+        prefetch_buffer_size=self._prefetch_buffer_size,
+        prefetch_next_selection=self._prefetch_next_selection,
+        max_workers=self._max_workers)
+
+
 class ClientIdDataSourceIterator(data_source.FederatedDataSourceIterator):
   """A `tff.program.FederatedDataSourceIterator` backed by client id strings.
 
@@ -28,6 +28,7 @@ from tensorflow_federated.python.core.impl.context_stack import context_stack_im
 from tensorflow_federated.python.core.impl.tensorflow_context import tensorflow_computation
 from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
+from tensorflow_federated.python.program import data_source
 from tensorflow_federated.python.program import federated_context
 from tensorflow_federated.python.program import native_platform
 
@@ -609,6 +610,146 @@ class DatasetDataSourceTest(parameterized.TestCase):
       native_platform.DatasetDataSource(datasets)
 
 
+
+class PrefetchingDatasetDataSourceIteratorTest(parameterized.TestCase,
+                                               unittest.IsolatedAsyncioTestCase,
+                                               tf.test.TestCase):
+
+  def _create_iterator(self, **kwargs):
+    datasets = [tf.data.Dataset.from_tensor_slices([1, 2, 3])] * 3
+    federated_type = computation_types.FederatedType(
+        computation_types.SequenceType(tf.int32), placements.CLIENTS)
+    return native_platform.PrefetchingDatasetDataSourceIterator(
+        datasets=datasets, federated_type=federated_type, **kwargs)
+
+  @parameterized.named_parameters(
+      ('1', 0),
+      ('2', 1),
+      ('3', 2),
+  )
+  def test_select_returns_data(self, number_of_clients):
+    iterator = self._create_iterator()
+
+    data = iterator.select(number_of_clients)
+
+    self.assertLen(data, number_of_clients)
+    for actual_dataset in data:
+      self.assertEqual(list(actual_dataset.as_numpy_iterator()), [1, 2, 3])
+
+  async def test_select_async_returns_data(self):
+    iterator = self._create_iterator()
+
+    data = await iterator.select_async(2)
+
+    self.assertLen(data, 2)
+    for actual_dataset in data:
+      self.assertEqual(list(actual_dataset.as_numpy_iterator()), [1, 2, 3])
+
+  def test_select_returns_shuffled_data(self):
+    iterator = self._create_iterator(shuffle_buffer_size=3)
+
+    data = iterator.select(3)
+
+    for actual_dataset in data:
+      self.assertCountEqual(list(actual_dataset.as_numpy_iterator()), [1, 2, 3])
+
+  def test_select_prepares_next_selection(self):
+    iterator = self._create_iterator()
+
+    with mock.patch.object(
+        iterator, '_prepare_dataset',
+        wraps=iterator._prepare_dataset) as mock_prepare:
+      iterator.select(2)
+      # Waits for the next selection to be prepared.
+      for future in iterator._next_selection:
+        future.result()
+      self.assertEqual(mock_prepare.call_count, 4)
+
+      iterator.select(2)
+      for future in iterator._next_selection:
+        future.result()
+      self.assertEqual(mock_prepare.call_count, 6)
+
+  def test_select_does_not_prepare_next_selection(self):
+    iterator = self._create_iterator(prefetch_next_selection=False)
+
+    with mock.patch.object(
+        iterator, '_prepare_dataset',
+        wraps=iterator._prepare_dataset) as mock_prepare:
+      iterator.select(2)
+      iterator.select(2)
+
+    self.assertEqual(mock_prepare.call_count, 4)
+    self.assertIsNone(iterator._next_selection)
+
+  def test_select_with_different_number_of_clients_discards_next_selection(
+      self):
+    iterator = self._create_iterator()
+
+    iterator.select(1)
+    data = iterator.select(2)
+
+    self.assertLen(data, 2)
+    self.assertLen(iterator._next_selection, 2)
+
+  @parameterized.named_parameters(
+      ('none', None),
+      ('negative', -1),
+      ('greater', 4),
+  )
+  def test_select_raises_value_error_with_number_of_clients(
+      self, number_of_clients):
+    iterator = self._create_iterator()
+    iterator.select(1)
+
+    with self.assertRaises(ValueError):
+      iterator.select(number_of_clients)
+
+    self.assertLen(iterator.select(1), 1)
+
+  @parameterized.named_parameters(
+      ('zero', 0),
+      ('negative', -1),
+  )
+  def test_init_raises_value_error_with_shuffle_buffer_size(
+      self, shuffle_buffer_size):
+    with self.assertRaises(ValueError):
+      self._create_iterator(shuffle_buffer_size=shuffle_buffer_size)
+
+  def test_init_raises_type_error_with_shuffle_buffer_size(self):
+    with self.assertRaises(TypeError):
+      self._create_iterator(shuffle_buffer_size='a')
+
+
+class PrefetchingDatasetDataSourceTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('prefetch', True, [
+          data_source.Capability.RANDOM_UNIFORM,
+          data_source.Capability.PREFETCH
+      ]),
+      ('no_prefetch', False, [data_source.Capability.RANDOM_UNIFORM]),
+  )
+  def test_capabilities(self, prefetch_next_selection, expected_capabilities):
+    datasets = [tf.data.Dataset.from_tensor_slices([1, 2, 3])] * 3
+
+    data_source_ = native_platform.PrefetchingDatasetDataSource(
+        datasets, prefetch_next_selection=prefetch_next_selection)
+
+    self.assertEqual(data_source_.capabilities, expected_capabilities)
+
+  def test_iterator_returns_prefetching_iterator(self):
+    datasets = [tf.data.Dataset.from_tensor_slices([1, 2, 3])] * 3
+    data_source_ = native_platform.PrefetchingDatasetDataSource(
+        datasets, shuffle_buffer_size=3)
+
+    iterator = data_source_.iterator()
+
+    self.assertIsInstance(iterator,
+                          native_platform.PrefetchingDatasetDataSourceIterator)
+    self.assertEqual(iterator.federated_type, data_source_.federated_type)
+    self.assertLen(iterator.select(2), 2)
+
 class ClientIdDataSourceIteratorTest(parameterized.TestCase, tf.test.TestCase):
 
   def test_init_does_not_raise_type_error(self):
@@ -26,6 +26,8 @@ from tensorflow_federated.python.simulation.datasets.dataset_utils import build_
 from tensorflow_federated.python.simulation.datasets.dataset_utils import build_synthethic_iid_datasets
 from tensorflow_federated.python.simulation.datasets.file_per_user_client_data import FilePerUserClientData
 from tensorflow_federated.python.simulation.datasets.from_tensor_slices_client_data import TestClientData
+from tensorflow_federated.python.simulation.datasets.mmap_client_data import MmapClientData
+from tensorflow_federated.python.simulation.datasets.mmap_client_data_utils import save_to_mmap_client_data
 from tensorflow_federated.python.simulation.datasets.sql_client_data import SqlClientData
 from tensorflow_federated.python.simulation.datasets.sql_client_data_utils import load_and_parse_sql_client_data
 from tensorflow_federated.python.simulation.datasets.sql_client_data_utils import save_to_sql_client_data
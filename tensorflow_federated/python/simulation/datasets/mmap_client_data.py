@@ -0,0 +1,256 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Implementation of `ClientData` backed by memory-mapped columnar files."""
+
+import collections
+import json
+import os
+from typing import Any, Dict, List
+
+from absl import logging
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.simulation.datasets import client_data
+
+
+class DataFormatError(Exception):
+  pass
+
+
+FORMAT_VERSION = 1
+METADATA_FILENAME = "metadata.json"
+OFFSETS_FILENAME = "offsets.bin"
+OFFSETS_DTYPE = np.int64
+
+
+def column_filename(column_index: int) -> str:
+  """Returns the name of the file holding the column at `column_index`."""
+  return f"column_{column_index}.bin"
+
+
+def _read_metadata(directory: str) -> Dict[str, Any]:
+  """Reads and validates the metadata of a memory-mapped `ClientData`.
+
+  Args:
+    directory: A string path to a directory written by
+      `tff.simulation.datasets.save_to_mmap_client_data`.
+
+  Returns:
+    A dictionary holding the `client_ids` and `columns` of the data.
+
+  Raises:
+    DataFormatError: If the metadata is missing or has an unsupported version.
+  """
+  metadata_filepath = os.path.join(directory, METADATA_FILENAME)
+  if not os.path.exists(metadata_filepath):
+    raise DataFormatError(
+        f"Directory [{directory}] does not have a {METADATA_FILENAME} file.")
+  with open(metadata_filepath, "r") as f:
+    metadata = json.load(f)
+  if metadata.get("format_version") != FORMAT_VERSION:
+    raise DataFormatError(
+        f"Directory [{directory}] has format version "
+        f"{metadata.get('format_version')}, expected {FORMAT_VERSION}.")
+  return metadata
+
+
+# Dtypes not supported by `tf.io.decode_raw`, which are decoded as the signed
+# integer dtype of the same size and bitcast.
+_DECODE_RAW_BITCAST_DTYPES = {
+    tf.uint32: tf.int32,
+    tf.uint64: tf.int64,
+}
+
+
+def _read_column_rows(filepath: str, spec: tf.TensorSpec, start: tf.Tensor,
+                      num_rows: tf.Tensor) -> tf.data.Dataset:
+  """Returns a dataset of `num_rows` rows of a column file, from `start`."""
+  row_size = spec.dtype.size * spec.shape.num_elements()
+  if row_size == 0:
+    # `tf.data.FixedLengthRecordDataset` can not read empty records.
+    return tf.data.Dataset.from_tensors(tf.zeros(spec.shape,
+                                                 spec.dtype)).repeat(num_rows)
+  decode_dtype = _DECODE_RAW_BITCAST_DTYPES.get(spec.dtype, spec.dtype)
+
+  def decode_row(record):
+    row = tf.io.decode_raw(record, decode_dtype)
+    if decode_dtype != spec.dtype:
+      row = tf.bitcast(row, spec.dtype)
+    return tf.reshape(row, spec.shape)
+
+  return tf.data.FixedLengthRecordDataset(
+      filepath, record_bytes=row_size,
+      header_bytes=start * row_size).take(num_rows).map(decode_row)
+
+
+class MmapClientData(client_data.ClientData):
+  """A `tff.simulation.datasets.ClientData` backed by memory-mapped files.
+
+  The examples of all clients are stored in a directory, one file per feature,
+  as fixed-size rows ordered by client. A separate offsets file holds the index
+  of the first row of each client, so the examples of any client are found in
+  constant time and read without parsing any `tf.train.Example` protos. The
+  files are memory-mapped read-only, so processes using the same directory
+  share a single copy of the data in the operating system's page cache.
+
+  The directory is written by `tff.simulation.datasets.save_to_mmap_client_data`
+  and contains:
+
+     -   `metadata.json`: The format version, the client ids in the order in
+         which their examples are stored, and the name, dtype and shape of each
+         column.
+     -   `offsets.bin`: An `int64` array with `len(client_ids) + 1` elements.
+         The examples of the `i`-th client are the rows `offsets[i]` up to
+         `offsets[i + 1]` of each column.
+     -   `column_<i>.bin`: The rows of the `i`-th column, in C order.
+
+  The elements of the client datasets are `collections.OrderedDict`s mapping
+  column names to tensors.
+  """
+
+  def __init__(self, directory: str):
+    """Constructs a `tff.simulation.datasets.MmapClientData` object.
+
+    Args:
+      directory: A `str` path to a directory written by
+        `tff.simulation.datasets.save_to_mmap_client_data`. The directory must
+        be on a local file system, since it is memory-mapped.
+
+    Raises:
+      DataFormatError: If the directory is not in the expected format.
+    """
+    py_typecheck.check_type(directory, str)
+    metadata = _read_metadata(directory)
+    self._directory = directory
+    self._client_ids = list(metadata["client_ids"])
+    self._client_indices = {
+        client_id: i for i, client_id in enumerate(self._client_ids)
+    }
+    self._offsets = np.fromfile(
+        os.path.join(directory, OFFSETS_FILENAME), dtype=OFFSETS_DTYPE)
+    if self._offsets.shape != (len(self._client_ids) + 1,):
+      raise DataFormatError(
+          f"Directory [{directory}] has {self._offsets.size} offsets, "
+          f"expected {len(self._client_ids) + 1}.")
+    num_examples = int(self._offsets[-1])
+
+    self._element_type_structure = collections.OrderedDict()
+    self._columns = []
+    for i, column in enumerate(metadata["columns"]):
+      dtype = tf.as_dtype(column["dtype"])
+      shape = tuple(column["shape"])
+      self._element_type_structure[column["name"]] = tf.TensorSpec(
+          shape=shape, dtype=dtype)
+      numpy_dtype = dtype.as_numpy_dtype
+      if num_examples:
+        column_array = np.memmap(
+            os.path.join(directory, column_filename(i)),
+            dtype=numpy_dtype,
+            mode="r",
+            shape=(num_examples,) + shape)
+      else:
+        # Empty files can not be memory-mapped.
+        column_array = np.zeros((0,) + shape, dtype=numpy_dtype)
+      self._columns.append(column_array)
+    logging.info("Loaded %d client ids from memory-mapped data.",
+                 len(self._client_ids))
+
+  def _check_client_id(self, client_id: str):
+    if client_id not in self._client_indices:
+      raise ValueError(
+          "ID [{i}] is not a client in this ClientData. See "
+          "property `client_ids` for the list of valid ids.".format(
+              i=client_id))
+
+  def _client_columns(self, client_id: str) -> List[np.ndarray]:
+    """Returns views of the rows of each column holding `client_id`'s data."""
+    self._check_client_id(client_id)
+    index = self._client_indices[client_id]
+    start, stop = self._offsets[index], self._offsets[index + 1]
+    return [column[start:stop] for column in self._columns]
+
+  def _create_dataset(self, client_id):
+    """Creates a `tf.data.Dataset` for a client in a TF-serializable manner."""
+    client_ids = tf.constant(self._client_ids, dtype=tf.string)
+    offsets = tf.constant(self._offsets, dtype=tf.int64)
+    indices = tf.reshape(tf.where(tf.equal(client_ids, client_id)), [-1])
+    check_client_id = tf.debugging.assert_equal(
+        tf.size(indices), 1, message="ID is not a client in this ClientData.")
+    with tf.control_dependencies([check_client_id]):
+      index = tf.identity(indices[0])
+    start = offsets[index]
+    num_rows = offsets[index + 1] - start
+
+    column_names = list(self._element_type_structure.keys())
+    column_datasets = []
+    for i, spec in enumerate(self._element_type_structure.values()):
+      column_datasets.append(
+          _read_column_rows(
+              os.path.join(self._directory, column_filename(i)), spec, start,
+              num_rows))
+
+    def to_example(*columns):
+      return collections.OrderedDict(zip(column_names, columns))
+
+    return tf.data.Dataset.zip(tuple(column_datasets)).map(to_example)
+
+  @property
+  def serializable_dataset_fn(self):
+    """Creates a `tf.data.Dataset` for a client in a TF-serializable manner.
+
+    The returned datasets read the rows of the client from the files in the
+    directory with TensorFlow ops, so they can be serialized and iterated in
+    any process which can read the directory.
+    """
+    return self._create_dataset
+
+  @property
+  def client_ids(self):
+    return self._client_ids
+
+  def create_tf_dataset_for_client(self, client_id: str):
+    """Creates a new `tf.data.Dataset` containing the client training examples.
+
+    This function will create a dataset for a given client if `client_id` is
+    contained in the `client_ids` property of the `MmapClientData`. Unlike
+    `self.serializable_dataset_fn`, this method is not serializable.
+
+    Args:
+      client_id: The string identifier for the desired client.
+
+    Returns:
+      A `tf.data.Dataset` object.
+    """
+    columns = self._client_columns(client_id)
+    return tf.data.Dataset.from_tensor_slices(
+        collections.OrderedDict(zip(self._element_type_structure, columns)))
+
+  def num_examples_for_client(self, client_id: str) -> int:
+    """Returns the number of examples of a client.
+
+    Args:
+      client_id: The string identifier for the desired client.
+
+    Raises:
+      ValueError: If `client_id` is not a client of this `ClientData`.
+    """
+    self._check_client_id(client_id)
+    index = self._client_indices[client_id]
+    return int(self._offsets[index + 1] - self._offsets[index])
+
+  @property
+  def element_type_structure(self):
+    return self._element_type_structure
@@ -0,0 +1,186 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import gc
+import json
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.core.backends.native import execution_contexts
+from tensorflow_federated.python.simulation.datasets import mmap_client_data
+from tensorflow_federated.python.simulation.datasets import mmap_client_data_utils
+
+_TEST_CLIENT_EXAMPLES = collections.OrderedDict(
+    test_a=collections.OrderedDict(
+        pixels=np.arange(12, dtype=np.float32).reshape([3, 2, 2]),
+        label=np.array([0, 1, 2], dtype=np.int32)),
+    test_b=collections.OrderedDict(
+        pixels=np.zeros([0, 2, 2], dtype=np.float32),
+        label=np.zeros([0], dtype=np.int32)),
+    test_c=collections.OrderedDict(
+        pixels=np.ones([2, 2, 2], dtype=np.float32),
+        label=np.array([3, 4], dtype=np.int32)),
+)
+
+
+def _save_test_client_data(directory):
+  mmap_client_data_utils.save_to_mmap_client_data(
+      list(_TEST_CLIENT_EXAMPLES.keys()), lambda cid: tf.data.Dataset.
+      from_tensor_slices(_TEST_CLIENT_EXAMPLES[cid]), directory)
+
+
+class MmapClientDataTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._directory = os.path.join(self.get_temp_dir(), 'data')
+    _save_test_client_data(self._directory)
+
+  def assertDatasetHasExamples(self, dataset, expected_examples):
+    actual_examples = list(dataset.as_numpy_iterator())
+    expected_num_examples = len(expected_examples['label'])
+    self.assertLen(actual_examples, expected_num_examples)
+    for i, actual_example in enumerate(actual_examples):
+      self.assertEqual(list(actual_example.keys()), ['pixels', 'label'])
+      self.assertAllEqual(actual_example['pixels'],
+                          expected_examples['pixels'][i])
+      self.assertAllEqual(actual_example['label'],
+                          expected_examples['label'][i])
+
+  def test_client_ids(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    self.assertEqual(client_data.client_ids, ['test_a', 'test_b', 'test_c'])
+
+  def test_element_type_structure(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    self.assertEqual(
+        client_data.element_type_structure,
+        collections.OrderedDict(
+            pixels=tf.TensorSpec(shape=(2, 2), dtype=tf.float32),
+            label=tf.TensorSpec(shape=(), dtype=tf.int32)))
+
+  def test_create_dataset_for_client(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    for client_id, expected_examples in _TEST_CLIENT_EXAMPLES.items():
+      dataset = client_data.create_tf_dataset_for_client(client_id)
+      self.assertEqual(dataset.element_spec, client_data.element_type_structure)
+      self.assertDatasetHasExamples(dataset, expected_examples)
+
+  def test_client_missing(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    with self.assertRaisesRegex(ValueError, 'not a client in this ClientData'):
+      client_data.create_tf_dataset_for_client('missing_client_id')
+
+  def test_num_examples_for_client(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    for client_id, expected_examples in _TEST_CLIENT_EXAMPLES.items():
+      self.assertEqual(
+          client_data.num_examples_for_client(client_id),
+          len(expected_examples['label']))
+
+  def test_serializable_dataset_fn(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+
+    @tf.function
+    def count_examples(client_id):
+      dataset = client_data.serializable_dataset_fn(client_id)
+      return dataset.reduce(0, lambda s, x: s + 1)
+
+    for client_id, expected_examples in _TEST_CLIENT_EXAMPLES.items():
+      dataset = client_data.serializable_dataset_fn(tf.constant(client_id))
+      self.assertEqual(dataset.element_spec, client_data.element_type_structure)
+      self.assertDatasetHasExamples(dataset, expected_examples)
+      self.assertEqual(
+          count_examples(tf.constant(client_id)),
+          len(expected_examples['label']))
+
+  def test_serializable_dataset_fn_after_garbage_collection(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    # Serializes the dataset in a graph, as a `tff.tf_computation` does.
+    with tf.Graph().as_default() as graph:
+      dataset = client_data.serializable_dataset_fn(tf.constant('test_a'))
+      element_spec = dataset.element_spec
+      graph_def_tensor = tf.raw_ops.DatasetToGraphV2(
+          input_dataset=tf.data.experimental.to_variant(dataset))
+      with tf.compat.v1.Session(graph=graph) as session:
+        graph_def = session.run(graph_def_tensor)
+    del client_data, dataset, graph, graph_def_tensor, session
+    gc.collect()
+
+    dataset = tf.data.experimental.from_variant(
+        tf.raw_ops.DatasetFromGraph(graph_def=graph_def), element_spec)
+
+    self.assertDatasetHasExamples(dataset, _TEST_CLIENT_EXAMPLES['test_a'])
+
+  def test_serializable_dataset_fn_raises_on_missing_client(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    with self.assertRaisesRegex(tf.errors.InvalidArgumentError,
+                                'not a client in this ClientData'):
+      client_data.serializable_dataset_fn(tf.constant('missing_client_id'))
+
+  def test_dataset_computation(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    self.assertEqual(
+        str(client_data.dataset_computation.type_signature),
+        '(string -> <pixels=float32[2,2],label=int32>*)')
+    dataset = client_data.dataset_computation('test_c')
+    self.assertDatasetHasExamples(dataset, _TEST_CLIENT_EXAMPLES['test_c'])
+
+  def test_create_dataset_from_all_clients(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    dataset = client_data.create_tf_dataset_from_all_clients()
+    actual_examples = dataset.reduce(0, lambda s, x: s + 1)
+    self.assertEqual(actual_examples, 5)
+
+  def test_preprocess(self):
+    client_data = mmap_client_data.MmapClientData(self._directory)
+    client_data = client_data.preprocess(
+        lambda ds: ds.map(lambda x: x['label']))
+    dataset = client_data.create_tf_dataset_for_client('test_a')
+    self.assertAllEqual(list(dataset.as_numpy_iterator()), [0, 1, 2])
+
+  def test_raises_on_missing_metadata(self):
+    os.remove(os.path.join(self._directory, mmap_client_data.METADATA_FILENAME))
+    with self.assertRaisesRegex(mmap_client_data.DataFormatError,
+                                'does not have a metadata.json file'):
+      mmap_client_data.MmapClientData(self._directory)
+
+  def test_raises_on_unknown_format_version(self):
+    metadata_filepath = os.path.join(self._directory,
+                                     mmap_client_data.METADATA_FILENAME)
+    with open(metadata_filepath) as f:
+      metadata = json.load(f)
+    metadata['format_version'] = mmap_client_data.FORMAT_VERSION + 1
+    with open(metadata_filepath, 'w') as f:
+      json.dump(metadata, f)
+    with self.assertRaisesRegex(mmap_client_data.DataFormatError,
+                                'format version'):
+      mmap_client_data.MmapClientData(self._directory)
+
+  def test_with_no_examples(self):
+    directory = os.path.join(self.get_temp_dir(), 'empty')
+    mmap_client_data_utils.save_to_mmap_client_data(
+        ['test_b'], lambda cid: tf.data.Dataset.from_tensor_slices(
+            _TEST_CLIENT_EXAMPLES[cid]), directory)
+    client_data = mmap_client_data.MmapClientData(directory)
+    dataset = client_data.create_tf_dataset_for_client('test_b')
+    self.assertEmpty(list(dataset))
+
+
+if __name__ == '__main__':
+  execution_contexts.set_local_python_execution_context()
+  tf.test.main()
@@ -0,0 +1,155 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities for constructing memory-mapped ClientData."""
+
+import collections
+import json
+import os
+import shutil
+import tempfile
+from typing import Callable, List, Mapping
+
+from absl import logging
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.simulation.datasets import mmap_client_data
+from tensorflow_federated.python.simulation.datasets import sql_client_data_utils
+
+# The number of examples converted to numpy at a time when writing a client's
+# dataset.
+_WRITE_BATCH_SIZE = 1024
+
+
+def _validate_element_spec(element_spec: Mapping[str, tf.TensorSpec]):
+  """Validates that `element_spec` can be stored in fixed-size columns."""
+  if not isinstance(element_spec, collections.abc.Mapping) or not element_spec:
+    raise sql_client_data_utils.ElementSpecCompatibilityError(
+        f'{element_spec} has type {type(element_spec)}, but expected a '
+        'non-empty `Mapping[str, tf.TensorSpec]`.')
+  for key, tensor_spec in element_spec.items():
+    if not isinstance(key, str):
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'{key} has type {type(key)}, but expected str.')
+    if not isinstance(tensor_spec, tf.TensorSpec):
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'{tensor_spec} has type {type(tensor_spec)}, but expected '
+          '`tf.TensorSpec`.')
+    if not tensor_spec.shape.is_fully_defined():
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'{key} has shape {tensor_spec.shape}, but expected a fully defined '
+          'shape.')
+    if not (tensor_spec.dtype.is_floating or tensor_spec.dtype.is_integer or
+            tensor_spec.dtype.is_bool):
+      raise sql_client_data_utils.ElementSpecCompatibilityError(
+          f'{key} has unsupported dtype {tensor_spec.dtype}.')
+
+
+def save_to_mmap_client_data(
+    client_ids: List[str],
+    dataset_fn: Callable[[str], tf.data.Dataset],
+    directory: str,
+    allow_overwrite: bool = False,
+) -> None:
+  """Serialize a federated dataset into a directory for `MmapClientData`.
+
+  Note: All the clients must share the same dataset.element_spec of type
+  `Mapping[str, TensorSpec]`, where each `TensorSpec` has a fully defined shape
+  and a numeric or boolean dtype.
+
+  Args:
+    client_ids: A list of string identifiers for clients in this dataset.
+    dataset_fn: A callable that accepts a `str` as an argument and returns a
+      `tf.data.Dataset` instance. Unlike `from_client_and_tf_dataset_fn`, it
+      does not require a TF serializable dataset function. To convert an
+      existing `ClientData`, pass its `create_tf_dataset_for_client` method.
+    directory: A `str` path to the directory to write. The directory is written
+      in a temporary directory next to it and then renamed, so a partially
+      written directory is never observed at this path.
+    allow_overwrite: A boolean indicating whether to allow overwriting if a
+      directory already exists at `directory`.
+
+  Raises:
+    FileExistsError: if a directory exists at `directory` and `allow_overwrite`
+      is False. If overwriting is intended, please use allow_overwrite = True.
+    ElementSpecCompatibilityError: if the element_spec of local datasets are not
+      identical across clients, or if the element_spec of datasets can not be
+      stored in fixed-size columns.
+  """
+  if os.path.exists(directory) and not allow_overwrite:
+    raise FileExistsError(f'Directory already exists at {directory}')
+
+  element_spec = dataset_fn(client_ids[0]).element_spec
+  _validate_element_spec(element_spec)
+  keys = list(element_spec.keys())
+  numpy_dtypes = [element_spec[key].dtype.as_numpy_dtype for key in keys]
+
+  parent_directory = os.path.dirname(os.path.abspath(directory))
+  tmp_directory = tempfile.mkdtemp(dir=parent_directory)
+  logging.info('Writing memory-mapped client data to scratch path %s.',
+               tmp_directory)
+  offsets = [0]
+  try:
+    column_files = [
+        open(
+            os.path.join(tmp_directory, mmap_client_data.column_filename(i)),
+            'wb') for i in range(len(keys))
+    ]
+    try:
+      for client_id in client_ids:
+        dataset = dataset_fn(client_id)
+        if dataset.element_spec != element_spec:
+          raise sql_client_data_utils.ElementSpecCompatibilityError(
+              'All the clients must share the same dataset element type. '
+              f'The local dataset of client {client_id} has element type '
+              f'{dataset.element_spec}, and the local dataset of client '
+              f'{client_ids[0]} has element type {element_spec}.')
+        num_examples = 0
+        for batch in dataset.batch(_WRITE_BATCH_SIZE).as_numpy_iterator():
+          for key, numpy_dtype, column_file in zip(keys, numpy_dtypes,
+                                                   column_files):
+            column_file.write(
+                np.ascontiguousarray(batch[key], dtype=numpy_dtype).tobytes())
+          num_examples += len(batch[keys[0]])
+        offsets.append(offsets[-1] + num_examples)
+    finally:
+      for column_file in column_files:
+        column_file.close()
+  except BaseException:
+    shutil.rmtree(tmp_directory)
+    raise
+
+  np.array(
+      offsets, dtype=mmap_client_data.OFFSETS_DTYPE).tofile(
+          os.path.join(tmp_directory, mmap_client_data.OFFSETS_FILENAME))
+  metadata = {
+      'format_version':
+          mmap_client_data.FORMAT_VERSION,
+      'client_ids':
+          list(client_ids),
+      'columns': [{
+          'name': key,
+          'dtype': element_spec[key].dtype.name,
+          'shape': element_spec[key].shape.as_list(),
+      } for key in keys],
+  }
+  with open(
+      os.path.join(tmp_directory, mmap_client_data.METADATA_FILENAME),
+      'w') as f:
+    json.dump(metadata, f)
+
+  if os.path.exists(directory):
+    shutil.rmtree(directory)
+  os.rename(tmp_directory, directory)
+  logging.info('Finished writing memory-mapped client data to %s.', directory)
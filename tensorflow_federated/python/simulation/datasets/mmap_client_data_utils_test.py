@@ -0,0 +1,159 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for mmap_client_data_utils."""
+
+import collections
+import os
+
+from absl.testing import parameterized
+import tensorflow as tf
+
+from tensorflow_federated.python.simulation.datasets import from_tensor_slices_client_data
+from tensorflow_federated.python.simulation.datasets import mmap_client_data
+from tensorflow_federated.python.simulation.datasets import mmap_client_data_utils
+from tensorflow_federated.python.simulation.datasets import sql_client_data_utils
+
+
+def _test_client_dataset_mapping():
+  test_ds1 = tf.data.Dataset.from_tensor_slices(
+      collections.OrderedDict(
+          i=[1, 2, 3], f=[[4.0, 0.5], [5.0, 1.5], [6.0, 2.5]]))
+  test_ds2 = tf.data.Dataset.from_tensor_slices(
+      collections.OrderedDict(i=[4, 5], f=[[7.0, 3.5], [8.0, 4.5]]))
+  return {'foo': test_ds1, 'bar': test_ds2}
+
+
+class ValidateElementSpecTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('non-iterable None', None),
+      ('non-iterable tensorspec', tf.TensorSpec(shape=())),
+      ('empty mapping', {}),
+      ('integer key', {
+          1: tf.TensorSpec(shape=())
+      }),
+      ('nested mapping', {
+          'outer': {
+              'inner': tf.TensorSpec(shape=())
+          }
+      }),
+      ('batched tensorspec', {
+          'a': tf.TensorSpec(shape=(None,))
+      }),
+      ('string tensorspec', {
+          'a': tf.TensorSpec(shape=(), dtype=tf.string)
+      }),
+  )
+  def test_raises_element_spec_compatibility_error(self, element_spec):
+    with self.assertRaises(sql_client_data_utils.ElementSpecCompatibilityError):
+      mmap_client_data_utils._validate_element_spec(element_spec)
+
+
+class MmapClientDataUtilsTest(tf.test.TestCase):
+
+  def assertDatasetsEqual(self, actual_dataset, expected_dataset):
+    actual_elements = list(actual_dataset.as_numpy_iterator())
+    expected_elements = list(expected_dataset.as_numpy_iterator())
+    self.assertLen(actual_elements, len(expected_elements))
+    for actual_element, expected_element in zip(actual_elements,
+                                                expected_elements):
+      self.assertEqual(
+          list(actual_element.keys()), list(expected_element.keys()))
+      for key in actual_element.keys():
+        self.assertAllEqual(actual_element[key], expected_element[key])
+
+  def test_save_to_mmap_client_data(self):
+    test_client_dataset_mapping = _test_client_dataset_mapping()
+    test_client_ids = list(test_client_dataset_mapping.keys())
+    dataset_fn = lambda cid: test_client_dataset_mapping[cid]
+    directory = os.path.join(self.get_temp_dir(), 'data')
+
+    mmap_client_data_utils.save_to_mmap_client_data(test_client_ids, dataset_fn,
+                                                    directory)
+
+    rebuilt_cd = mmap_client_data.MmapClientData(directory)
+    self.assertEqual(rebuilt_cd.client_ids, test_client_ids)
+    for cid in rebuilt_cd.client_ids:
+      rebuilt_ds = rebuilt_cd.create_tf_dataset_for_client(cid)
+      ds = test_client_dataset_mapping[cid]
+      self.assertEqual(rebuilt_ds.element_spec, ds.element_spec)
+      self.assertDatasetsEqual(rebuilt_ds, ds)
+
+  def test_save_to_mmap_client_data_from_client_data(self):
+    client_data = from_tensor_slices_client_data.TestClientData({
+        'a': collections.OrderedDict(x=[[1, 2], [3, 4]], y=[0.5, 1.5]),
+        'b': collections.OrderedDict(x=[[5, 6]], y=[2.5]),
+    })
+    directory = os.path.join(self.get_temp_dir(), 'data')
+
+    mmap_client_data_utils.save_to_mmap_client_data(
+        client_data.client_ids, client_data.create_tf_dataset_for_client,
+        directory)
+
+    rebuilt_cd = mmap_client_data.MmapClientData(directory)
+    self.assertEqual(rebuilt_cd.client_ids, client_data.client_ids)
+    self.assertEqual(rebuilt_cd.element_type_structure,
+                     client_data.element_type_structure)
+    for cid in client_data.client_ids:
+      self.assertDatasetsEqual(
+          rebuilt_cd.create_tf_dataset_for_client(cid),
+          client_data.create_tf_dataset_for_client(cid))
+
+  def test_save_to_mmap_client_data_can_overwrite_if_enabled(self):
+    test_client_dataset_mapping = _test_client_dataset_mapping()
+    test_client_ids = list(test_client_dataset_mapping.keys())
+    dataset_fn = lambda cid: test_client_dataset_mapping[cid]
+    directory = os.path.join(self.get_temp_dir(), 'data')
+
+    mmap_client_data_utils.save_to_mmap_client_data(test_client_ids[0:1],
+                                                    dataset_fn, directory)
+    mmap_client_data_utils.save_to_mmap_client_data(
+        test_client_ids, dataset_fn, directory, allow_overwrite=True)
+
+    rebuilt_cd = mmap_client_data.MmapClientData(directory)
+    self.assertEqual(rebuilt_cd.client_ids, test_client_ids)
+
+  def test_save_to_mmap_client_data_will_not_overwrite_if_not_allowed(self):
+    test_client_dataset_mapping = _test_client_dataset_mapping()
+    test_client_ids = list(test_client_dataset_mapping.keys())
+    dataset_fn = lambda cid: test_client_dataset_mapping[cid]
+    directory = os.path.join(self.get_temp_dir(), 'data')
+
+    mmap_client_data_utils.save_to_mmap_client_data(test_client_ids[0:1],
+                                                    dataset_fn, directory)
+
+    with self.assertRaises(FileExistsError):
+      mmap_client_data_utils.save_to_mmap_client_data(
+          test_client_ids, dataset_fn, directory, allow_overwrite=False)
+
+  def test_save_to_mmap_client_data_raises_type_error(self):
+    test_ds1 = tf.data.Dataset.from_tensor_slices(
+        collections.OrderedDict(i=[1, 2, 3], f=[4.0, 5.0, 6.0]))
+    # Uses a different element_spec intentionally.
+    test_ds2 = tf.data.Dataset.from_tensor_slices(
+        collections.OrderedDict(i=[7.0, 8.0], f=[4, 5]))
+    test_client_dataset_mapping = {'foo': test_ds1, 'bar': test_ds2}
+    test_client_ids = list(test_client_dataset_mapping.keys())
+    dataset_fn = lambda cid: test_client_dataset_mapping[cid]
+    directory = os.path.join(self.get_temp_dir(), 'data')
+
+    with self.assertRaises(sql_client_data_utils.ElementSpecCompatibilityError):
+      mmap_client_data_utils.save_to_mmap_client_data(test_client_ids,
+                                                      dataset_fn, directory)
+    self.assertFalse(os.path.exists(directory))
+    self.assertEmpty(os.listdir(self.get_temp_dir()))
+
+
+if __name__ == '__main__':
+  tf.test.main()
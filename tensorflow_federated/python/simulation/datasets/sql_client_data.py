@@ -13,8 +13,11 @@
 # limitations under the License.
 """Implementation of `ClientData` backed by an SQL database."""
 
+import collections
 import sqlite3
-from typing import Iterator, Optional
+import threading
+from typing import Dict, List, Optional, Sequence
+import weakref
 
 from absl import logging
 import tensorflow as tf
@@ -31,18 +34,28 @@ REQUIRED_TABLES = frozenset(["examples", "client_metadata"])
 REQUIRED_EXAMPLES_COLUMNS = frozenset(
     ["split_name", "client_id", "serialized_example_proto"])
 
+# The name of the index over the `(client_id, split_name)` columns of the
+# `examples` table, used to look up the examples of a client. The `client_id`
+# column comes first so the index is also used when no split is selected.
+EXAMPLES_INDEX_NAME = "idx_examples_client_id_split_name"
 
-def _check_database_format(database_filepath: str):
+# Older versions of SQLite limit a statement to 999 parameters, so reading the
+# examples of many clients is split into multiple queries of this many clients.
+_MAX_CLIENTS_PER_QUERY = 500
+
+
+def _check_database_format(connection: sqlite3.Connection,
+                           database_filepath: str):
   """Validates the format of a SQLite database.
 
   Args:
+    connection: A `sqlite3.Connection` to the database.
     database_filepath: A string filepath to a SQLite database.
 
   Raises:
     DatabaseFormatError: If the required tables or columns are missing from the
       database at `database_filepath`.
   """
-  connection = sqlite3.connect(database_filepath)
   # Make sure `examples` and `client_metadata` tables exists.
   result = connection.execute("SELECT name FROM sqlite_master;")
   table_names = {r[0] for r in result}
@@ -62,25 +75,48 @@ def _check_database_format(database_filepath: str):
         f"but is missing columns {missing_required_columns}.")
 
 
-def _fetch_client_ids(database_filepath: str,
-                      split_name: Optional[str] = None) -> Iterator[str]:
-  """Fetches the list of client_ids.
+def _create_examples_index(connection: sqlite3.Connection,
+                           database_filepath: str):
+  """Creates an index over the `(client_id, split_name)` of the examples.
+
+  Without this index, reading the examples of a client scans the entire
+  `examples` table. If the database is read-only the index is not created, and
+  a warning is logged instead.
+
+  Args:
+    connection: A `sqlite3.Connection` to the database.
+    database_filepath: A string filepath to a SQLite database.
+  """
+  try:
+    with connection:
+      connection.execute(f"CREATE INDEX IF NOT EXISTS {EXAMPLES_INDEX_NAME} "
+                         "ON examples (client_id, split_name);")
+  except sqlite3.OperationalError as e:
+    logging.warning(
+        "Unable to create an index over the examples of the SQL database at "
+        "[%s], reading client datasets will be slow: %s", database_filepath, e)
+
+
+def _fetch_client_num_examples(
+    connection: sqlite3.Connection,
+    split_name: Optional[str] = None) -> Dict[str, int]:
+  """Fetches the number of examples of each client.
 
   Args:
-    database_filepath: A path to a SQL database.
-    split_name: An optional split name to filter on. If `None`, all client ids
-      are returned.
+    connection: A `sqlite3.Connection` to the database.
+    split_name: An optional split name to filter on. If `None`, all clients are
+      returned, with their number of examples summed over all splits.
 
   Returns:
-    An iterator of string client ids.
+    A dictionary mapping string client ids to their number of examples.
   """
-  connection = sqlite3.connect(database_filepath)
-  query = "SELECT DISTINCT client_id FROM client_metadata"
+  query = "SELECT client_id, SUM(num_examples) FROM client_metadata"
+  parameters = ()
   if split_name is not None:
-    query += f" WHERE split_name = '{split_name}'"
-  query += ";"
-  result = connection.execute(query)
-  return map(lambda x: x[0], result)
+    query += " WHERE split_name = ?"
+    parameters = (split_name,)
+  query += " GROUP BY client_id;"
+  return dict(connection.execute(query, parameters))
 
 
 class SqlClientData(client_data.ClientData):
@@ -107,6 +143,13 @@ class SqlClientData(client_data.ClientData):
          training examples.
      -   `num_examples`: `INTEGER` column containing the number of examples
          held by this client.
+
+  On construction, an index over the `(client_id, split_name)` columns of the
+  `examples` table is created if the database is writable and the index does
+  not already exist. Client datasets created outside of TensorFlow, by
+  `create_tf_dataset_for_client` and `create_tf_datasets_for_clients`, are read
+  through a single connection which is shared by all reads of this object. The
+  connection is closed by `close`, or when this object is garbage collected.
   """
 
   def __init__(self, database_filepath: str, split_name: Optional[str] = None):
@@ -119,11 +162,20 @@ class SqlClientData(client_data.ClientData):
         A value of `None` means no filtering, selecting all examples.
     """
     py_typecheck.check_type(database_filepath, str)
-    _check_database_format(database_filepath)
+    # The connection may be used from other threads, for example by a
+    # `tf.data.Dataset` reading client datasets in parallel, so access to it is
+    # serialized by a lock.
+    self._connection = sqlite3.connect(
+        database_filepath, check_same_thread=False)
+    self._connection_lock = threading.Lock()
+    self._finalizer = weakref.finalize(self, self._connection.close)
+    _check_database_format(self._connection, database_filepath)
+    _create_examples_index(self._connection, database_filepath)
     self._filepath = database_filepath
     self._split_name = split_name
-    self._client_ids = sorted(
-        list(_fetch_client_ids(database_filepath, split_name)))
+    self._client_num_examples = _fetch_client_num_examples(
+        self._connection, split_name)
+    self._client_ids = sorted(self._client_num_examples)
     logging.info("Loaded %d client ids from SQL database.",
                  len(self._client_ids))
     # SQLite returns a single column of bytes which are serialized protocol
@@ -132,18 +184,34 @@ class SqlClientData(client_data.ClientData):
 
   def _create_dataset(self, client_id):
     """Creates a `tf.data.Dataset` for a client in a TF-serializable manner."""
+    # `SqlDataset` does not support query parameters, so quotes in the client id
+    # are escaped instead.
+    client_id = tf.strings.regex_replace(client_id, "'", "''")
     query_parts = [
         "SELECT serialized_example_proto FROM examples WHERE client_id = '",
         client_id, "'"
     ]
     if self._split_name is not None:
       query_parts.extend([" and split_name ='", self._split_name, "'"])
+    # Keeps the examples in the order of the table, rather than of the index.
+    query_parts.append(" ORDER BY rowid")
     return tf.data.experimental.SqlDataset(
         driver_name="sqlite",
         data_source_name=self._filepath,
         query=tf.strings.join(query_parts),
         output_types=(tf.string))
 
+  def close(self):
+    """Closes the connection to the database.
+
+    Client datasets can no longer be created by `create_tf_dataset_for_client`
+    and `create_tf_datasets_for_clients` once the connection is closed. Datasets
+    created by `serializable_dataset_fn` open their own connections, and are
+    not affected.
+    """
+    with self._connection_lock:
+      self._finalizer()
+
   @property
   def serializable_dataset_fn(self):
     return self._create_dataset
@@ -152,6 +220,34 @@ class SqlClientData(client_data.ClientData):
   def client_ids(self):
     return self._client_ids
 
+  def _check_client_id(self, client_id: str):
+    if client_id not in self._client_num_examples:
+      raise ValueError(
+          "ID [{i}] is not a client in this ClientData. See "
+          "property `client_ids` for the list of valid ids.".format(
+              i=client_id))
+
+  def _fetch_client_examples(
+      self, client_ids: Sequence[str]) -> Dict[str, List[bytes]]:
+    """Reads the serialized examples of `client_ids` from the database."""
+    examples = collections.defaultdict(list)
+    for start in range(0, len(client_ids), _MAX_CLIENTS_PER_QUERY):
+      query_client_ids = client_ids[start:start + _MAX_CLIENTS_PER_QUERY]
+      placeholders = ", ".join("?" * len(query_client_ids))
+      query = ("SELECT client_id, serialized_example_proto FROM examples "
+               f"WHERE client_id IN ({placeholders})")
+      parameters = tuple(query_client_ids)
+      if self._split_name is not None:
+        query += " AND split_name = ?"
+        parameters += (self._split_name,)
+      # Keeps the examples in the order of the table, rather than of the index.
+      query += " ORDER BY rowid;"
+      with self._connection_lock:
+        rows = self._connection.execute(query, parameters).fetchall()
+      for client_id, serialized_example_proto in rows:
+        examples[client_id].append(serialized_example_proto)
+    return examples
+
   def create_tf_dataset_for_client(self, client_id: str):
     """Creates a new `tf.data.Dataset` containing the client training examples.
 
@@ -165,12 +261,50 @@ class SqlClientData(client_data.ClientData):
     Returns:
       A `tf.data.Dataset` object.
     """
-    if client_id not in self.client_ids:
-      raise ValueError(
-          "ID [{i}] is not a client in this ClientData. See "
-          "property `client_ids` for the list of valid ids.".format(
-              i=client_id))
-    return self._create_dataset(client_id)
+    return self.create_tf_datasets_for_clients([client_id])[0]
+
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    """Creates a `tf.data.Dataset` for each client in `client_ids`.
+
+    The examples of all the clients are read in a single query, which is much
+    faster than calling `create_tf_dataset_for_client` for each client when
+    sampling many clients from a large database. Like
+    `create_tf_dataset_for_client`, this method is not serializable.
+
+    Args:
+      client_ids: A sequence of string identifiers of clients contained in the
+        `client_ids` property of the `SQLClientData`.
+
+    Returns:
+      A list of `tf.data.Dataset` objects, in the same order as `client_ids`.
+
+    Raises:
+      ValueError: If any of `client_ids` is not a client of this `ClientData`.
+    """
+    for client_id in client_ids:
+      self._check_client_id(client_id)
+    examples = self._fetch_client_examples(list(set(client_ids)))
+    return [
+        tf.data.Dataset.from_tensor_slices(
+            tf.constant(examples[client_id], dtype=tf.string))
+        for client_id in client_ids
+    ]
+
+  def num_examples_for_client(self, client_id: str) -> int:
+    """Returns the number of examples of a client.
+
+    The number of examples is read from the `client_metadata` table when this
+    object is constructed, so this method does not query the database.
+
+    Args:
+      client_id: The string identifier for the desired client.
+
+    Raises:
+      ValueError: If `client_id` is not a client of this `ClientData`.
+    """
+    self._check_client_id(client_id)
+    return self._client_num_examples[client_id]
 
   @property
   def element_type_structure(self):
@@ -13,8 +13,9 @@
 # limitations under the License.
 
 import os
-
 import sqlite3
+from unittest import mock
+
 from absl import flags
 import tensorflow as tf
 
@@ -146,6 +147,114 @@ class SqlClientDataTest(tf.test.TestCase):
     with self.subTest('test'):
       test_split('test', 1)
 
+  def test_creates_examples_index(self):
+    database_filepath = os.path.join(self.get_temp_dir(), 'no_index.sqlite')
+    with sqlite3.connect(database_filepath) as connection:
+      connection.execute("""CREATE TABLE examples (
+             split_name TEXT NOT NULL,
+             client_id TEXT NOT NULL,
+             serialized_example_proto BLOB NOT NULL);""")
+      connection.execute("""CREATE TABLE client_metadata (
+             client_id TEXT NOT NULL,
+             split_name TEXT NOT NULL,
+             num_examples INTEGER NOT NULL);""")
+
+    sql_client_data.SqlClientData(database_filepath)
+
+    with sqlite3.connect(database_filepath) as connection:
+      index_names = [
+          r[0] for r in connection.execute(
+              "SELECT name FROM sqlite_master WHERE type = 'index';")
+      ]
+      index_columns = [
+          r[2] for r in connection.execute(
+              f'PRAGMA index_info({sql_client_data.EXAMPLES_INDEX_NAME});')
+      ]
+    self.assertIn(sql_client_data.EXAMPLES_INDEX_NAME, index_names)
+    self.assertEqual(index_columns, ['client_id', 'split_name'])
+
+  def test_close_closes_connection(self):
+    client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+    client_data.create_tf_dataset_for_client('test_a')
+
+    client_data.close()
+    client_data.close()
+
+    with self.assertRaises(sqlite3.ProgrammingError):
+      client_data.create_tf_dataset_for_client('test_a')
+
+  def test_serializable_dataset_fn_after_close(self):
+    client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+    client_data.close()
+
+    dataset = client_data.serializable_dataset_fn('test_a')
+
+    self.assertLen(list(dataset), 1)
+
+  def test_num_examples_for_client(self):
+
+    def test_split(split_name, example_counts):
+      client_data = sql_client_data.SqlClientData(
+          test_dataset_filepath(), split_name=split_name)
+      for client_id, expected_examples in example_counts.items():
+        self.assertEqual(
+            client_data.num_examples_for_client(client_id),
+            expected_examples,
+            msg=client_id)
+
+    with self.subTest('no_split'):
+      test_split(None, {'test_a': 1, 'test_b': 2, 'test_c': 3})
+    with self.subTest('train_split'):
+      test_split('train', {'test_a': 1, 'test_b': 1, 'test_c': 2})
+    with self.subTest('test_split'):
+      test_split('test', {'test_b': 1, 'test_c': 1})
+
+  def test_num_examples_for_client_missing(self):
+    client_data = sql_client_data.SqlClientData(
+        test_dataset_filepath(), split_name='test')
+    with self.assertRaisesRegex(ValueError, 'not a client in this ClientData'):
+      client_data.num_examples_for_client('test_a')
+
+  def test_create_datasets_for_clients(self):
+
+    def test_split(split_name, example_nums):
+      client_data = sql_client_data.SqlClientData(
+          test_dataset_filepath(), split_name=split_name)
+      client_ids = list(example_nums.keys())
+      datasets = client_data.create_tf_datasets_for_clients(client_ids)
+      self.assertLen(datasets, len(client_ids))
+      for client_id, dataset in zip(client_ids, datasets):
+        self.assertEqual(dataset.element_spec,
+                         client_data.element_type_structure)
+        actual_example_nums = [
+            tf.train.Example.FromString(
+                x.numpy()).features.feature['example_num'].int64_list.value[0]
+            for x in dataset
+        ]
+        self.assertEqual(
+            actual_example_nums, example_nums[client_id], msg=client_id)
+
+    with self.subTest('no_split'):
+      test_split(None, {'test_c': [0, 1, 2], 'test_a': [0], 'test_b': [0, 1]})
+    with self.subTest('train_split'):
+      test_split('train', {'test_b': [0], 'test_c': [0, 2]})
+    with self.subTest('test_split'):
+      test_split('test', {'test_c': [1], 'test_b': [1]})
+
+  def test_create_datasets_for_clients_in_multiple_queries(self):
+    client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+    client_ids = ['test_c', 'test_a', 'test_b', 'test_c']
+    with mock.patch.object(sql_client_data, '_MAX_CLIENTS_PER_QUERY', 2):
+      datasets = client_data.create_tf_datasets_for_clients(client_ids)
+    actual_examples = [int(d.reduce(0, lambda s, x: s + 1)) for d in datasets]
+    self.assertEqual(actual_examples, [3, 1, 2, 3])
+
+  def test_create_datasets_for_clients_missing(self):
+    client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+    with self.assertRaisesRegex(ValueError, 'not a client in this ClientData'):
+      client_data.create_tf_datasets_for_clients(
+          ['test_a', 'missing_client_id'])
+
 
 class PreprocessSqlClientDataTest(tf.test.TestCase):
 
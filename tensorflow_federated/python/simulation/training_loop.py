@@ -15,10 +15,17 @@
 
 import asyncio
 import collections
+from concurrent import futures
+import contextlib
+import functools
+import queue
+import threading
 import time
-from typing import Any, Callable, Iterable, MutableMapping, Optional, OrderedDict, Tuple
+from typing import Any, Awaitable, Callable, Iterable, Iterator, MutableMapping, Optional, OrderedDict, Tuple
 
 from absl import logging
+import numpy as np
+import tree
 
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.computation import computation_base
@@ -51,6 +58,196 @@ def _run_training(training_fn: computation_base.Computation,
   return state, collections.OrderedDict(metrics)
 
 
+@contextlib.contextmanager
+def _prefetch_client_selections(
+    client_selection_fn: Callable[[int], Any], last_round: int,
+    rounds_to_prefetch: int) -> Iterator[Callable[[int], Any]]:
+  """Yields a `client_selection_fn` which selects clients ahead of time.
+
+  While the selection of a round is used, the selections of up to the next
+  `rounds_to_prefetch` rounds are computed in a background thread. A single
+  thread is used, so `client_selection_fn` is still invoked sequentially and in
+  order of round number.
+
+  Args:
+    client_selection_fn: A `Callable` accepting an integer round number, and
+      returning the client data to use in that round.
+    last_round: The last round number for which clients are selected.
+    rounds_to_prefetch: The number of rounds to select clients for ahead of the
+      current round. If `0`, `client_selection_fn` is yielded unchanged.
+
+  Yields:
+    A `Callable` accepting an integer round number, and returning the output of
+    `client_selection_fn` for that round.
+  """
+  if rounds_to_prefetch == 0:
+    yield client_selection_fn
+    return
+
+  executor = futures.ThreadPoolExecutor(
+      max_workers=1, thread_name_prefix='client_selection')
+  selections = collections.OrderedDict()
+
+  def prefetching_selection_fn(round_num: int) -> Any:
+    next_round = max(selections, default=round_num - 1) + 1
+    for prefetched_round in range(
+        next_round,
+        min(round_num + rounds_to_prefetch, last_round) + 1):
+      selections[prefetched_round] = executor.submit(client_selection_fn,
+                                                     prefetched_round)
+    selection = selections.pop(round_num, None)
+    if selection is None:
+      # The round was not prefetched, for example because rounds were skipped.
+      for future in selections.values():
+        future.cancel()
+      selections.clear()
+      return client_selection_fn(round_num)
+    return selection.result()
+
+  try:
+    yield prefetching_selection_fn
+  finally:
+    for future in selections.values():
+      future.cancel()
+    executor.shutdown(wait=True)
+
+
+_WriteFn = Callable[..., None]
+
+
+def _snapshot(value: Any) -> Any:
+  """Returns `value` with copies of the mutable arrays in its structure."""
+
+  def _copy(leaf):
+    if isinstance(leaf, np.ndarray):
+      return leaf.copy()
+    elif isinstance(leaf, structure.Struct):
+      # `tree` treats a `Struct` as a leaf, so its elements are copied here.
+      return _snapshot(leaf)
+    return leaf
+
+  if isinstance(value, structure.Struct):
+    # `structure.map_structure` can not pack the Python containers a `Struct`
+    # may hold, so the elements are copied one by one.
+    elements = structure.iter_elements(value)
+    return structure.Struct([(name, _snapshot(e)) for name, e in elements])
+  return tree.map_structure(_copy, value)
+
+
+class _BackgroundWriter():
+  """Awaits writes in order in a background thread.
+
+  A write is a function returning an awaitable, which is invoked and awaited in
+  an event loop owned by the background thread. If a write fails, all the
+  following writes are skipped and the error is raised by the next call to
+  `submit` or `flush`.
+  """
+
+  def __init__(self, max_pending_writes: int):
+    self._queue = queue.Queue(maxsize=max_pending_writes)
+    self._error = None
+    # Unlike `_error`, which is cleared once raised, never reset, so that the
+    # writes submitted after a failed write are skipped.
+    self._failed = False
+    self._thread = threading.Thread(
+        target=self._run, name='training_loop_writer', daemon=True)
+    self._thread.start()
+
+  def _run(self):
+    loop = asyncio.new_event_loop()
+    try:
+      while True:
+        write_fn = self._queue.get()
+        try:
+          if write_fn is None:
+            return
+          if not self._failed:
+            loop.run_until_complete(write_fn())
+        except Exception as e:  # pylint: disable=broad-except
+          self._error = e
+          self._failed = True
+        finally:
+          self._queue.task_done()
+    finally:
+      loop.close()
+
+  def _raise_error(self):
+    if self._error is not None:
+      error, self._error = self._error, None
+      raise error
+
+  def submit(self, write_fn: Callable[[], Awaitable[None]]):
+    """Submits a write, blocking while `max_pending_writes` are pending."""
+    self._raise_error()
+    self._queue.put(write_fn)
+
+  def flush(self):
+    """Waits for the pending writes, raising the error of a failed write."""
+    self._queue.join()
+    self._raise_error()
+
+  def close(self):
+    self._queue.put(None)
+    self._thread.join()
+
+
+@contextlib.contextmanager
+def _writes_in_background(loop: asyncio.AbstractEventLoop,
+                          max_pending_writes: int) -> Iterator[_WriteFn]:
+  """Yields a function which writes in the background.
+
+  The yielded function accepts a function returning an awaitable and its
+  arguments. If `max_pending_writes` is `0`, the awaitable is awaited in `loop`
+  before the function returns. Otherwise, the arguments are snapshotted and the
+  awaitable is awaited by a background thread, and the function only blocks
+  while `max_pending_writes` writes are pending. The pending writes are flushed
+  on exit, including if an error is raised.
+
+  Args:
+    loop: The event loop in which to await writes if `max_pending_writes` is
+      `0`.
+    max_pending_writes: The maximum number of writes submitted but not yet
+      completed.
+
+  Yields:
+    A function which accepts a function returning an awaitable and its
+    arguments.
+  """
+  if max_pending_writes == 0:
+    yield lambda write_fn, *args: loop.run_until_complete(write_fn(*args))
+    return
+
+  writer = _BackgroundWriter(max_pending_writes)
+
+  def write(write_fn, *args):
+    writer.submit(functools.partial(write_fn, *_snapshot(args)))
+
+  try:
+    yield write
+  except:
+    # Writes submitted before the error, for example the program state of the
+    # last completed round, are still flushed. An error raised by the writes is
+    # logged so that the original error is raised.
+    try:
+      writer.flush()
+    except Exception:  # pylint: disable=broad-except
+      logging.exception('Failed to flush writes after an error.')
+    raise
+  else:
+    writer.flush()
+  finally:
+    writer.close()
+
+
+async def _release_metrics(
+    metrics_managers: Iterable[release_manager_lib.ReleaseManager],
+    metrics: Any, round_num: int):
+  """Releases `metrics` with each of the `metrics_managers`."""
+  metrics_type = type_conversions.infer_type(metrics)
+  await asyncio.gather(
+      *[m.release(metrics, metrics_type, round_num) for m in metrics_managers])
+
+
 def _run_evaluation(evaluation_fn: Callable[[Any, Any], MetricsType],
                     client_selection_fn: Callable[[int], Any], state: Any,
                     round_num: int) -> OrderedDict[str, Any]:
@@ -76,7 +273,9 @@ def run_training_process(
         program_state_manager_lib.ProgramStateManager] = None,
     rounds_per_saving_program_state: int = 1,
     metrics_managers: Optional[Iterable[
-        release_manager_lib.ReleaseManager]] = None):
+        release_manager_lib.ReleaseManager]] = None,
+    rounds_to_prefetch: int = 0,
+    max_pending_writes: int = 0):
   """Runs a federated `training_process`.
 
   The following `tff.Computation` types signaures are required:
@@ -105,6 +304,21 @@ def run_training_process(
   * tff.simulation.EVALUATION_TIME_KEY: The amount of time (in seconds) it takes
     to run one round of evaluation.
 
+  If `rounds_to_prefetch` is positive, `training_selection_fn` is invoked in a
+  background thread for up to `rounds_to_prefetch` rounds ahead of the current
+  round, so that selecting clients and building their datasets overlaps with
+  training. In this case `training_selection_fn` must be safe to invoke from
+  another thread, and must not depend on the state of the training process. The
+  outputs of at most `rounds_to_prefetch` rounds are held in memory at a time.
+
+  If `max_pending_writes` is positive, program state is saved and metrics are
+  released in a background thread, so that the next round starts without
+  waiting for them. The arrays in the state are copied when it is submitted for
+  saving, and at most `max_pending_writes` saves and releases are pending at a
+  time, after which the training loop waits for them. Pending writes are
+  flushed before this function returns or raises an error, and an error raised
+  by a write is raised by this function in a later round.
+
   Args:
     training_process: A `tff.templates.IterativeProcess` to run for training.
     training_selection_fn: A `Callable` accepting an integer round number, and
@@ -124,10 +338,25 @@ def run_training_process(
       between saving program state.
     metrics_managers: An optional list of `tff.program.ReleaseManagers`s to use
       to save metrics.
+    rounds_to_prefetch: The number of rounds for which to invoke
+      `training_selection_fn` ahead of the current round. If `0`, the default,
+      `training_selection_fn` is invoked at the start of each round.
+    max_pending_writes: The maximum number of program state saves and metrics
+      releases to run in the background. If `0`, the default, they are run
+      before the next round starts.
 
   Returns:
     The `state` of the training process after training.
+
+  Raises:
+    ValueError: If `rounds_to_prefetch` or `max_pending_writes` is negative.
   """
+  if rounds_to_prefetch < 0:
+    raise ValueError('Expected `rounds_to_prefetch` to be non-negative, found '
+                     f'{rounds_to_prefetch}.')
+  if max_pending_writes < 0:
+    raise ValueError('Expected `max_pending_writes` to be non-negative, found '
+                     f'{max_pending_writes}.')
   loop = asyncio.get_event_loop()
 
   logging.info('Running training process')
@@ -137,57 +366,49 @@ def run_training_process(
         program_state_manager.load_latest(training_process_structure))
   else:
     program_state = None
-  if program_state is not None:
-    logging.info('Loaded program state at version %d', previous_saved_version)
-    state = program_state
-    start_round = previous_saved_version + 1
-  else:
-    logging.info('Initializing training process')
-    state = training_process.initialize()
-    start_round = 1
-
-    if evaluation_fn is not None and evaluation_selection_fn is not None:
-      evaluation_metrics = _run_evaluation(evaluation_fn,
-                                           evaluation_selection_fn, state, 0)
-
-      if metrics_managers is not None:
-        metrics_type = type_conversions.infer_type(evaluation_metrics)
-        loop.run_until_complete(
-            asyncio.gather(*[
-                m.release(evaluation_metrics, metrics_type, 0)
-                for m in metrics_managers
-            ]))
-
-    if program_state_manager is not None:
-      loop.run_until_complete(program_state_manager.save(state, 0))
-
-  for round_num in range(start_round, total_rounds + 1):
-    logging.info('Starting round %d', round_num)
-    metrics = collections.OrderedDict()
-    state, training_metrics = _run_training(training_process.next,
-                                            training_selection_fn, state,
-                                            round_num)
-    if metrics_managers is not None:
-      metrics.update(training_metrics)
-
-    if evaluation_fn is not None and evaluation_selection_fn is not None:
-      if round_num % rounds_per_evaluation == 0:
+  with _writes_in_background(loop, max_pending_writes) as write:
+    if program_state is not None:
+      logging.info('Loaded program state at version %d', previous_saved_version)
+      state = program_state
+      start_round = previous_saved_version + 1
+    else:
+      logging.info('Initializing training process')
+      state = training_process.initialize()
+      start_round = 1
+
+      if evaluation_fn is not None and evaluation_selection_fn is not None:
         evaluation_metrics = _run_evaluation(evaluation_fn,
-                                             evaluation_selection_fn, state,
-                                             round_num)
+                                             evaluation_selection_fn, state, 0)
+
         if metrics_managers is not None:
-          metrics.update(evaluation_metrics)
-
-    if metrics_managers is not None:
-      metrics_type = type_conversions.infer_type(metrics)
-      loop.run_until_complete(
-          asyncio.gather(*[
-              m.release(metrics, metrics_type, round_num)
-              for m in metrics_managers
-          ]))
-
-    if program_state_manager is not None:
-      if round_num % rounds_per_saving_program_state == 0:
-        loop.run_until_complete(program_state_manager.save(state, round_num))
+          write(_release_metrics, metrics_managers, evaluation_metrics, 0)
+
+      if program_state_manager is not None:
+        write(program_state_manager.save, state, 0)
+
+    with _prefetch_client_selections(training_selection_fn, total_rounds,
+                                     rounds_to_prefetch) as selection_fn:
+      for round_num in range(start_round, total_rounds + 1):
+        logging.info('Starting round %d', round_num)
+        metrics = collections.OrderedDict()
+        state, training_metrics = _run_training(training_process.next,
+                                                selection_fn, state, round_num)
+        if metrics_managers is not None:
+          metrics.update(training_metrics)
+
+        if evaluation_fn is not None and evaluation_selection_fn is not None:
+          if round_num % rounds_per_evaluation == 0:
+            evaluation_metrics = _run_evaluation(evaluation_fn,
+                                                 evaluation_selection_fn, state,
+                                                 round_num)
+            if metrics_managers is not None:
+              metrics.update(evaluation_metrics)
+
+        if metrics_managers is not None:
+          write(_release_metrics, metrics_managers, metrics, round_num)
+
+        if program_state_manager is not None:
+          if round_num % rounds_per_saving_program_state == 0:
+            write(program_state_manager.save, state, round_num)
 
   return state
@@ -13,12 +13,15 @@
 # limitations under the License.
 
 import collections
+import threading
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 
+from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.computation import computation_base
 from tensorflow_federated.python.core.impl.federated_context import federated_computation
 from tensorflow_federated.python.core.impl.federated_context import intrinsics
@@ -418,5 +421,327 @@ class RunTrainingProcessTest(parameterized.TestCase):
     self.assertEqual(metrics_manager.release.call_args_list, expected_calls)
 
 
+class RunTrainingProcessWithPrefetchingTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('0_1', 0, 1),
+      ('1_1', 1, 1),
+      ('5_1', 5, 1),
+      ('5_3', 5, 3),
+      ('5_10', 5, 10),
+  )
+  def test_training_fns_called(self, total_rounds, rounds_to_prefetch):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 1.0})
+    training_selection_fn = mock.MagicMock()
+    training_selection_fn.side_effect = lambda round_num: [round_num]
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=training_selection_fn,
+        total_rounds=total_rounds,
+        rounds_to_prefetch=rounds_to_prefetch)
+
+    expected_calls = []
+    for round_num in range(1, total_rounds + 1):
+      call = mock.call(round_num)
+      expected_calls.append(call)
+    self.assertEqual(training_selection_fn.call_args_list, expected_calls)
+    expected_calls = []
+    for round_num in range(1, total_rounds + 1):
+      if round_num == 1:
+        state = 'initialize'
+      else:
+        state = 'update'
+      call = mock.call(state, [round_num])
+      expected_calls.append(call)
+    self.assertEqual(training_process.next.call_args_list, expected_calls)
+
+  @parameterized.named_parameters(
+      ('1', 1),
+      ('3', 3),
+  )
+  def test_selects_clients_ahead_of_training(self, rounds_to_prefetch):
+    total_rounds = 6
+    selected_rounds = []
+    next_round_selected = threading.Condition()
+
+    def training_selection_fn(round_num):
+      with next_round_selected:
+        selected_rounds.append(round_num)
+        next_round_selected.notify_all()
+      return [round_num]
+
+    def next_fn(state, client_data):
+      round_num = client_data[0]
+      # The selection of the next round is computed while this round trains,
+      # but the selection of rounds beyond the prefetched ones is not.
+      if round_num < total_rounds:
+        with next_round_selected:
+          self.assertTrue(
+              next_round_selected.wait_for(
+                  lambda: round_num + 1 in selected_rounds, timeout=10))
+      self.assertLessEqual(max(selected_rounds), round_num + rounds_to_prefetch)
+      return (state, {'metric': 1.0})
+
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.side_effect = next_fn
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=training_selection_fn,
+        total_rounds=total_rounds,
+        rounds_to_prefetch=rounds_to_prefetch)
+
+    self.assertEqual(selected_rounds, list(range(1, total_rounds + 1)))
+
+  def test_raises_training_selection_fn_error(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 1.0})
+
+    def training_selection_fn(round_num):
+      if round_num == 3:
+        raise ValueError('Selection failed.')
+      return [round_num]
+
+    with self.assertRaisesRegex(ValueError, 'Selection failed.'):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=training_selection_fn,
+          total_rounds=5,
+          rounds_to_prefetch=2)
+    self.assertEqual(training_process.next.call_count, 2)
+
+  def test_raises_with_negative_rounds_to_prefetch(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    with self.assertRaises(ValueError):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=mock.MagicMock(),
+          total_rounds=1,
+          rounds_to_prefetch=-1)
+
+
+class RunTrainingProcessWithBackgroundWritesTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('1_1', 1, 1),
+      ('5_1', 5, 1),
+      ('5_2', 5, 2),
+      ('5_10', 5, 10),
+  )
+  def test_program_state_and_metrics_managers_called(self, total_rounds,
+                                                     max_pending_writes):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 1.0})
+    training_selection_fn = mock.MagicMock()
+    program_state_manager = mock.AsyncMock()
+    program_state_manager.load_latest.return_value = (None, 0)
+    metrics_manager = mock.AsyncMock()
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=training_selection_fn,
+        total_rounds=total_rounds,
+        program_state_manager=program_state_manager,
+        metrics_managers=[metrics_manager],
+        max_pending_writes=max_pending_writes)
+
+    expected_calls = [mock.call('initialize', 0)]
+    for round_num in range(1, total_rounds + 1):
+      call = mock.call('update', round_num)
+      expected_calls.append(call)
+    self.assertEqual(program_state_manager.save.call_args_list, expected_calls)
+    self.assertEqual([c[0][2] for c in metrics_manager.release.call_args_list],
+                     list(range(1, total_rounds + 1)))
+
+  def test_next_round_starts_before_program_state_is_saved(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    second_round_started = threading.Event()
+    saved_after_second_round_started = []
+
+    def next_fn(state, client_data):
+      del state  # Unused.
+      if client_data == 2:
+        second_round_started.set()
+      return ('update', {'metric': 1.0})
+
+    async def save(program_state, version):
+      del program_state  # Unused.
+      if version == 1:
+        saved_after_second_round_started.append(
+            second_round_started.wait(timeout=10))
+
+    training_process.next.side_effect = next_fn
+    program_state_manager = mock.AsyncMock()
+    program_state_manager.load_latest.return_value = ('update', 0)
+    program_state_manager.save.side_effect = save
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=lambda round_num: round_num,
+        total_rounds=2,
+        program_state_manager=program_state_manager,
+        max_pending_writes=1)
+
+    self.assertEqual(saved_after_second_round_started, [True])
+    self.assertEqual(program_state_manager.save.call_count, 2)
+
+  def test_saves_snapshot_of_program_state(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    state = collections.OrderedDict(weights=np.zeros([3]))
+    training_process.initialize.return_value = state
+    saved_states = []
+    save_started = threading.Event()
+
+    def next_fn(state, client_data):
+      del client_data  # Unused.
+      # Wait until the previous save is in the background before mutating it.
+      save_started.wait(timeout=10)
+      state['weights'] += 1.0
+      return (state, {'metric': 1.0})
+
+    async def save(program_state, version):
+      del version  # Unused.
+      save_started.set()
+      saved_states.append(program_state['weights'].tolist())
+
+    training_process.next.side_effect = next_fn
+    program_state_manager = mock.AsyncMock()
+    program_state_manager.load_latest.return_value = (None, 0)
+    program_state_manager.save.side_effect = save
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=mock.MagicMock(),
+        total_rounds=2,
+        program_state_manager=program_state_manager,
+        max_pending_writes=2)
+
+    self.assertEqual(saved_states,
+                     [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0], [2.0, 2.0, 2.0]])
+
+  def test_saves_snapshot_of_program_state_struct(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    weights = np.zeros([3])
+    state = structure.Struct([
+        ('weights', weights),
+        ('nested', structure.Struct([('weights', weights)])),
+        ('dict', collections.OrderedDict(weights=weights)),
+    ])
+    training_process.initialize.return_value = state
+    saved_states = []
+    rounds_finished = [threading.Event(), threading.Event()]
+
+    def next_fn(state, client_data):
+      del client_data  # Unused.
+      round_index = training_process.next.call_count - 1
+      weights[:] += 1.0
+      rounds_finished[round_index].set()
+      return (state, {'metric': 1.0})
+
+    async def save(program_state, version):
+      if version < len(rounds_finished):
+        # Only save once the next round has mutated the state.
+        rounds_finished[version].wait(timeout=10)
+      saved_states.append([
+          program_state.weights.tolist(),
+          program_state.nested.weights.tolist(),
+          program_state.dict['weights'].tolist(),
+      ])
+
+    training_process.next.side_effect = next_fn
+    program_state_manager = mock.AsyncMock()
+    program_state_manager.load_latest.return_value = (None, 0)
+    program_state_manager.save.side_effect = save
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=mock.MagicMock(),
+        total_rounds=2,
+        program_state_manager=program_state_manager,
+        max_pending_writes=2)
+
+    self.assertEqual(
+        saved_states,
+        [[[0.0, 0.0, 0.0]] * 3, [[1.0, 1.0, 1.0]] * 3, [[2.0, 2.0, 2.0]] * 3])
+
+  def test_raises_program_state_manager_error(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    later_saves_submitted = threading.Event()
+
+    def next_fn(state, client_data):
+      del state, client_data  # Unused.
+      if training_process.next.call_count == 2:
+        # The save of round 1 was submitted after the failing save of round 0.
+        later_saves_submitted.set()
+      return ('update', {'metric': 1.0})
+
+    async def save(program_state, version):
+      del program_state, version  # Unused.
+      later_saves_submitted.wait(timeout=10)
+      raise ValueError('Save failed.')
+
+    training_process.next.side_effect = next_fn
+    program_state_manager = mock.AsyncMock()
+    program_state_manager.load_latest.return_value = (None, 0)
+    program_state_manager.save.side_effect = save
+
+    with self.assertRaisesRegex(ValueError, 'Save failed.'):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=mock.MagicMock(),
+          total_rounds=3,
+          program_state_manager=program_state_manager,
+          max_pending_writes=1)
+
+    # Writes following the failed write are skipped.
+    program_state_manager.save.assert_called_once()
+
+  def test_flushes_writes_on_training_error(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.side_effect = [
+        ('update', {
+            'metric': 1.0
+        }),
+        ('update', {
+            'metric': 1.0
+        }),
+        RuntimeError('Training failed.'),
+    ]
+    program_state_manager = mock.AsyncMock()
+    program_state_manager.load_latest.return_value = (None, 0)
+
+    with self.assertRaisesRegex(RuntimeError, 'Training failed.'):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=mock.MagicMock(),
+          total_rounds=5,
+          program_state_manager=program_state_manager,
+          max_pending_writes=3)
+
+    self.assertEqual(program_state_manager.save.call_args_list, [
+        mock.call('initialize', 0),
+        mock.call('update', 1),
+        mock.call('update', 2),
+    ])
+
+  def test_raises_with_negative_max_pending_writes(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    with self.assertRaises(ValueError):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=mock.MagicMock(),
+          total_rounds=1,
+          max_pending_writes=-1)
+
+
 if __name__ == '__main__':
   absltest.main()